@@ -10,14 +10,19 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, HttpUrl
 
 from ..config import settings
-from ..db.supabase import get_supabase_client
-from ..security.ssrf import SSRFError, validate_url
+from ..db.repository import get_repository, ilike
+from ..security.ssrf import SSRFError, validate_url_async
+from ..services.crawler import is_html, read_text
+from ..services.http_clients import get_client
 
 router = APIRouter()
 logger = logging.getLogger("checkyourhospital.batch")
 
 BATCH_CONCURRENCY = 10
 SCAN_TIMEOUT = 15
+_HEADERS = {"User-Agent": "CheckYourHospital-BatchScanner/1.0"}
+# robots.txt / sitemap.xml are only inspected for a marker near the start
+_PROBE_BYTES = 65_536
 
 
 class BatchScanRequest(BaseModel):
@@ -53,9 +58,9 @@ async def _light_scan(client: httpx.AsyncClient, url: str) -> LightScanResult:
     result.is_https = parsed.scheme == "https"
 
     try:
-        # Fetch main page
-        resp = await client.get(url, follow_redirects=True, timeout=SCAN_TIMEOUT)
-        html = resp.text
+        # Fetch main page, streamed: a non-HTML body is never downloaded
+        async with client.stream("GET", url, headers=_HEADERS, timeout=SCAN_TIMEOUT) as resp:
+            html = (await read_text(resp)).text if is_html(resp) else ""
         soup = BeautifulSoup(html, "html.parser")
 
         # Meta description
@@ -77,26 +82,14 @@ async def _light_scan(client: httpx.AsyncClient, url: str) -> LightScanResult:
 
     # robots.txt
     try:
-        robots_resp = await client.get(
-            f"{base}/robots.txt", follow_redirects=True, timeout=10
-        )
-        result.has_robots_txt = (
-            robots_resp.status_code == 200
-            and "user-agent" in robots_resp.text.lower()
-        )
+        result.has_robots_txt = "user-agent" in (await _probe(client, f"{base}/robots.txt")).lower()
     except Exception:
         pass
 
     # sitemap.xml
     try:
-        sitemap_resp = await client.get(
-            f"{base}/sitemap.xml", follow_redirects=True, timeout=10
-        )
-        result.has_sitemap = (
-            sitemap_resp.status_code == 200
-            and "<urlset" in sitemap_resp.text.lower()
-            or "sitemapindex" in sitemap_resp.text.lower()
-        )
+        sitemap = (await _probe(client, f"{base}/sitemap.xml")).lower()
+        result.has_sitemap = "<urlset" in sitemap or "sitemapindex" in sitemap
     except Exception:
         pass
 
@@ -104,6 +97,14 @@ async def _light_scan(client: httpx.AsyncClient, url: str) -> LightScanResult:
     return result
 
 
+async def _probe(client: httpx.AsyncClient, url: str) -> str:
+    """Start of ``url``'s body if it answers 200, else ``""`` (body left unread)."""
+    async with client.stream("GET", url, headers=_HEADERS, timeout=10) as resp:
+        if resp.status_code != 200:
+            return ""
+        return (await read_text(resp, _PROBE_BYTES)).text
+
+
 def _calc_score(result: LightScanResult) -> int:
     """Calculate a 0-100 technical SEO score from 5 binary checks."""
     checks = [
@@ -129,30 +130,30 @@ async def batch_scan(body: BatchScanRequest):
         async with sem:
             # Skip SSRF-blocked URLs silently
             try:
-                validate_url(url)
+                await validate_url_async(url)
             except SSRFError:
                 return LightScanResult(url=url, error="SSRF blocked")
             return await _light_scan(client, url)
 
-    async with httpx.AsyncClient(
-        headers={"User-Agent": "CheckYourHospital-BatchScanner/1.0"},
-    ) as client:
-        tasks = [scan_with_sem(client, str(u)) for u in body.urls]
-        results = await asyncio.gather(*tasks)
+    client = get_client("sites")
+    tasks = [scan_with_sem(client, str(u)) for u in body.urls]
+    results = await asyncio.gather(*tasks)
 
     # Update beauty_clinics if requested
     if body.update_db:
-        sb = get_supabase_client()
-        if sb:
+        repo = get_repository()
+        if repo:
             for r in results:
                 if r.error:
                     continue
                 # Match by website URL
                 domain = urlparse(r.url).netloc
                 try:
-                    sb.table("beauty_clinics").update({
-                        "latest_score": r.score,
-                    }).like("website", f"%{domain}%").execute()
+                    await repo.update(
+                        "beauty_clinics",
+                        {"latest_score": r.score},
+                        [ilike("website", f"%{domain}%")],
+                    )
                 except Exception as e:
                     logger.warning(f"DB update failed for {domain}: {e}")
 
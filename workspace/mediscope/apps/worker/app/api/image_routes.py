@@ -1,7 +1,6 @@
 """API routes for image generation."""
 
 import logging
-import uuid
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import Response
@@ -10,7 +9,9 @@ from pydantic import BaseModel
 from ..api.routes import verify_bearer
 from ..services.image_generator import (
     ImageType,
+    find_uploaded_image,
     generate_image,
+    image_upload_path,
     list_templates,
     upload_image_to_storage,
 )
@@ -44,6 +45,14 @@ async def generate_image_endpoint(
     If upload=true, uploads to Supabase Storage and returns URL.
     Otherwise, returns PNG bytes directly.
     """
+    if body.upload:
+        filename = image_upload_path(
+            body.image_type, body.procedure_name, body.data, body.language, body.width, body.height
+        )
+        url = await find_uploaded_image(filename)
+        if url is not None:
+            return GenerateImageUrlResponse(url=url, filename=filename)
+
     try:
         png_bytes = await generate_image(
             image_type=body.image_type,
@@ -58,7 +67,6 @@ async def generate_image_endpoint(
         raise HTTPException(status_code=500, detail="Image generation failed")
 
     if body.upload:
-        filename = f"{body.image_type.value}/{uuid.uuid4()}.png"
         try:
             url = upload_image_to_storage(filename, png_bytes)
         except RuntimeError:
@@ -3,15 +3,24 @@
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 from pydantic import BaseModel, HttpUrl
 
 from ..config import settings
 from ..db.supabase import get_supabase_client, save_scan_result, update_audit_status
+from ..security.dns_resolver import resolver
 from ..security.rate_limit import RateLimiter
-from ..security.ssrf import SSRFError, validate_url
+from ..security.ssrf import SSRFError, validate_url_async
+from ..services.browser_pool import get_browser_pool
+from ..services.job_queue import Job, WorkerPool, get_job_queue
+from ..services.lab_metrics import lab_metrics_stats
+from ..services.pagespeed_cache import pagespeed_cache_stats
 from ..services.pdf_generator import generate_pdf
+from ..services.regex_guard import regex_guard_stats
+from ..services.render_cache import get_render_cache
+from ..services.scan_cache import scan_cache, scan_key
 from ..services.scanner import run_scan
+from ..services.serp_checker import serp_cache_stats
 
 router = APIRouter()
 rate_limiter = RateLimiter(max_requests=settings.rate_limit_rpm, window_seconds=60)
@@ -37,12 +46,29 @@ async def health():
     return {"status": "ok", "service": "checkyourhospital-worker"}
 
 
+@router.get("/metrics")
+async def metrics(_token: str = Depends(verify_bearer)):
+    """In-process cache and queue counters for this instance."""
+    return {
+        "scan_cache": scan_cache.stats,
+        "serp_cache": serp_cache_stats(),
+        "dns": resolver.stats(),
+        "jobs": get_job_queue().counts(),
+        "pagespeed_cache": pagespeed_cache_stats(),
+        "lab_metrics": lab_metrics_stats(),
+        "browser_pool": get_browser_pool().stats(),
+        "render_cache": get_render_cache().stats(),
+        "regex_guard": regex_guard_stats(),
+    }
+
+
 # --- Scan ---
 
 class ScanRequest(BaseModel):
     audit_id: str | None = None
     url: HttpUrl
     options: dict | None = None
+    priority: int = 0  # higher runs first
 
 
 class ScanResponse(BaseModel):
@@ -50,20 +76,49 @@ class ScanResponse(BaseModel):
     status: str
 
 
-async def _run_scan_task(task_id: str, url: str, audit_id: str | None, options: dict):
-    """Background task: run scan and save results."""
+class ScanStatusResponse(BaseModel):
+    task_id: str
+    status: str  # queued | running | succeeded | failed
+    priority: int
+    attempts: int
+    max_attempts: int
+    created_at: float
+    updated_at: float
+    result: dict | None = None
+    error: str | None = None
+
+
+async def _run_scan_task(
+    task_id: str,
+    url: str,
+    audit_id: str | None,
+    options: dict,
+    *,
+    final_attempt: bool = True,
+) -> dict:
+    """Run scan and save results. Raises on failure so the job queue can retry;
+    the audit is only marked failed once no retry is left."""
     import logging
     logger = logging.getLogger("checkyourhospital.scan")
 
     max_pages = options.get("max_pages", 50)
     max_depth = options.get("depth", 3)
+    concurrency = options.get("concurrency")
+    force_refresh = bool(options.get("force_refresh"))
 
     try:
         if audit_id:
             await update_audit_status(audit_id, "scanning")
 
         logger.info(f"Scan started: {url} (audit_id={audit_id})")
-        result = await run_scan(url, max_pages=max_pages, max_depth=max_depth)
+        # Identical scans in flight are shared; recent results are reused
+        result = await scan_cache.run(
+            scan_key(url, {"max_pages": max_pages, "depth": max_depth}),
+            lambda: run_scan(
+                url, max_pages=max_pages, max_depth=max_depth, crawl_concurrency=concurrency
+            ),
+            force_refresh=force_refresh,
+        )
         result["task_id"] = task_id
         logger.info(f"Scan completed: {url} score={result.get('total_score')}")
 
@@ -84,14 +139,42 @@ async def _run_scan_task(task_id: str, url: str, audit_id: str | None, options:
                 logger.warning(f"PDF generation failed for audit_id={audit_id}: {pdf_err}")
     except Exception as e:
         logger.exception(f"Scan failed: {url} error={e}")
-        if audit_id:
+        if audit_id and final_attempt:
             await update_audit_status(audit_id, "failed")
+        raise
+
+    return {
+        "total_score": result.get("total_score"),
+        "grade": result.get("grade"),
+        "pages_crawled": result.get("pages_crawled"),
+        "error": result.get("error"),
+        "scan_cache": result.get("scan_cache"),
+    }
+
+
+async def _run_scan_job(job: Job) -> dict:
+    """Job queue handler for ``scan`` jobs."""
+    p = job.payload
+    return await _run_scan_task(
+        job.id, p["url"], p.get("audit_id"), p.get("options") or {},
+        final_attempt=job.is_last_attempt,
+    )
+
+
+_scan_workers: WorkerPool | None = None
+
+
+def get_scan_workers() -> WorkerPool:
+    """Worker pool draining scan jobs; started and stopped by the app lifespan."""
+    global _scan_workers
+    if _scan_workers is None:
+        _scan_workers = WorkerPool(get_job_queue(), {"scan": _run_scan_job})
+    return _scan_workers
 
 
 @router.post("/scan", response_model=ScanResponse, status_code=202)
 async def scan(
     body: ScanRequest,
-    background_tasks: BackgroundTasks,
     _token: str = Depends(verify_bearer),
 ):
     url_str = str(body.url)
@@ -105,18 +188,38 @@ async def scan(
 
     # SSRF validation
     try:
-        validate_url(url_str)
+        await validate_url_async(url_str)
     except SSRFError as e:
         raise HTTPException(status_code=400, detail=f"URL blocked: {e}")
 
     task_id = str(uuid.uuid4())
     options = body.options or {}
 
-    background_tasks.add_task(_run_scan_task, task_id, url_str, body.audit_id, options)
+    get_job_queue().enqueue(
+        "scan",
+        {"url": url_str, "audit_id": body.audit_id, "options": options},
+        job_id=task_id,
+        priority=body.priority,
+    )
+    get_scan_workers().notify()
 
     return ScanResponse(task_id=task_id, status="queued")
 
 
+@router.get("/scan/{task_id}", response_model=ScanStatusResponse)
+async def scan_status(task_id: str, _token: str = Depends(verify_bearer)):
+    """Status of a queued scan: queued → running → succeeded | failed.
+
+    The queue is a SQLite file local to each instance, so only the instance that
+    accepted the scan knows the task: with several Cloud Run instances, a poll
+    routed to another one gets 404.
+    """
+    job = get_job_queue().get(task_id)
+    if job is None or job.kind != "scan":
+        raise HTTPException(status_code=404, detail="Scan task not found")
+    return ScanStatusResponse(**job.to_dict())
+
+
 # --- Generate PDF ---
 
 class GeneratePdfRequest(BaseModel):
@@ -2,20 +2,18 @@
 
 from urllib.parse import urlparse
 
-from bs4 import BeautifulSoup
-
 from .base import CheckResult, Grade
+from .parsed_page import ParsedPage, as_page
 
 _DISPLAY_NAME = "대표 URL 지정"
 _DESCRIPTION = "같은 내용의 페이지가 여러 주소로 접근될 때, 어떤 것이 진짜인지 알려줍니다"
 _RECOMMENDATION = '웹 개발자에게 "각 페이지에 canonical 태그를 추가해달라"고 요청하세요'
 
 
-def check_canonical(html: str, url: str) -> CheckResult:
-    soup = BeautifulSoup(html, "lxml")
+def check_canonical(html: str | ParsedPage, url: str) -> CheckResult:
     issues: list[str] = []
 
-    canonical = soup.find("link", rel="canonical")
+    canonical = as_page(html, url).soup.find("link", rel="canonical")
     details: dict = {"has_canonical": canonical is not None}
 
     if not canonical:
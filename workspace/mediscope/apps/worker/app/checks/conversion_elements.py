@@ -5,6 +5,7 @@ import re
 from bs4 import BeautifulSoup
 
 from .base import CheckResult, Grade
+from .parsed_page import ParsedPage, as_pages
 
 # CTA keywords (Korean + English)
 _CTA_KEYWORDS = re.compile(
@@ -64,11 +65,11 @@ def _detect_cta_buttons(soup: BeautifulSoup) -> list[dict]:
     return ctas
 
 
-def _detect_phone_links(soup: BeautifulSoup) -> dict:
+def _detect_phone_links(page: ParsedPage) -> dict:
     """Detect phone numbers and whether they use tel: links."""
-    tel_links = soup.find_all("a", href=re.compile(r"^tel:", re.I))
+    tel_links = page.soup.find_all("a", href=re.compile(r"^tel:", re.I))
     phone_re = re.compile(r"0\d{1,2}[-.\s]?\d{3,4}[-.\s]?\d{4}")
-    text = soup.get_text()
+    text = page.raw_text
     phone_texts = phone_re.findall(text)
     return {
         "tel_links": len(tel_links),
@@ -77,9 +78,9 @@ def _detect_phone_links(soup: BeautifulSoup) -> dict:
     }
 
 
-def _detect_messengers(soup: BeautifulSoup) -> dict[str, bool]:
+def _detect_messengers(page: ParsedPage) -> dict[str, bool]:
     """Detect messenger widgets and links."""
-    full_html = str(soup)
+    full_html = page.html
     found: dict[str, bool] = {}
     for name, patterns in _MESSENGER_PATTERNS.items():
         found[name] = any(p.search(full_html) for p in patterns)
@@ -117,18 +118,17 @@ def _analyze_forms(soup: BeautifulSoup) -> dict:
     }
 
 
-def _detect_price(soup: BeautifulSoup) -> bool:
+def _detect_price(page: ParsedPage) -> bool:
     """Check if price information is visible."""
-    text = soup.get_text()
-    return bool(_PRICE_KEYWORDS.search(text))
+    return bool(_PRICE_KEYWORDS.search(page.raw_text))
 
 
-def check_conversion_elements(pages: list[dict]) -> CheckResult:
+def check_conversion_elements(pages: list[dict] | list[ParsedPage]) -> CheckResult:
     """
     Analyze crawled pages for booking/conversion elements.
 
     Args:
-        pages: List of dicts with keys: url, html, status_code
+        pages: ParsedPage objects or dicts with keys: url, html, status_code
 
     Returns:
         CheckResult with conversion element analysis.
@@ -144,8 +144,9 @@ def check_conversion_elements(pages: list[dict]) -> CheckResult:
             issues=["분석할 페이지가 없습니다"],
         )
 
-    main_html = pages[0]["html"]
-    main_soup = BeautifulSoup(main_html, "html.parser")
+    pages = as_pages(pages)
+    main_page = pages[0]
+    main_soup = main_page.soup
 
     # 1. CTA detection on main page
     main_ctas = _detect_cta_buttons(main_soup)
@@ -155,28 +156,25 @@ def check_conversion_elements(pages: list[dict]) -> CheckResult:
     procedure_pages_total = 0
     procedure_pages_with_cta = 0
     for page in pages[1:]:
-        url = page.get("url", "")
-        page_soup = BeautifulSoup(page["html"], "html.parser")
-        title_text = page_soup.title.string if page_soup.title else ""
-        body_text = page_soup.get_text()[:500]
+        url = page.url
+        title_text = page.title
+        body_text = page.raw_text[:500]
         if _PROCEDURE_KEYWORDS.search(url) or _PROCEDURE_KEYWORDS.search(title_text or "") or _PROCEDURE_KEYWORDS.search(body_text):
             procedure_pages_total += 1
-            if _detect_cta_buttons(page_soup):
+            if _detect_cta_buttons(page.soup):
                 procedure_pages_with_cta += 1
 
     # 3. Phone detection
-    phone_info = _detect_phone_links(main_soup)
+    phone_info = _detect_phone_links(main_page)
 
     # 4. Messenger detection
-    messengers = _detect_messengers(main_soup)
+    messengers = _detect_messengers(main_page)
 
     # 5. Form analysis
     form_info = _analyze_forms(main_soup)
 
     # 6. Price visibility (check all pages)
-    price_visible = any(
-        _detect_price(BeautifulSoup(p["html"], "html.parser")) for p in pages
-    )
+    price_visible = any(_detect_price(p) for p in pages)
 
     # === Scoring ===
     score = 0
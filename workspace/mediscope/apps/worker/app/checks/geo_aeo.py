@@ -6,6 +6,7 @@ import re
 import httpx
 
 from ..checks.base import CheckResult, Grade
+from ..checks.parsed_page import ParsedPage, as_page
 from ..config import settings
 
 logger = logging.getLogger("checkyourhospital.checks.geo_aeo")
@@ -263,11 +264,10 @@ async def check_ai_search_mention(
     )
 
 
-def check_content_clarity(html: str) -> CheckResult:
+def check_content_clarity(html: str | ParsedPage) -> CheckResult:
     """Check content clarity signals for AI engines."""
-    from bs4 import BeautifulSoup
-
-    soup = BeautifulSoup(html, "html.parser")
+    page = as_page(html)
+    soup = page.soup
     score = 0.0
     issues: list[str] = []
     details: dict = {}
@@ -313,7 +313,7 @@ def check_content_clarity(html: str) -> CheckResult:
 
     # Check for Q&A style content (natural language queries)
     qa_patterns = re.compile(r"(무엇|어떻게|왜|언제|어디|how|what|why|when|where)\s*[?？]", re.I)
-    text = soup.get_text()
+    text = page.raw_text
     qa_matches = qa_patterns.findall(text)
     details["qa_pattern_count"] = len(qa_matches)
     if qa_matches:
@@ -1,8 +1,7 @@
 """Heading structure check (weight: 5%)."""
 
-from bs4 import BeautifulSoup
-
 from .base import CheckResult, Grade
+from .parsed_page import ParsedPage, as_page
 
 _DISPLAY_NAME = "페이지 구조 (제목 체계)"
 _DESCRIPTION = "페이지의 대제목-소제목 구조가 논리적인지 확인합니다"
@@ -11,14 +10,14 @@ _RECOMMENDATION = (
 )
 
 
-def check_headings(html: str) -> CheckResult:
-    soup = BeautifulSoup(html, "lxml")
+def check_headings(html: str | ParsedPage) -> CheckResult:
+    page = as_page(html)
     issues: list[str] = []
 
-    h1_tags = soup.find_all("h1")
-    h1_count = len(h1_tags)
-    h2_count = len(soup.find_all("h2"))
-    h3_count = len(soup.find_all("h3"))
+    levels = [level for level, _ in page.headings]
+    h1_count = levels.count(1)
+    h2_count = levels.count(2)
+    h3_count = levels.count(3)
 
     details = {"h1_count": h1_count, "h2_count": h2_count, "h3_count": h3_count}
 
@@ -38,9 +37,7 @@ def check_headings(html: str) -> CheckResult:
         issues.append("H1 태그가 과다합니다 (3개 이상)")
 
     # Check hierarchy: H1 should come before H2
-    all_headings = soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6"])
-    if len(all_headings) >= 2:
-        levels = [int(h.name[1]) for h in all_headings]
+    if len(levels) >= 2:
         for i in range(1, len(levels)):
             if levels[i] - levels[i - 1] > 1:
                 issues.append(f"헤딩 계층 건너뜀: H{levels[i-1]} → H{levels[i]}")
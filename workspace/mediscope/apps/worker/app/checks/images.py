@@ -1,8 +1,7 @@
 """Image ALT tag check (weight: 5%)."""
 
-from bs4 import BeautifulSoup
-
 from .base import CheckResult, Grade
+from .parsed_page import ParsedPage, as_page
 
 _DISPLAY_NAME = "이미지 설명 텍스트"
 _DESCRIPTION = "이미지에 대체 텍스트(설명)가 있는지 확인합니다"
@@ -11,9 +10,8 @@ _RECOMMENDATION = (
 )
 
 
-def check_images(html: str) -> CheckResult:
-    soup = BeautifulSoup(html, "lxml")
-    images = soup.find_all("img")
+def check_images(html: str | ParsedPage) -> CheckResult:
+    images = as_page(html).soup.find_all("img")
     total = len(images)
 
     if total == 0:
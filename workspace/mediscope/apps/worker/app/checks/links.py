@@ -1,11 +1,11 @@
 """Internal links / broken links check (weight: 5%)."""
 
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 
 import httpx
-from bs4 import BeautifulSoup
 
 from .base import CheckResult, Grade
+from .parsed_page import ParsedPage, as_page
 
 _DISPLAY_NAME = "내부 링크 상태"
 _DESCRIPTION = "홈페이지 내 링크들이 정상적으로 작동하는지 확인합니다"
@@ -15,16 +15,14 @@ _RECOMMENDATION = (
 
 
 async def check_links(
-    client: httpx.AsyncClient, html: str, base_url: str, *, max_check: int = 30
+    client: httpx.AsyncClient, html: str | ParsedPage, base_url: str, *, max_check: int = 30
 ) -> CheckResult:
-    soup = BeautifulSoup(html, "lxml")
+    page = as_page(html, base_url)
     base_domain = urlparse(base_url).netloc
     issues: list[str] = []
 
     internal_links: list[str] = []
-    for a in soup.find_all("a", href=True):
-        href = str(a["href"])
-        full = urljoin(base_url, href)
+    for full in page.links:
         parsed = urlparse(full)
         if parsed.netloc == base_domain and parsed.scheme in ("http", "https"):
             internal_links.append(full)
@@ -1,8 +1,7 @@
 """Meta tags check — title + description (weight: 10%)."""
 
-from bs4 import BeautifulSoup, Tag
-
 from .base import CheckResult, Grade
+from .parsed_page import ParsedPage, as_page
 
 _DISPLAY_NAME = "검색 결과 미리보기"
 _DESCRIPTION = "검색 결과에 보이는 제목과 설명문입니다"
@@ -11,14 +10,13 @@ _RECOMMENDATION = (
 )
 
 
-def check_meta_tags(html: str, url: str) -> CheckResult:
-    soup = BeautifulSoup(html, "lxml")
+def check_meta_tags(html: str | ParsedPage, url: str) -> CheckResult:
+    page = as_page(html, url)
     issues: list[str] = []
     details: dict = {}
 
     # Title
-    title_tag = soup.find("title")
-    title_text = title_tag.get_text(strip=True) if title_tag else ""
+    title_text = page.title
     details["title"] = title_text
     details["title_length"] = len(title_text)
 
@@ -30,12 +28,7 @@ def check_meta_tags(html: str, url: str) -> CheckResult:
         issues.append(f"title이 너무 짧습니다 ({len(title_text)}자)")
 
     # Description
-    desc_tag = soup.find("meta", attrs={"name": "description"})
-    desc_text = ""
-    if isinstance(desc_tag, Tag):
-        desc_text = desc_tag.get("content", "") or ""
-        if isinstance(desc_text, list):
-            desc_text = desc_text[0] if desc_text else ""
+    desc_text = page.meta.get("description", "")
     details["description"] = desc_text
     details["description_length"] = len(desc_text)
 
@@ -45,14 +38,11 @@ def check_meta_tags(html: str, url: str) -> CheckResult:
         issues.append(f"description이 너무 깁니다 ({len(desc_text)}자, 권장 160자 이하)")
 
     # OG tags
-    og_title = soup.find("meta", property="og:title")
-    og_desc = soup.find("meta", property="og:description")
-    og_image = soup.find("meta", property="og:image")
-    details["has_og_title"] = og_title is not None
-    details["has_og_description"] = og_desc is not None
-    details["has_og_image"] = og_image is not None
+    details["has_og_title"] = "og:title" in page.meta
+    details["has_og_description"] = "og:description" in page.meta
+    details["has_og_image"] = "og:image" in page.meta
 
-    if not og_title:
+    if not details["has_og_title"]:
         issues.append("og:title이 없습니다")
 
     # Score
@@ -1,8 +1,7 @@
 """Mobile responsiveness check (weight: 5%)."""
 
-from bs4 import BeautifulSoup
-
 from .base import CheckResult, Grade
+from .parsed_page import ParsedPage, as_page
 
 _DISPLAY_NAME = "모바일 최적화"
 _DESCRIPTION = "스마트폰에서 홈페이지가 제대로 보이는지 확인합니다"
@@ -11,43 +10,25 @@ _RECOMMENDATION = (
 )
 
 
-def check_mobile(html: str) -> CheckResult:
-    soup = BeautifulSoup(html, "lxml")
+def check_mobile(html: str | ParsedPage) -> CheckResult:
+    page = as_page(html)
     issues: list[str] = []
     details: dict = {}
 
     # Check viewport meta tag
-    viewport = soup.find("meta", attrs={"name": "viewport"})
-    has_viewport = viewport is not None
+    has_viewport = "viewport" in page.meta
     details["has_viewport"] = has_viewport
 
     if not has_viewport:
         issues.append("viewport 메타 태그가 없습니다")
     else:
-        content = viewport.get("content", "")
-        if isinstance(content, list):
-            content = content[0] if content else ""
+        content = page.meta["viewport"]
         details["viewport_content"] = content
         if "width=device-width" not in content:
             issues.append("viewport에 width=device-width가 설정되지 않았습니다")
 
-    # Check for tap target issues (basic heuristic: very small clickable elements)
-    # This is a simplified check — full check would use Lighthouse
-    small_links = 0
-    for a in soup.find_all("a"):
-        style = a.get("style", "")
-        if isinstance(style, str) and "font-size" in style:
-            # Very rough heuristic
-            pass
-
-    # Check for text size (basic)
-    font_too_small = False
-    for style_tag in soup.find_all("style"):
-        if style_tag.string and "font-size: 1" in style_tag.string:
-            # font-size: 10px or smaller
-            pass
-
-    details["small_links"] = small_links
+    # Tap target / font size checks need rendering — full check would use Lighthouse
+    details["small_links"] = 0
 
     if not has_viewport:
         return CheckResult(
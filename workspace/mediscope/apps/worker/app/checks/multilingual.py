@@ -3,9 +3,8 @@
 import re
 from urllib.parse import parse_qs, urlparse
 
-from bs4 import BeautifulSoup
-
 from .base import CheckResult, Grade
+from .parsed_page import ParsedPage, as_page
 
 # URL patterns indicating a specific language version
 _LANG_PATH_RE = re.compile(
@@ -40,18 +39,17 @@ _OC_RECOMMENDATION = (
 
 
 def check_multilingual_pages(
-    main_html: str, crawled_urls: list[str],
+    main_html: str | ParsedPage, crawled_urls: list[str],
 ) -> CheckResult:
     """Check for multi-language page availability."""
-    soup = BeautifulSoup(main_html, "html.parser")
+    page = as_page(main_html)
+    soup = page.soup
     detected: set[str] = set()
 
     # Check <html lang="...">
-    html_tag = soup.find("html")
-    if html_tag:
-        html_lang = (html_tag.get("lang") or "").strip().lower()
-        if html_lang:
-            detected.add(html_lang.split("-")[0])
+    html_lang = page.lang.lower()
+    if html_lang:
+        detected.add(html_lang.split("-")[0])
 
     # Check <meta http-equiv="content-language">
     meta_lang = soup.find("meta", attrs={"http-equiv": re.compile(r"content-language", re.I)})
@@ -164,10 +162,9 @@ def check_multilingual_pages(
     )
 
 
-def check_hreflang(main_html: str) -> CheckResult:
+def check_hreflang(main_html: str | ParsedPage) -> CheckResult:
     """Check <link rel="alternate" hreflang="..."> tags."""
-    soup = BeautifulSoup(main_html, "html.parser")
-    tags = soup.find_all("link", attrs={"rel": "alternate", "hreflang": True})
+    tags = as_page(main_html).soup.find_all("link", attrs={"rel": "alternate", "hreflang": True})
     langs = [tag["hreflang"] for tag in tags if tag.get("hreflang")]
     count = len(langs)
 
@@ -203,11 +200,12 @@ def check_hreflang(main_html: str) -> CheckResult:
     )
 
 
-def check_overseas_channels(main_html: str) -> CheckResult:
+def check_overseas_channels(main_html: str | ParsedPage) -> CheckResult:
     """Detect overseas messaging channel links (LINE, WeChat, WhatsApp)."""
-    soup = BeautifulSoup(main_html, "html.parser")
+    page = as_page(main_html)
+    soup = page.soup
     channels: set[str] = set()
-    text = soup.get_text()
+    text = page.raw_text
 
     for a in soup.find_all("a", href=True):
         href = str(a["href"]).lower()
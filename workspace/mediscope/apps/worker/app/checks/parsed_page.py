@@ -0,0 +1,137 @@
+"""Parse-once document model shared by checks and analyzers.
+
+A scan used to re-parse the same HTML with BeautifulSoup in nearly every check.
+``ParsedPage`` parses once (lxml backend) and memoizes the derived views that
+checks ask for. The soup is shared, so consumers must treat it as read-only —
+no ``decompose()``/``extract()``; use ``text`` for script-free visible text.
+"""
+
+import json
+from functools import cached_property
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+# Tags whose text is never visible to a visitor
+_INVISIBLE_TAGS = {"script", "style", "noscript"}
+
+
+def visible_text(soup: BeautifulSoup) -> str:
+    """Script/style/noscript-free text joined by spaces, without mutating ``soup``."""
+    parts: list[str] = []
+    for s in soup.strings:
+        if any(p.name in _INVISIBLE_TAGS for p in s.parents):
+            continue
+        s = s.strip()
+        if s:
+            parts.append(s)
+    return " ".join(parts)
+
+
+class ParsedPage:
+    def __init__(
+        self, url: str = "", html: str = "", status_code: int = 200, *, title: str | None = None
+    ):
+        self.url = url
+        self.html = html or ""
+        self.status_code = status_code
+        if title:
+            # Caller already knows the title (legacy page dicts) — skip extraction
+            self.__dict__["title"] = title
+
+    def __repr__(self) -> str:
+        return f"ParsedPage(url={self.url!r}, bytes={len(self.html)})"
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        return BeautifulSoup(self.html, "lxml")
+
+    @cached_property
+    def title(self) -> str:
+        tag = self.soup.find("title")
+        return tag.get_text(strip=True) if tag else ""
+
+    @cached_property
+    def lang(self) -> str:
+        """``<html lang>`` attribute, stripped (empty if absent)."""
+        tag = self.soup.find("html")
+        return str(tag.get("lang") or "").strip() if tag else ""
+
+    @cached_property
+    def text(self) -> str:
+        """Visible text: script/style/noscript removed, strings joined by spaces."""
+        return visible_text(self.soup)
+
+    @cached_property
+    def full_text(self) -> str:
+        """``soup.get_text(separator=" ", strip=True)`` — includes noscript text."""
+        return self.soup.get_text(separator=" ", strip=True)
+
+    @cached_property
+    def raw_text(self) -> str:
+        """``soup.get_text()`` — unstripped, no separator."""
+        return self.soup.get_text()
+
+    @cached_property
+    def json_ld(self) -> list:
+        """All JSON-LD items; top-level arrays are flattened, invalid blocks skipped."""
+        items: list = []
+        for script in self.soup.find_all("script", type="application/ld+json"):
+            try:
+                data = json.loads(script.string or "")
+            except (json.JSONDecodeError, TypeError):
+                continue
+            if isinstance(data, list):
+                items.extend(data)
+            else:
+                items.append(data)
+        return items
+
+    @cached_property
+    def links(self) -> list[str]:
+        """Absolute URLs of every ``<a href>``, resolved against the page URL."""
+        return [urljoin(self.url, str(a["href"])) for a in self.soup.find_all("a", href=True)]
+
+    @cached_property
+    def meta(self) -> dict[str, str]:
+        """``<meta>`` content keyed by lower-cased ``name`` or ``property`` (first wins)."""
+        meta: dict[str, str] = {}
+        for tag in self.soup.find_all("meta"):
+            content = tag.get("content")
+            if isinstance(content, list):
+                content = content[0] if content else ""
+            for attr in ("name", "property"):
+                key = tag.get(attr)
+                if key:
+                    meta.setdefault(str(key).lower(), str(content or ""))
+        return meta
+
+    @cached_property
+    def headings(self) -> list[tuple[int, str]]:
+        """``(level, text)`` for every h1–h6 in document order."""
+        return [
+            (int(h.name[1]), h.get_text(strip=True))
+            for h in self.soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6"])
+        ]
+
+
+def as_page(doc, url: str = "") -> ParsedPage:
+    """Accept raw HTML, a ``ParsedPage``, a ``CrawlResult`` or a legacy page dict."""
+    if isinstance(doc, ParsedPage):
+        return doc
+    if isinstance(doc, str):
+        return ParsedPage(url=url, html=doc)
+    if isinstance(doc, dict):
+        return ParsedPage(
+            url=doc.get("url", url),
+            html=doc.get("html", ""),
+            status_code=doc.get("status_code", 200),
+            title=doc.get("title"),
+        )
+    # CrawlResult memoizes its own ParsedPage
+    return doc.parsed
+
+
+def as_pages(pages: list) -> list[ParsedPage]:
+    """Normalise a list of pages (see ``as_page``)."""
+    return [as_page(p) for p in pages]
@@ -1,10 +1,17 @@
 """Core Web Vitals + performance score (covers LCP/INP/CLS/perf_score — 4 items, weight: 15%)."""
 
+import logging
+
 import httpx
 
 from ..config import settings
 from .base import CheckResult, Grade
 
+logger = logging.getLogger("checkyourhospital.performance")
+
+_PSI_URL = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
+_STRATEGY = "mobile"
+
 # Display names / descriptions / recommendations for each performance metric
 _META: dict[str, tuple[str, str, str]] = {
     "lcp": (
@@ -33,50 +40,107 @@ _META: dict[str, tuple[str, str, str]] = {
 async def check_performance(
     client: httpx.AsyncClient, url: str
 ) -> list[CheckResult]:
-    """Returns 4 CheckResults: lcp, inp, cls, performance_score."""
-    results: list[CheckResult] = []
+    """Returns 4 CheckResults: lcp, inp, cls, performance_score.
+
+    ``settings.lab_metrics_mode`` adds local Chromium measurement: ``fallback``
+    when PageSpeed fails, ``always`` instead of it.
+    """
+    if settings.lab_metrics_mode == "always":
+        return await _lab_results(url) or _fallback_results("로컬 성능 측정 실패")
+
+    from ..services.pagespeed_cache import cached_pagespeed
+
+    try:
+        metrics = await cached_pagespeed(
+            url, _STRATEGY, lambda: _fetch_pagespeed(client, url, _STRATEGY)
+        )
+    except PageSpeedError as e:
+        return await _psi_unavailable(url, str(e))
+    return _psi_results(metrics)
+
 
-    api_key = settings.pagespeed_api_key
-    psi_url = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
-    params: dict = {"url": url, "strategy": "mobile", "category": "PERFORMANCE"}
-    if api_key:
-        params["key"] = api_key
+class PageSpeedError(Exception):
+    """PageSpeed Insights could not be reached or answered with an error."""
+
+
+async def _fetch_pagespeed(client: httpx.AsyncClient, url: str, strategy: str) -> dict:
+    """Call PSI and keep only the numbers the checks need (cached by pagespeed_cache)."""
+    params: dict = {"url": url, "strategy": strategy, "category": "PERFORMANCE"}
+    if settings.pagespeed_api_key:
+        params["key"] = settings.pagespeed_api_key
 
     try:
-        resp = await client.get(psi_url, params=params, timeout=60)
+        resp = await client.get(_PSI_URL, params=params, timeout=60)
         if resp.status_code != 200:
-            return _fallback_results("PageSpeed API 호출 실패")
+            raise PageSpeedError("PageSpeed API 호출 실패")
         data = resp.json()
-    except (httpx.HTTPError, ValueError):
-        return _fallback_results("PageSpeed API 접속 불가")
+    except (httpx.HTTPError, ValueError) as e:
+        raise PageSpeedError("PageSpeed API 접속 불가") from e
 
-    metrics = (
-        data.get("lighthouseResult", {})
-        .get("audits", {})
-    )
+    audits = data.get("lighthouseResult", {}).get("audits", {})
     categories = data.get("lighthouseResult", {}).get("categories", {})
 
+    inp_ms = _get_numeric(audits, "interaction-to-next-paint", "numericValue")
+    if inp_ms is None:
+        inp_ms = _get_numeric(audits, "max-potential-fid", "numericValue")
+    perf_score_raw = categories.get("performance", {}).get("score")
+    metrics = {
+        "lcp_ms": _get_numeric(audits, "largest-contentful-paint", "numericValue"),
+        "inp_ms": inp_ms,
+        "cls": _get_numeric(audits, "cumulative-layout-shift", "numericValue"),
+        "performance_score": perf_score_raw * 100 if perf_score_raw is not None else None,
+    }
+    if all(value is None for value in metrics.values()):
+        # A 200 with no metrics is a Lighthouse runtimeError: an error, not a result to cache
+        raise PageSpeedError("PageSpeed 측정 결과 없음")
+    return metrics
+
+
+def _psi_results(metrics: dict) -> list[CheckResult]:
     # LCP (weight: 5%) — good: ≤2.5s
-    lcp_ms = _get_numeric(metrics, "largest-contentful-paint", "numericValue")
+    lcp_ms = metrics.get("lcp_ms")
     lcp_s = lcp_ms / 1000 if lcp_ms else None
-    results.append(_score_metric("lcp", lcp_s, good=2.5, poor=4.0, unit="s"))
-
     # INP (weight: 3%) — good: ≤200ms
-    inp_ms = _get_numeric(metrics, "interaction-to-next-paint", "numericValue")
-    if inp_ms is None:
-        inp_ms = _get_numeric(metrics, "max-potential-fid", "numericValue")
-    inp_val = inp_ms if inp_ms else None
-    results.append(_score_metric("inp", inp_val, good=200, poor=500, unit="ms"))
+    inp_val = metrics.get("inp_ms") or None
+    return [
+        _score_metric("lcp", lcp_s, good=2.5, poor=4.0, unit="s"),
+        _score_metric("inp", inp_val, good=200, poor=500, unit="ms"),
+        # CLS (weight: 3%) — good: ≤0.1
+        _score_metric("cls", metrics.get("cls"), good=0.1, poor=0.25, unit=""),
+        # Performance score (weight: 4%) — Lighthouse 0-100
+        _score_perf(metrics.get("performance_score")),
+    ]
 
-    # CLS (weight: 3%) — good: ≤0.1
-    cls_val = _get_numeric(metrics, "cumulative-layout-shift", "numericValue")
-    results.append(_score_metric("cls", cls_val, good=0.1, poor=0.25, unit=""))
 
-    # Performance score (weight: 4%) — Lighthouse 0-100
-    perf_score_raw = categories.get("performance", {}).get("score")
-    perf_score = perf_score_raw * 100 if perf_score_raw is not None else None
-    results.append(_score_perf(perf_score))
+async def _psi_unavailable(url: str, reason: str) -> list[CheckResult]:
+    if settings.lab_metrics_mode == "fallback":
+        lab = await _lab_results(url)
+        if lab:
+            return lab
+    return _fallback_results(reason)
+
+
+async def _lab_results(url: str) -> list[CheckResult] | None:
+    """The same 4 results from a local lab run; TBT stands in for INP."""
+    from ..services.lab_metrics import lab_performance_score, measure_lab_metrics
 
+    try:
+        lab = await measure_lab_metrics(url)
+    except Exception as e:
+        logger.warning("Lab metrics failed for %s: %s", url, e)
+        return None
+
+    lab_details = {"source": "lab", "profile": lab.profile, "transfer_bytes": lab.transfer_bytes}
+    lcp_s = lab.lcp_ms / 1000 if lab.lcp_ms is not None else None
+    results = [
+        _score_metric("lcp", lcp_s, good=2.5, poor=4.0, unit="s"),
+        _score_metric("inp", lab.tbt_ms, good=200, poor=600, unit="ms"),
+        _score_metric("cls", lab.cls, good=0.1, poor=0.25, unit=""),
+        _score_perf(lab_performance_score(lab)),
+    ]
+    for r in results:
+        r.details.update(lab_details)
+    results[1].details["metric"] = "tbt"
     return results
 
 
@@ -164,12 +228,12 @@ def _score_perf(score: float | None) -> CheckResult:
     )
 
 
-def _fallback_results(reason: str) -> list[CheckResult]:
+def _fallback_results(reason: str, fail_type: str = "api_error") -> list[CheckResult]:
     names = ["lcp", "inp", "cls", "performance_score"]
     return [
         CheckResult(
             name=n, score=0.5, grade=Grade.WARN,
-            fail_type="api_error",
+            fail_type=fail_type,
             display_name=_META[n][0],
             description=_META[n][1],
             recommendation=_META[n][2],
@@ -0,0 +1,208 @@
+"""Server delivery performance from crawl metadata (no PageSpeed call, not weighted).
+
+Scores what the crawler already measured for every page — TTFB, compression,
+cache headers, HTTP version, HTML weight and redirect latency — so a scan has
+a performance signal even when PageSpeed Insights is unavailable or slow.
+Takes ``CrawlResult`` objects (``services.crawler``); anything with the same
+attributes works.
+"""
+
+from statistics import median
+
+from ..services.http_clients import http2_available
+from .base import CheckResult, Grade
+
+_DISPLAY_NAME = "서버 응답 성능"
+_DESCRIPTION = "서버가 페이지를 얼마나 빠르고 효율적으로 전달하는지(응답 시간, 압축, 캐시)입니다"
+_RECOMMENDATION = (
+    "호스팅 업체나 웹 개발자에게 서버 응답 속도, gzip/brotli 압축, 캐시 설정, "
+    "HTTP/2 적용을 요청하세요"
+)
+
+# TTFB (ms) — web.dev: good ≤ 800ms, poor > 1800ms
+_TTFB_GOOD = 800
+_TTFB_POOR = 1800
+# Decoded HTML size (bytes) of a typical page
+_HTML_GOOD = 100_000
+_HTML_POOR = 300_000
+# Total redirect time (ms) before the homepage
+_REDIRECT_GOOD = 500
+_REDIRECT_POOR = 1000
+# Bodies smaller than this gain little from compression
+_COMPRESSIBLE_BYTES = 1024
+_COMPRESSED = ("br", "gzip", "zstd", "deflate")
+
+# Facet weights within this check (sum 1.0)
+_FACET_WEIGHTS = {
+    "ttfb": 0.30,
+    "compression": 0.20,
+    "caching": 0.15,
+    "redirects": 0.15,
+    "http2": 0.10,
+    "html_bytes": 0.10,
+}
+
+
+def _tiered(value: float, good: float, poor: float) -> float:
+    if value <= good:
+        return 1.0
+    if value <= poor:
+        return 0.5
+    return 0.0
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def _ttfb(pages: list) -> tuple[float | None, dict, list[str]]:
+    values = [p.ttfb_ms for p in pages if p.ttfb_ms is not None]
+    if not values:
+        return None, {"measured": 0}, []
+    med = median(values)
+    details = {
+        "measured": len(values),
+        "median_ms": round(med, 1),
+        "p90_ms": round(_percentile(values, 90), 1),
+        "max_ms": round(max(values), 1),
+        "slow_pages": sum(1 for v in values if v > _TTFB_POOR),
+    }
+    issues = []
+    if med > _TTFB_GOOD:
+        issues.append(f"서버 응답 시간(TTFB) 중앙값 {med:.0f}ms (권장: {_TTFB_GOOD}ms 이하)")
+    return _tiered(med, _TTFB_GOOD, _TTFB_POOR), details, issues
+
+
+def _compression(pages: list) -> tuple[float | None, dict, list[str]]:
+    candidates = [p for p in pages if len(p.html) >= _COMPRESSIBLE_BYTES]
+    if not candidates:
+        return None, {"checked": 0}, []
+    encodings: dict[str, int] = {}
+    for p in candidates:
+        enc = (p.content_encoding or "identity").lower()
+        encodings[enc] = encodings.get(enc, 0) + 1
+    compressed = sum(n for enc, n in encodings.items() if enc in _COMPRESSED)
+    ratio = compressed / len(candidates)
+    details = {
+        "checked": len(candidates),
+        "compressed": compressed,
+        "encodings": encodings,
+        "brotli": encodings.get("br", 0) > 0,
+    }
+    issues = []
+    if ratio < 1:
+        issues.append(f"압축되지 않은 페이지 {len(candidates) - compressed}개 (gzip/brotli 미적용)")
+    return ratio, details, issues
+
+
+def _caching(pages: list) -> tuple[float | None, dict, list[str]]:
+    with_cache_control = with_validator = 0
+    total = 0.0
+    for p in pages:
+        has_cc = "cache-control" in p.headers
+        has_validator = "etag" in p.headers or "last-modified" in p.headers
+        with_cache_control += has_cc
+        with_validator += has_validator
+        total += (has_cc + has_validator) / 2
+    details = {
+        "cache_control": with_cache_control,
+        "validators": with_validator,
+        "pages": len(pages),
+    }
+    issues = []
+    if with_cache_control < len(pages):
+        issues.append(f"Cache-Control 헤더 없는 페이지 {len(pages) - with_cache_control}개")
+    if with_validator < len(pages):
+        issues.append(f"ETag/Last-Modified 없는 페이지 {len(pages) - with_validator}개")
+    return total / len(pages), details, issues
+
+
+def _http2(main) -> tuple[float | None, dict, list[str]]:
+    version = main.http_version
+    if not version:
+        return None, {"version": None}, []
+    if not http2_available():
+        # Our client only spoke HTTP/1.1, so the version says nothing about the site
+        return None, {"version": version, "h2_offered": False}, []
+    modern = version.upper() in ("HTTP/2", "HTTP/3")
+    issues = [] if modern else [f"{version} 사용 중 (HTTP/2 미지원)"]
+    return (1.0 if modern else 0.5), {"version": version}, issues
+
+
+def _html_bytes(pages: list) -> tuple[float | None, dict, list[str]]:
+    sizes = [len(p.html.encode("utf-8")) for p in pages]
+    med = median(sizes)
+    details = {
+        "median_bytes": int(med),
+        "max_bytes": max(sizes),
+        "transfer_bytes": sum(p.transfer_size or 0 for p in pages),
+    }
+    issues = []
+    if med > _HTML_GOOD:
+        issues.append(f"HTML 크기 중앙값 {med / 1000:.0f}KB (권장: {_HTML_GOOD // 1000}KB 이하)")
+    return _tiered(med, _HTML_GOOD, _HTML_POOR), details, issues
+
+
+def _redirects(main, pages: list) -> tuple[float | None, dict, list[str]]:
+    hops = len(main.redirects)
+    ms = main.redirect_ms
+    details = {
+        "main_hops": hops,
+        "main_redirect_ms": ms,
+        "pages_redirected": sum(1 for p in pages if p.redirects),
+    }
+    if hops == 0:
+        return 1.0, details, []
+    issues = [f"첫 페이지 도달까지 리다이렉트 {hops}회 ({ms:.0f}ms)"]
+    if hops >= 2 or ms > _REDIRECT_POOR:
+        return 0.0, details, issues
+    return (0.75 if ms <= _REDIRECT_GOOD else 0.5), details, issues
+
+
+def check_server_performance(pages: list) -> CheckResult:
+    """Score delivery performance of crawled pages; ``pages[0]`` is the homepage."""
+    if not pages:
+        return CheckResult(
+            name="server_performance", score=0.5, grade=Grade.WARN,
+            fail_type="not_applicable",
+            display_name=_DISPLAY_NAME, description=_DESCRIPTION,
+            recommendation=_RECOMMENDATION,
+            issues=["수집된 페이지 없음"],
+        )
+
+    main = pages[0]
+    facets = {
+        "ttfb": _ttfb(pages),
+        "compression": _compression(pages),
+        "caching": _caching(pages),
+        "redirects": _redirects(main, pages),
+        "http2": _http2(main),
+        "html_bytes": _html_bytes(pages),
+    }
+
+    weighted = weight_sum = 0.0
+    details: dict = {}
+    issues: list[str] = []
+    for name, (score, facet_details, facet_issues) in facets.items():
+        details[name] = {"score": None if score is None else round(score, 2), **facet_details}
+        issues.extend(facet_issues)
+        if score is not None:
+            weighted += score * _FACET_WEIGHTS[name]
+            weight_sum += _FACET_WEIGHTS[name]
+
+    score = round(weighted / weight_sum, 2) if weight_sum else 0.5
+    if score >= 0.8:
+        grade = Grade.PASS
+    elif score >= 0.5:
+        grade = Grade.WARN
+    else:
+        grade = Grade.FAIL
+
+    return CheckResult(
+        name="server_performance", score=score, grade=grade,
+        display_name=_DISPLAY_NAME, description=_DESCRIPTION,
+        recommendation=_RECOMMENDATION,
+        details=details, issues=issues,
+    )
@@ -1,11 +1,9 @@
 """Structured data checks: Schema.org, FAQ, E-E-A-T signals."""
 
-import json
 import re
 
-from bs4 import BeautifulSoup
-
 from ..checks.base import CheckResult, Grade
+from ..checks.parsed_page import ParsedPage, as_page
 
 # --- structured_data ---
 _SD_DISPLAY_NAME = "검색 강화 데이터"
@@ -31,20 +29,9 @@ _EEAT_RECOMMENDATION = (
 )
 
 
-def _extract_json_ld(html: str) -> list[dict]:
+def _extract_json_ld(html: str | ParsedPage) -> list[dict]:
     """Extract all JSON-LD structured data from HTML."""
-    soup = BeautifulSoup(html, "html.parser")
-    results = []
-    for script in soup.find_all("script", type="application/ld+json"):
-        try:
-            data = json.loads(script.string or "")
-            if isinstance(data, list):
-                results.extend(data)
-            else:
-                results.append(data)
-        except (json.JSONDecodeError, TypeError):
-            continue
-    return results
+    return as_page(html).json_ld
 
 
 def _get_types(json_ld_items: list[dict]) -> set[str]:
@@ -69,9 +56,10 @@ def _get_types(json_ld_items: list[dict]) -> set[str]:
     return types
 
 
-def check_structured_data(html: str) -> CheckResult:
+def check_structured_data(html: str | ParsedPage) -> CheckResult:
     """Check for medical-relevant Schema.org structured data."""
-    json_ld = _extract_json_ld(html)
+    page = as_page(html)
+    json_ld = _extract_json_ld(page)
     types = _get_types(json_ld)
 
     score = 0.0
@@ -109,8 +97,7 @@ def check_structured_data(html: str) -> CheckResult:
         issues.append("JSON-LD 구조화 데이터가 전혀 없습니다")
 
     # Check microdata/RDFa as fallback
-    soup = BeautifulSoup(html, "html.parser")
-    microdata = soup.find_all(attrs={"itemtype": True})
+    microdata = page.soup.find_all(attrs={"itemtype": True})
     if microdata and not json_ld:
         score += 0.2
         found_schemas.append("microdata")
@@ -140,11 +127,12 @@ def check_structured_data(html: str) -> CheckResult:
     )
 
 
-def check_faq_content(html: str) -> CheckResult:
+def check_faq_content(html: str | ParsedPage) -> CheckResult:
     """Check for FAQ structured data and content."""
-    json_ld = _extract_json_ld(html)
+    page = as_page(html)
+    json_ld = _extract_json_ld(page)
     types = _get_types(json_ld)
-    soup = BeautifulSoup(html, "html.parser")
+    soup = page.soup
 
     score = 0.0
     issues: list[str] = []
@@ -180,7 +168,7 @@ def check_faq_content(html: str) -> CheckResult:
 
     # Question-answer pairs in content
     qa_pattern = re.compile(r"(Q\.|질문|Question)\s*[:：]", re.I)
-    text = soup.get_text()
+    text = page.raw_text
     qa_count = len(qa_pattern.findall(text))
     details["qa_pair_count"] = qa_count
     if qa_count >= 3:
@@ -210,17 +198,18 @@ def check_faq_content(html: str) -> CheckResult:
 
 
 def check_eeat_signals(
-    html: str, url: str, crawled_pages: list | None = None,
+    html: str | ParsedPage, url: str, crawled_pages: list | None = None,
 ) -> CheckResult:
     """Check E-E-A-T signals across main page and crawled sub-pages.
 
     Args:
-        html: Main page HTML
+        html: Main page HTML or ParsedPage
         url: Main page URL
-        crawled_pages: List of CrawlResult objects from crawler (optional)
+        crawled_pages: List of CrawlResult/ParsedPage objects from crawler (optional)
     """
-    soup = BeautifulSoup(html, "html.parser")
-    text = soup.get_text().lower()
+    page = as_page(html, url)
+    soup = page.soup
+    text = page.raw_text.lower()
 
     # Also analyze relevant sub-pages (doctor/about/intro pages)
     _DOCTOR_URL_RE = re.compile(
@@ -230,13 +219,10 @@ def check_eeat_signals(
     sub_texts: list[str] = []
     doctor_page_found = False
     if crawled_pages:
-        for page in crawled_pages:
-            page_url = getattr(page, "url", "")
-            page_html = getattr(page, "html", "")
-            if _DOCTOR_URL_RE.search(page_url):
+        for sub_page in crawled_pages:
+            if _DOCTOR_URL_RE.search(getattr(sub_page, "url", "")):
                 doctor_page_found = True
-                sub_soup = BeautifulSoup(page_html, "html.parser")
-                sub_texts.append(sub_soup.get_text().lower())
+                sub_texts.append(as_page(sub_page).raw_text.lower())
 
     # Combine all text for analysis
     all_text = text + " " + " ".join(sub_texts)
@@ -323,7 +309,7 @@ def check_eeat_signals(
             )
 
     # Schema.org Person/Physician
-    json_ld = _extract_json_ld(html)
+    json_ld = _extract_json_ld(page)
     types = _get_types(json_ld)
     if {"Person", "Physician"} & types:
         score += 0.1
@@ -18,12 +18,82 @@ class Settings(BaseSettings):
     crawler_timeout: int = 30
     crawler_max_pages: int = 50
     crawler_max_depth: int = 3
+    crawler_concurrency: int = 5  # 1 = sequential crawl
+    crawler_per_host_limit: int = 4  # max in-flight requests per host
+    crawler_max_html_bytes: int = 5_000_000  # decoded HTML read per page; the rest is dropped
+    # Crawl frontier URL canonicalization (app/services/url_normalizer.py)
+    # Query/path params dropped from crawled URLs; comma-separated, * wildcards
+    crawler_strip_params: str = (
+        "utm_*,fbclid,gclid,gclsrc,dclid,msclkid,yclid,igshid,_ga,_gl,mc_cid,mc_eid,"
+        "n_media,n_query,n_rank,n_ad,n_ad_group,n_keyword,n_keyword_id,n_campaign_type,napm,"
+        "jsessionid,phpsessid,aspsessionid*,sessionid,cfid,cftoken"
+    )
+    crawler_sort_query: bool = True  # ?b=1&a=2 and ?a=2&b=1 are the same page
+
+    # Scan time budget (Cloud Run request timeout is 300s)
+    scan_deadline: int = 240  # whole scan: crawl, checks and analyzers
+    scan_crawl_timeout: int = 150  # crawl share; the rest is left for checks and analyzers
+    scan_check_timeout: int = 45  # each network-bound check
+    scan_performance_timeout: int = 90  # PageSpeed runs a full Lighthouse audit
+
+    # HTML analyzers run off the event loop: inline | thread | process
+    analyzer_executor: str = "thread"
+    analyzer_workers: int = 2
+    # Extra tech stack signatures, merged over app/data/tech_signatures.json (same format)
+    tech_signatures_file: str = ""
+    # Guarded analyzer regex scans over page HTML/text (app/services/regex_guard.py)
+    regex_max_input: int = 2_000_000  # chars scanned per page; analyzers may cap lower
+    regex_chunk: int = 8192  # window per match attempt, plus the overlap
+    regex_chunk_overlap: int = 1024  # longest match found intact across a window edge
+    regex_budget_ms: int = 250  # wall clock per analyzer per page
+    regex_cpu_budget_ms: int = 200  # thread CPU per analyzer per page
+
+    # Scan job queue (local SQLite) and worker pool
+    job_queue_path: str = "/tmp/cyh-worker-jobs.sqlite3"
+    job_workers: int = 2  # scans running at once per instance
+    job_max_attempts: int = 3
+    job_retry_backoff: float = 15.0  # seconds before the first retry, doubled after
+    job_visibility_timeout: int = 360  # lease on a running job; renewed while it runs
+
+    # Repeated scans of the same URL + options share one run / a recent result
+    scan_cache_ttl: int = 600  # seconds; 0 disables result caching
+    scan_cache_max_entries: int = 100
+
+    # Supabase calls run on a dedicated thread pool; caps concurrent DB round-trips
+    db_max_concurrency: int = 8
+
+    # Shared outbound HTTP clients (app/services/http_clients.py); HTTP/2 needs the h2 package
+    http2_enabled: bool = True
+
+    # SSRF validation DNS cache (per hostname, shared by crawler, checks and batch scans)
+    dns_cache_ttl: int = 300
+    dns_negative_ttl: int = 30
+    dns_cache_max_entries: int = 2048
 
     # Rate limiting
     rate_limit_rpm: int = 10
 
     # PageSpeed Insights API (optional)
     pagespeed_api_key: str = ""
+    # PSI result cache per (url, strategy) — app/services/pagespeed_cache.py
+    pagespeed_cache_ttl: int = 259200  # fresh for 3 days
+    pagespeed_stale_ttl: int = 345600  # then served stale (refreshed in background) 4 more days
+    pagespeed_memory_cache_max_entries: int = 2000
+
+    # Local lab metrics with the pooled Chromium (app/services/lab_metrics.py)
+    lab_metrics_mode: str = "off"  # off | fallback (when PageSpeed fails) | always (skip PageSpeed)
+    lab_metrics_profile: str = "mobile"  # mobile | desktop throttling
+    lab_metrics_timeout: int = 30  # page load, seconds
+    lab_metrics_settle: float = 2.0  # wait for network idle after load, seconds
+    lab_metrics_cache_ttl: int = 3600
+    browser_pool_size: int = 2  # concurrent browser jobs (lab runs, PDF/PNG renders)
+    browser_recycle_after: int = 200  # relaunch Chromium after this many jobs, once idle
+
+    # Rendered PNG/PDF cache (app/services/render_cache.py)
+    # Cloud Run's /tmp is in-memory: this cache counts against the instance's RAM
+    render_cache_dir: str = "/tmp/cyh-render-cache"
+    render_cache_max_mb: int = 32  # 0 disables the disk tier
+    render_cache_storage: bool = False  # also reuse uploads via content-addressed Storage paths
 
     # Perplexity API (optional, for GEO/AEO AI search checks)
     perplexity_api_key: str = ""
@@ -38,6 +108,9 @@ class Settings(BaseSettings):
 
     # SERP Checker (optional)
     serper_api_key: str = ""  # Serper.dev API key for Google SERP
+    serp_provider_concurrency: int = 4  # concurrent uncached searches per portal
+    serp_memory_cache_max_entries: int = 5000  # in-process tier in front of serp_cache
+    serp_negative_ttl: int = 900  # seconds a failed search is remembered (memory only)
 
     # Supabase Storage
     supabase_storage_bucket: str = "reports"
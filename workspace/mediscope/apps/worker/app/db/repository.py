@@ -0,0 +1,317 @@
+"""Async data-access layer over Supabase (PostgREST).
+
+supabase-py is synchronous, so calling it from ``async def`` code blocked the
+event loop on every round-trip. ``Repository`` exposes table operations as
+coroutines: each query is built and executed on a small dedicated thread pool
+(``settings.db_max_concurrency`` workers), which bounds concurrent DB calls and
+keeps them off the loop. The underlying supabase client — and its pooled HTTP
+connections — is shared by all calls.
+
+Filters are plain tuples built with ``eq``, ``in_``, ``ilike`` etc. so the same
+call works against ``FakeRepository`` (in-memory, for tests).
+
+Batching: ``insert``/``upsert`` take a list of rows in one request, and
+``select_in`` splits a large ``IN`` list into chunks fetched concurrently.
+"""
+
+import asyncio
+import re
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
+
+from ..config import settings
+from .supabase import get_supabase_client
+
+
+class Filter(NamedTuple):
+    op: str  # eq | neq | gt | gte | lt | lte | in_ | ilike | is_null | not_null
+    column: str
+    value: Any = None
+
+
+def eq(column: str, value: Any) -> Filter:
+    return Filter("eq", column, value)
+
+
+def neq(column: str, value: Any) -> Filter:
+    return Filter("neq", column, value)
+
+
+def gt(column: str, value: Any) -> Filter:
+    return Filter("gt", column, value)
+
+
+def gte(column: str, value: Any) -> Filter:
+    return Filter("gte", column, value)
+
+
+def lt(column: str, value: Any) -> Filter:
+    return Filter("lt", column, value)
+
+
+def lte(column: str, value: Any) -> Filter:
+    return Filter("lte", column, value)
+
+
+def in_(column: str, values: Iterable) -> Filter:
+    return Filter("in_", column, list(values))
+
+
+def ilike(column: str, pattern: str) -> Filter:
+    return Filter("ilike", column, pattern)
+
+
+def is_null(column: str) -> Filter:
+    return Filter("is_null", column)
+
+
+def not_null(column: str) -> Filter:
+    return Filter("not_null", column)
+
+
+def _chunks(values: list, size: int) -> list[list]:
+    return [values[i:i + size] for i in range(0, len(values), max(1, size))]
+
+
+class Repository:
+    """Async table operations on the Supabase client."""
+
+    def __init__(self, client, *, max_concurrency: int | None = None):
+        self.client = client
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_concurrency or settings.db_max_concurrency),
+            thread_name_prefix="db",
+        )
+
+    async def _execute(self, build) -> list[dict]:
+        """Build and execute a query off the event loop; returns ``response.data``."""
+        loop = asyncio.get_running_loop()
+        resp = await loop.run_in_executor(self._executor, lambda: build(self.client).execute())
+        data = resp.data
+        if data is None:
+            return []
+        return data if isinstance(data, list) else [data]
+
+    @staticmethod
+    def _apply(query, filters: Iterable[Filter]):
+        for f in filters:
+            if f.op == "not_null":
+                query = query.not_.is_(f.column, "null")
+            elif f.op == "is_null":
+                query = query.is_(f.column, "null")
+            else:
+                query = getattr(query, f.op)(f.column, f.value)
+        return query
+
+    async def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Iterable[Filter] = (),
+        *,
+        order: str | None = None,
+        desc: bool = False,
+        limit: int | None = None,
+    ) -> list[dict]:
+        filters = list(filters)
+
+        def build(client):
+            query = self._apply(client.table(table).select(columns), filters)
+            if order:
+                query = query.order(order, desc=desc)
+            if limit is not None:
+                query = query.limit(limit)
+            return query
+
+        return await self._execute(build)
+
+    async def select_one(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Iterable[Filter] = (),
+        *,
+        order: str | None = None,
+        desc: bool = False,
+    ) -> dict | None:
+        rows = await self.select(table, columns, filters, order=order, desc=desc, limit=1)
+        return rows[0] if rows else None
+
+    async def select_in(
+        self,
+        table: str,
+        columns: str,
+        column: str,
+        values: Iterable,
+        filters: Iterable[Filter] = (),
+        *,
+        chunk_size: int = 100,
+    ) -> list[dict]:
+        """``column IN values`` as a few chunked requests (URL length limits) run together."""
+        values = list(dict.fromkeys(values))
+        if not values:
+            return []
+        filters = list(filters)
+        batches = await asyncio.gather(
+            *(
+                self.select(table, columns, [*filters, in_(column, chunk)])
+                for chunk in _chunks(values, chunk_size)
+            )
+        )
+        return [row for batch in batches for row in batch]
+
+    async def insert(self, table: str, rows: dict | list[dict]) -> list[dict]:
+        if not rows:
+            return []
+        return await self._execute(lambda client: client.table(table).insert(rows))
+
+    async def upsert(
+        self, table: str, rows: dict | list[dict], *, on_conflict: str = ""
+    ) -> list[dict]:
+        if not rows:
+            return []
+        return await self._execute(
+            lambda client: client.table(table).upsert(rows, on_conflict=on_conflict)
+        )
+
+    async def update(self, table: str, values: dict, filters: Iterable[Filter]) -> list[dict]:
+        filters = list(filters)
+        return await self._execute(
+            lambda client: self._apply(client.table(table).update(values), filters)
+        )
+
+
+def _matches(row: dict, f: Filter) -> bool:
+    value = row.get(f.column)
+    if f.op == "is_null":
+        return value is None
+    if f.op == "not_null":
+        return value is not None
+    if f.op == "in_":
+        return value in f.value
+    if f.op == "ilike":
+        if value is None:
+            return False
+        parts = re.split("(%)", f.value)
+        pattern = "".join(".*" if part == "%" else re.escape(part) for part in parts)
+        return re.fullmatch(pattern, str(value), re.IGNORECASE | re.DOTALL) is not None
+    if f.op == "eq":
+        return value == f.value
+    if f.op == "neq":
+        return value != f.value
+    if value is None:
+        return False
+    return {
+        "gt": value > f.value,
+        "gte": value >= f.value,
+        "lt": value < f.value,
+        "lte": value <= f.value,
+    }[f.op]
+
+
+def _project(row: dict, columns: str) -> dict:
+    names = [c.strip() for c in columns.split(",") if c.strip()]
+    if "*" in names:
+        return dict(row)
+    # Embedded resources ("hospitals(url)") are returned as stored under their name
+    keys = [n.split("(", 1)[0].strip() for n in names]
+    return {k: row.get(k) for k in keys}
+
+
+class FakeRepository(Repository):
+    """In-memory ``Repository`` for tests. ``tables`` maps table name → list of rows.
+
+    Rows are plain dicts; embedded selects such as ``hospitals(url)`` are not
+    joined — seed the nested value on the row instead.
+    """
+
+    def __init__(self, tables: dict[str, list[dict]] | None = None):
+        self.tables: dict[str, list[dict]] = {
+            k: [dict(r) for r in v] for k, v in (tables or {}).items()
+        }
+        self.calls: list[tuple[str, str]] = []
+
+    def rows(self, table: str) -> list[dict]:
+        return self.tables.setdefault(table, [])
+
+    async def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Iterable[Filter] = (),
+        *,
+        order: str | None = None,
+        desc: bool = False,
+        limit: int | None = None,
+    ) -> list[dict]:
+        self.calls.append(("select", table))
+        filters = list(filters)
+        rows = [r for r in self.rows(table) if all(_matches(r, f) for f in filters)]
+        if order:
+            present = [r for r in rows if r.get(order) is not None]
+            missing = [r for r in rows if r.get(order) is None]
+            rows = sorted(present, key=lambda r: r[order], reverse=desc) + missing
+        if limit is not None:
+            rows = rows[:limit]
+        return [_project(r, columns) for r in rows]
+
+    async def insert(self, table: str, rows: dict | list[dict]) -> list[dict]:
+        self.calls.append(("insert", table))
+        new = [dict(r) for r in (rows if isinstance(rows, list) else [rows])]
+        for i, row in enumerate(new):
+            row.setdefault("id", f"{table}-{len(self.rows(table)) + i + 1}")
+        self.rows(table).extend(new)
+        return [dict(r) for r in new]
+
+    async def upsert(
+        self, table: str, rows: dict | list[dict], *, on_conflict: str = ""
+    ) -> list[dict]:
+        self.calls.append(("upsert", table))
+        keys = [k.strip() for k in (on_conflict or "id").split(",")]
+        stored = self.rows(table)
+        out = []
+        for row in rows if isinstance(rows, list) else [rows]:
+            existing = next(
+                (r for r in stored if all(r.get(k) == row.get(k) for k in keys)), None
+            )
+            if existing is None:
+                existing = dict(row)
+                stored.append(existing)
+            else:
+                existing.update(row)
+            out.append(dict(existing))
+        return out
+
+    async def update(self, table: str, values: dict, filters: Iterable[Filter]) -> list[dict]:
+        self.calls.append(("update", table))
+        filters = list(filters)
+        updated = []
+        for row in self.rows(table):
+            if all(_matches(row, f) for f in filters):
+                row.update(values)
+                updated.append(dict(row))
+        return updated
+
+
+_override: Repository | None = None
+_repository: Repository | None = None
+
+
+def get_repository() -> Repository | None:
+    """Shared repository, or ``None`` when Supabase is not configured."""
+    global _repository
+    if _override is not None:
+        return _override
+    client = get_supabase_client()
+    if client is None:
+        return None
+    if _repository is None or _repository.client is not client:
+        _repository = Repository(client)
+    return _repository
+
+
+def set_repository(repo: Repository | None) -> None:
+    """Install ``repo`` (e.g. a ``FakeRepository``) for every caller; ``None`` restores Supabase."""
+    global _override
+    _override = repo
@@ -21,62 +21,64 @@ def get_supabase_client() -> Client | None:
 
 async def save_scan_result(audit_id: str, result: dict) -> bool:
     """Save full scan result: update audits + insert audit_items."""
-    client = get_supabase_client()
-    if client is None:
+    from .repository import eq, get_repository
+
+    repo = get_repository()
+    if repo is None:
         return False
 
     # Update audits table
     total_score = result.get("total_score", 0)
-    client.table("audits").update({
+    await repo.update("audits", {
         "status": "completed",
         "total_score": int(round(total_score)) if total_score is not None else 0,
         "grade": result.get("grade", "F"),
         "scores": result.get("category_scores", {}),
         "details": result.get("details", {}),
         "scan_duration_ms": result.get("scan_duration_ms"),
-    }).eq("id", audit_id).execute()
-
-    # Insert audit_items
-    items = result.get("items", [])
-    if items:
-        rows = []
-        for item in items:
-            row = {
-                "audit_id": audit_id,
-                "category": item["category"],
-                "item_key": item["item_key"],
-                "status": item["status"],
-                "score": item.get("score"),
-                "weight": item.get("weight"),
-                "details": item.get("details", {}),
-                "suggestion": item.get("suggestion"),
-                "priority": item.get("priority"),
-            }
-            # Include customer-friendly fields in details
-            details = dict(row.get("details") or {})
-            for field in ("display_name", "description", "recommendation", "fail_type"):
-                if item.get(field):
-                    details[field] = item[field]
-            row["details"] = details
-            rows.append(row)
-        client.table("audit_items").insert(rows).execute()
+    }, [eq("id", audit_id)])
+
+    # Insert audit_items (one batched request)
+    rows = []
+    for item in result.get("items", []):
+        row = {
+            "audit_id": audit_id,
+            "category": item["category"],
+            "item_key": item["item_key"],
+            "status": item["status"],
+            "score": item.get("score"),
+            "weight": item.get("weight"),
+            "details": item.get("details", {}),
+            "suggestion": item.get("suggestion"),
+            "priority": item.get("priority"),
+        }
+        # Include customer-friendly fields in details
+        details = dict(row.get("details") or {})
+        for field in ("display_name", "description", "recommendation", "fail_type"):
+            if item.get(field):
+                details[field] = item[field]
+        row["details"] = details
+        rows.append(row)
+    await repo.insert("audit_items", rows)
 
     # Update hospital's latest score
-    audit = client.table("audits").select("hospital_id").eq("id", audit_id).single().execute()
-    if audit.data and audit.data.get("hospital_id"):
-        client.table("hospitals").update({
+    audit = await repo.select_one("audits", "hospital_id", [eq("id", audit_id)])
+    if audit and audit.get("hospital_id"):
+        await repo.update("hospitals", {
             "latest_score": result.get("total_score", 0),
             "latest_audit_id": audit_id,
-        }).eq("id", audit.data["hospital_id"]).execute()
+        }, [eq("id", audit["hospital_id"])])
 
     return True
 
 
 async def update_audit_status(audit_id: str, status: str) -> bool:
     """Update audit status (pending/scanning/completed/failed)."""
-    client = get_supabase_client()
-    if client is None:
+    from .repository import eq, get_repository
+
+    repo = get_repository()
+    if repo is None:
         return False
 
-    client.table("audits").update({"status": status}).eq("id", audit_id).execute()
+    await repo.update("audits", {"status": status}, [eq("id", audit_id)])
     return True
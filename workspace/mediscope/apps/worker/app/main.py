@@ -1,5 +1,7 @@
 """CheckYourHospital Worker — FastAPI crawling engine."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -7,14 +9,30 @@ from .api.batch_routes import router as batch_router
 from .api.benchmark_routes import router as benchmark_router
 from .api.content_routes import router as content_router
 from .api.image_routes import router as image_router
-from .api.routes import router
+from .api.routes import get_scan_workers, router
 from .api.subscription_routes import router as subscription_router
 from .config import settings
+from .services.analyzer_executor import shutdown_executors
+from .services.browser_pool import aclose_browser_pool
+from .services.http_clients import aclose_clients
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    workers = get_scan_workers()
+    await workers.start()
+    yield
+    await workers.stop()
+    shutdown_executors()
+    await aclose_clients()
+    await aclose_browser_pool()
+
 
 app = FastAPI(
     title="CheckYourHospital Worker",
     version="0.1.0",
     docs_url="/docs" if settings.debug else None,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -0,0 +1,135 @@
+"""Cached hostname resolution for SSRF validation.
+
+A crawl calls ``validate_url`` for every discovered URL, and a batch scan for
+every input — almost always the same handful of hosts. ``DNSResolver`` keeps
+resolved addresses per hostname for ``settings.dns_cache_ttl`` seconds and
+failures for ``settings.dns_negative_ttl`` seconds. ``resolve_async`` runs
+``getaddrinfo`` on the default executor instead of the event loop, and
+concurrent lookups of the same host share one resolution.
+
+The cache only stores addresses; the private-range check in ``ssrf`` runs on
+every call.
+"""
+
+import asyncio
+import functools
+import ipaddress
+import socket
+
+from ..config import settings
+from ..services.ttl_cache import MISSING, TTLCache
+
+
+class DNSResolver:
+    def __init__(
+        self,
+        ttl: float | None = None,
+        negative_ttl: float | None = None,
+        max_entries: int | None = None,
+    ):
+        self.ttl = ttl if ttl is not None else settings.dns_cache_ttl
+        self.negative_ttl = negative_ttl if negative_ttl is not None else settings.dns_negative_ttl
+        self._cache = TTLCache(
+            max_entries=max_entries or settings.dns_cache_max_entries, ttl=self.ttl
+        )
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.counts = {"lookups": 0, "resolutions": 0, "coalesced": 0, "failures": 0}
+
+    def clear(self) -> None:
+        self._cache.clear()
+        for key in self.counts:
+            self.counts[key] = 0
+
+    def stats(self) -> dict:
+        hits = self._cache.hits
+        return {
+            **self.counts,
+            "cache_hits": hits,
+            "lookups_saved": hits + self.counts["coalesced"],
+            "entries": len(self._cache),
+        }
+
+    @staticmethod
+    def _literal(hostname: str) -> tuple[str, ...] | None:
+        try:
+            return (str(ipaddress.ip_address(hostname)),)
+        except ValueError:
+            return None
+
+    def _cached(self, hostname: str) -> tuple[str, ...] | None:
+        """Addresses from the cache; raises ``socket.gaierror`` for a cached failure."""
+        entry = self._cache.get(hostname)
+        if entry is MISSING:
+            return None
+        if isinstance(entry, socket.gaierror):
+            raise entry
+        return entry
+
+    def _store(self, hostname: str, infos) -> tuple[str, ...]:
+        addresses = tuple(dict.fromkeys(sockaddr[0] for *_, sockaddr in infos))
+        self._cache.set(hostname, addresses)
+        return addresses
+
+    def _store_failure(self, hostname: str, error: socket.gaierror) -> None:
+        self.counts["failures"] += 1
+        self._cache.set(hostname, error, ttl=self.negative_ttl)
+
+    def resolve(self, hostname: str) -> tuple[str, ...]:
+        """Blocking resolution for sync callers. Raises ``socket.gaierror``."""
+        literal = self._literal(hostname)
+        if literal:
+            return literal
+        self.counts["lookups"] += 1
+        cached = self._cached(hostname)
+        if cached is not None:
+            return cached
+        self.counts["resolutions"] += 1
+        try:
+            infos = socket.getaddrinfo(hostname, 443, proto=socket.IPPROTO_TCP)
+        except socket.gaierror as e:
+            self._store_failure(hostname, e)
+            raise
+        return self._store(hostname, infos)
+
+    async def resolve_async(self, hostname: str) -> tuple[str, ...]:
+        """Non-blocking, single-flight resolution. Raises ``socket.gaierror``."""
+        literal = self._literal(hostname)
+        if literal:
+            return literal
+        self.counts["lookups"] += 1
+        cached = self._cached(hostname)
+        if cached is not None:
+            return cached
+
+        future = self._inflight.get(hostname)
+        if future is not None:
+            self.counts["coalesced"] += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[hostname] = future
+        self.counts["resolutions"] += 1
+        try:
+            infos = await loop.run_in_executor(
+                None,
+                functools.partial(socket.getaddrinfo, hostname, 443, proto=socket.IPPROTO_TCP),
+            )
+        except socket.gaierror as e:
+            self._store_failure(hostname, e)
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        except BaseException as e:
+            future.set_exception(socket.gaierror(f"resolution of {hostname} aborted: {e!r}"))
+            future.exception()
+            raise
+        else:
+            addresses = self._store(hostname, infos)
+            future.set_result(addresses)
+            return addresses
+        finally:
+            self._inflight.pop(hostname, None)
+
+
+resolver = DNSResolver()
@@ -0,0 +1,87 @@
+"""httpx transport that connects only to addresses the SSRF layer validated.
+
+``validate_url`` resolves a hostname and checks the addresses; a plain httpx
+client then resolves it again to connect, which costs a second lookup and lets a
+rebinding DNS server answer differently the second time. ``PinnedTransport``
+closes that gap at the socket level: httpcore's TCP connect is routed through
+``PinnedNetworkBackend``, which takes the address from the shared ``resolver``
+cache (the same answer ``validate_url`` checked), re-checks it, and dials that
+IP. The request URL is untouched, so the Host header, TLS SNI and certificate
+verification still use the hostname.
+
+Every request through the transport — including each redirect hop httpx
+follows — is validated first, so a redirect to a private or metadata address
+fails with ``BlockedAddressError`` before any connection is opened.
+"""
+
+import socket
+
+import httpcore
+import httpx
+
+from .dns_resolver import resolver
+from .ssrf import SSRFError, _is_private_ip, validate_url_async
+
+
+class BlockedAddressError(httpx.ConnectError, SSRFError):
+    """A request (or redirect hop) targeted a host the SSRF policy blocks."""
+
+
+class PinnedNetworkBackend(httpcore.AsyncNetworkBackend):
+    """Dial the validated, cached addresses for a hostname instead of re-resolving it."""
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend):
+        self._backend = backend
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options=None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            addresses = await resolver.resolve_async(host)
+        except socket.gaierror as e:
+            raise httpcore.ConnectError(f"DNS resolution failed: {host}") from e
+
+        blocked = [ip for ip in addresses if _is_private_ip(ip)]
+        if blocked:
+            raise httpcore.ConnectError(f"Blocked private IP: {blocked[0]} for {host}")
+
+        last_error: Exception | None = None
+        for ip in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    ip,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        raise last_error or httpcore.ConnectError(f"No addresses for {host}")
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        raise httpcore.ConnectError("Unix sockets are not allowed")
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class PinnedTransport(httpx.AsyncHTTPTransport):
+    """``AsyncHTTPTransport`` that validates every request and dials pinned IPs."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # httpx exposes no hook for the pool's network backend, so wrap the one it built
+        self._pool._network_backend = PinnedNetworkBackend(self._pool._network_backend)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            await validate_url_async(str(request.url))
+        except SSRFError as e:
+            raise BlockedAddressError(str(e), request=request) from e
+        return await super().handle_async_request(request)
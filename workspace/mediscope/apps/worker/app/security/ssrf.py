@@ -4,6 +4,8 @@ import ipaddress
 import socket
 from urllib.parse import urlparse
 
+from .dns_resolver import resolver
+
 BLOCKED_NETWORKS = [
     ipaddress.ip_network("10.0.0.0/8"),
     ipaddress.ip_network("172.16.0.0/12"),
@@ -35,8 +37,8 @@ def _is_private_ip(ip_str: str) -> bool:
     return any(addr in network for network in BLOCKED_NETWORKS)
 
 
-def validate_url(url: str) -> str:
-    """Validate URL is safe to fetch. Returns normalized URL or raises SSRFError."""
+def _parse(url: str) -> str:
+    """Scheme/hostname checks that need no DNS. Returns the hostname."""
     parsed = urlparse(url)
 
     if parsed.scheme not in ("http", "https"):
@@ -49,15 +51,40 @@ def validate_url(url: str) -> str:
     if hostname in BLOCKED_HOSTNAMES:
         raise SSRFError(f"Blocked hostname: {hostname}")
 
+    return hostname
+
+
+def _check_addresses(hostname: str, addresses: tuple[str, ...]) -> None:
+    for ip in addresses:
+        if _is_private_ip(ip):
+            raise SSRFError(f"Blocked private IP: {ip} for {hostname}")
+
+
+def validate_url(url: str) -> str:
+    """Validate URL is safe to fetch. Returns normalized URL or raises SSRFError.
+
+    Blocking on a cache miss — async code should use ``validate_url_async``.
+    """
+    hostname = _parse(url)
+
     # DNS resolution to prevent rebinding
     try:
-        resolved = socket.getaddrinfo(hostname, parsed.port or 443, proto=socket.IPPROTO_TCP)
+        addresses = resolver.resolve(hostname)
     except socket.gaierror:
         raise SSRFError(f"DNS resolution failed: {hostname}")
 
-    for family, type_, proto, canonname, sockaddr in resolved:
-        ip = sockaddr[0]
-        if _is_private_ip(ip):
-            raise SSRFError(f"Blocked private IP: {ip} for {hostname}")
+    _check_addresses(hostname, addresses)
+    return url
+
+
+async def validate_url_async(url: str) -> str:
+    """``validate_url`` without blocking the event loop (shared DNS cache)."""
+    hostname = _parse(url)
+
+    try:
+        addresses = await resolver.resolve_async(hostname)
+    except socket.gaierror:
+        raise SSRFError(f"DNS resolution failed: {hostname}")
 
+    _check_addresses(hostname, addresses)
     return url
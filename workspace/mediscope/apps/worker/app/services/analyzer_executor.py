@@ -0,0 +1,119 @@
+"""Off-loop execution of the CPU-bound HTML analyzers.
+
+Analyzers such as ``analyze_multilingual_readiness`` or ``detect_tech_stack`` walk
+every crawled page and can hold the event loop for seconds on large sites, which
+stalls ``/health`` and every other in-flight scan. ``run_analyzers`` moves them off
+the loop. The mode comes from ``settings.analyzer_executor``:
+
+- ``inline``  — run on the caller's thread (tests, debugging)
+- ``thread``  — one pool task per analyzer, sharing the already parsed pages
+- ``process`` — analyzers are split across worker processes; each worker gets a
+  compact ``(url, html, status_code)`` payload and parses it once for its share
+
+Each job is ``(name, fn, kwargs)`` and is called as ``fn(pages, **kwargs)``. ``fn``
+must be a module-level function so it can be pickled for the process pool.
+Exceptions propagate to the caller, as they would from a direct call.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from ..checks.parsed_page import ParsedPage, as_pages
+from ..config import settings
+
+logger = logging.getLogger("checkyourhospital.analyzer_executor")
+
+AnalyzerJob = tuple[str, Callable, dict]
+PagePayload = tuple[str, str, int]
+
+MODES = ("inline", "thread", "process")
+
+_executors: dict[str, Executor] = {}
+
+
+def _get_executor(mode: str) -> Executor:
+    executor = _executors.get(mode)
+    if executor is None:
+        workers = max(1, settings.analyzer_workers)
+        if mode == "process":
+            # Never fork: the parent has a running event loop and pool threads
+            executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("forkserver")
+            )
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analyzer")
+        _executors[mode] = executor
+    return executor
+
+
+def shutdown_executors() -> None:
+    """Stop the pools (app shutdown). They are recreated lazily on next use."""
+    for executor in _executors.values():
+        executor.shutdown(wait=False, cancel_futures=True)
+    _executors.clear()
+
+
+def to_payload(pages: list[ParsedPage]) -> list[PagePayload]:
+    """Compact, picklable form of the crawled pages — no soup, no cached views."""
+    return [(p.url, p.html, p.status_code) for p in pages]
+
+
+def _parse_all(pages: list[ParsedPage]) -> None:
+    for page in pages:
+        page.soup  # noqa: B018 — warm the shared cached soup
+
+
+def _run_jobs(pages: list[ParsedPage], jobs: list[AnalyzerJob]) -> dict:
+    return {name: fn(pages, **kwargs) for name, fn, kwargs in jobs}
+
+
+def _run_jobs_from_payload(payload: list[PagePayload], jobs: list[AnalyzerJob]) -> dict:
+    """Process-pool entry point: parse the payload once, then run this worker's jobs."""
+    pages = [ParsedPage(url=url, html=html, status_code=status) for url, html, status in payload]
+    return _run_jobs(pages, jobs)
+
+
+async def run_analyzers(pages: list, jobs: list[AnalyzerJob], mode: str | None = None) -> dict:
+    """Run analyzer ``jobs`` over ``pages`` and return ``{name: result}``."""
+    mode = mode or settings.analyzer_executor
+    if mode not in MODES:
+        raise ValueError(f"Unknown analyzer executor mode: {mode!r}")
+    pages = as_pages(pages)
+    started = time.perf_counter()
+
+    if mode == "inline" or not jobs:
+        results = _run_jobs(pages, jobs)
+    elif mode == "thread":
+        loop = asyncio.get_running_loop()
+        executor = _get_executor(mode)
+        # Parse up front so concurrent analyzers don't each build the same soup
+        await loop.run_in_executor(executor, _parse_all, pages)
+        outputs = await asyncio.gather(
+            *(loop.run_in_executor(executor, _run_jobs, pages, [job]) for job in jobs)
+        )
+        results = {name: out for out_map in outputs for name, out in out_map.items()}
+    else:
+        loop = asyncio.get_running_loop()
+        executor = _get_executor(mode)
+        payload = to_payload(pages)
+        # One share per worker so each process parses the pages only once
+        shares = min(len(jobs), max(1, settings.analyzer_workers))
+        groups = [jobs[i::shares] for i in range(shares)]
+        outputs = await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, _run_jobs_from_payload, payload, group)
+                for group in groups
+            )
+        )
+        results = {name: out for out_map in outputs for name, out in out_map.items()}
+
+    logger.debug(
+        "Ran %d analyzers over %d pages (%s) in %.0fms",
+        len(jobs), len(pages), mode, (time.perf_counter() - started) * 1000,
+    )
+    # Preserve job order for callers that iterate the result
+    return {name: results[name] for name, _, _ in jobs}
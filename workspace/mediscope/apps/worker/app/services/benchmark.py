@@ -2,7 +2,7 @@
 
 import statistics
 
-from ..db.supabase import get_supabase_client
+from ..db.repository import eq, get_repository, in_, not_null
 from .regions import get_region_name, get_region_sggus
 
 
@@ -62,8 +62,8 @@ async def compute_benchmark(
     Filters by sido/sggu if provided, or by region_name (medical tourism region).
     If your_score is given, computes what percentile it falls in.
     """
-    sb = get_supabase_client()
-    if sb is None:
+    repo = get_repository()
+    if repo is None:
         return None
 
     # Resolve region_name to sggu set for querying
@@ -79,23 +79,20 @@ async def compute_benchmark(
         filter_sggus = get_region_sggus(resolved_region_name)
 
     try:
-        query = sb.table("beauty_clinics").select("latest_score")
-
+        filters = []
         if filter_sggus:
             # Filter by all sggus in the region
-            query = query.in_("sggu", list(filter_sggus))
+            filters.append(in_("sggu", filter_sggus))
             if sido:
-                query = query.eq("sido", sido)
+                filters.append(eq("sido", sido))
         else:
             if sido:
-                query = query.eq("sido", sido)
+                filters.append(eq("sido", sido))
             if sggu:
-                query = query.eq("sggu", sggu)
-
-        query = query.not_.is_("latest_score", "null")
+                filters.append(eq("sggu", sggu))
+        filters.append(not_null("latest_score"))
 
-        result = query.execute()
-        rows = result.data or []
+        rows = await repo.select("beauty_clinics", "latest_score", filters)
     except Exception:
         return None
 
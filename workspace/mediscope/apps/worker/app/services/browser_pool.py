@@ -0,0 +1,202 @@
+"""Shared headless Chromium, kept warm across jobs.
+
+Launching Chromium costs 1–2s and a large memory spike; doing it per PDF, PNG
+or lab measurement dominated those jobs. ``BrowserPool`` launches one browser
+lazily and shares it, with at most ``browser_pool_size`` jobs using it at once:
+
+- ``context(**options)`` — a fresh, isolated context per job (lab metrics need
+  empty cookies and HTTP cache), closed afterwards
+- ``render(fn, viewport=...)`` — runs ``fn(page)`` on a reusable page from a
+  shared render context (PDF/PNG from ``set_content``, no site state involved)
+
+The browser is recycled after ``browser_recycle_after`` jobs (once idle) to cap
+memory growth, and relaunched when it crashes or disconnects; a render that
+hits a crash is retried once on the new browser.
+
+The pool is closed by ``aclose_browser_pool()`` in the app lifespan.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from ..config import settings
+
+logger = logging.getLogger("checkyourhospital.browser_pool")
+
+# /dev/shm is tiny in containers; Chromium falls back to /tmp with this flag
+_LAUNCH_ARGS = ["--disable-dev-shm-usage"]
+
+
+class BrowserPool:
+    def __init__(self, size: int | None = None, recycle_after: int | None = None):
+        self.size = max(1, size or settings.browser_pool_size)
+        self.recycle_after = recycle_after or settings.browser_recycle_after
+        self._slots = asyncio.Semaphore(self.size)
+        self._launch_lock = asyncio.Lock()
+        self._playwright = None
+        self._browser = None
+        self._render_context = None
+        self._idle_pages: list = []
+        self._in_use = 0
+        self._uses = 0  # jobs on the current browser
+        self.launches = 0
+        self.recycles = 0
+        self.crashes = 0
+        self.contexts_opened = 0
+        self.renders = 0
+
+    def _connected(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def _ensure_browser(self):
+        async with self._launch_lock:
+            if self._browser is not None and self._uses >= self.recycle_after and self._in_use == 0:
+                self.recycles += 1
+                await self._close_browser()
+            if not self._connected():
+                if self._browser is not None:
+                    # Disconnected without us closing it: crashed or killed (OOM)
+                    self.crashes += 1
+                    logger.warning("Pooled Chromium disconnected; relaunching")
+                    await self._close_browser()
+                if self._playwright is None:
+                    from playwright.async_api import async_playwright
+
+                    self._playwright = await async_playwright().start()
+                try:
+                    self._browser = await self._playwright.chromium.launch(args=_LAUNCH_ARGS)
+                except Exception:
+                    # Don't leave the driver process running for a browser that never started
+                    await self._playwright.stop()
+                    self._playwright = None
+                    raise
+                self._uses = 0
+                self.launches += 1
+                logger.info("Launched pooled Chromium (%d)", self.launches)
+            self._uses += 1
+            return self._browser
+
+    async def _close_browser(self) -> None:
+        browser, self._browser = self._browser, None
+        self._render_context = None
+        self._idle_pages.clear()
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.debug("Closing Chromium failed: %s", e)
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator:
+        async with self._slots:
+            browser = await self._ensure_browser()
+            self._in_use += 1
+            try:
+                yield browser
+            finally:
+                self._in_use -= 1
+
+    @asynccontextmanager
+    async def context(self, **options) -> AsyncIterator:
+        """A new browser context (``Browser.new_context`` options), closed on exit."""
+        async with self._slot() as browser:
+            ctx = await browser.new_context(**options)
+            self.contexts_opened += 1
+            try:
+                yield ctx
+            finally:
+                try:
+                    await ctx.close()
+                except Exception as e:
+                    logger.debug("Closing browser context failed: %s", e)
+
+    async def _checkout_page(self, browser, viewport: dict | None):
+        if self._idle_pages:
+            page = self._idle_pages.pop()
+        else:
+            if self._render_context is None:
+                self._render_context = await browser.new_context()
+            page = await self._render_context.new_page()
+        if viewport:
+            await page.set_viewport_size(viewport)
+        return page
+
+    async def render(
+        self, fn: Callable[[Any], Awaitable[Any]], *, viewport: dict | None = None
+    ) -> Any:
+        """``await fn(page)`` on a pooled page; retried once if the browser crashed."""
+        for attempt in (1, 2):
+            async with self._slot() as browser:
+                page = None
+                try:
+                    page = await self._checkout_page(browser, viewport)
+                    result = await fn(page)
+                except Exception:
+                    if attempt == 1 and not browser.is_connected():
+                        continue  # _ensure_browser relaunches on the retry
+                    if page is not None:
+                        await _close_quietly(page)
+                    raise
+                self.renders += 1
+                if browser is self._browser:
+                    self._idle_pages.append(page)
+                return result
+        raise RuntimeError("unreachable")
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "in_use": self._in_use,
+            "idle_pages": len(self._idle_pages),
+            "launches": self.launches,
+            "recycles": self.recycles,
+            "crashes": self.crashes,
+            "contexts_opened": self.contexts_opened,
+            "renders": self.renders,
+        }
+
+    async def aclose(self) -> None:
+        async with self._launch_lock:
+            await self._close_browser()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+
+async def _close_quietly(page) -> None:
+    try:
+        await page.close()
+    except Exception:
+        pass
+
+
+_pool: BrowserPool | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """The shared pool. Playwright's connection is bound to the loop it started on,
+    so a new event loop (tests) gets a new pool; the server has a single loop."""
+    global _pool, _loop
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if _pool is None or (loop is not None and loop is not _loop):
+        _pool = BrowserPool()
+        _loop = loop
+    return _pool
+
+
+async def aclose_browser_pool() -> None:
+    """Close the shared browser (app shutdown)."""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        try:
+            await pool.aclose()
+        except Exception as e:
+            logger.warning("Error closing browser pool: %s", e)
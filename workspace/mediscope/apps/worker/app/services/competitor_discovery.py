@@ -1,10 +1,11 @@
 """Competitor discovery: find same-region competitors and compare scores."""
 
+import asyncio
 import logging
 import statistics
 from urllib.parse import urlparse
 
-from ..db.supabase import get_supabase_client
+from ..db.repository import Repository, eq, get_repository, ilike, in_, not_null
 from .regions import get_region_name, get_region_sggus
 
 logger = logging.getLogger("checkyourhospital.competitor_discovery")
@@ -44,8 +45,8 @@ async def discover_competitors(
 
     Returns comparison dict or None if matching fails.
     """
-    sb = get_supabase_client()
-    if sb is None:
+    repo = get_repository()
+    if repo is None:
         return None
 
     domain = _extract_domain(url)
@@ -54,14 +55,12 @@ async def discover_competitors(
 
     # Step 1: Find this hospital in beauty_clinics
     try:
-        result = (
-            sb.table("beauty_clinics")
-            .select("id,name,sido,sggu,website,latest_score")
-            .ilike("website", f"%{domain}%")
-            .limit(1)
-            .execute()
+        rows = await repo.select(
+            "beauty_clinics",
+            "id,name,sido,sggu,website,latest_score",
+            [ilike("website", f"%{domain}%")],
+            limit=1,
         )
-        rows = result.data or []
     except Exception:
         logger.exception("Failed to find clinic by domain: %s", domain)
         return None
@@ -84,15 +83,11 @@ async def discover_competitors(
         region_sggus = {sggu}
 
     try:
-        query = (
-            sb.table("beauty_clinics")
-            .select("id,name,website,latest_score,sggu")
-            .eq("sido", sido)
-            .in_("sggu", list(region_sggus))
-            .not_.is_("latest_score", "null")
+        competitors_raw = await repo.select(
+            "beauty_clinics",
+            "id,name,website,latest_score,sggu",
+            [eq("sido", sido), in_("sggu", region_sggus), not_null("latest_score")],
         )
-        comp_result = query.execute()
-        competitors_raw = comp_result.data or []
     except Exception:
         logger.exception("Failed to query regional competitors")
         return None
@@ -146,7 +141,7 @@ async def discover_competitors(
         percentile = round((lower_count / len(scores)) * 100)
 
     # Step 4: Portal comparison from audits.details
-    portal_comparison = await _build_portal_comparison(sb, url, domain, all_clinics, my_id)
+    portal_comparison = await _build_portal_comparison(repo, url, domain, all_clinics, my_id)
 
     # Build insight
     insight = _build_insight(
@@ -172,7 +167,7 @@ async def discover_competitors(
 
 
 async def _build_portal_comparison(
-    sb,
+    repo: Repository,
     url: str,
     my_domain: str,
     all_clinics: list[dict],
@@ -197,22 +192,23 @@ async def _build_portal_comparison(
     my_portal_scores: dict[str, float | None] = {p: None for p in portals}
 
     try:
-        # Get latest audit per domain via ordering
-        for d in domains:
-            audit_result = (
-                sb.table("audits")
-                .select("url,details")
-                .ilike("url", f"%{d}%")
-                .eq("status", "completed")
-                .order("created_at", desc=True)
-                .limit(1)
-                .execute()
+        # Latest audit per domain (ILIKE can't be batched into one IN query);
+        # the lookups run concurrently, bounded by the repository's DB pool
+        latest = await asyncio.gather(*(
+            repo.select_one(
+                "audits",
+                "url,details",
+                [ilike("url", f"%{d}%"), eq("status", "completed")],
+                order="created_at",
+                desc=True,
             )
-            audit_rows = audit_result.data or []
-            if not audit_rows:
+            for d in domains
+        ))
+        for d, audit in zip(domains, latest):
+            if not audit:
                 continue
 
-            details = audit_rows[0].get("details") or {}
+            details = audit.get("details") or {}
             ps = details.get("portal_scores") or {}
 
             is_me = d == my_domain
@@ -5,9 +5,9 @@ from collections import defaultdict
 from datetime import date, datetime, timedelta
 from urllib.parse import urlparse
 
-from bs4 import BeautifulSoup
-
+from ..checks.parsed_page import ParsedPage, as_page, as_pages
 from .multilingual_analyzer import _PAGE_TYPE_PATTERNS
+from .regex_guard import PageScan, RegexGuard
 
 
 # ── Page type classification (reuse patterns from multilingual_analyzer) ─────
@@ -105,9 +105,9 @@ def _parse_date_safe(year: int, month: int, day: int = 1) -> date | None:
         return None
 
 
-def _extract_date_from_meta(html: str) -> date | None:
+def _extract_date_from_meta(html: str | ParsedPage) -> date | None:
     """Extract date from HTML meta tags."""
-    soup = BeautifulSoup(html, "html.parser")
+    soup = as_page(html).soup
     for meta_name in _DATE_META_NAMES:
         # Check property attribute
         tag = soup.find("meta", attrs={"property": meta_name})
@@ -148,21 +148,24 @@ def _parse_iso_or_date_string(s: str) -> date | None:
     return None
 
 
-def _extract_date_from_text(html: str) -> date | None:
+# Visible text scanned for dates per page (footers included on any real page)
+_MAX_TEXT = 500_000
+
+
+def _extract_date_from_text(html: str | ParsedPage, scan: PageScan | None = None) -> date | None:
     """Extract the most relevant date from page text content."""
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    text = soup.get_text(separator=" ", strip=True)
+    page = as_page(html)
+    text = page.text
 
     if not text:
         return None
+    scan = scan or RegexGuard("content_freshness", max_input=_MAX_TEXT).page(page.url)
 
     found_dates: list[tuple[date, bool]] = []  # (date, is_update_context)
 
     # English month patterns
     for p in _DATE_PATTERNS_ENGLISH:
-        for m in p.finditer(text):
+        for m in scan.finditer(p, text):
             month_name = m.group(1).lower()
             day = int(m.group(2))
             year = int(m.group(3))
@@ -178,7 +181,7 @@ def _extract_date_from_text(html: str) -> date | None:
 
     # Y-M-D patterns
     for p in _DATE_PATTERNS_YMD:
-        for m in p.finditer(text):
+        for m in scan.finditer(p, text):
             year, month, day = int(m.group(1)), int(m.group(2)), int(m.group(3))
             d = _parse_date_safe(year, month, day)
             if d:
@@ -189,7 +192,7 @@ def _extract_date_from_text(html: str) -> date | None:
 
     # Y-M patterns (less precise)
     for p in _DATE_PATTERNS_YM:
-        for m in p.finditer(text):
+        for m in scan.finditer(p, text):
             year, month = int(m.group(1)), int(m.group(2))
             d = _parse_date_safe(year, month, 1)
             if d:
@@ -209,24 +212,24 @@ def _extract_date_from_text(html: str) -> date | None:
     return max(d for d, _ in found_dates)
 
 
-def extract_page_date(page: dict) -> date | None:
+def extract_page_date(page: dict | ParsedPage, scan: PageScan | None = None) -> date | None:
     """Extract the most relevant date from a page.
 
     Priority:
     1. Meta tags (article:modified_time, etc.)
     2. Text content date patterns
     """
-    html = page.get("html", "")
-    if not html:
+    page = as_page(page)
+    if not page.html:
         return None
 
     # 1. Meta tags
-    d = _extract_date_from_meta(html)
+    d = _extract_date_from_meta(page)
     if d:
         return d
 
     # 2. Text content
-    return _extract_date_from_text(html)
+    return _extract_date_from_text(page, scan)
 
 
 # ── Freshness scoring ────────────────────────────────────────────────────────
@@ -263,11 +266,9 @@ def _calculate_freshness_score(
     return round(weighted_sum / total_pages)
 
 
-def _extract_title(html: str) -> str:
+def _extract_title(html: str | ParsedPage) -> str:
     """Extract page title from HTML."""
-    soup = BeautifulSoup(html, "html.parser")
-    title = soup.find("title")
-    return title.get_text(strip=True) if title else ""
+    return as_page(html).title
 
 
 # ── Recommendations ──────────────────────────────────────────────────────────
@@ -343,15 +344,18 @@ def _generate_recommendations(
 
 # ── Main analysis function ───────────────────────────────────────────────────
 
-def analyze_content_freshness(pages: list[dict], today: date | None = None) -> dict:
+def analyze_content_freshness(
+    pages: list[dict] | list[ParsedPage], today: date | None = None
+) -> dict:
     """Analyze content freshness from crawled pages.
 
     Args:
-        pages: List of crawled page dicts with keys: url, html, status_code
+        pages: ParsedPage objects or crawled page dicts with keys: url, html, status_code
         today: Override for current date (for testing)
 
     Returns:
-        Analysis result with freshness scores, type breakdown, ratings, recommendations.
+        Analysis result with freshness scores, type breakdown, ratings, recommendations;
+        ``details["regex_guard"]`` lists pages whose date scan hit a cap or budget.
     """
     if today is None:
         today = date.today()
@@ -369,14 +373,14 @@ def analyze_content_freshness(pages: list[dict], today: date | None = None) -> d
 
     # Process each page
     type_pages: dict[str, list[dict]] = defaultdict(list)
+    guard = RegexGuard("content_freshness", max_input=_MAX_TEXT)
 
-    for page in pages:
-        url = page.get("url", "")
-        html = page.get("html", "")
-        title = page.get("title", "") or _extract_title(html)
+    for page in as_pages(pages):
+        url = page.url
+        title = page.title
 
         page_type = _classify_freshness_page_type(url, title)
-        page_date = extract_page_date(page)
+        page_date = extract_page_date(page, guard.page(url))
 
         type_pages[page_type].append({
             "url": url,
@@ -411,7 +415,7 @@ def analyze_content_freshness(pages: list[dict], today: date | None = None) -> d
     overall_score = _calculate_freshness_score(pages_with_date, total_pages, rating_counts)
     recommendations = _generate_recommendations(by_type, rating_counts, total_pages, today)
 
-    return {
+    return guard.report({
         "overall_freshness_score": overall_score,
         "total_pages": total_pages,
         "pages_with_date": pages_with_date,
@@ -419,4 +423,4 @@ def analyze_content_freshness(pages: list[dict], today: date | None = None) -> d
         "by_type": by_type,
         "freshness_rating": rating_counts,
         "recommendations": recommendations,
-    }
+    })
@@ -0,0 +1,105 @@
+"""Crawl frontier that drops already-seen URLs when they are enqueued.
+
+The crawler used to put every same-site link on its queue and skip repeats only
+when a worker dequeued them, comparing raw strings. ``Frontier`` keys each URL
+by ``url_key`` and rejects a known key at ``push`` time, so the queue only ever
+holds distinct pages. Keys are kept as 64-bit BLAKE2b digests rather than URL
+strings: a crawl sees every link on every page, far more than it fetches.
+"""
+
+import asyncio
+import hashlib
+import itertools
+from urllib.parse import urldefrag
+
+from .url_normalizer import canonical_url, url_key
+
+
+class DigestSet:
+    """Set of strings, stored as 64-bit digests (false positives ~n²/2⁶⁵)."""
+
+    __slots__ = ("_digests",)
+
+    def __init__(self):
+        self._digests: set[int] = set()
+
+    @staticmethod
+    def _digest(value: str) -> int:
+        return int.from_bytes(
+            hashlib.blake2b(value.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "big"
+        )
+
+    def add(self, value: str) -> bool:
+        """Add ``value``; False if it was already present."""
+        digest = self._digest(value)
+        if digest in self._digests:
+            return False
+        self._digests.add(digest)
+        return True
+
+    def __contains__(self, value: str) -> bool:
+        return self._digest(value) in self._digests
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+
+class Frontier:
+    """Depth-ordered (then FIFO) queue of URLs to crawl, deduplicated on push.
+
+    ``fetches_saved`` counts rejected URLs that a crawl deduplicating on raw
+    (fragment-less) strings would still have fetched: variants of a known page
+    and links to where an earlier redirect ended.
+    """
+
+    def __init__(self):
+        self._queue: asyncio.PriorityQueue[tuple[int, int, str]] = asyncio.PriorityQueue()
+        self._order = itertools.count()
+        self._seen = DigestSet()
+        self._raw = DigestSet()
+        self.enqueued = 0
+        self.duplicates = 0
+        self.fetches_saved = 0
+
+    def seed(self, url: str) -> None:
+        """Queue the start URL at depth 0, exactly as given."""
+        self._raw.add(urldefrag(url).url)
+        self._seen.add(url_key(url))
+        self._enqueue(url, 0)
+
+    def push(self, link: str, depth: int) -> bool:
+        """Queue ``link`` (as ``canonical_url``) at ``depth`` unless its page was already seen."""
+        raw_new = self._raw.add(urldefrag(link).url)
+        if not self._seen.add(url_key(link)):
+            self.duplicates += 1
+            if raw_new:
+                self.fetches_saved += 1
+            return False
+        self._enqueue(canonical_url(link), depth)
+        return True
+
+    def mark_seen(self, url: str) -> None:
+        """Record a page reached without being pushed (a redirect target)."""
+        self._seen.add(url_key(url))
+
+    def _enqueue(self, url: str, depth: int) -> None:
+        self._queue.put_nowait((depth, next(self._order), url))
+        self.enqueued += 1
+
+    async def get(self) -> tuple[int, str]:
+        depth, _, url = await self._queue.get()
+        return depth, url
+
+    def task_done(self) -> None:
+        self._queue.task_done()
+
+    async def join(self) -> None:
+        await self._queue.join()
+
+    def stats(self) -> dict:
+        return {
+            "enqueued": self.enqueued,
+            "duplicates_dropped": self.duplicates,
+            "fetches_saved": self.fetches_saved,
+            "seen": len(self._seen),
+        }
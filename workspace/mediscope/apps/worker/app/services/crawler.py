@@ -1,19 +1,204 @@
 """HTTP crawler with SSRF protection."""
 
-from urllib.parse import urljoin, urlparse
+import asyncio
+import codecs
+import logging
+import time
+from typing import NamedTuple
+from urllib.parse import urlparse
 
 import httpx
-from bs4 import BeautifulSoup
 
+from ..checks.parsed_page import ParsedPage
 from ..config import settings
-from ..security.ssrf import SSRFError, validate_url
+from ..security.ssrf import SSRFError, validate_url_async
+from .crawl_frontier import Frontier
+from .http_clients import get_client
+from .response_memo import ResponseMemo
+from .url_normalizer import site_host
+
+logger = logging.getLogger("checkyourhospital.crawler")
+
+
+class RedirectHop(NamedTuple):
+    """One redirect the crawler followed on its way to a page."""
+
+    url: str
+    status_code: int
+    location: str
+    elapsed_ms: float | None = None
 
 
 class CrawlResult:
-    def __init__(self, url: str, html: str, status_code: int):
+    """A crawled page plus the response metadata the crawl saw for free.
+
+    ``url`` is the URL that was requested, ``final_url`` where the redirects (if
+    any) ended. ``headers`` are the final response's headers, lower-cased.
+    ``ttfb_ms`` covers connect + request until the final response's headers
+    arrived, ``elapsed_ms`` the whole final exchange including the body, and
+    ``transfer_size`` the body bytes on the wire (before decompression) and
+    ``http_version`` the negotiated protocol. ``truncated`` is set when the body
+    was cut off at ``crawler_max_html_bytes``.
+    Slotted: a scan holds up to ``crawler_max_pages`` of these.
+    """
+
+    __slots__ = (
+        "url",
+        "html",
+        "status_code",
+        "headers",
+        "final_url",
+        "redirects",
+        "elapsed_ms",
+        "ttfb_ms",
+        "transfer_size",
+        "content_encoding",
+        "http_version",
+        "truncated",
+        "_parsed",
+    )
+
+    def __init__(
+        self,
+        url: str,
+        html: str,
+        status_code: int,
+        *,
+        headers: dict[str, str] | None = None,
+        final_url: str | None = None,
+        redirects: tuple[RedirectHop, ...] = (),
+        elapsed_ms: float | None = None,
+        ttfb_ms: float | None = None,
+        transfer_size: int | None = None,
+        content_encoding: str | None = None,
+        http_version: str | None = None,
+        truncated: bool = False,
+    ):
         self.url = url
         self.html = html
         self.status_code = status_code
+        self.headers = headers or {}
+        self.final_url = final_url or url
+        self.redirects = redirects
+        self.elapsed_ms = elapsed_ms
+        self.ttfb_ms = ttfb_ms
+        self.transfer_size = transfer_size
+        self.content_encoding = content_encoding
+        self.http_version = http_version
+        self.truncated = truncated
+        self._parsed: ParsedPage | None = None
+
+    @classmethod
+    def from_response(
+        cls,
+        url: str,
+        resp: httpx.Response,
+        *,
+        ttfb_ms: float | None = None,
+        body: "StreamedBody | None" = None,
+    ) -> "CrawlResult":
+        """``body`` is what ``read_text`` read of a streamed ``resp``; without it
+        the response must have been read already."""
+        return cls(
+            url=url,
+            html=body.text if body else resp.text,
+            status_code=resp.status_code,
+            headers={k.lower(): v for k, v in resp.headers.items()},
+            final_url=str(resp.url),
+            redirects=tuple(
+                RedirectHop(
+                    url=str(hop.url),
+                    status_code=hop.status_code,
+                    location=hop.headers.get("location", ""),
+                    elapsed_ms=_elapsed_ms(hop),
+                )
+                for hop in resp.history
+            ),
+            elapsed_ms=_elapsed_ms(resp),
+            ttfb_ms=ttfb_ms,
+            transfer_size=resp.num_bytes_downloaded,
+            content_encoding=resp.headers.get("content-encoding"),
+            http_version=resp.http_version,
+            truncated=body.truncated if body else False,
+        )
+
+    @property
+    def redirect_ms(self) -> float:
+        """Time spent on redirect hops before the final response."""
+        return round(sum(hop.elapsed_ms or 0.0 for hop in self.redirects), 1)
+
+    @property
+    def parsed(self) -> ParsedPage:
+        """Parse-once view of this page, shared by link extraction and every check."""
+        if self._parsed is None:
+            self._parsed = ParsedPage(url=self.url, html=self.html, status_code=self.status_code)
+        return self._parsed
+
+
+class StreamedBody(NamedTuple):
+    """A streamed response body, read up to a byte cap."""
+
+    text: str
+    content: bytes  # decompressed bytes that were read
+    truncated: bool
+
+
+def is_html(resp: httpx.Response) -> bool:
+    return "text/html" in resp.headers.get("content-type", "")
+
+
+async def read_text(resp: httpx.Response, max_bytes: int | None = None) -> StreamedBody:
+    """Read and decode a streamed body chunk by chunk, stopping after ``max_bytes``.
+
+    Bytes are counted after decompression, and decoded with the response's
+    encoding (``charset``, else the client default) as ``resp.text`` would.
+    """
+    max_bytes = max_bytes or settings.crawler_max_html_bytes
+    decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+    chunks: list[bytes] = []
+    parts: list[str] = []
+    size = 0
+    truncated = False
+    async for chunk in resp.aiter_bytes():
+        if size + len(chunk) > max_bytes:
+            chunk = chunk[: max_bytes - size]
+            truncated = True
+        size += len(chunk)
+        chunks.append(chunk)
+        parts.append(decoder.decode(chunk))
+        if truncated:
+            break
+    if not truncated:  # a cut-off multibyte character is dropped, not replaced
+        parts.append(decoder.decode(b"", final=True))
+    return StreamedBody("".join(parts), b"".join(chunks), truncated)
+
+
+def _elapsed_ms(resp: httpx.Response) -> float | None:
+    try:
+        return round(resp.elapsed.total_seconds() * 1000, 1)
+    except RuntimeError:  # response was never closed (e.g. built by hand)
+        return None
+
+
+class _HeaderTimer:
+    """httpcore ``trace`` hook: time to response headers for each request/redirect hop."""
+
+    def __init__(self):
+        self.ttfb_ms: list[float] = []
+        self._started: float | None = None
+
+    async def __call__(self, event: str, info: dict) -> None:
+        now = time.perf_counter()
+        if self._started is None:
+            # First event of a hop: connect on a new connection, send on a reused one
+            self._started = now
+        if event.endswith("receive_response_headers.complete"):
+            self.ttfb_ms.append(round((now - self._started) * 1000, 1))
+            self._started = None
+
+    @property
+    def last(self) -> float | None:
+        return self.ttfb_ms[-1] if self.ttfb_ms else None
 
 
 class Crawler:
@@ -23,75 +208,203 @@ class Crawler:
         max_pages: int | None = None,
         max_depth: int | None = None,
         timeout: int | None = None,
+        concurrency: int | None = None,
+        per_host_limit: int | None = None,
+        max_html_bytes: int | None = None,
     ):
         self.max_pages = max_pages or settings.crawler_max_pages
         self.max_depth = max_depth or settings.crawler_max_depth
         self.timeout = timeout or settings.crawler_timeout
+        self.concurrency = max(1, concurrency or settings.crawler_concurrency)
+        self.per_host_limit = max(1, per_host_limit or settings.crawler_per_host_limit)
+        self.max_html_bytes = max_html_bytes or settings.crawler_max_html_bytes
+        # Timing of the last crawl() call — see _crawl_stats()
+        self.stats: dict = {}
+        # Every response (and redirect hop) of the last crawl() call, for the checks
+        self.memo = ResponseMemo()
 
-    async def crawl(self, start_url: str) -> list[CrawlResult]:
-        validate_url(start_url)
+    async def crawl(self, start_url: str, timeout: float | None = None) -> list[CrawlResult]:
+        """Breadth-first crawl of same-domain pages.
 
+        Workers pull from a depth-ordered frontier so pages are still visited
+        level by level; with ``concurrency=1`` this is the sequential crawl.
+        The start page is always ``results[0]`` since it is the only frontier
+        entry until it has been fetched. Links are queued in canonical form,
+        once per page (``Frontier``). After ``timeout`` seconds the fetches still
+        in flight are cancelled and the pages crawled so far are returned
+        (``stats["timed_out"]``).
+        """
+        await validate_url_async(start_url)
+
+        self.memo = memo = ResponseMemo()
         results: list[CrawlResult] = []
-        visited: set[str] = set()
-        queue: list[tuple[str, int]] = [(start_url, 0)]
-        base_domain = urlparse(start_url).netloc
-
-        async with httpx.AsyncClient(
-            timeout=self.timeout,
-            follow_redirects=True,
-            headers={"User-Agent": "CheckYourHospital-Bot/1.0"},
-        ) as client:
-            while queue and len(results) < self.max_pages:
-                url, depth = queue.pop(0)
-
-                if url in visited:
-                    continue
-                visited.add(url)
+        base_host = site_host(start_url)
+
+        frontier = Frontier()
+        frontier.seed(start_url)
 
+        host_limits: dict[str, asyncio.Semaphore] = {}
+        in_flight = 0
+        slot_freed = asyncio.Condition()
+        fetch_seconds = 0.0
+        fetched = 0
+        non_html = 0
+        truncated = 0
+        started = time.perf_counter()
+
+        async def fetch(client: httpx.AsyncClient, url: str) -> CrawlResult | None:
+            """GET ``url`` as a stream: non-HTML bodies are never downloaded and
+            HTML is read up to ``max_html_bytes``."""
+            nonlocal fetch_seconds, fetched, non_html, truncated
+            host = urlparse(url).netloc
+            sem = host_limits.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+            async with sem:
+                t0 = time.perf_counter()
+                timer = _HeaderTimer()
+                try:
+                    async with client.stream(
+                        "GET", url, timeout=self.timeout, extensions={"trace": timer}
+                    ) as resp:
+                        if not is_html(resp):
+                            # Still recorded: checks ask about non-HTML URLs too
+                            memo.record(resp, content=b"", partial=True)
+                            non_html += 1
+                            return None
+                        body = await read_text(resp, self.max_html_bytes)
+                except httpx.HTTPError as e:
+                    memo.record_error(url, e)
+                    return None
+                finally:
+                    fetch_seconds += time.perf_counter() - t0
+                    fetched += 1
+            memo.record(resp, content=body.content, partial=body.truncated)
+            if body.truncated:
+                truncated += 1
+            return CrawlResult.from_response(url, resp, ttfb_ms=timer.last, body=body)
+
+        async def visit(client: httpx.AsyncClient, url: str, depth: int) -> None:
+            nonlocal in_flight
+            # Reserve a page slot up front so concurrent workers never overshoot
+            # max_pages. With every slot taken, wait for an in-flight fetch to
+            # settle: one that fails or is not HTML frees its slot for this URL.
+            async with slot_freed:
+                await slot_freed.wait_for(
+                    lambda: len(results) + in_flight < self.max_pages
+                    or len(results) >= self.max_pages
+                )
+                if len(results) >= self.max_pages:
+                    return
+                in_flight += 1
+            try:
                 try:
-                    validate_url(url)
+                    await validate_url_async(url)
                 except SSRFError:
-                    continue
+                    return
+
+                page = await fetch(client, url)
+                if page is None or len(results) >= self.max_pages:
+                    return
+                results.append(page)
+                if page.final_url != url:
+                    frontier.mark_seen(page.final_url)
+            finally:
+                async with slot_freed:
+                    in_flight -= 1
+                    slot_freed.notify_all()
+
+            # Extract links for next depth
+            if depth < self.max_depth:
+                for full in page.parsed.links:
+                    # Only follow same-site (www. or not), http(s) links
+                    if (
+                        full.startswith(("http://", "https://"))
+                        and site_host(full) == base_host
+                    ):
+                        frontier.push(full, depth + 1)
 
+        async def worker(client: httpx.AsyncClient) -> None:
+            while True:
+                depth, url = await frontier.get()
                 try:
-                    resp = await client.get(url)
-                except httpx.HTTPError:
-                    continue
-
-                content_type = resp.headers.get("content-type", "")
-                if "text/html" not in content_type:
-                    continue
-
-                result = CrawlResult(url=url, html=resp.text, status_code=resp.status_code)
-                results.append(result)
-
-                # Extract links for next depth
-                if depth < self.max_depth:
-                    soup = BeautifulSoup(resp.text, "lxml")
-                    for a in soup.find_all("a", href=True):
-                        href = str(a["href"])
-                        full = urljoin(url, href)
-                        parsed = urlparse(full)
-                        # Only follow same-domain, http(s) links
-                        if (
-                            parsed.netloc == base_domain
-                            and parsed.scheme in ("http", "https")
-                            and full not in visited
-                        ):
-                            # Strip fragments
-                            clean = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-                            if parsed.query:
-                                clean += f"?{parsed.query}"
-                            queue.append((clean, depth + 1))
+                    if len(results) < self.max_pages:
+                        await visit(client, url, depth)
+                except Exception as e:
+                    # One bad page must not take the worker (and the crawl) down
+                    logger.warning("Crawl of %s failed: %s", url, e)
+                finally:
+                    frontier.task_done()
 
+        client = get_client("sites")
+        workers = [asyncio.create_task(worker(client)) for _ in range(self.concurrency)]
+        timed_out = False
+        try:
+            await asyncio.wait_for(frontier.join(), timeout)
+        except TimeoutError:
+            timed_out = True
+            logger.warning(
+                "Crawl of %s stopped after %.1fs with %d pages", start_url, timeout, len(results)
+            )
+        finally:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        self.stats = self._crawl_stats(
+            wall_seconds=time.perf_counter() - started,
+            fetch_seconds=fetch_seconds,
+            fetched=fetched,
+            pages=len(results),
+            non_html=non_html,
+            truncated=truncated,
+            frontier=frontier.stats(),
+            timed_out=timed_out,
+        )
         return results
 
+    def _crawl_stats(
+        self,
+        *,
+        wall_seconds: float,
+        fetch_seconds: float,
+        fetched: int,
+        pages: int,
+        non_html: int = 0,
+        truncated: int = 0,
+        frontier: dict | None = None,
+        timed_out: bool = False,
+    ) -> dict:
+        """Summarise a crawl.
+
+        ``sequential_estimate_ms`` is the sum of individual request times, i.e. what
+        the same crawl would have taken fetching one URL at a time.
+        ``non_html_skipped`` counts responses dropped unread by content type,
+        ``truncated`` pages cut off at ``max_html_bytes``. ``frontier`` reports
+        duplicate URLs dropped at enqueue time and the fetches that saved.
+        ``timed_out`` is set when the crawl was cut off by its timeout.
+        """
+        wall_ms = round(wall_seconds * 1000)
+        sequential_ms = round(fetch_seconds * 1000)
+        return {
+            "mode": "sequential" if self.concurrency == 1 else "concurrent",
+            "concurrency": self.concurrency,
+            "per_host_limit": self.per_host_limit,
+            "pages": pages,
+            "requests": fetched,
+            "wall_time_ms": wall_ms,
+            "sequential_estimate_ms": sequential_ms,
+            "speedup": round(sequential_ms / wall_ms, 2) if wall_ms else 1.0,
+            "non_html_skipped": non_html,
+            "truncated": truncated,
+            "frontier": frontier or {},
+            "timed_out": timed_out,
+        }
+
     async def fetch_single(self, url: str) -> CrawlResult:
-        validate_url(url)
-        async with httpx.AsyncClient(
-            timeout=self.timeout,
-            follow_redirects=True,
-            headers={"User-Agent": "CheckYourHospital-Bot/1.0"},
-        ) as client:
-            resp = await client.get(url)
-            return CrawlResult(url=url, html=resp.text, status_code=resp.status_code)
+        await validate_url_async(url)
+        client = get_client("sites")
+        timer = _HeaderTimer()
+        async with client.stream(
+            "GET", url, timeout=self.timeout, extensions={"trace": timer}
+        ) as resp:
+            body = await read_text(resp, self.max_html_bytes)
+        return CrawlResult.from_response(url, resp, ttfb_ms=timer.last, body=body)
@@ -0,0 +1,121 @@
+"""Application-scoped HTTP clients, one per target, shared across scans.
+
+Each scan used to open its own ``httpx.AsyncClient`` for the crawl, the checks,
+SERP lookups, LLM calls and alert e-mails, paying TCP/TLS handshakes to the same
+hosts again every time. ``get_client(target)`` returns a long-lived client whose
+connection pool (HTTP/2 where the server supports it) is reused by every caller
+in the process. Clients are closed by ``aclose_clients()`` in the app lifespan.
+
+Targets:
+
+- ``sites``      — clinic websites (crawler, checks, batch scan). Uses the SSRF
+  ``PinnedTransport`` and never stores cookies, so no state leaks between scans.
+- ``googleapis`` — PageSpeed Insights
+- ``serper``, ``naver`` — SERP APIs
+- ``llm``        — content generation (Anthropic / OpenAI)
+- ``resend``     — alert e-mails
+
+Callers must not close these clients. Response compression: httpx advertises
+``gzip, deflate`` and adds ``br`` when the ``brotli`` package is installed.
+"""
+
+import asyncio
+import importlib.util
+import logging
+from dataclasses import dataclass
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+import httpx
+
+from ..config import settings
+from ..security.pinned_transport import PinnedTransport
+
+logger = logging.getLogger("checkyourhospital.http_clients")
+
+BOT_USER_AGENT = "CheckYourHospital-Bot/1.0"
+
+
+@dataclass(frozen=True)
+class ClientProfile:
+    max_connections: int
+    max_keepalive: int
+    timeout: float
+    keepalive_expiry: float = 30.0
+    pinned: bool = False
+
+
+def _profiles() -> dict[str, ClientProfile]:
+    return {
+        # Many distinct hosts, few requests each: wide pool, short keep-alive
+        "sites": ClientProfile(
+            max_connections=100,
+            max_keepalive=40,
+            timeout=settings.crawler_timeout,
+            keepalive_expiry=15.0,
+            pinned=True,
+        ),
+        "googleapis": ClientProfile(max_connections=20, max_keepalive=10, timeout=60),
+        "serper": ClientProfile(max_connections=10, max_keepalive=10, timeout=15),
+        "naver": ClientProfile(max_connections=10, max_keepalive=10, timeout=15),
+        "llm": ClientProfile(
+            max_connections=10, max_keepalive=5, timeout=60, keepalive_expiry=60.0
+        ),
+        "resend": ClientProfile(max_connections=4, max_keepalive=2, timeout=10),
+    }
+
+
+def http2_available() -> bool:
+    return settings.http2_enabled and importlib.util.find_spec("h2") is not None
+
+
+def _no_cookies() -> CookieJar:
+    # Passed as a raw jar: httpx would copy an httpx.Cookies into a default-policy jar
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def _build(target: str) -> httpx.AsyncClient:
+    profile = _profiles()[target]
+    limits = httpx.Limits(
+        max_connections=profile.max_connections,
+        max_keepalive_connections=profile.max_keepalive,
+        keepalive_expiry=profile.keepalive_expiry,
+    )
+    http2 = http2_available()
+    if profile.pinned:
+        return httpx.AsyncClient(
+            transport=PinnedTransport(limits=limits, http2=http2),
+            timeout=profile.timeout,
+            follow_redirects=True,
+            headers={"User-Agent": BOT_USER_AGENT},
+            cookies=_no_cookies(),
+        )
+    return httpx.AsyncClient(limits=limits, http2=http2, timeout=profile.timeout)
+
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_client(target: str) -> httpx.AsyncClient:
+    """Shared client for ``target`` (see module docstring). Do not close it."""
+    global _loop
+    loop = asyncio.get_running_loop()
+    if loop is not _loop:
+        # Pools are bound to the loop they were opened on (matters for tests that
+        # run one loop per test; the server has a single loop)
+        _clients.clear()
+        _loop = loop
+    client = _clients.get(target)
+    if client is None or client.is_closed:
+        client = _clients[target] = _build(target)
+    return client
+
+
+async def aclose_clients() -> None:
+    """Close every shared client (app shutdown)."""
+    clients = list(_clients.values())
+    _clients.clear()
+    results = await asyncio.gather(*(c.aclose() for c in clients), return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning("Error closing HTTP client: %s", result)
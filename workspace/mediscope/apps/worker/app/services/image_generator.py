@@ -1,14 +1,16 @@
 """Image generator: Jinja2 HTML templates → Playwright screenshot → PNG bytes."""
 
 import logging
+import uuid
 from enum import Enum
 from pathlib import Path
 
 from jinja2 import Environment, FileSystemLoader
-from playwright.async_api import async_playwright
 
 from ..config import settings
 from ..db.supabase import get_supabase_client
+from .browser_pool import get_browser_pool
+from .render_cache import get_render_cache, render_key, storage_path
 
 logger = logging.getLogger("checkyourhospital.image")
 
@@ -65,14 +67,13 @@ async def html_to_screenshot(
     width: int = 1080,
     height: int = 1080,
 ) -> bytes:
-    """Convert HTML string to PNG screenshot bytes using Playwright."""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page(viewport={"width": width, "height": height})
+    """Convert HTML string to PNG screenshot bytes on a pooled Chromium page."""
+
+    async def render(page) -> bytes:
         await page.set_content(html, wait_until="networkidle")
-        png_bytes = await page.screenshot(type="png", full_page=False)
-        await browser.close()
-    return png_bytes
+        return await page.screenshot(type="png", full_page=False)
+
+    return await get_browser_pool().render(render, viewport={"width": width, "height": height})
 
 
 async def generate_image(
@@ -89,17 +90,61 @@ async def generate_image(
     2. Open page with Playwright Chromium
     3. Capture screenshot at specified size
     4. Return PNG bytes
+
+    Identical requests (same template version, data, language and size) are
+    served from the render cache without opening a page.
     """
-    default_w, default_h = IMAGE_TYPE_DEFAULTS[image_type]
-    w = width or default_w
-    h = height or default_h
+    w, h = _size(image_type, width, height)
+    key = image_render_key(image_type, procedure_name, data, language, w, h)
+    cache = get_render_cache()
+    cached = await cache.get(key, "png")
+    if cached is not None:
+        return cached
 
     html = render_image_html(image_type, procedure_name, data, language)
     png_bytes = await html_to_screenshot(html, w, h)
+    await cache.put(key, "png", png_bytes)
     logger.info(f"Image generated: type={image_type.value} size={len(png_bytes)} bytes")
     return png_bytes
 
 
+def _size(image_type: ImageType, width: int | None, height: int | None) -> tuple[int, int]:
+    default_w, default_h = IMAGE_TYPE_DEFAULTS[image_type]
+    return width or default_w, height or default_h
+
+
+def image_render_key(
+    image_type: ImageType, procedure_name: str, data: dict, language: str, width: int, height: int
+) -> str:
+    return render_key(
+        TEMPLATES_DIR / TEMPLATE_FILES[image_type],
+        {"procedure_name": procedure_name, "data": data},
+        language=language,
+        size=(width, height),
+    )
+
+
+def image_upload_path(
+    image_type: ImageType,
+    procedure_name: str,
+    data: dict,
+    language: str = "ko",
+    width: int | None = None,
+    height: int | None = None,
+) -> str:
+    """Storage object path for an image: content-addressed when
+    ``render_cache_storage`` is on (so re-uploads are skipped), unique otherwise."""
+    if not settings.render_cache_storage:
+        return f"{image_type.value}/{uuid.uuid4()}.png"
+    w, h = _size(image_type, width, height)
+    return storage_path(image_render_key(image_type, procedure_name, data, language, w, h), "png")
+
+
+async def find_uploaded_image(filename: str) -> str | None:
+    """Public URL of ``filename`` if an identical image was already uploaded."""
+    return await get_render_cache().remote_url(settings.supabase_image_bucket, filename)
+
+
 def upload_image_to_storage(filename: str, png_bytes: bytes) -> str:
     """Upload PNG to Supabase Storage and return public URL."""
     client = get_supabase_client()
@@ -112,7 +157,9 @@ def upload_image_to_storage(filename: str, png_bytes: bytes) -> str:
         png_bytes,
         file_options={"content-type": "image/png", "upsert": "true"},
     )
-    return client.storage.from_(bucket).get_public_url(filename)
+    url = client.storage.from_(bucket).get_public_url(filename)
+    get_render_cache().remember_remote(bucket, filename, url)
+    return url
 
 
 def list_templates() -> list[dict]:
@@ -4,6 +4,8 @@ import re
 
 from bs4 import BeautifulSoup
 
+from ..checks.parsed_page import ParsedPage, as_pages
+
 
 # Language switcher patterns
 _LANG_SWITCH_PATTERNS = [
@@ -120,69 +122,65 @@ def _check_lang_switcher(main_soup: BeautifulSoup) -> dict:
     return {"status": "fail", "detail": "언어 전환 버튼 없음"}
 
 
-def _check_intl_phone(pages: list[dict]) -> dict:
+def _check_intl_phone(pages: list[ParsedPage]) -> dict:
     """Check for international phone number format (+82 etc.)."""
     for page in pages:
-        html = page.get("html", "")
+        html = page.html
         if _INTL_PHONE_RE.search(html):
             return {"status": "pass", "detail": "국제 전화번호 형식(국가코드 포함) 발견"}
     # Check if any phone exists at all
     phone_re = re.compile(r"0\d{1,2}[-.\s]?\d{3,4}[-.\s]?\d{4}")
     for page in pages:
-        if phone_re.search(page.get("html", "")):
+        if phone_re.search(page.html):
             return {"status": "warn", "detail": "국내 전화번호만 있음, +82 국가코드 미포함"}
     return {"status": "fail", "detail": "전화번호 없음"}
 
 
-def _check_timezone(pages: list[dict]) -> dict:
+def _check_timezone(pages: list[ParsedPage]) -> dict:
     """Check for timezone display."""
     for page in pages:
-        if _TIMEZONE_RE.search(page.get("html", "")):
+        if _TIMEZONE_RE.search(page.html):
             return {"status": "pass", "detail": "시간대 정보 표시됨"}
     return {"status": "fail", "detail": "시간대 미표시 (영업시간에 KST/UTC 등 없음)"}
 
 
-def _check_currency(pages: list[dict]) -> dict:
+def _check_currency(pages: list[ParsedPage]) -> dict:
     """Check for multi-currency display."""
     for page in pages:
-        if _CURRENCY_RE.search(page.get("html", "")):
+        if _CURRENCY_RE.search(page.html):
             return {"status": "pass", "detail": "해외 통화 표시 발견 (USD/JPY/CNY 등)"}
     return {"status": "fail", "detail": "원(₩)만 표기, 해외 통화 미표시"}
 
 
-def _check_google_translate(pages: list[dict]) -> dict:
+def _check_google_translate(pages: list[ParsedPage]) -> dict:
     """Check for Google Translate widget."""
     for page in pages:
-        if _GOOGLE_TRANSLATE_RE.search(page.get("html", "")):
+        if _GOOGLE_TRANSLATE_RE.search(page.html):
             return {"status": "pass", "detail": "Google 번역 위젯 발견"}
     return {"status": "fail", "detail": "번역 위젯 없음"}
 
 
-def _check_visa_info(pages: list[dict]) -> dict:
+def _check_visa_info(pages: list[ParsedPage]) -> dict:
     """Check for visa/immigration information."""
     for page in pages:
-        soup = BeautifulSoup(page.get("html", ""), "html.parser")
-        text = soup.get_text()
-        if _VISA_RE.search(text):
+        if _VISA_RE.search(page.raw_text):
             return {"status": "pass", "detail": "비자/입국 관련 정보 발견"}
     return {"status": "fail", "detail": "비자/입국 정보 없음"}
 
 
-def _check_travel_support(pages: list[dict]) -> dict:
+def _check_travel_support(pages: list[ParsedPage]) -> dict:
     """Check for travel support (airport pickup, hotel, etc.)."""
     for page in pages:
-        soup = BeautifulSoup(page.get("html", ""), "html.parser")
-        text = soup.get_text()
-        if _TRAVEL_RE.search(text):
+        if _TRAVEL_RE.search(page.raw_text):
             return {"status": "pass", "detail": "공항 픽업/숙소 안내 정보 발견"}
     return {"status": "fail", "detail": "픽업/숙소 안내 없음"}
 
 
-def _check_payment_methods(pages: list[dict]) -> dict:
+def _check_payment_methods(pages: list[ParsedPage]) -> dict:
     """Check for international payment methods."""
     found_methods: list[str] = []
     for page in pages:
-        html = page.get("html", "")
+        html = page.html
         for method in ["alipay", "wechat pay", "unionpay", "paypal", "jcb"]:
             if method in html.lower() and method not in found_methods:
                 found_methods.append(method)
@@ -205,30 +203,28 @@ def _check_payment_methods(pages: list[dict]) -> dict:
     return {"status": "fail", "detail": "해외 결제수단(Alipay, WeChat Pay, PayPal 등) 없음"}
 
 
-def _check_multilingual_fonts(pages: list[dict]) -> dict:
+def _check_multilingual_fonts(pages: list[ParsedPage]) -> dict:
     """Check for multilingual font support."""
     for page in pages:
-        html = page.get("html", "")
+        html = page.html
         if _MULTILINGUAL_FONT_RE.search(html):
             return {"status": "pass", "detail": "중문/일문 전용 웹폰트 포함"}
     # Check for generic CJK font in CSS
     for page in pages:
-        soup = BeautifulSoup(page.get("html", ""), "html.parser")
-        styles = soup.find_all("style")
+        styles = page.soup.find_all("style")
         for style in styles:
             if style.string and _MULTILINGUAL_FONT_RE.search(style.string):
                 return {"status": "pass", "detail": "CSS에 다국어 폰트 지정됨"}
     return {"status": "warn", "detail": "중문/일문 전용 폰트 미지정"}
 
 
-def _check_alt_multilingual(pages: list[dict]) -> dict:
+def _check_alt_multilingual(pages: list[ParsedPage]) -> dict:
     """Check for multilingual image alt text."""
     total_with_alt = 0
     non_ko_alt_count = 0
 
     for page in pages:
-        soup = BeautifulSoup(page.get("html", ""), "html.parser")
-        for img in soup.find_all("img", alt=True):
+        for img in page.soup.find_all("img", alt=True):
             alt = img["alt"].strip()
             if not alt:
                 continue
@@ -313,13 +309,13 @@ _CHECK_CONFIGS: list[dict] = [
 
 
 def analyze_international_usability(
-    pages: list[dict],
+    pages: list[dict] | list[ParsedPage],
     multilingual_readiness: dict,
 ) -> dict:
     """Analyze website UX readiness for foreign patients.
 
     Args:
-        pages: Crawled page list with keys: url, html, status_code
+        pages: ParsedPage objects or crawled page dicts with keys: url, html, status_code
         multilingual_readiness: Multilingual readiness result (already computed)
 
     Returns:
@@ -336,7 +332,8 @@ def analyze_international_usability(
             "recommendations": [],
         }
 
-    main_soup = BeautifulSoup(pages[0].get("html", ""), "html.parser")
+    pages = as_pages(pages)
+    main_soup = pages[0].soup
 
     # Run all checks
     checks: dict[str, dict] = {
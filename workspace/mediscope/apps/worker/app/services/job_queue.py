@@ -0,0 +1,382 @@
+"""Durable local job queue (SQLite) and a fixed-size async worker pool.
+
+Replaces FastAPI ``BackgroundTasks`` for scans: jobs survive a process restart,
+at most ``settings.job_workers`` run at once, and failures are retried with
+exponential backoff.
+
+- Higher ``priority`` runs first; FIFO within a priority.
+- A claimed job holds a lease (``settings.job_visibility_timeout``) that the pool
+  renews while the handler runs. A job whose lease lapses (its worker hung or
+  died) becomes claimable again.
+- ``recover()`` — called when the pool starts — requeues jobs left ``running`` by
+  a previous process.
+
+SQLite calls are short and run on the event loop thread under a lock.
+
+Deployment limits: the pool keeps working after ``POST /scan`` has answered, so
+Cloud Run must not throttle CPU between requests (``--no-cpu-throttling`` in
+``deploy.sh``); and the database is a file local to each instance, so a job is
+only visible to the instance that accepted it.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from ..config import settings
+
+logger = logging.getLogger("checkyourhospital.job_queue")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_expires_at REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, priority DESC, created_at);
+"""
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    payload: dict
+    priority: int
+    status: str
+    attempts: int
+    max_attempts: int
+    created_at: float
+    updated_at: float
+    result: dict | None = None
+    error: str | None = None
+
+    @property
+    def is_last_attempt(self) -> bool:
+        return self.attempts >= self.max_attempts
+
+    def to_dict(self) -> dict:
+        return {
+            "task_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "priority": self.priority,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+def _row_to_job(row: sqlite3.Row) -> Job:
+    return Job(
+        id=row["id"],
+        kind=row["kind"],
+        payload=json.loads(row["payload"]),
+        priority=row["priority"],
+        status=row["status"],
+        attempts=row["attempts"],
+        max_attempts=row["max_attempts"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+        result=json.loads(row["result"]) if row["result"] else None,
+        error=row["error"],
+    )
+
+
+class JobQueue:
+    def __init__(
+        self,
+        path: str,
+        *,
+        visibility_timeout: float | None = None,
+        max_attempts: int | None = None,
+        retry_backoff: float | None = None,
+    ):
+        self.path = path
+        self.visibility_timeout = visibility_timeout or settings.job_visibility_timeout
+        self.max_attempts = max_attempts or settings.job_max_attempts
+        self.retry_backoff = (
+            retry_backoff if retry_backoff is not None else settings.job_retry_backoff
+        )
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: dict,
+        *,
+        job_id: str | None = None,
+        priority: int = 0,
+        max_attempts: int | None = None,
+    ) -> str:
+        job_id = job_id or str(uuid.uuid4())
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, payload, priority, status, max_attempts,"
+                " available_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id, kind, json.dumps(payload), priority, QUEUED,
+                    max_attempts or self.max_attempts, now, now, now,
+                ),
+            )
+        return job_id
+
+    def claim(self) -> Job | None:
+        """Lease the next runnable job (queued and due, or running with a lapsed lease)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Lapsed leases on their last attempt are given up, not re-run
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, updated_at = ?"
+                    " WHERE status = ? AND lease_expires_at < ? AND attempts >= max_attempts",
+                    (FAILED, "visibility timeout exceeded", now, RUNNING, now),
+                )
+                row = self._conn.execute(
+                    "SELECT * FROM jobs"
+                    " WHERE (status = ? AND available_at <= ?)"
+                    " OR (status = ? AND lease_expires_at < ?)"
+                    " ORDER BY priority DESC, created_at LIMIT 1",
+                    (QUEUED, now, RUNNING, now),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1,"
+                    " lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                    (RUNNING, now + self.visibility_timeout, now, row["id"]),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        job = _row_to_job(row)
+        job.status = RUNNING
+        job.attempts += 1
+        return job
+
+    def heartbeat(self, job_id: str) -> None:
+        """Extend the lease of a running job."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (now + self.visibility_timeout, now, job_id, RUNNING),
+            )
+
+    def complete(self, job_id: str, result: dict | None = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL,"
+                " lease_expires_at = NULL, updated_at = ? WHERE id = ?",
+                (SUCCEEDED, json.dumps(result, default=str) if result else None, now, job_id),
+            )
+
+    def fail(self, job_id: str, error: str) -> str:
+        """Record a failed attempt. Returns the new status (queued for retry, or failed)."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return FAILED
+            if row["attempts"] >= row["max_attempts"]:
+                status, available_at = FAILED, now
+            else:
+                # Exponential backoff: base, 2x base, 4x base, ...
+                status = QUEUED
+                available_at = now + self.retry_backoff * 2 ** (row["attempts"] - 1)
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, available_at = ?,"
+                " lease_expires_at = NULL, updated_at = ? WHERE id = ?",
+                (status, error, available_at, now, job_id),
+            )
+        return status
+
+    def release(self, job_id: str) -> None:
+        """Hand a running job back untouched (worker shutdown) — the attempt is not counted."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = MAX(attempts - 1, 0), available_at = ?,"
+                " lease_expires_at = NULL, updated_at = ? WHERE id = ? AND status = ?",
+                (QUEUED, now, now, job_id, RUNNING),
+            )
+
+    def recover(self) -> int:
+        """Requeue jobs a previous process left running. Returns how many were requeued."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_expires_at = NULL, updated_at = ?"
+                " WHERE status = ? AND attempts >= max_attempts",
+                (FAILED, "interrupted by restart", now, RUNNING),
+            )
+            cur = self._conn.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, lease_expires_at = NULL,"
+                " updated_at = ? WHERE status = ?",
+                (QUEUED, now, now, RUNNING),
+            )
+        return cur.rowcount
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+            ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+
+_queue: JobQueue | None = None
+
+
+def get_job_queue() -> JobQueue:
+    """Process-wide queue at ``settings.job_queue_path`` (opened on first use)."""
+    global _queue
+    if _queue is None:
+        _queue = JobQueue(settings.job_queue_path)
+    return _queue
+
+
+JobHandler = Callable[[Job], Awaitable[dict | None]]
+
+
+class WorkerPool:
+    """``size`` async workers draining ``queue``; ``handlers`` maps job kind → coroutine."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: dict[str, JobHandler],
+        *,
+        size: int | None = None,
+        poll_interval: float = 1.0,
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.size = max(1, size or settings.job_workers)
+        self.poll_interval = poll_interval
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup: asyncio.Event | None = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        recovered = self.queue.recover()
+        if recovered:
+            logger.info("Requeued %d interrupted jobs", recovered)
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"job-worker-{i}")
+            for i in range(self.size)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers after an enqueue instead of waiting for the next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            try:
+                job = self.queue.claim()
+                if job is not None:
+                    await self._run(job)
+                    continue
+            except Exception:
+                # e.g. sqlite "database is locked": keep the worker, retry after a poll
+                logger.exception("Job worker %d hit a queue error", index)
+                await asyncio.sleep(self.poll_interval)
+                continue
+            assert self._wakeup is not None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except TimeoutError:
+                pass
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.queue.visibility_timeout / 3)
+            try:
+                self.queue.heartbeat(job_id)
+            except Exception:
+                # Keep beating: a lapsed lease would let another worker run the job again
+                logger.exception("Heartbeat for job %s failed", job_id)
+
+    async def _run(self, job: Job) -> None:
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            self.queue.fail(job.id, f"no handler for job kind {job.kind!r}")
+            return
+
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            result = await handler(job)
+        except asyncio.CancelledError:
+            # Shutdown mid-job: give it back for the next process
+            self.queue.release(job.id)
+            raise
+        except Exception as e:
+            status = self.queue.fail(job.id, f"{type(e).__name__}: {e}")
+            logger.warning(
+                "Job %s (%s) attempt %d/%d failed: %s -> %s",
+                job.id, job.kind, job.attempts, job.max_attempts, e, status,
+            )
+        else:
+            self.queue.complete(job.id, result)
+        finally:
+            heartbeat.cancel()
@@ -4,9 +4,8 @@ Extracts procedure names from crawled pages and generates search keywords
 with multilingual support and priority ranking.
 """
 
-import re
-
-from .procedure_completeness import PROCEDURE_KEYWORDS, PROCEDURE_LABELS, _extract_text
+from ..checks.parsed_page import ParsedPage, as_pages
+from .procedure_completeness import PROCEDURE_LABELS, _extract_text, _identify_procedures
 
 # Procedure popularity weights (estimated search volume)
 PROCEDURE_POPULARITY: dict[str, int] = {
@@ -68,25 +67,12 @@ PORTAL_BY_LANGUAGE: dict[str, list[str]] = {
     "zh": ["google", "baidu"],
 }
 
-# Precompiled patterns (reuse from procedure_completeness)
-_PROCEDURE_PATTERNS: dict[str, re.Pattern] = {
-    key: re.compile("|".join(re.escape(kw) for kw in keywords), re.I)
-    for key, keywords in PROCEDURE_KEYWORDS.items()
-}
-
-
-def _extract_procedures_from_pages(pages: list[dict]) -> list[str]:
+def _extract_procedures_from_pages(pages: list[dict] | list[ParsedPage]) -> list[str]:
     """Extract unique procedure keys found across all crawled pages."""
     found: set[str] = set()
-    for page in pages:
-        url = page.get("url", "")
-        html = page.get("html", "")
-        title = page.get("title", "")
-        text = _extract_text(html) if html else ""
-        combined = f"{url} {title} {text}"
-        for proc_key, pattern in _PROCEDURE_PATTERNS.items():
-            if pattern.search(combined):
-                found.add(proc_key)
+    for page in as_pages(pages):
+        text = _extract_text(page) if page.html else ""
+        found.update(_identify_procedures(page.url, page.title, text))
     return sorted(found)
 
 
@@ -189,7 +175,7 @@ def _generate_base_keywords(region: str) -> list[dict]:
 
 
 def extract_and_generate_keywords(
-    pages: list[dict],
+    pages: list[dict] | list[ParsedPage],
     region_name: str,
     hospital_name: str | None = None,
 ) -> dict:
@@ -202,7 +188,7 @@ def extract_and_generate_keywords(
         4. Sort by priority and select top 10
 
     Args:
-        pages: List of crawled page dicts with keys: url, html, (title optional)
+        pages: ParsedPage objects or crawled page dicts with keys: url, html
         region_name: Region name (e.g., "홍대", "강남/서초")
         hospital_name: Optional hospital name for branded keywords
 
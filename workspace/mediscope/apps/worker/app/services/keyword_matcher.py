@@ -0,0 +1,278 @@
+"""Single-pass multi-keyword matching (Aho-Corasick) for the keyword analyzers.
+
+Review sentiment, procedure completeness, the keyword engine, medical compliance
+and the tech stack detector each scanned the same text once per keyword or
+pattern — dozens to hundreds of passes per page. ``KeywordMatcher`` compiles any
+number of labelled literal dictionaries into one automaton and reports every hit
+(overlapping ones included) with its offsets in one linear pass.
+
+``RegexSet`` ports pattern lists onto the same engine: the literals each regex
+requires are matched by one automaton, a regex is only run when all of them
+occurred, and a regex that starts with a literal is only tried at those offsets.
+Its matches are exactly what ``pattern.finditer`` would return.
+
+Matching is case-insensitive (``str.lower`` per character, so offsets always
+refer to the original text), like the ``re.I`` searches it replaces.
+"""
+
+import re
+from collections import defaultdict, deque
+from collections.abc import Hashable, Iterable, Iterator, Mapping
+from typing import NamedTuple
+
+
+class Hit(NamedTuple):
+    start: int
+    end: int
+    label: Hashable
+
+
+def _fold(text: str) -> str:
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    # A few characters lower-case to two ('İ' → 'i̇'); keep those as-is so
+    # offsets stay aligned with the original text
+    return "".join(c if len(low := c.lower()) != 1 else low for c in text)
+
+
+class KeywordMatcher:
+    def __init__(self, entries: Iterable[tuple[str, Hashable]], *, ignore_case: bool = True):
+        """``entries`` are ``(keyword, label)`` pairs; a keyword may carry several labels."""
+        self.ignore_case = ignore_case
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[tuple[int, Hashable]]] = [[]]
+        self.keywords = 0
+        for keyword, label in entries:
+            if not keyword:
+                continue
+            state = 0
+            for ch in _fold(keyword) if ignore_case else keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append((len(keyword), label))
+            self.keywords += 1
+
+        # Failure links in BFS order, folded into a DFA: every state's transition
+        # table already includes the ones inherited through its failure chain
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [dict(goto[0])] + [{}] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            if fail[state]:
+                outputs[state] = outputs[state] + outputs[fail[state]]
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                queue.append(nxt)
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+
+    @classmethod
+    def from_groups(cls, groups: Mapping[Hashable, Iterable[str]], **kwargs) -> "KeywordMatcher":
+        """Matcher over ``{label: [keyword, ...]}``."""
+        return cls(((kw, label) for label, keywords in groups.items() for kw in keywords), **kwargs)
+
+    def __len__(self) -> int:
+        return self.keywords
+
+    def iter_hits(self, text: str) -> Iterator[Hit]:
+        """Every keyword occurrence, ordered by end offset."""
+        delta, outputs = self._delta, self._outputs
+        state = 0
+        for end, ch in enumerate(_fold(text) if self.ignore_case else text, 1):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for length, label in outputs[state]:
+                    yield Hit(end - length, end, label)
+
+    def hits(self, text: str) -> list[Hit]:
+        return list(self.iter_hits(text))
+
+    def labels(self, text: str) -> set:
+        """Labels with at least one hit in ``text``."""
+        return {hit.label for hit in self.iter_hits(text)}
+
+
+def non_overlapping(hits: Iterable[Hit]) -> list[Hit]:
+    """Leftmost-longest, non-overlapping subset of ``hits`` — what a regex
+    alternation's ``finditer`` would report for the same keywords."""
+    result: list[Hit] = []
+    last_end = 0
+    for hit in sorted(hits, key=lambda h: (h.start, -h.end)):
+        if hit.start >= last_end:
+            result.append(hit)
+            last_end = hit.end
+    return result
+
+
+# -- Regexes gated by their literals ---------------------------------------------
+
+
+class Literals(NamedTuple):
+    atoms: list[str]  # substrings every match contains, in order
+    leading: bool  # the pattern starts with atoms[0]
+    exact: bool  # the pattern is just atoms[0]
+
+
+_NO_LITERALS = Literals([], False, False)
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def required_literals(pattern: str) -> Literals:
+    """Literal runs of ``pattern`` that any match must contain.
+
+    Conservative: parsing stops at the first group or character class, and a
+    pattern with top-level alternation requires nothing.
+    """
+    if _has_top_level_alternation(pattern):
+        return _NO_LITERALS
+    atoms: list[str] = []
+    leading = False
+    cur: list[str] = []
+    cur_start = 0
+    complete = True
+
+    def flush() -> None:
+        nonlocal leading
+        if cur:
+            if not atoms and cur_start == 0:
+                leading = True
+            atoms.append("".join(cur))
+            cur.clear()
+
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if not cur:
+            cur_start = i
+        if c == "\\" and i + 1 < len(pattern):
+            nxt = pattern[i + 1]
+            if nxt.isalnum():  # \s \w \d \b …: not a literal
+                flush()
+                complete = False
+            else:
+                cur.append(nxt)
+            i += 2
+        elif c in "*?{":
+            if cur:
+                cur.pop()  # the quantified character is optional
+            flush()
+            complete = False
+            i = pattern.find("}", i) + 1 if c == "{" else i + 1
+            if i == 0:
+                break
+        elif c in "+.^$":
+            flush()
+            complete = False
+            i += 1
+        elif c in "([":
+            complete = False
+            break
+        else:
+            cur.append(c)
+            i += 1
+    flush()
+    exact = complete and leading and len(atoms) == 1
+    return Literals(atoms, leading, exact)
+
+
+class RegexSet:
+    """Labelled regex lists evaluated off one ``KeywordMatcher`` pass."""
+
+    def __init__(self, groups: Mapping[Hashable, Iterable[re.Pattern]]):
+        self.groups: dict[Hashable, list[re.Pattern]] = {
+            label: list(ps) for label, ps in groups.items()
+        }
+        self._patterns: list[tuple[Hashable, re.Pattern, Literals]] = []
+        entries: list[tuple[str, tuple[int, int]]] = []
+        for label, patterns in self.groups.items():
+            for pattern in patterns:
+                idx = len(self._patterns)
+                literals = required_literals(pattern.pattern)
+                if literals.exact and not pattern.flags & re.IGNORECASE:
+                    literals = literals._replace(exact=False)  # confirm the case
+                self._patterns.append((label, pattern, literals))
+                entries.extend((atom, (idx, n)) for n, atom in enumerate(literals.atoms))
+        self.matcher = KeywordMatcher(entries)
+
+    def _scan(self, text: str) -> dict[tuple[int, int], list[int]]:
+        positions: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for start, _end, key in self.matcher.iter_hits(text):
+            positions[key].append(start)
+        return positions
+
+    def _matches(self, idx: int, text: str, positions: dict) -> Iterator[re.Match]:
+        _label, pattern, literals = self._patterns[idx]
+        if not literals.atoms:
+            yield from pattern.finditer(text)
+            return
+        if any((idx, n) not in positions for n in range(len(literals.atoms))):
+            return
+        if not literals.leading:
+            yield from pattern.finditer(text)
+            return
+        # Every match starts at an occurrence of the leading literal
+        last_end = 0
+        for pos in sorted(positions[(idx, 0)]):
+            if pos < last_end:
+                continue
+            m = pattern.match(text, pos)
+            if m:
+                last_end = m.end()
+                yield m
+
+    def matches(self, text: str) -> dict[Hashable, list[re.Match]]:
+        """``{label: matches}`` in pattern order, each pattern's matches in text order."""
+        positions = self._scan(text)
+        found: dict[Hashable, list[re.Match]] = {}
+        for idx, (label, _pattern, _literals) in enumerate(self._patterns):
+            matches = list(self._matches(idx, text, positions))
+            if matches:
+                found.setdefault(label, []).extend(matches)
+        return found
+
+    def labels(self, text: str, known: Iterable[Hashable] = ()) -> set:
+        """Labels with at least one matching pattern. Labels in ``known`` are
+        already confirmed (by the caller) and are not evaluated again."""
+        found = set(known)
+        if found >= self.groups.keys():
+            return found
+        positions = self._scan(text)
+        for idx, (label, pattern, literals) in enumerate(self._patterns):
+            if label in found:
+                continue
+            if literals.exact:
+                if (idx, 0) in positions:
+                    found.add(label)
+            elif next(self._matches(idx, text, positions), None) is not None:
+                found.add(label)
+        return found
@@ -0,0 +1,228 @@
+"""Local lab measurement of LCP / CLS / TBT with the pooled headless Chromium.
+
+Used by ``check_performance`` when PageSpeed Insights is unavailable (or
+instead of it, see ``settings.lab_metrics_mode``). A page is loaded in a fresh
+context from the shared ``BrowserPool`` under a throttling profile modelled on
+Lighthouse's (network via CDP ``Network.emulateNetworkConditions``, CPU via
+``Emulation.setCPUThrottlingRate``), and Web Vitals are collected by
+``PerformanceObserver``s installed before any page script runs.
+
+Every request the page makes goes through the SSRF policy first, so a scanned
+site cannot point the browser at internal addresses. Results are cached per
+``(url, profile)`` for ``lab_metrics_cache_ttl`` seconds.
+
+TBT stands in for INP, as in Lighthouse: INP needs real interactions.
+"""
+
+import asyncio
+import logging
+import math
+from dataclasses import asdict, dataclass
+
+from ..config import settings
+from ..security.ssrf import SSRFError, validate_url_async
+from .browser_pool import get_browser_pool
+from .ttl_cache import MISSING, TTLCache
+
+logger = logging.getLogger("checkyourhospital.lab_metrics")
+
+
+@dataclass(frozen=True)
+class ThrottleProfile:
+    latency_ms: float
+    download_kbps: float
+    upload_kbps: float
+    cpu_slowdown: float
+    viewport: tuple[int, int]
+    mobile: bool
+
+
+# Lighthouse defaults: "slow 4G" + 4x CPU for mobile, cable-ish for desktop
+PROFILES: dict[str, ThrottleProfile] = {
+    "mobile": ThrottleProfile(
+        latency_ms=150, download_kbps=1638.4, upload_kbps=750, cpu_slowdown=4,
+        viewport=(412, 823), mobile=True,
+    ),
+    "desktop": ThrottleProfile(
+        latency_ms=40, download_kbps=10240, upload_kbps=10240, cpu_slowdown=1,
+        viewport=(1350, 940), mobile=False,
+    ),
+}
+
+
+@dataclass
+class LabMetrics:
+    url: str
+    profile: str
+    fcp_ms: float | None
+    lcp_ms: float | None
+    cls: float | None
+    tbt_ms: float | None
+    transfer_bytes: int | None
+    requests: int | None
+    blocked_requests: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# Installed before page scripts. CLS uses session windows (≤1s gap, ≤5s long)
+# like web-vitals; TBT sums long-task time beyond 50ms after FCP.
+_OBSERVER_SCRIPT = """
+(() => {
+  const m = window.__labMetrics = {fcp: null, lcp: null, cls: 0, tbt: 0, longTasks: []};
+  let win = 0, winStart = 0, winLast = 0;
+  const observe = (type, cb) => {
+    try {
+      new PerformanceObserver(l => l.getEntries().forEach(cb)).observe({type, buffered: true});
+    } catch (e) {}
+  };
+  observe('paint', e => { if (e.name === 'first-contentful-paint') m.fcp = e.startTime; });
+  observe('largest-contentful-paint', e => { m.lcp = e.startTime; });
+  observe('layout-shift', e => {
+    if (e.hadRecentInput) return;
+    if (win && e.startTime - winLast < 1000 && e.startTime - winStart < 5000) {
+      win += e.value;
+    } else {
+      win = e.value; winStart = e.startTime;
+    }
+    winLast = e.startTime;
+    m.cls = Math.max(m.cls, win);
+  });
+  observe('longtask', e => { m.longTasks.push([e.startTime, e.duration]); });
+})();
+"""
+
+_COLLECT_SCRIPT = """
+() => {
+  const m = window.__labMetrics || {};
+  const fcp = m.fcp || 0;
+  const tbt = (m.longTasks || []).reduce(
+    (sum, [start, dur]) => start + dur > fcp ? sum + Math.max(0, dur - 50) : sum, 0);
+  const nav = performance.getEntriesByType('navigation')[0];
+  const res = performance.getEntriesByType('resource');
+  const bytes = res.reduce((s, r) => s + (r.transferSize || 0), nav ? nav.transferSize || 0 : 0);
+  return {fcp: m.fcp, lcp: m.lcp, cls: m.cls, tbt, bytes, requests: res.length + 1};
+}
+"""
+
+_cache = TTLCache(max_entries=512, ttl=settings.lab_metrics_cache_ttl)
+
+
+def lab_metrics_stats() -> dict:
+    return _cache.stats()
+
+
+def clear_lab_metrics_cache() -> None:
+    _cache.clear()
+
+
+async def _throttle(context, page, profile: ThrottleProfile) -> None:
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Network.enable")
+    await cdp.send(
+        "Network.emulateNetworkConditions",
+        {
+            "offline": False,
+            "latency": profile.latency_ms,
+            "downloadThroughput": profile.download_kbps * 1024 / 8,
+            "uploadThroughput": profile.upload_kbps * 1024 / 8,
+        },
+    )
+    await cdp.send("Emulation.setCPUThrottlingRate", {"rate": profile.cpu_slowdown})
+
+
+async def _measure(url: str, profile_name: str, timeout: float) -> LabMetrics:
+    profile = PROFILES[profile_name]
+    blocked = 0
+
+    async def guard(route):
+        nonlocal blocked
+        try:
+            await validate_url_async(route.request.url)
+        except SSRFError:
+            blocked += 1
+            await route.abort("blockedbyclient")
+            return
+        await route.continue_()
+
+    width, height = profile.viewport
+    async with get_browser_pool().context(
+        viewport={"width": width, "height": height},
+        is_mobile=profile.mobile,
+        has_touch=profile.mobile,
+        service_workers="block",
+    ) as context:
+        await context.route(lambda u: u.startswith(("http://", "https://")), guard)
+        await context.add_init_script(_OBSERVER_SCRIPT)
+        page = await context.new_page()
+        await _throttle(context, page, profile)
+        await page.goto(url, wait_until="load", timeout=timeout * 1000)
+        # Let late LCP candidates, shifts and long tasks land
+        try:
+            await page.wait_for_load_state(
+                "networkidle", timeout=settings.lab_metrics_settle * 1000
+            )
+        except Exception:
+            pass
+        raw = await page.evaluate(_COLLECT_SCRIPT)
+
+    return LabMetrics(
+        url=url,
+        profile=profile_name,
+        fcp_ms=raw.get("fcp"),
+        lcp_ms=raw.get("lcp"),
+        cls=raw.get("cls"),
+        tbt_ms=raw.get("tbt"),
+        transfer_bytes=raw.get("bytes"),
+        requests=raw.get("requests"),
+        blocked_requests=blocked,
+    )
+
+
+async def measure_lab_metrics(url: str, profile: str | None = None) -> LabMetrics:
+    """Lab metrics for ``url`` (cached). Raises on SSRF, navigation or browser errors."""
+    profile = profile or settings.lab_metrics_profile
+    key = (url, profile)
+    cached = _cache.get(key)
+    if cached is not MISSING:
+        return cached
+    await validate_url_async(url)
+    metrics = await asyncio.wait_for(
+        _measure(url, profile, settings.lab_metrics_timeout), settings.lab_metrics_timeout + 5
+    )
+    _cache.set(key, metrics)
+    return metrics
+
+
+# Lighthouse v10 scoring: (p10, median) of each metric's log-normal curve, weights
+_CURVES = {
+    "mobile": {
+        "fcp_ms": (1800, 3000), "lcp_ms": (2500, 4000), "tbt_ms": (200, 600), "cls": (0.1, 0.25),
+    },
+    "desktop": {
+        "fcp_ms": (934, 1600), "lcp_ms": (1200, 2400), "tbt_ms": (150, 350), "cls": (0.1, 0.25),
+    },
+}
+# Speed Index (10) is not measured
+_SCORE_WEIGHTS = {"fcp_ms": 10, "lcp_ms": 25, "tbt_ms": 30, "cls": 25}
+
+
+def _log_normal_score(value: float, p10: float, median: float) -> float:
+    if value <= 0:
+        return 1.0
+    standardized = math.log(value / median) * 0.9062938208 / -math.log(p10 / median)
+    return max(0.0, min(1.0, (1 - math.erf(standardized)) / 2))
+
+
+def lab_performance_score(metrics: LabMetrics) -> float | None:
+    """Lighthouse-style 0-100 score from the measured metrics (re-weighted without SI)."""
+    curves = _CURVES.get(metrics.profile, _CURVES["mobile"])
+    total = weight_sum = 0.0
+    for name, weight in _SCORE_WEIGHTS.items():
+        value = getattr(metrics, name)
+        if value is None:
+            continue
+        total += _log_normal_score(value, *curves[name]) * weight
+        weight_sum += weight
+    return round(total / weight_sum * 100, 1) if weight_sum else None
@@ -3,7 +3,8 @@
 import re
 from collections import defaultdict
 
-from bs4 import BeautifulSoup
+from ..checks.parsed_page import ParsedPage, as_page, as_pages
+from .keyword_matcher import RegexSet
 
 # Page type classification (reuse patterns from multilingual_analyzer)
 _PROCEDURE_RE = re.compile(
@@ -127,25 +128,45 @@ _PRIVACY_KEYWORDS = [
     re.compile(r"個人情報", re.I),
 ]
 
+# Before/After consent (KR) and explanation (JP) checks
+_KR_BEFORE_AFTER = [re.compile(r"before.*after", re.I), re.compile(r"전후")]
+_KR_CONSENT = [re.compile(r"동의"), re.compile(r"consent", re.I)]
+_JP_EXPLANATION = [
+    re.compile(r"治療内容", re.I),
+    re.compile(r"リスク", re.I),
+    re.compile(r"費用", re.I),
+    re.compile(r"期間", re.I),
+]
+
+# Every page-text pattern list, evaluated from one keyword-matcher pass per page
+_PAGE_PATTERNS = RegexSet({
+    **{f"kr_{rule}": patterns for rule, patterns in KR_PROHIBITED.items()},
+    "kr_disclosure": KR_REQUIRED_DISCLOSURES,
+    "kr_before_after": _KR_BEFORE_AFTER,
+    "kr_consent": _KR_CONSENT,
+    "jp_testimonial": JP_TESTIMONIAL,
+    "jp_comparison": JP_COMPARISON,
+    "jp_before_after": JP_BEFORE_AFTER,
+    "jp_explanation": _JP_EXPLANATION,
+    "privacy": _PRIVACY_KEYWORDS,
+})
+
 # Language detection helpers
 _HANGUL_RE = re.compile(r"[\uAC00-\uD7A3]")
 _HIRAGANA_RE = re.compile(r"[\u3040-\u309F]")
 _KATAKANA_RE = re.compile(r"[\u30A0-\u30FF]")
 
 
-def _extract_text(html: str) -> str:
+def _extract_text(html: str | ParsedPage) -> str:
     """Extract visible text from HTML."""
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    return soup.get_text(separator=" ", strip=True)
+    return as_page(html).text
 
 
-def _is_procedure_page(url: str, html: str) -> bool:
+def _is_procedure_page(url: str, html: str | ParsedPage) -> bool:
     """Check if a page is a procedure/treatment page."""
-    soup = BeautifulSoup(html, "html.parser")
-    title = soup.title.string if soup.title else ""
-    text_sample = _extract_text(html)[:500]
+    page = as_page(html)
+    title = page.title
+    text_sample = _extract_text(page)[:500]
     return bool(
         _PROCEDURE_RE.search(url)
         or _PROCEDURE_RE.search(title or "")
@@ -153,17 +174,16 @@ def _is_procedure_page(url: str, html: str) -> bool:
     )
 
 
-def _is_review_page(url: str, html: str) -> bool:
+def _is_review_page(url: str, html: str | ParsedPage) -> bool:
     """Check if a page is a review/testimonial page."""
-    soup = BeautifulSoup(html, "html.parser")
-    title = soup.title.string if soup.title else ""
+    title = as_page(html).title
     return bool(
         _REVIEW_RE.search(url)
         or _REVIEW_RE.search(title or "")
     )
 
 
-def _detect_page_lang(html: str) -> str:
+def _detect_page_lang(html: str | ParsedPage) -> str:
     """Detect primary language of a page (ko/ja/other)."""
     text = _extract_text(html)[:2000]
     hangul = len(_HANGUL_RE.findall(text))
@@ -175,22 +195,26 @@ def _detect_page_lang(html: str) -> str:
     return "other"
 
 
-def _find_pattern_matches(
-    text: str, patterns: list[re.Pattern], max_context: int = 30,
-) -> list[str]:
-    """Find pattern matches with surrounding context."""
-    matches: list[str] = []
-    for pattern in patterns:
-        for m in pattern.finditer(text):
-            start = max(0, m.start() - max_context)
-            end = min(len(text), m.end() + max_context)
-            context = text[start:end].strip()
-            if context not in matches:
-                matches.append(context)
-    return matches
+def _scan_pages(pages: list[ParsedPage]) -> list[dict[str, list[re.Match]]]:
+    """``_PAGE_PATTERNS`` matches for each page's visible text."""
+    return [_PAGE_PATTERNS.matches(_extract_text(page)) for page in pages]
+
 
+def _match_contexts(text: str, matches: list[re.Match], max_context: int = 30) -> list[str]:
+    """Unique match snippets with surrounding context."""
+    contexts: list[str] = []
+    for m in matches:
+        start = max(0, m.start() - max_context)
+        end = min(len(text), m.end() + max_context)
+        context = text[start:end].strip()
+        if context not in contexts:
+            contexts.append(context)
+    return contexts
 
-def _check_kr_violations(pages: list[dict]) -> tuple[list[dict], list[dict], list[dict]]:
+
+def _check_kr_violations(
+    pages: list[ParsedPage], scans: list[dict] | None = None,
+) -> tuple[list[dict], list[dict], list[dict]]:
     """Check Korean medical advertising violations."""
     violations: list[dict] = []
     warnings: list[dict] = []
@@ -199,21 +223,20 @@ def _check_kr_violations(pages: list[dict]) -> tuple[list[dict], list[dict], lis
     procedure_pages_checked = 0
     procedure_pages_with_disclosure = 0
 
-    for page in pages:
-        url = page["url"]
-        html = page["html"]
-        text = _extract_text(html)
-        lang = _detect_page_lang(html)
+    for page, found in zip(pages, scans or _scan_pages(pages)):
+        url = page.url
+        text = _extract_text(page)
+        lang = _detect_page_lang(page)
 
         # Only check Korean-language pages for KR rules
         if lang != "ko":
             continue
 
         # Check prohibited expressions
-        for rule_key, patterns in KR_PROHIBITED.items():
+        for rule_key in KR_PROHIBITED:
             full_rule = f"kr_{rule_key}"
             meta = _RULE_META.get(full_rule, {})
-            matches = _find_pattern_matches(text, patterns)
+            matches = _match_contexts(text, found.get(full_rule, []))
             for match_text in matches:
                 severity = "high" if rule_key == "exaggeration" else "medium"
                 violations.append({
@@ -226,9 +249,9 @@ def _check_kr_violations(pages: list[dict]) -> tuple[list[dict], list[dict], lis
                 })
 
         # Check procedure pages for required disclosures
-        if _is_procedure_page(url, html):
+        if _is_procedure_page(url, page):
             procedure_pages_checked += 1
-            has_disclosure = any(p.search(text) for p in KR_REQUIRED_DISCLOSURES)
+            has_disclosure = "kr_disclosure" in found
             if has_disclosure:
                 procedure_pages_with_disclosure += 1
                 compliant.append({
@@ -248,21 +271,17 @@ def _check_kr_violations(pages: list[dict]) -> tuple[list[dict], list[dict], lis
                 })
 
         # Check Before/After pages
-        if _is_review_page(url, html):
-            ba_patterns = [re.compile(r"before.*after", re.I), re.compile(r"전후")]
-            if any(p.search(text) for p in ba_patterns):
-                consent_keywords = [re.compile(r"동의"), re.compile(r"consent", re.I)]
-                has_consent = any(p.search(text) for p in consent_keywords)
-                if not has_consent:
-                    meta = _RULE_META["kr_before_after"]
-                    warnings.append({
-                        "severity": "medium",
-                        "rule": "kr_before_after",
-                        "text": "Before/After 사진에 동의 관련 고지가 확인되지 않음",
-                        "url": url,
-                        "law": meta["law"],
-                        "description": meta["description"],
-                    })
+        if _is_review_page(url, page):
+            if "kr_before_after" in found and "kr_consent" not in found:
+                meta = _RULE_META["kr_before_after"]
+                warnings.append({
+                    "severity": "medium",
+                    "rule": "kr_before_after",
+                    "text": "Before/After 사진에 동의 관련 고지가 확인되지 않음",
+                    "url": url,
+                    "law": meta["law"],
+                    "description": meta["description"],
+                })
 
     # Summary compliant items
     if procedure_pages_checked > 0 and procedure_pages_with_disclosure == procedure_pages_checked:
@@ -274,23 +293,24 @@ def _check_kr_violations(pages: list[dict]) -> tuple[list[dict], list[dict], lis
     return violations, warnings, compliant
 
 
-def _check_jp_violations(pages: list[dict]) -> tuple[list[dict], list[dict], list[dict]]:
+def _check_jp_violations(
+    pages: list[ParsedPage], scans: list[dict] | None = None,
+) -> tuple[list[dict], list[dict], list[dict]]:
     """Check Japanese medical advertising violations."""
     violations: list[dict] = []
     warnings: list[dict] = []
     compliant: list[dict] = []
 
-    for page in pages:
-        url = page["url"]
-        html = page["html"]
-        text = _extract_text(html)
-        lang = _detect_page_lang(html)
+    for page, found in zip(pages, scans or _scan_pages(pages)):
+        url = page.url
+        text = _extract_text(page)
+        lang = _detect_page_lang(page)
 
         if lang != "ja":
             continue
 
         # Check testimonial usage
-        matches = _find_pattern_matches(text, JP_TESTIMONIAL)
+        matches = _match_contexts(text, found.get("jp_testimonial", []))
         for match_text in matches:
             meta = _RULE_META["jp_testimonial"]
             violations.append({
@@ -303,7 +323,7 @@ def _check_jp_violations(pages: list[dict]) -> tuple[list[dict], list[dict], lis
             })
 
         # Check comparison ads
-        matches = _find_pattern_matches(text, JP_COMPARISON)
+        matches = _match_contexts(text, found.get("jp_comparison", []))
         for match_text in matches:
             meta = _RULE_META["jp_comparison"]
             warnings.append({
@@ -316,16 +336,10 @@ def _check_jp_violations(pages: list[dict]) -> tuple[list[dict], list[dict], lis
             })
 
         # Check Before/After without explanation
-        if _is_procedure_page(url, html) or _is_review_page(url, html):
-            ba_matches = _find_pattern_matches(text, JP_BEFORE_AFTER)
-            if ba_matches:
-                explanation_re = [
-                    re.compile(r"治療内容", re.I),
-                    re.compile(r"リスク", re.I),
-                    re.compile(r"費用", re.I),
-                    re.compile(r"期間", re.I),
-                ]
-                has_explanation = sum(1 for p in explanation_re if p.search(text)) >= 2
+        if _is_procedure_page(url, page) or _is_review_page(url, page):
+            if "jp_before_after" in found:
+                # At least two of the explanation patterns
+                has_explanation = len({m.re for m in found.get("jp_explanation", [])}) >= 2
                 if not has_explanation:
                     meta = _RULE_META["jp_before_after"]
                     warnings.append({
@@ -346,7 +360,9 @@ def _check_jp_violations(pages: list[dict]) -> tuple[list[dict], list[dict], lis
     return violations, warnings, compliant
 
 
-def _check_global_compliance(pages: list[dict]) -> tuple[list[dict], list[dict], list[dict]]:
+def _check_global_compliance(
+    pages: list[ParsedPage], scans: list[dict] | None = None,
+) -> tuple[list[dict], list[dict], list[dict]]:
     """Check global compliance items."""
     violations: list[dict] = []
     warnings: list[dict] = []
@@ -354,13 +370,9 @@ def _check_global_compliance(pages: list[dict]) -> tuple[list[dict], list[dict],
 
     # Check privacy policy presence in multiple languages
     privacy_langs: set[str] = set()
-    for page in pages:
-        text = _extract_text(page["html"])
-        for kw in _PRIVACY_KEYWORDS:
-            if kw.search(text):
-                lang = _detect_page_lang(page["html"])
-                privacy_langs.add(lang)
-                break
+    for page, found in zip(pages, scans or _scan_pages(pages)):
+        if "privacy" in found:
+            privacy_langs.add(_detect_page_lang(page))
 
     if not privacy_langs:
         meta = _RULE_META["global_privacy"]
@@ -368,7 +380,7 @@ def _check_global_compliance(pages: list[dict]) -> tuple[list[dict], list[dict],
             "severity": "medium",
             "rule": "global_privacy",
             "text": "개인정보 처리방침을 찾을 수 없습니다",
-            "url": pages[0]["url"] if pages else "",
+            "url": pages[0].url if pages else "",
             "law": meta["law"],
             "description": meta["description"],
         })
@@ -378,7 +390,7 @@ def _check_global_compliance(pages: list[dict]) -> tuple[list[dict], list[dict],
             "severity": "low",
             "rule": "global_privacy",
             "text": f"개인정보 처리방침이 {len(privacy_langs)}개 언어에서만 확인됨",
-            "url": pages[0]["url"] if pages else "",
+            "url": pages[0].url if pages else "",
             "law": meta["law"],
             "description": meta["description"],
         })
@@ -478,12 +490,12 @@ def _generate_recommendations(
     return recs
 
 
-def check_medical_compliance(pages: list[dict]) -> dict:
+def check_medical_compliance(pages: list[dict] | list[ParsedPage]) -> dict:
     """
     Check crawled pages for medical advertising regulation violations.
 
     Args:
-        pages: List of dicts with keys: url, html
+        pages: ParsedPage objects or dicts with keys: url, html
 
     Returns:
         Compliance analysis result with violations, warnings, scores by country.
@@ -502,10 +514,13 @@ def check_medical_compliance(pages: list[dict]) -> dict:
             "recommendations": [],
         }
 
+    pages = as_pages(pages)
+    scans = _scan_pages(pages)
+
     # Run checks by country
-    kr_violations, kr_warnings, kr_compliant = _check_kr_violations(pages)
-    jp_violations, jp_warnings, jp_compliant = _check_jp_violations(pages)
-    gl_violations, gl_warnings, gl_compliant = _check_global_compliance(pages)
+    kr_violations, kr_warnings, kr_compliant = _check_kr_violations(pages, scans)
+    jp_violations, jp_warnings, jp_compliant = _check_jp_violations(pages, scans)
+    gl_violations, gl_warnings, gl_compliant = _check_global_compliance(pages, scans)
 
     all_violations = kr_violations + jp_violations + gl_violations
     all_warnings = kr_warnings + jp_warnings + gl_warnings
@@ -6,7 +6,8 @@ from datetime import datetime, timedelta, timezone
 import httpx
 
 from ..config import settings
-from ..db.supabase import get_supabase_client
+from ..db.repository import eq, get_repository, lt
+from .http_clients import get_client
 from .scanner import run_scan
 
 logger = logging.getLogger("checkyourhospital.monitoring")
@@ -25,8 +26,8 @@ async def create_subscription(
     name: str,
     frequency: str = "weekly",
 ) -> dict | None:
-    client = get_supabase_client()
-    if client is None:
+    repo = get_repository()
+    if repo is None:
         return None
 
     now = datetime.now(timezone.utc).isoformat()
@@ -42,24 +43,21 @@ async def create_subscription(
         "next_scan_at": next_scan_at,
         "created_at": now,
     }
-    result = client.table("subscriptions").insert(row).execute()
-    return result.data[0] if result.data else None
+    rows = await repo.insert("subscriptions", row)
+    return rows[0] if rows else None
 
 
 async def get_due_subscriptions() -> list[dict]:
-    client = get_supabase_client()
-    if client is None:
+    repo = get_repository()
+    if repo is None:
         return []
 
     now = datetime.now(timezone.utc).isoformat()
-    result = (
-        client.table("subscriptions")
-        .select("*, hospitals(url)")
-        .eq("status", "active")
-        .lt("next_scan_at", now)
-        .execute()
+    return await repo.select(
+        "subscriptions",
+        "*, hospitals(url)",
+        [eq("status", "active"), lt("next_scan_at", now)],
     )
-    return result.data or []
 
 
 async def record_score_history(
@@ -69,8 +67,8 @@ async def record_score_history(
     grade: str,
     category_scores: dict,
 ) -> dict | None:
-    client = get_supabase_client()
-    if client is None:
+    repo = get_repository()
+    if repo is None:
         return None
 
     row = {
@@ -81,8 +79,8 @@ async def record_score_history(
         "category_scores": category_scores,
         "scanned_at": datetime.now(timezone.utc).isoformat(),
     }
-    result = client.table("score_history").insert(row).execute()
-    return result.data[0] if result.data else None
+    rows = await repo.insert("score_history", row)
+    return rows[0] if rows else None
 
 
 async def create_alert(
@@ -93,8 +91,8 @@ async def create_alert(
     prev_score: float | None,
     new_score: float,
 ) -> dict | None:
-    client = get_supabase_client()
-    if client is None:
+    repo = get_repository()
+    if repo is None:
         return None
 
     row = {
@@ -106,8 +104,8 @@ async def create_alert(
         "new_score": int(round(new_score)),
         "created_at": datetime.now(timezone.utc).isoformat(),
     }
-    result = client.table("alerts").insert(row).execute()
-    return result.data[0] if result.data else None
+    rows = await repo.insert("alerts", row)
+    return rows[0] if rows else None
 
 
 async def send_alert_email(
@@ -159,21 +157,21 @@ async def send_alert_email(
     """
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.post(
-                "https://api.resend.com/emails",
-                headers={"Authorization": f"Bearer {settings.resend_api_key}"},
-                json={
-                    "from": "CheckYourHospital <noreply@checkyourhospital.com>",
-                    "to": email,
-                    "subject": f"[CheckYourHospital] {hospital_name} 점수 변동 알림",
-                    "html": html_body,
-                },
-            )
-            if resp.status_code >= 400:
-                logger.warning(f"Resend API error {resp.status_code}: {resp.text}")
-                return False
-            return True
+        client = get_client("resend")
+        resp = await client.post(
+            "https://api.resend.com/emails",
+            headers={"Authorization": f"Bearer {settings.resend_api_key}"},
+            json={
+                "from": "CheckYourHospital <noreply@checkyourhospital.com>",
+                "to": email,
+                "subject": f"[CheckYourHospital] {hospital_name} 점수 변동 알림",
+                "html": html_body,
+            },
+        )
+        if resp.status_code >= 400:
+            logger.warning(f"Resend API error {resp.status_code}: {resp.text}")
+            return False
+        return True
     except httpx.HTTPError as exc:
         logger.warning(f"Failed to send alert email: {exc}")
         return False
@@ -188,20 +186,19 @@ async def process_subscription(subscription: dict) -> dict:
         logger.warning(f"No URL for hospital {hospital_id}, skipping")
         return {"status": "skipped", "reason": "no_url"}
 
-    client = get_supabase_client()
+    repo = get_repository()
 
     # Get previous score and grade
-    prev_record = (
-        client.table("score_history")
-        .select("total_score, grade, category_scores")
-        .eq("hospital_id", hospital_id)
-        .order("scanned_at", desc=True)
-        .limit(1)
-        .execute()
+    prev_record = await repo.select_one(
+        "score_history",
+        "total_score, grade, category_scores",
+        [eq("hospital_id", hospital_id)],
+        order="scanned_at",
+        desc=True,
     )
-    prev_score = prev_record.data[0]["total_score"] if prev_record.data else None
-    prev_grade = prev_record.data[0].get("grade", "") if prev_record.data else ""
-    prev_category_scores = prev_record.data[0].get("category_scores", {}) if prev_record.data else {}
+    prev_score = prev_record["total_score"] if prev_record else None
+    prev_grade = prev_record.get("grade", "") if prev_record else ""
+    prev_category_scores = prev_record.get("category_scores", {}) if prev_record else {}
 
     # Run scan
     result = await run_scan(hospital_url)
@@ -254,9 +251,9 @@ async def process_subscription(subscription: dict) -> dict:
     frequency = subscription.get("frequency", "weekly")
     hours = FREQUENCY_HOURS.get(frequency, 168)
     next_scan_at = (datetime.now(timezone.utc) + timedelta(hours=hours)).isoformat()
-    client.table("subscriptions").update(
-        {"next_scan_at": next_scan_at}
-    ).eq("id", subscription_id).execute()
+    await repo.update(
+        "subscriptions", {"next_scan_at": next_scan_at}, [eq("id", subscription_id)]
+    )
 
     logger.info(
         f"Subscription {subscription_id} processed: "
@@ -5,8 +5,7 @@ import unicodedata
 from collections import defaultdict
 from urllib.parse import urlparse
 
-from bs4 import BeautifulSoup
-
+from ..checks.parsed_page import ParsedPage, as_page, as_pages
 
 # Language detection via URL path patterns
 _LANG_PATH_RE = re.compile(
@@ -86,13 +85,9 @@ def _detect_lang_from_url(url: str) -> str | None:
     return None
 
 
-def _detect_lang_from_content(html: str) -> str:
+def _detect_lang_from_content(html: str | ParsedPage) -> str:
     """Detect primary language from HTML content using character frequency analysis."""
-    soup = BeautifulSoup(html, "html.parser")
-    # Remove script/style
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    text = soup.get_text(separator=" ", strip=True)
+    text = as_page(html).text
 
     if not text:
         return "ko"  # default
@@ -124,18 +119,15 @@ def _detect_lang_from_content(html: str) -> str:
     return "ko"
 
 
-def _detect_lang_from_html_tag(html: str) -> str | None:
+def _detect_lang_from_html_tag(html: str | ParsedPage) -> str | None:
     """Detect language from <html lang='...'> attribute."""
-    soup = BeautifulSoup(html, "html.parser")
-    html_tag = soup.find("html")
-    if html_tag:
-        lang = (html_tag.get("lang") or "").strip()
-        if lang:
-            return _normalize_lang(lang)
+    lang = as_page(html).lang
+    if lang:
+        return _normalize_lang(lang)
     return None
 
 
-def _classify_page_type(url: str, html: str) -> str:
+def _classify_page_type(url: str, html: str | ParsedPage) -> str:
     """Classify page into a type based on URL and content keywords."""
     # Check main page first (URL-only check)
     parsed = urlparse(url)
@@ -156,17 +148,14 @@ def _classify_page_type(url: str, html: str) -> str:
     return "other"
 
 
-def _extract_title(html: str) -> str:
+def _extract_title(html: str | ParsedPage) -> str:
     """Extract page title from HTML."""
-    soup = BeautifulSoup(html, "html.parser")
-    title = soup.find("title")
-    return title.get_text(strip=True) if title else ""
+    return as_page(html).title
 
 
-def _extract_hreflang_tags(html: str) -> list[dict]:
+def _extract_hreflang_tags(html: str | ParsedPage) -> list[dict]:
     """Extract hreflang link tags from HTML."""
-    soup = BeautifulSoup(html, "html.parser")
-    tags = soup.find_all("link", attrs={"rel": "alternate", "hreflang": True})
+    tags = as_page(html).soup.find_all("link", attrs={"rel": "alternate", "hreflang": True})
     results = []
     for tag in tags:
         hreflang = tag.get("hreflang", "")
@@ -180,11 +169,11 @@ def _extract_hreflang_tags(html: str) -> list[dict]:
     return results
 
 
-def analyze_multilingual_readiness(pages: list[dict]) -> dict:
+def analyze_multilingual_readiness(pages: list[dict] | list[ParsedPage]) -> dict:
     """Analyze multilingual readiness from crawled pages.
 
     Args:
-        pages: List of crawled page dicts with keys: url, html, status_code, (title optional)
+        pages: ParsedPage objects or crawled page dicts with keys: url, html, status_code
 
     Returns:
         Analysis result with languages, page_types, matrix, readiness_scores, etc.
@@ -206,26 +195,25 @@ def analyze_multilingual_readiness(pages: list[dict]) -> dict:
     all_hreflang: list[dict] = []
     page_details: list[dict] = []
 
-    for page in pages:
-        url = page.get("url", "")
-        html = page.get("html", "")
+    for page in as_pages(pages):
+        url = page.url
 
         # Detect language (priority: URL > html tag > content analysis)
         lang = _detect_lang_from_url(url)
         if not lang:
-            lang = _detect_lang_from_html_tag(html)
+            lang = _detect_lang_from_html_tag(page)
         if not lang:
-            lang = _detect_lang_from_content(html)
+            lang = _detect_lang_from_content(page)
 
         lang = _normalize_lang(lang)
-        page_type = _classify_page_type(url, html)
-        title = page.get("title", "") or _extract_title(html)
+        page_type = _classify_page_type(url, page)
+        title = page.title
 
         lang_pages[lang].append({"url": url, "title": title, "page_type": page_type})
         page_type_lang[page_type].add(lang)
 
         # Collect hreflang from main page
-        hreflang_tags = _extract_hreflang_tags(html)
+        hreflang_tags = _extract_hreflang_tags(page)
         if hreflang_tags:
             all_hreflang.extend(hreflang_tags)
 
@@ -0,0 +1,181 @@
+"""PageSpeed Insights results cached per (url, strategy).
+
+Lab scores for a clinic homepage barely move over a few days, yet every scan —
+including each daily/weekly subscription rescan — ran a full Lighthouse audit
+through PSI. ``cached_pagespeed`` answers from process memory, then the
+``pagespeed_cache`` table, and only calls PSI on a miss:
+
+- fresh (younger than ``pagespeed_cache_ttl``): returned as is
+- stale (younger than ``pagespeed_cache_ttl + pagespeed_stale_ttl``): returned
+  immediately while one background task refreshes it
+- otherwise: fetched; concurrent scans of the same URL share one PSI call
+
+Only the extracted metrics are stored (not the multi-MB PSI response). Failed
+fetches are not cached — the caller falls back as before.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+
+from ..config import settings
+from ..db.repository import eq, get_repository
+from .ttl_cache import MISSING, TTLCache
+
+logger = logging.getLogger("checkyourhospital.pagespeed_cache")
+
+Key = tuple[str, str]
+Fetch = Callable[[], Awaitable[dict]]
+
+_memory = TTLCache(
+    max_entries=settings.pagespeed_memory_cache_max_entries,
+    ttl=settings.pagespeed_cache_ttl + settings.pagespeed_stale_ttl,
+)
+_inflight: dict[Key, asyncio.Task] = {}
+_refreshing: set[asyncio.Task] = set()
+_counts = {
+    "fresh_hits": 0,
+    "stale_hits": 0,
+    "db_hits": 0,
+    "misses": 0,
+    "coalesced": 0,
+    "refreshes": 0,
+    "errors": 0,
+}
+
+
+def pagespeed_cache_stats() -> dict:
+    hits = _counts["fresh_hits"] + _counts["stale_hits"]
+    lookups = hits + _counts["misses"]
+    return {
+        **_counts,
+        "lookups": lookups,
+        "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        "memory": _memory.stats(),
+    }
+
+
+def clear_pagespeed_cache() -> None:
+    """Drop the memory tier and counters (the DB tier is left alone)."""
+    _memory.clear()
+    _inflight.clear()
+    for key in _counts:
+        _counts[key] = 0
+
+
+async def cached_pagespeed(url: str, strategy: str, fetch: Fetch) -> dict:
+    """Metrics for ``(url, strategy)``; ``fetch()`` is only awaited on a miss.
+
+    Exceptions from ``fetch`` propagate to every caller waiting on that fetch.
+    """
+    key = (url, strategy)
+    entry = _memory.get(key)
+    if entry is MISSING:
+        entry = await _read_db(key)
+        if entry is not None:
+            _counts["db_hits"] += 1
+            _memory.set(key, entry)
+
+    if entry is not None:
+        metrics, fetched_at = entry
+        age = time.time() - fetched_at
+        if age < settings.pagespeed_cache_ttl:
+            _counts["fresh_hits"] += 1
+            return metrics
+        if age < settings.pagespeed_cache_ttl + settings.pagespeed_stale_ttl:
+            _counts["stale_hits"] += 1
+            _refresh_in_background(key, fetch)
+            return metrics
+
+    _counts["misses"] += 1
+    return await _single_flight(key, fetch)
+
+
+async def _single_flight(key: Key, fetch: Fetch) -> dict:
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_and_store(key, fetch))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        _counts["coalesced"] += 1
+    # A caller timing out must not cancel the fetch other scans are waiting on
+    return await asyncio.shield(task)
+
+
+async def _fetch_and_store(key: Key, fetch: Fetch) -> dict:
+    try:
+        metrics = await fetch()
+    except Exception:
+        _counts["errors"] += 1
+        raise
+    fetched_at = time.time()
+    _memory.set(key, (metrics, fetched_at))
+    await _write_db(key, metrics, fetched_at)
+    return metrics
+
+
+def _refresh_in_background(key: Key, fetch: Fetch) -> None:
+    if key in _inflight:
+        return
+    _counts["refreshes"] += 1
+
+    async def refresh() -> None:
+        try:
+            await _single_flight(key, fetch)
+        except Exception as e:
+            logger.warning("PageSpeed refresh failed for %s: %s", key[0], e)
+
+    task = asyncio.create_task(refresh())
+    # Keep a reference until done so the task is not garbage-collected mid-flight
+    _refreshing.add(task)
+    task.add_done_callback(_refreshing.discard)
+
+
+async def _read_db(key: Key) -> tuple[dict, float] | None:
+    try:
+        repo = get_repository()
+        if repo is None:
+            return None
+        url, strategy = key
+        row = await repo.select_one(
+            "pagespeed_cache",
+            "metrics,fetched_at",
+            [eq("url", url), eq("strategy", strategy)],
+        )
+    except Exception as e:
+        logger.warning("Failed to read PageSpeed cache: %s", e)
+        return None
+    if not row or row.get("metrics") is None:
+        return None
+    try:
+        fetched_at = datetime.fromisoformat(row["fetched_at"])
+    except (TypeError, ValueError):
+        return None
+    if fetched_at.tzinfo is None:
+        fetched_at = fetched_at.replace(tzinfo=UTC)
+    return row["metrics"], fetched_at.timestamp()
+
+
+async def _write_db(key: Key, metrics: dict, fetched_at: float) -> None:
+    try:
+        repo = get_repository()
+        if repo is None:
+            return
+        url, strategy = key
+        await repo.upsert(
+            "pagespeed_cache",
+            [
+                {
+                    "url": url,
+                    "strategy": strategy,
+                    "metrics": metrics,
+                    "fetched_at": datetime.fromtimestamp(fetched_at, UTC).isoformat(),
+                }
+            ],
+            on_conflict="url,strategy",
+        )
+    except Exception as e:
+        logger.warning("Failed to save PageSpeed cache: %s", e)
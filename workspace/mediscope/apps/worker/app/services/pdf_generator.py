@@ -1,19 +1,25 @@
 """PDF report generator: Jinja2 HTML → Playwright PDF → Supabase Storage."""
 
+import asyncio
 import logging
 from datetime import datetime
 from pathlib import Path
 
 from jinja2 import Environment, FileSystemLoader
-from playwright.async_api import async_playwright
 
 from ..config import settings
+from ..db.repository import eq, get_repository
 from ..db.supabase import get_supabase_client
+from .browser_pool import get_browser_pool
+from .render_cache import get_render_cache, render_key, storage_path
 
 logger = logging.getLogger("checkyourhospital.pdf")
 
 TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
 
+# Playwright's default; reset explicitly since pooled pages are shared with PNG renders
+_PDF_VIEWPORT = {"width": 1280, "height": 720}
+
 _jinja_env = Environment(
     loader=FileSystemLoader(str(TEMPLATES_DIR)),
     autoescape=True,
@@ -71,7 +77,12 @@ CATEGORY_LABELS: dict[str, str] = {
 }
 
 
-def render_report_html(audit_data: dict) -> str:
+def _report_date() -> str:
+    now = datetime.now()
+    return f"{now.year}년 {now.month}월 {now.day}일"
+
+
+def render_report_html(audit_data: dict, report_date: str | None = None) -> str:
     """Render audit data into an HTML string using Jinja2 template."""
     scores = audit_data.get("category_scores", audit_data.get("scores", {}))
 
@@ -119,13 +130,10 @@ def render_report_html(audit_data: dict) -> str:
         key=lambda x: priority_order.get(x["grade"], 99),
     )
 
-    now = datetime.now()
-    report_date = f"{now.year}년 {now.month}월 {now.day}일"
-
     template = _jinja_env.get_template("report.html")
     return template.render(
         url=audit_data.get("url", ""),
-        report_date=report_date,
+        report_date=report_date or _report_date(),
         total_score=total_score,
         grade=grade,
         grade_color=_grade_color(grade),
@@ -154,28 +162,27 @@ def render_report_html(audit_data: dict) -> str:
 
 
 async def html_to_pdf(html: str) -> bytes:
-    """Convert HTML string to PDF bytes using Playwright."""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
+    """Convert HTML string to PDF bytes on a pooled Chromium page."""
+
+    async def render(page) -> bytes:
         await page.set_content(html, wait_until="networkidle")
-        pdf_bytes = await page.pdf(
+        return await page.pdf(
             format="A4",
             print_background=True,
             margin={"top": "10mm", "right": "10mm", "bottom": "10mm", "left": "10mm"},
         )
-        await browser.close()
-    return pdf_bytes
+
+    return await get_browser_pool().render(render, viewport=_PDF_VIEWPORT)
 
 
-def upload_to_storage(audit_id: str, pdf_bytes: bytes) -> str:
+def upload_to_storage(audit_id: str, pdf_bytes: bytes, file_path: str | None = None) -> str:
     """Upload PDF to Supabase Storage and return public URL."""
     client = get_supabase_client()
     if client is None:
         raise RuntimeError("Supabase client not configured")
 
     bucket = settings.supabase_storage_bucket
-    file_path = f"{audit_id}.pdf"
+    file_path = file_path or f"{audit_id}.pdf"
 
     # Upload (upsert to overwrite if re-generated)
     client.storage.from_(bucket).upload(
@@ -189,33 +196,58 @@ def upload_to_storage(audit_id: str, pdf_bytes: bytes) -> str:
     return public_url
 
 
-def update_audit_report_url(audit_id: str, url: str) -> None:
+async def update_audit_report_url(audit_id: str, url: str) -> None:
     """Update audits.report_url with the generated PDF URL."""
-    client = get_supabase_client()
-    if client is None:
+    repo = get_repository()
+    if repo is None:
         return
-    client.table("audits").update({"report_url": url}).eq("id", audit_id).execute()
+    await repo.update("audits", {"report_url": url}, [eq("id", audit_id)])
 
 
 async def generate_pdf(audit_id: str, audit_data: dict) -> str:
     """Generate PDF report: render HTML → convert to PDF → upload → update DB.
 
+    Identical reports (same audit data, template version and date) reuse the
+    cached PDF instead of Playwright; with ``render_cache_storage`` they also
+    share one content-addressed upload.
+
     Returns the public URL of the generated PDF.
     """
     logger.info(f"Generating PDF for audit_id={audit_id}")
 
-    # 1. Render HTML from audit data
-    html = render_report_html(audit_data)
+    report_date = _report_date()
+    key = render_key(
+        TEMPLATES_DIR / "report.html",
+        {"audit": audit_data, "report_date": report_date},
+        size=(210, 297),  # A4, mm
+    )
+    cache = get_render_cache()
+    bucket = settings.supabase_storage_bucket
+
+    file_path = None
+    pdf_url = None
+    if settings.render_cache_storage:
+        file_path = storage_path(key, "pdf")
+        pdf_url = await cache.remote_url(bucket, file_path)
+
+    if pdf_url is None:
+        pdf_bytes = await cache.get(key, "pdf")
+        if pdf_bytes is None:
+            # 1. Render HTML from audit data
+            html = render_report_html(audit_data, report_date)
 
-    # 2. Convert HTML to PDF via Playwright
-    pdf_bytes = await html_to_pdf(html)
-    logger.info(f"PDF generated: {len(pdf_bytes)} bytes")
+            # 2. Convert HTML to PDF via Playwright
+            pdf_bytes = await html_to_pdf(html)
+            await cache.put(key, "pdf", pdf_bytes)
+            logger.info(f"PDF generated: {len(pdf_bytes)} bytes")
 
-    # 3. Upload to Supabase Storage
-    pdf_url = upload_to_storage(audit_id, pdf_bytes)
+        # 3. Upload to Supabase Storage (supabase-py is sync: keep it off the loop)
+        pdf_url = await asyncio.to_thread(upload_to_storage, audit_id, pdf_bytes, file_path)
+        if file_path is not None:
+            cache.remember_remote(bucket, file_path, pdf_url)
 
     # 4. Update audits.report_url
-    update_audit_report_url(audit_id, pdf_url)
+    await update_audit_report_url(audit_id, pdf_url)
 
     logger.info(f"PDF uploaded: {pdf_url}")
     return pdf_url
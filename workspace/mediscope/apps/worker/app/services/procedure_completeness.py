@@ -1,9 +1,9 @@
 """Procedure completeness analyzer — checks content coverage per procedure type."""
 
-import re
 from collections import defaultdict
 
-from bs4 import BeautifulSoup
+from ..checks.parsed_page import ParsedPage, as_page, as_pages
+from .keyword_matcher import Hit, KeywordMatcher, non_overlapping
 
 
 # Procedure identification keywords (multilingual)
@@ -52,47 +52,57 @@ PROCEDURE_LABELS: dict[str, str] = {
     "scar": "흉터",
 }
 
-# Precompiled patterns for procedure detection
-_PROCEDURE_PATTERNS: dict[str, re.Pattern] = {
-    key: re.compile("|".join(re.escape(kw) for kw in keywords), re.I)
-    for key, keywords in PROCEDURE_KEYWORDS.items()
-}
-
-# Precompiled patterns for section detection
-_SECTION_PATTERNS: dict[str, re.Pattern] = {
-    key: re.compile("|".join(re.escape(kw) for kw in keywords), re.I)
-    for key, keywords in CONTENT_SECTIONS.items()
-}
+# Procedure and section keywords share one automaton, so a page is scanned once.
+# Labels: ("procedure", key) and ("section", key)
+_MATCHER = KeywordMatcher.from_groups({
+    **{("procedure", key): keywords for key, keywords in PROCEDURE_KEYWORDS.items()},
+    **{("section", key): keywords for key, keywords in CONTENT_SECTIONS.items()},
+})
 
 
-def _extract_text(html: str) -> str:
+def _extract_text(html: str | ParsedPage) -> str:
     """Extract visible text from HTML, removing scripts and styles."""
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    return soup.get_text(separator=" ", strip=True)
+    return as_page(html).text
+
+
+def _scan_page(url: str, title: str, text: str) -> tuple[list[str], list[Hit]]:
+    """One pass over ``"{url} {title} {text}"``: the procedures referenced, and
+    the section keyword hits inside ``text`` (offsets relative to ``text``)."""
+    prefix_len = len(url) + len(title) + 2
+    procedures: set[str] = set()
+    section_hits: list[Hit] = []
+    for hit in _MATCHER.iter_hits(f"{url} {title} {text}"):
+        kind, key = hit.label
+        if kind == "procedure":
+            procedures.add(key)
+        elif hit.start >= prefix_len:
+            section_hits.append(Hit(hit.start - prefix_len, hit.end - prefix_len, key))
+    return [key for key in PROCEDURE_KEYWORDS if key in procedures], section_hits
 
 
 def _identify_procedures(url: str, title: str, text: str) -> list[str]:
     """Identify which procedures are referenced in the page."""
-    combined = f"{url} {title} {text}"
-    found = []
-    for proc_key, pattern in _PROCEDURE_PATTERNS.items():
-        if pattern.search(combined):
-            found.append(proc_key)
-    return found
+    return _scan_page(url, title, text)[0]
 
 
-def _detect_sections(text: str) -> dict[str, dict]:
+def _detect_sections(text: str, hits: list[Hit] | None = None) -> dict[str, dict]:
     """Detect which content sections are present and estimate their content length.
 
+    ``hits`` are the section keyword hits from ``_scan_page`` when already known.
+
     Returns:
         Dict mapping section key to {"present": bool, "partial": bool, "char_count": int}
     """
+    if hits is None:
+        hits = _scan_page("", "", text)[1]
+    hits_by_section: dict[str, list[Hit]] = defaultdict(list)
+    for hit in hits:
+        hits_by_section[hit.label].append(hit)
+
     results: dict[str, dict] = {}
 
-    for section_key, pattern in _SECTION_PATTERNS.items():
-        matches = list(pattern.finditer(text))
+    for section_key in CONTENT_SECTIONS:
+        matches = non_overlapping(hits_by_section.get(section_key, ()))
         if not matches:
             results[section_key] = {"present": False, "partial": False, "char_count": 0}
             continue
@@ -100,7 +110,7 @@ def _detect_sections(text: str) -> dict[str, dict]:
         # Estimate content around the keyword: take 500 chars after each match
         total_chars = 0
         for m in matches:
-            start = m.start()
+            start = m.start
             end = min(start + 500, len(text))
             snippet = text[start:end]
             total_chars += len(snippet)
@@ -115,11 +125,11 @@ def _detect_sections(text: str) -> dict[str, dict]:
     return results
 
 
-def analyze_procedure_completeness(pages: list[dict]) -> dict:
+def analyze_procedure_completeness(pages: list[dict] | list[ParsedPage]) -> dict:
     """Analyze procedure content completeness across crawled pages.
 
     Args:
-        pages: List of crawled page dicts with keys: url, html, (title optional)
+        pages: ParsedPage objects or crawled page dicts with keys: url, html
 
     Returns:
         Analysis result with procedures, overall completeness, recommendations, etc.
@@ -140,22 +150,13 @@ def analyze_procedure_completeness(pages: list[dict]) -> dict:
         "sections": {s: {"present": False, "partial": False, "char_count": 0} for s in CONTENT_SECTIONS},
     })
 
-    for page in pages:
-        url = page.get("url", "")
-        html = page.get("html", "")
-        title = page.get("title", "")
-
-        text = _extract_text(html)
-        if not title:
-            soup = BeautifulSoup(html, "html.parser")
-            title_tag = soup.find("title")
-            title = title_tag.get_text(strip=True) if title_tag else ""
-
-        procedures = _identify_procedures(url, title, text)
+    for page in as_pages(pages):
+        text = _extract_text(page)
+        procedures, section_hits = _scan_page(page.url, page.title, text)
         if not procedures:
             continue
 
-        sections = _detect_sections(text)
+        sections = _detect_sections(text, section_hits)
 
         for proc in procedures:
             proc_data[proc]["pages_found"] += 1
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass, field
 
-from ..db.supabase import get_supabase_client
+from ..db.repository import eq, get_repository, ilike
 
 
 @dataclass
@@ -38,91 +39,59 @@ async def get_procedure_data(procedure_name: str) -> ProcedureData | None:
 
     Joins procedures → procedure_details → procedure_intl → intl_prices.
     """
-    client = get_supabase_client()
-    if client is None:
+    repo = get_repository()
+    if repo is None:
         return None
 
     # Find procedure by name (case-insensitive search)
-    result = (
-        client.table("procedures")
-        .select("id, name, primary_category_id")
-        .ilike("name", f"%{procedure_name}%")
-        .limit(1)
-        .execute()
+    proc = await repo.select_one(
+        "procedures", "id, name, primary_category_id", [ilike("name", f"%{procedure_name}%")]
     )
 
-    if not result.data:
+    if proc is None:
         # Try search_dict for alias matching
-        alias_result = (
-            client.table("search_dict")
-            .select("procedure_id, canonical_term")
-            .ilike("term", f"%{procedure_name}%")
-            .limit(1)
-            .execute()
+        alias = await repo.select_one(
+            "search_dict", "procedure_id, canonical_term", [ilike("term", f"%{procedure_name}%")]
         )
-        if not alias_result.data:
+        if not alias or not alias.get("procedure_id"):
             return None
-        proc_id = alias_result.data[0].get("procedure_id")
-        if not proc_id:
-            return None
-        result = (
-            client.table("procedures")
-            .select("id, name, primary_category_id")
-            .eq("id", proc_id)
-            .limit(1)
-            .execute()
+        proc = await repo.select_one(
+            "procedures", "id, name, primary_category_id", [eq("id", alias["procedure_id"])]
         )
-        if not result.data:
+        if proc is None:
             return None
 
-    proc = result.data[0]
     proc_id = proc["id"]
 
-    # Fetch category name
-    category_name = ""
-    if proc.get("primary_category_id"):
-        cat_result = (
-            client.table("procedure_categories")
-            .select("name")
-            .eq("id", proc["primary_category_id"])
-            .limit(1)
-            .execute()
+    # Category, details, translations and prices only depend on the procedure id
+    async def fetch_category() -> dict | None:
+        if not proc.get("primary_category_id"):
+            return None
+        return await repo.select_one(
+            "procedure_categories", "name", [eq("id", proc["primary_category_id"])]
         )
-        if cat_result.data:
-            category_name = cat_result.data[0].get("name", "")
-
-    # Fetch procedure details
-    detail_result = (
-        client.table("procedure_details")
-        .select("*")
-        .eq("procedure_id", proc_id)
-        .limit(1)
-        .execute()
-    )
-    detail = detail_result.data[0] if detail_result.data else {}
-
-    # Fetch translations
-    intl_result = (
-        client.table("procedure_intl")
-        .select("*")
-        .eq("procedure_id", proc_id)
-        .execute()
+
+    category, detail, intl_rows, price_rows = await asyncio.gather(
+        fetch_category(),
+        repo.select_one("procedure_details", "*", [eq("procedure_id", proc_id)]),
+        repo.select("procedure_intl", "*", [eq("procedure_id", proc_id)]),
+        repo.select(
+            "intl_prices",
+            "country_code, currency, price, price_unit",
+            [eq("top_procedure_id", proc_id)],
+        ),
     )
+    category_name = category.get("name", "") if category else ""
+    detail = detail or {}
+
     translations: dict[str, dict] = {}
-    for row in intl_result.data or []:
+    for row in intl_rows:
         lang = row.get("language_code", "")
         if lang:
             translations[lang] = row
 
-    # Fetch international prices
-    price_result = (
-        client.table("intl_prices")
-        .select("country_code, currency, price, price_unit")
-        .eq("top_procedure_id", proc_id)
-        .execute()
-    )
     price_by_country: dict[str, dict] = {}
-    for row in price_result.data or []:
+    for row in price_rows:
         cc = row.get("country_code", "")
         if cc:
             price_by_country[cc] = {
@@ -157,29 +126,22 @@ async def get_procedure_data(procedure_name: str) -> ProcedureData | None:
 
 async def list_procedures() -> list[dict]:
     """List all procedures grouped by category."""
-    client = get_supabase_client()
-    if client is None:
+    repo = get_repository()
+    if repo is None:
         return []
 
-    # Fetch categories
-    cat_result = (
-        client.table("procedure_categories")
-        .select("id, name, name_en, icon, display_order")
-        .order("display_order")
-        .execute()
-    )
-    categories = {c["id"]: c for c in (cat_result.data or [])}
-
-    # Fetch procedures
-    proc_result = (
-        client.table("procedures")
-        .select("id, name, primary_category_id, grade, thumbnail_url")
-        .order("name")
-        .execute()
+    cat_rows, proc_rows = await asyncio.gather(
+        repo.select(
+            "procedure_categories", "id, name, name_en, icon, display_order", order="display_order"
+        ),
+        repo.select(
+            "procedures", "id, name, primary_category_id, grade, thumbnail_url", order="name"
+        ),
     )
+    categories = {c["id"]: c for c in cat_rows}
 
     grouped: dict[str, dict] = {}
-    for proc in proc_result.data or []:
+    for proc in proc_rows:
         cat_id = proc.get("primary_category_id")
         cat = categories.get(cat_id, {})
         cat_name = cat.get("name", "기타")
@@ -0,0 +1,142 @@
+"""Bounded-cost regex scans for analyzers that run patterns over page HTML/text.
+
+A match attempt in ``re`` cannot be interrupted, and a pattern such as
+``<video[^>]*>.*?<source…`` (``re.DOTALL``) costs O(n²) on a page full of
+``<video`` tags with no ``<source>``. One such page used to pin a worker CPU
+for the whole scan. ``RegexGuard`` bounds the cost structurally:
+
+- input cap: only the first ``max_input`` characters of a page are scanned
+- chunked scanning: patterns run over windows of ``chunk`` characters plus
+  ``overlap``, so no match attempt backtracks across more than one window;
+  matches are those of ``pattern.finditer`` except ones longer than ``overlap``
+- budgets: wall-clock and thread-CPU time per analyzer per page, counted from
+  its first scan and checked between windows; once spent, the page's
+  remaining scans return nothing
+
+Each cap or budget hit is recorded once per page as an event naming the
+analyzer and page, which the analyzer reports in ``details["regex_guard"]``.
+"""
+
+import logging
+import re
+import time
+from collections.abc import Iterator
+
+from ..config import settings
+
+logger = logging.getLogger("checkyourhospital.regex_guard")
+
+# A match ending this close to a window edge may continue past it (or be
+# changed by a lookahead/``$`` at the edge) and is rescanned in the next window
+_EDGE_MARGIN = 64
+
+_stats = {"pages": 0, "input_capped": 0, "budget_exceeded": 0}
+
+
+class PageScan:
+    """Guarded scans of one page, sharing the page's time budget."""
+
+    def __init__(self, guard: "RegexGuard", url: str):
+        self.guard = guard
+        self.url = url
+        self.exhausted = False
+        self._reasons: set[str] = set()
+        self._started: tuple[float, float] | None = None  # on the first scan
+
+    def _record(self, reason: str, **info) -> None:
+        if reason in self._reasons:
+            return
+        self._reasons.add(reason)
+        event = {"analyzer": self.guard.analyzer, "url": self.url, "reason": reason, **info}
+        self.guard.events.append(event)
+        _stats["input_capped" if reason == "input_cap" else "budget_exceeded"] += 1
+        logger.warning("Regex guard: %s hit %s on %s", self.guard.analyzer, reason, self.url)
+
+    def _over_budget(self, offset: int) -> bool:
+        if self.exhausted:
+            return True
+        if self._started is None:
+            self._started = (time.monotonic(), time.thread_time())
+            return False
+        guard = self.guard
+        wall_ms = (time.monotonic() - self._started[0]) * 1000
+        cpu_ms = (time.thread_time() - self._started[1]) * 1000
+        if wall_ms > guard.budget_ms:
+            self._record("time_budget", limit_ms=guard.budget_ms, offset=offset)
+        elif cpu_ms > guard.cpu_budget_ms:
+            self._record("cpu_budget", limit_ms=guard.cpu_budget_ms, offset=offset)
+        else:
+            return False
+        self.exhausted = True
+        return True
+
+    def finditer(self, pattern: re.Pattern, text: str) -> Iterator[re.Match]:
+        """``pattern.finditer(text)``, windowed and within the page budget."""
+        guard = self.guard
+        end = len(text)
+        if end > guard.max_input:
+            end = guard.max_input
+            self._record("input_cap", limit=guard.max_input, length=len(text))
+        pos = 0
+        while pos < end:
+            if self._over_budget(pos):
+                return
+            window_end = min(end, pos + guard.chunk + guard.overlap)
+            safe_end = window_end if window_end == end else window_end - _EDGE_MARGIN
+            next_pos = min(end, pos + guard.chunk)
+            for m in pattern.finditer(text, pos, window_end):
+                if m.start() >= pos + guard.chunk:
+                    next_pos = m.start()
+                    break
+                if m.end() > safe_end and m.start() > pos:
+                    next_pos = m.start()
+                    break
+                yield m
+                next_pos = max(next_pos, m.end())
+            pos = next_pos
+
+    def search(self, pattern: re.Pattern, text: str) -> re.Match | None:
+        return next(self.finditer(pattern, text), None)
+
+    def findall(self, pattern: re.Pattern, text: str) -> list[str]:
+        """``pattern.findall`` for patterns with at most one group."""
+        group = 1 if pattern.groups else 0
+        return [m.group(group) for m in self.finditer(pattern, text)]
+
+
+class RegexGuard:
+    """Caps and budgets for one analyzer run; defaults come from ``settings``."""
+
+    def __init__(
+        self,
+        analyzer: str,
+        *,
+        max_input: int | None = None,
+        chunk: int | None = None,
+        overlap: int | None = None,
+        budget_ms: float | None = None,
+        cpu_budget_ms: float | None = None,
+    ):
+        self.analyzer = analyzer
+        self.max_input = max_input or settings.regex_max_input
+        self.chunk = max(chunk or settings.regex_chunk, 1)
+        self.overlap = max(overlap or settings.regex_chunk_overlap, 2 * _EDGE_MARGIN)
+        self.budget_ms = budget_ms or settings.regex_budget_ms
+        self.cpu_budget_ms = cpu_budget_ms or settings.regex_cpu_budget_ms
+        self.events: list[dict] = []
+
+    def page(self, url: str) -> PageScan:
+        """Scans of one page under a fresh budget."""
+        _stats["pages"] += 1
+        return PageScan(self, url)
+
+    def report(self, result: dict) -> dict:
+        """Add the recorded events to ``result["details"]["regex_guard"]``, if any."""
+        if self.events:
+            result.setdefault("details", {})["regex_guard"] = self.events
+        return result
+
+
+def regex_guard_stats() -> dict:
+    """Pages scanned and cap/budget hits in this process."""
+    return dict(_stats)
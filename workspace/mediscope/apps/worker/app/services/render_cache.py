@@ -0,0 +1,212 @@
+"""Content-addressed cache for rendered PNGs and PDFs.
+
+The same SNS card for a procedure, or the same report, used to be re-rendered
+in Chromium (and re-uploaded) on every request. ``render_key`` hashes
+everything that determines the output — template name and mtime, data,
+language and dimensions — so identical requests map to the same key:
+
+- local disk (``render_cache_dir``), LRU-evicted beyond ``render_cache_max_mb``:
+  a hit skips Playwright. On Cloud Run ``/tmp`` is memory-backed, so this tier
+  uses instance RAM; it is kept small by default and ``0`` turns it off
+- optionally Supabase Storage (``render_cache_storage``): uploads go to a
+  content-addressed path ``cache/<key>.<ext>``, and a hit skips both the render
+  and the upload
+
+Template edits change the mtime, hence the key; stale entries simply age out.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from ..config import settings
+from ..db.supabase import get_supabase_client
+
+logger = logging.getLogger("checkyourhospital.render_cache")
+
+
+def render_key(
+    template: Path,
+    data: dict,
+    *,
+    language: str = "",
+    size: tuple[int, int] | None = None,
+) -> str:
+    """Stable hash of a render's inputs (template name + mtime, data, language, size)."""
+    try:
+        mtime = template.stat().st_mtime_ns
+    except OSError:
+        mtime = 0
+    payload = json.dumps(
+        {
+            "template": template.name,
+            "mtime": mtime,
+            "data": data,
+            "language": language,
+            "size": list(size) if size else None,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    def __init__(self, directory: str | Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: OrderedDict[str, int] | None = None  # filename → size, LRU order
+        self._total = 0
+        self._remote: dict[str, str] = {}  # storage path → public URL
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.remote_hits = 0
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        if self._index is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            files = sorted(
+                (p for p in self.directory.iterdir() if p.is_file() and not p.name.startswith(".")),
+                key=lambda p: p.stat().st_mtime,
+            )
+            self._index = OrderedDict((p.name, p.stat().st_size) for p in files)
+            self._total = sum(self._index.values())
+        return self._index
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    async def get(self, key: str, ext: str) -> bytes | None:
+        """Cached bytes for ``key``; the disk read runs off the event loop."""
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self._get, key, ext)
+
+    async def put(self, key: str, ext: str, content: bytes) -> None:
+        """Store ``content``; the write and any eviction run off the event loop."""
+        if self.enabled:
+            await asyncio.to_thread(self._put, key, ext, content)
+
+    def _get(self, key: str, ext: str) -> bytes | None:
+        name = f"{key}.{ext}"
+        with self._lock:
+            index = self._load_index()
+            if name not in index:
+                self.misses += 1
+                return None
+            try:
+                content = (self.directory / name).read_bytes()
+            except OSError:
+                self._total -= index.pop(name)
+                self.misses += 1
+                return None
+            index.move_to_end(name)
+            self.hits += 1
+        # mtime is the LRU order a restarted process rebuilds the index from
+        try:
+            os.utime(self.directory / name)
+        except OSError:
+            pass
+        return content
+
+    def _put(self, key: str, ext: str, content: bytes) -> None:
+        if len(content) > self.max_bytes:
+            return
+        name = f"{key}.{ext}"
+        with self._lock:
+            index = self._load_index()
+            tmp = self.directory / f".{name}.tmp"
+            try:
+                tmp.write_bytes(content)
+                os.replace(tmp, self.directory / name)
+            except OSError as e:
+                logger.warning("Render cache write failed: %s", e)
+                return
+            self._total += len(content) - index.pop(name, 0)
+            index[name] = len(content)
+            while self._total > self.max_bytes and index:
+                old, size = index.popitem(last=False)
+                self._total -= size
+                self.evictions += 1
+                try:
+                    (self.directory / old).unlink()
+                except OSError:
+                    pass
+
+    # -- Supabase Storage tier -------------------------------------------------
+
+    async def remote_url(self, bucket: str, path: str) -> str | None:
+        """Public URL of ``path`` if it was already uploaded (by any instance)."""
+        if not settings.render_cache_storage:
+            return None
+        url = self._remote.get(f"{bucket}/{path}")
+        if url is None:
+            url = await asyncio.to_thread(_find_in_storage, bucket, path)
+            if url is not None:
+                self._remote[f"{bucket}/{path}"] = url
+        if url is not None:
+            self.remote_hits += 1
+        return url
+
+    def remember_remote(self, bucket: str, path: str, url: str) -> None:
+        self._remote[f"{bucket}/{path}"] = url
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._index or ()),
+            "bytes": self._total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "remote_hits": self.remote_hits,
+        }
+
+
+def storage_path(key: str, ext: str) -> str:
+    """Content-addressed object path used when ``render_cache_storage`` is on."""
+    return f"cache/{key}.{ext}"
+
+
+def _find_in_storage(bucket: str, path: str) -> str | None:
+    client = get_supabase_client()
+    if client is None:
+        return None
+    folder, _, name = path.rpartition("/")
+    try:
+        entries = client.storage.from_(bucket).list(folder, {"search": name})
+    except Exception as e:
+        logger.warning("Render cache storage lookup failed: %s", e)
+        return None
+    if not any(entry.get("name") == name for entry in entries or []):
+        return None
+    return client.storage.from_(bucket).get_public_url(path)
+
+
+_cache: RenderCache | None = None
+
+
+def get_render_cache() -> RenderCache:
+    global _cache
+    if _cache is None:
+        _cache = RenderCache(
+            settings.render_cache_dir, max(0, settings.render_cache_max_mb) * 1024 * 1024
+        )
+    return _cache
+
+
+def set_render_cache(cache: RenderCache | None) -> None:
+    """Install ``cache`` for every caller; ``None`` rebuilds it from settings."""
+    global _cache
+    _cache = cache
@@ -0,0 +1,204 @@
+"""Per-scan memo of HTTP responses, so a URL is fetched at most once per scan.
+
+The crawl already GETs every page; ``check_errors`` then re-requested the same
+URLs for their status, ``check_links`` HEADed internal links that were just
+crawled and ``check_https`` re-fetched the homepage. ``ResponseMemo`` records
+what the crawl saw — each redirect hop (status + ``Location``) and the final
+response (status, headers, body) — and ``MemoizedClient`` answers ``get``/``head``
+from it, falling back to the network (and recording) on a miss.
+
+An entry is keyed by the request URL and stores what a request *without*
+following redirects returns, so both ``follow_redirects=False`` lookups and
+followed lookups (by walking the recorded chain) can be answered. HEAD is
+answered from a recorded GET. Requests with extra options (params, custom
+headers, ...) and non-GET/HEAD methods go straight to the wrapped client.
+
+The crawl does not download non-HTML bodies and caps HTML ones; those entries
+are ``partial`` and answer HEAD only, a GET fetches the full body. Misses are
+fetched the same way: a HEAD is sent as HEAD (recorded as ``partial``) and a
+GET body is streamed up to ``crawler_max_html_bytes``.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+
+import httpx
+
+from ..config import settings
+
+_REDIRECTS = (301, 302, 303, 307, 308)
+_MAX_HOPS = 10
+# The stored body is already decoded; replaying these would make httpx decode it again
+_REPLAY_DROP = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def memo_key(url: str | httpx.URL) -> str:
+    return str(httpx.URL(str(url)).copy_with(fragment=None))
+
+
+@dataclass
+class MemoEntry:
+    url: str
+    status_code: int = 0
+    headers: dict[str, str] = field(default_factory=dict)
+    content: bytes | None = None  # None for redirect hops and failures
+    error: str | None = None
+    partial: bool = False  # body not (fully) read: status and headers only
+
+    @property
+    def location(self) -> str | None:
+        if self.status_code not in _REDIRECTS:
+            return None
+        location = self.headers.get("location")
+        return str(httpx.URL(self.url).join(location)) if location else None
+
+    def to_response(self, method: str = "GET") -> httpx.Response:
+        headers = {k: v for k, v in self.headers.items() if k not in _REPLAY_DROP}
+        return httpx.Response(
+            self.status_code,
+            headers=headers,
+            content=self.content or b"",
+            request=httpx.Request(method, self.url),
+        )
+
+
+class ResponseMemo:
+    def __init__(self):
+        self._entries: dict[str, MemoEntry] = {}
+        self._inflight: dict[tuple[str, str, bool], asyncio.Task] = {}
+        self.hits = 0
+        self.fetches = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "fetches": self.fetches}
+
+    def record(
+        self, response: httpx.Response, *, content: bytes | None = None, partial: bool = False
+    ) -> None:
+        """Store a response and every redirect hop that led to it.
+
+        ``content`` is the body when ``response`` was streamed (``partial`` if
+        not all of it was read); otherwise the read ``response.content`` is used.
+        """
+        for hop in response.history:
+            self._entries[memo_key(hop.request.url)] = MemoEntry(
+                url=memo_key(hop.request.url),
+                status_code=hop.status_code,
+                headers={k.lower(): v for k, v in hop.headers.items()},
+            )
+        if response.status_code in _REDIRECTS:
+            content, partial = None, False
+        elif content is None:
+            content = response.content
+        url = memo_key(response.request.url)
+        self._entries[url] = MemoEntry(
+            url=url,
+            status_code=response.status_code,
+            headers={k.lower(): v for k, v in response.headers.items()},
+            content=content,
+            partial=partial,
+        )
+
+    def record_error(self, url: str, error: Exception) -> None:
+        key = memo_key(url)
+        self._entries[key] = MemoEntry(url=key, error=f"{type(error).__name__}: {error}")
+
+    def get(self, url: str) -> MemoEntry | None:
+        """What requesting ``url`` without following redirects returned, if recorded."""
+        return self._entries.get(memo_key(url))
+
+    def resolve(self, url: str, follow_redirects: bool) -> MemoEntry | None:
+        """Recorded answer for a request, walking redirects when asked to follow them."""
+        entry = self.get(url)
+        if not follow_redirects:
+            return entry
+        for _ in range(_MAX_HOPS):
+            if entry is None or entry.error or entry.location is None:
+                # A followed request needs the final body; a bare hop entry won't do
+                if entry is not None and entry.content is None and not entry.error:
+                    return None
+                return entry
+            entry = self.get(entry.location)
+        return None
+
+
+class MemoizedClient:
+    """``httpx.AsyncClient`` stand-in whose plain GET/HEAD calls go through a ``ResponseMemo``."""
+
+    def __init__(self, client: httpx.AsyncClient, memo: ResponseMemo):
+        self._client = client
+        self.memo = memo
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    async def get(self, url, **kwargs) -> httpx.Response:
+        return await self._request("GET", url, kwargs)
+
+    async def head(self, url, **kwargs) -> httpx.Response:
+        return await self._request("HEAD", url, kwargs)
+
+    async def _request(self, method: str, url, kwargs: dict) -> httpx.Response:
+        follow = kwargs.pop("follow_redirects", self._client.follow_redirects)
+        timeout = kwargs.pop("timeout", httpx.USE_CLIENT_DEFAULT)
+        if kwargs or not httpx.URL(str(url)).is_absolute_url:
+            send = self._client.get if method == "GET" else self._client.head
+            return await send(url, follow_redirects=follow, timeout=timeout, **kwargs)
+
+        entry = self.memo.resolve(str(url), follow)
+        if entry is not None and entry.partial and method == "GET":
+            entry = None  # the crawl did not keep this body
+        if entry is None:
+            key = (method, memo_key(url), follow)
+            task = self._inflight_fetch(key, method, str(url), follow, timeout)
+            await task
+            entry = self.memo.resolve(str(url), follow)
+        else:
+            self.memo.hits += 1
+
+        if entry is None:  # fetched, but the chain was too long to replay
+            send = self._client.get if method == "GET" else self._client.head
+            return await send(url, follow_redirects=follow, timeout=timeout)
+        if entry.error:
+            raise httpx.ConnectError(entry.error, request=httpx.Request(method, entry.url))
+        return entry.to_response(method)
+
+    def _inflight_fetch(
+        self, key, method: str, url: str, follow: bool, timeout
+    ) -> asyncio.Task:
+        memo = self.memo
+        task = memo._inflight.get(key)
+        if task is None:
+            memo.fetches += 1
+            task = asyncio.ensure_future(self._fetch(method, url, follow, timeout))
+            memo._inflight[key] = task
+            task.add_done_callback(lambda _: memo._inflight.pop(key, None))
+        else:
+            memo.hits += 1
+        return asyncio.shield(task)
+
+    async def _fetch(self, method: str, url: str, follow: bool, timeout) -> None:
+        """Fetch and record ``url``: HEAD as HEAD, GET streamed up to the HTML byte cap."""
+        max_bytes = settings.crawler_max_html_bytes
+        try:
+            if method == "HEAD":
+                resp = await self._client.head(url, follow_redirects=follow, timeout=timeout)
+                self.memo.record(resp, content=b"", partial=True)
+                return
+            async with self._client.stream(
+                "GET", url, follow_redirects=follow, timeout=timeout
+            ) as resp:
+                chunks: list[bytes] = []
+                size = 0
+                async for chunk in resp.aiter_bytes():
+                    chunks.append(chunk[: max_bytes - size])
+                    size += len(chunk)
+                    if size > max_bytes:
+                        break
+        except httpx.HTTPError as e:
+            self.memo.record_error(url, e)
+            return
+        self.memo.record(resp, content=b"".join(chunks), partial=size > max_bytes)
@@ -3,8 +3,8 @@
 import re
 from collections import Counter, defaultdict
 
-from bs4 import BeautifulSoup
-
+from ..checks.parsed_page import ParsedPage, as_page, as_pages
+from .keyword_matcher import KeywordMatcher
 from .procedure_completeness import PROCEDURE_KEYWORDS, PROCEDURE_LABELS
 
 # ── Sentiment keyword dictionaries (with weights) ────────────────────
@@ -62,65 +62,60 @@ _STAR_PATTERNS = re.compile(r"(★|☆|⭐|star|rating|점|\bscore\b)", re.I)
 
 _RATING_NUMBER_RE = re.compile(r"(\d(?:\.\d)?)\s*/\s*5")
 
-# Precompiled patterns for sentiment keywords
-_POSITIVE_PATTERNS: dict[str, list[tuple[re.Pattern, float]]] = {
-    lang: [(re.compile(re.escape(kw), re.I), weight) for kw, weight in keywords.items()]
-    for lang, keywords in POSITIVE_KEYWORDS.items()
-}
-
-_NEGATIVE_PATTERNS: dict[str, list[tuple[re.Pattern, float]]] = {
-    lang: [(re.compile(re.escape(kw), re.I), weight) for kw, weight in keywords.items()]
-    for lang, keywords in NEGATIVE_KEYWORDS.items()
-}
-
-# Precompiled procedure patterns for matching reviews to procedures
-_PROCEDURE_PATTERNS: dict[str, re.Pattern] = {
-    key: re.compile("|".join(re.escape(kw) for kw in keywords), re.I)
-    for key, keywords in PROCEDURE_KEYWORDS.items()
-}
+# Sentiment and procedure keywords share one automaton, so each review is
+# scanned once. Labels: ("positive"|"negative", lang, keyword) and ("procedure", key)
+_SENTIMENT_LABELS: list[tuple[tuple[str, str, str], float]] = [
+    ((polarity, lang, kw), weight)
+    for polarity, dictionary in (("positive", POSITIVE_KEYWORDS), ("negative", NEGATIVE_KEYWORDS))
+    for lang, keywords in dictionary.items()
+    for kw, weight in keywords.items()
+]
+
+_REVIEW_MATCHER = KeywordMatcher(
+    [(label[2], label) for label, _weight in _SENTIMENT_LABELS]
+    + [(kw, ("procedure", key)) for key, keywords in PROCEDURE_KEYWORDS.items() for kw in keywords]
+)
 
 
-def _extract_text(html: str) -> str:
+def _extract_text(html: str | ParsedPage) -> str:
     """Extract visible text from HTML, removing scripts and styles."""
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    return soup.get_text(separator=" ", strip=True)
+    return as_page(html).text
 
 
-def _is_review_page(url: str, html: str) -> bool:
+def _is_review_page(url: str, html: str | ParsedPage) -> bool:
     """Check if a page is a review page based on URL and content."""
     if _REVIEW_URL_PATTERNS.search(url):
         return True
-    soup = BeautifulSoup(html, "html.parser")
-    title_tag = soup.find("title")
-    if title_tag and _REVIEW_SECTION_KEYWORDS.search(title_tag.get_text()):
+    page = as_page(html)
+    if page.title and _REVIEW_SECTION_KEYWORDS.search(page.title):
         return True
     # Check headings
-    for heading in soup.find_all(["h1", "h2", "h3"]):
-        if _REVIEW_SECTION_KEYWORDS.search(heading.get_text()):
+    for level, heading in page.headings:
+        if level <= 3 and _REVIEW_SECTION_KEYWORDS.search(heading):
             return True
     return False
 
 
-def _has_review_section(html: str) -> bool:
+def _has_review_section(html: str | ParsedPage) -> bool:
     """Check if the page contains a review section."""
-    soup = BeautifulSoup(html, "html.parser")
+    page = as_page(html)
+    soup = page.soup
     # Check for review containers by class/id
-    for el in soup.find_all(attrs={"class": _REVIEW_CONTAINER_RE}):
+    if soup.find(attrs={"class": _REVIEW_CONTAINER_RE}):
         return True
-    for el in soup.find_all(attrs={"id": _REVIEW_CONTAINER_RE}):
+    if soup.find(attrs={"id": _REVIEW_CONTAINER_RE}):
         return True
     # Check headings for review keywords
-    for heading in soup.find_all(["h1", "h2", "h3", "h4"]):
-        if _REVIEW_SECTION_KEYWORDS.search(heading.get_text()):
+    for level, heading in page.headings:
+        if level <= 4 and _REVIEW_SECTION_KEYWORDS.search(heading):
             return True
     return False
 
 
-def _extract_review_texts(html: str) -> list[str]:
+def _extract_review_texts(html: str | ParsedPage) -> list[str]:
     """Extract individual review texts from HTML."""
-    soup = BeautifulSoup(html, "html.parser")
+    page = as_page(html)
+    soup = page.soup
     reviews: list[str] = []
 
     # Strategy 1: Find review containers by class/id
@@ -145,17 +140,8 @@ def _extract_review_texts(html: str) -> list[str]:
                         reviews.append(text)
 
     # Strategy 3: Check structured data (Review schema)
-    for script in soup.find_all("script", type="application/ld+json"):
-        try:
-            import json
-            data = json.loads(script.string or "")
-            if isinstance(data, list):
-                for item in data:
-                    _extract_schema_reviews(item, reviews)
-            elif isinstance(data, dict):
-                _extract_schema_reviews(data, reviews)
-        except (json.JSONDecodeError, TypeError):
-            pass
+    for item in page.json_ld:
+        _extract_schema_reviews(item, reviews)
 
     return reviews
 
@@ -180,22 +166,16 @@ def _extract_schema_reviews(data: dict, reviews: list[str]) -> None:
         _extract_schema_reviews(item, reviews)
 
 
-def _detect_star_ratings(html: str) -> tuple[bool, float | None]:
+def _detect_star_ratings(html: str | ParsedPage) -> tuple[bool, float | None]:
     """Detect star ratings in HTML. Returns (has_ratings, average_rating)."""
-    soup = BeautifulSoup(html, "html.parser")
-    text = soup.get_text(separator=" ", strip=True)
+    page = as_page(html)
+    text = page.full_text
     has_stars = bool(_STAR_PATTERNS.search(text))
 
     # Try to extract numeric rating from structured data
-    for script in soup.find_all("script", type="application/ld+json"):
-        try:
-            import json
-            data = json.loads(script.string or "")
-            rating = _find_aggregate_rating(data)
-            if rating is not None:
-                return True, rating
-        except (json.JSONDecodeError, TypeError):
-            pass
+    rating = _find_aggregate_rating(page.json_ld)
+    if rating is not None:
+        return True, rating
 
     # Try to extract from text patterns like "4.5/5"
     matches = _RATING_NUMBER_RE.findall(text)
@@ -231,24 +211,28 @@ def _find_aggregate_rating(data) -> float | None:
     return None
 
 
-def _analyze_sentiment(text: str) -> dict:
-    """Analyze sentiment of a single review text. Returns scores and matched keywords."""
+def _analyze_sentiment(text: str, found: set | None = None) -> dict:
+    """Analyze sentiment of a single review text. Returns scores and matched keywords.
+
+    ``found`` is ``_REVIEW_MATCHER.labels(text)`` when the caller already has it.
+    """
+    if found is None:
+        found = _REVIEW_MATCHER.labels(text)
     positive_score = 0.0
     negative_score = 0.0
     positive_matches: list[str] = []
     negative_matches: list[str] = []
 
-    for lang_patterns in _POSITIVE_PATTERNS.values():
-        for pattern, weight in lang_patterns:
-            if pattern.search(text):
-                positive_score += weight
-                positive_matches.append(pattern.pattern.replace("\\", ""))
-
-    for lang_patterns in _NEGATIVE_PATTERNS.values():
-        for pattern, weight in lang_patterns:
-            if pattern.search(text):
-                negative_score += weight
-                negative_matches.append(pattern.pattern.replace("\\", ""))
+    for label, weight in _SENTIMENT_LABELS:
+        if label not in found:
+            continue
+        polarity, _lang, kw = label
+        if polarity == "positive":
+            positive_score += weight
+            positive_matches.append(kw)
+        else:
+            negative_score += weight
+            negative_matches.append(kw)
 
     total = positive_score + negative_score
     if total == 0:
@@ -268,20 +252,18 @@ def _analyze_sentiment(text: str) -> dict:
     }
 
 
-def _match_procedures(text: str) -> list[str]:
+def _match_procedures(text: str, found: set | None = None) -> list[str]:
     """Match review text to procedure types."""
-    found = []
-    for proc_key, pattern in _PROCEDURE_PATTERNS.items():
-        if pattern.search(text):
-            found.append(proc_key)
-    return found
+    if found is None:
+        found = _REVIEW_MATCHER.labels(text)
+    return [key for key in PROCEDURE_KEYWORDS if ("procedure", key) in found]
 
 
-def analyze_review_sentiment(pages: list[dict]) -> dict:
+def analyze_review_sentiment(pages: list[dict] | list[ParsedPage]) -> dict:
     """Analyze patient review sentiment from crawled pages.
 
     Args:
-        pages: List of crawled page dicts with keys: url, html
+        pages: ParsedPage objects or crawled page dicts with keys: url, html
 
     Returns:
         Analysis result with sentiment scores, keywords, procedure breakdown, etc.
@@ -294,22 +276,19 @@ def analyze_review_sentiment(pages: list[dict]) -> dict:
     has_star_ratings = False
     all_ratings: list[float] = []
 
-    for page in pages:
-        url = page.get("url", "")
-        html = page.get("html", "")
-
-        is_review = _is_review_page(url, html)
-        has_section = _has_review_section(html)
+    for page in as_pages(pages):
+        is_review = _is_review_page(page.url, page)
+        has_section = _has_review_section(page)
         if is_review or has_section:
             has_review_section = True
 
         # Extract reviews from review pages/sections
         if is_review or has_section:
-            reviews = _extract_review_texts(html)
+            reviews = _extract_review_texts(page)
             all_reviews.extend(reviews)
 
         # Detect star ratings
-        stars, rating = _detect_star_ratings(html)
+        stars, rating = _detect_star_ratings(page)
         if stars:
             has_star_ratings = True
         if rating is not None:
@@ -341,7 +320,8 @@ def analyze_review_sentiment(pages: list[dict]) -> dict:
     })
 
     for review_text in all_reviews:
-        result = _analyze_sentiment(review_text)
+        found = _REVIEW_MATCHER.labels(review_text)
+        result = _analyze_sentiment(review_text, found)
         sentiment = result["sentiment"]
 
         if sentiment == "positive":
@@ -355,7 +335,7 @@ def analyze_review_sentiment(pages: list[dict]) -> dict:
         all_negative_keywords.extend(result["negative_keywords"])
 
         # Match to procedures
-        procs = _match_procedures(review_text)
+        procs = _match_procedures(review_text, found)
         for proc in procs:
             procedure_sentiments[proc]["review_count"] += 1
             procedure_sentiments[proc][sentiment] += 1
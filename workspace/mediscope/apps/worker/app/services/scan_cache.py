@@ -0,0 +1,116 @@
+"""Scan-level single-flight and short-TTL result cache.
+
+Repeated ``/worker/scan`` requests for the same hospital (demos, page reloads)
+used to re-crawl the site and re-hit PageSpeed/Serper/Gemini every time.
+``ScanCache.run`` keys a scan by the crawler's ``url_key`` plus the options that change its
+result: identical scans already in flight share one ``run_scan``, and completed
+results are served for ``settings.scan_cache_ttl`` seconds unless the caller
+asks for ``force_refresh``.
+
+Results that carry an ``error`` (site unreachable) and exceptions are never
+cached; concurrent waiters of a failed scan all see the exception.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from ..config import settings
+from .url_normalizer import url_key
+
+logger = logging.getLogger("checkyourhospital.scan_cache")
+
+
+def scan_key(url: str, options: dict) -> str:
+    """Cache key: ``url_key`` of the URL plus result-affecting options (sorted, JSON)."""
+    return json.dumps([url_key(url), options], sort_keys=True, default=str)
+
+
+class ScanCache:
+    def __init__(self, ttl: float | None = None, max_entries: int | None = None):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._results: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0}
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl if self._ttl is not None else settings.scan_cache_ttl
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is not None:
+            return self._max_entries
+        return settings.scan_cache_max_entries
+
+    def clear(self) -> None:
+        self._results.clear()
+
+    def _lookup(self, key: str) -> tuple[float, dict] | None:
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        stored_at, _ = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._results[key]
+            return None
+        self._results.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, result: dict) -> None:
+        if self.ttl <= 0 or result.get("error"):
+            return
+        self._results[key] = (time.monotonic(), result)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    async def run(
+        self,
+        key: str,
+        scan: Callable[[], Awaitable[dict]],
+        *,
+        force_refresh: bool = False,
+    ) -> dict:
+        """Return a cached or shared result for ``key``, running ``scan()`` only if needed.
+
+        The returned dict is a shallow copy with a ``scan_cache`` entry describing
+        where it came from, so callers may add top-level keys freely.
+        """
+        if force_refresh:
+            self.stats["refreshes"] += 1
+        else:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.stats["hits"] += 1
+                stored_at, result = entry
+                age = round(time.monotonic() - stored_at, 1)
+                return {**result, "scan_cache": {"hit": True, "coalesced": False, "age_s": age}}
+
+        task = self._inflight.get(key)
+        coalesced = task is not None
+        if coalesced:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+            task = asyncio.create_task(self._run_and_store(key, scan))
+            self._inflight[key] = task
+
+        # shield: one cancelled waiter must not cancel the scan others are waiting on
+        result = await asyncio.shield(task)
+        return {**result, "scan_cache": {"hit": False, "coalesced": coalesced, "age_s": 0.0}}
+
+    async def _run_and_store(self, key: str, scan: Callable[[], Awaitable[dict]]) -> dict:
+        try:
+            result = await scan()
+            self._store(key, result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+
+scan_cache = ScanCache()
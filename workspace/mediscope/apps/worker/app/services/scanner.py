@@ -1,6 +1,8 @@
 """Scanner orchestrator: runs all checks and produces a score."""
 
+import asyncio
 import logging
+import time
 
 import httpx
 
@@ -21,8 +23,11 @@ from ..checks.multilingual import (
     check_multilingual_pages,
     check_overseas_channels,
 )
+from ..checks.parsed_page import ParsedPage
+from ..checks.performance import _fallback_results as _performance_fallback
 from ..checks.performance import check_performance
 from ..checks.robots import check_robots
+from ..checks.server_performance import check_server_performance
 from ..checks.sitemap import check_sitemap
 from ..checks.structured_data import (
     check_eeat_signals,
@@ -31,9 +36,11 @@ from ..checks.structured_data import (
 )
 from ..checks.url_structure import check_url_structure
 from ..config import settings
+from ..security.ssrf import validate_url_async
 from .competitor_discovery import discover_competitors
 from .content_freshness_analyzer import analyze_content_freshness
-from .crawler import Crawler
+from .crawler import Crawler, CrawlResult
+from .http_clients import get_client
 from .international_usability import analyze_international_usability
 from .keyword_engine import extract_and_generate_keywords
 from .medical_compliance import check_medical_compliance
@@ -41,10 +48,12 @@ from .multilingual_analyzer import analyze_multilingual_readiness
 from .patient_journey_scorer import calculate_journey_scores
 from .portal_scorer import calculate_portal_scores
 from .procedure_completeness import analyze_procedure_completeness
+from .response_memo import MemoizedClient
 from .review_sentiment import analyze_review_sentiment
 from .scorer import calculate_score
 from .season_insight import get_season_insight
 from .serp_checker import check_keyword_rankings
+from .stage_graph import Stage, run_stages
 from .tech_stack_detector import detect_tech_stack
 from .video_presence import analyze_video_presence
 from .voice_search_analyzer import analyze_voice_search_readiness
@@ -52,10 +61,36 @@ from .voice_search_analyzer import analyze_voice_search_readiness
 logger = logging.getLogger("checkyourhospital.scanner")
 
 
-async def _safe_check(coro, name: str) -> CheckResult | None:
-    """Run a check safely — return None on unexpected crash instead of killing scan."""
+def _remaining(deadline: float, cap: float) -> float:
+    """Seconds a step may take: its own cap, clipped to what is left of the scan budget."""
+    return max(0.0, min(cap, deadline - time.monotonic()))
+
+
+def _timeout_result(name: str, seconds: float) -> CheckResult:
+    """Result for a check cut off by its timeout or the scan deadline."""
+    return CheckResult(
+        name=name, score=0.0, grade=Grade.FAIL,
+        fail_type="system_limit",
+        display_name=name,
+        description="측정 시간이 초과되어 이 항목을 완료하지 못했습니다",
+        recommendation="잠시 후 다시 진단을 시도해주세요",
+        issues=[f"측정 시간 초과 ({seconds:.0f}초)"],
+        details={"timed_out": True, "timeout_s": round(seconds, 1)},
+    )
+
+
+async def _safe_check(coro, name: str, timeout: float | None = None) -> CheckResult | None:
+    """Run a check safely — return None on unexpected crash instead of killing scan.
+
+    With ``timeout``, an overrunning check is cancelled and reported as ``system_limit``.
+    """
     try:
-        return await coro
+        if timeout is None:
+            return await coro
+        return await asyncio.wait_for(coro, timeout)
+    except TimeoutError:
+        logger.warning("Check %s timed out after %.1fs", name, timeout)
+        return _timeout_result(name, timeout)
     except Exception as e:
         logger.error(f"Check {name} crashed: {e}")
         return CheckResult(
@@ -84,6 +119,222 @@ def _safe_sync(fn, name: str) -> CheckResult:
         )
 
 
+async def _safe_performance(
+    client: httpx.AsyncClient, url: str, timeout: float
+) -> list[CheckResult]:
+    """PageSpeed check (4 results) with a timeout; never raises."""
+    try:
+        return await asyncio.wait_for(check_performance(client, url), timeout)
+    except TimeoutError:
+        logger.warning("Performance check timed out after %.1fs", timeout)
+        return _performance_fallback(f"측정 시간 초과 ({timeout:.0f}초)", fail_type="system_limit")
+    except Exception as e:
+        logger.error(f"Performance check crashed: {e}")
+        return []
+
+
+async def _safe_competitors(url: str, hospital_name: str, deadline: float) -> dict | None:
+    """Regional competitor comparison. This depends on optional Supabase data and
+    must not block the core scan when benchmark tables are unavailable."""
+    timeout = _remaining(deadline, settings.scan_check_timeout)
+    try:
+        return await asyncio.wait_for(
+            discover_competitors(url, hospital_name=hospital_name), timeout
+        )
+    except TimeoutError:
+        logger.warning("Competitor discovery timed out after %.1fs", timeout)
+    except Exception as e:
+        logger.error("Competitor discovery crashed: %s", e)
+    return None
+
+
+async def _safe_keyword_rankings(url: str, score_data: dict, deadline: float) -> dict:
+    """Keyword rankings (SERP check) — uses keyword_analysis if available."""
+    kw_list = score_data.get("keyword_analysis", {}).get("keywords", [])
+    if not kw_list:
+        return {}
+    timeout = _remaining(deadline, settings.scan_check_timeout)
+    try:
+        return await asyncio.wait_for(check_keyword_rankings(url, kw_list), timeout)
+    except TimeoutError:
+        logger.warning("SERP checker timed out after %.1fs", timeout)
+    except Exception as e:
+        logger.error("SERP checker crashed: %s", e)
+    return {}
+
+
+async def _await_performance(perf_task: asyncio.Task) -> list[CheckResult]:
+    """Performance checks (returns 4 results) — the task is started before the crawl."""
+    return await perf_task
+
+
+def _check_stage(name: str, check, inputs: tuple[str, ...]) -> Stage:
+    """Async check stage: ``check(*inputs)`` under the per-check timeout and scan deadline."""
+
+    async def run(deadline: float, **kwargs) -> CheckResult | None:
+        timeout = _remaining(deadline, settings.scan_check_timeout)
+        # By name, not kwargs order: the arguments must follow ``inputs``
+        return await _safe_check(check(*(kwargs[i] for i in inputs)), name, timeout)
+
+    return Stage(name, run, ("deadline", *inputs), "async")
+
+
+def _html_checks(main_page: ParsedPage, url: str, crawled_urls: list[str]) -> list[CheckResult]:
+    """Sync checks (HTML parsing, each wrapped for safety)."""
+    return [
+        _safe_sync(fn, name)
+        for fn, name in [
+            (lambda: check_meta_tags(main_page, url), "meta_tags"),
+            (lambda: check_headings(main_page), "headings"),
+            (lambda: check_images(main_page), "images_alt"),
+            (lambda: check_canonical(main_page, url), "canonical"),
+            (lambda: check_url_structure(url, crawled_urls), "url_structure"),
+            (lambda: check_mobile(main_page), "mobile"),
+            (lambda: check_multilingual_pages(main_page, crawled_urls), "multilingual_pages"),
+            (lambda: check_hreflang(main_page), "hreflang"),
+            (lambda: check_overseas_channels(main_page), "overseas_channels"),
+        ]
+    ]
+
+
+def _geo_html_checks(main_page: ParsedPage, url: str, pages: list[ParsedPage]) -> list[CheckResult]:
+    """GEO/AEO: HTML-based checks (sync)."""
+    return [
+        _safe_sync(fn, name)
+        for fn, name in [
+            (lambda: check_structured_data(main_page), "structured_data"),
+            (lambda: check_faq_content(main_page), "faq_content"),
+            (lambda: check_eeat_signals(main_page, url, pages), "eeat_signals"),
+            (lambda: check_content_clarity(main_page), "content_clarity"),
+        ]
+    ]
+
+
+def _collect_results(**outputs) -> list[CheckResult]:
+    """Flatten check stage outputs, in stage order, into one result list."""
+    results: list[CheckResult] = []
+    for out in outputs.values():
+        if isinstance(out, list):
+            results.extend(out)
+        elif out:
+            results.append(out)
+    return results
+
+
+def _conversion_analysis(pages: list[ParsedPage]) -> dict:
+    """Conversion element analysis, flattened for the report."""
+    result = _safe_sync(lambda: check_conversion_elements(pages), "conversion_elements")
+    return {
+        "score": round(result.score * 100),
+        "grade": result.grade.value,
+        **result.details,
+    }
+
+
+def _server_performance(crawl_results: list[CrawlResult]) -> dict:
+    """Delivery performance from crawl metadata, flattened for the report."""
+    result = _safe_sync(lambda: check_server_performance(crawl_results), "server_performance")
+    return {
+        "score": round(result.score * 100),
+        "grade": result.grade.value,
+        "issues": result.issues,
+        **result.details,
+    }
+
+
+def _category_scores(score_data: dict) -> dict:
+    return score_data.get("category_scores", {})
+
+
+# Checks, in report order. Stage inputs name keys of the scan context built in
+# run_scan; each stage's result is stored under its own name.
+CHECK_STAGES: list[Stage] = [
+    _check_stage("robots_txt", check_robots, ("client", "url")),
+    _check_stage("sitemap", check_sitemap, ("client", "url")),
+    _check_stage("https", check_https, ("client", "url")),
+    _check_stage("links", check_links, ("client", "main_page", "url")),
+    _check_stage("errors_404", check_errors, ("client", "crawled_urls")),
+    Stage("performance", _await_performance, ("perf_task",), "async"),
+    Stage("html_checks", _html_checks, ("main_page", "url", "crawled_urls")),
+]
+
+GEO_CHECK_STAGES: list[Stage] = [
+    _check_stage(
+        "ai_search_mention",
+        check_ai_search_mention,
+        ("client", "url", "hospital_name", "specialty", "region_name"),
+    ),
+    _check_stage(
+        "international_search",
+        check_international_search,
+        ("client", "url", "hospital_name", "specialty", "region_name"),
+    ),
+    Stage("geo_html_checks", _geo_html_checks, ("main_page", "url", "pages")),
+]
+
+# Everything downstream of the checks. "cpu" stages run off the event loop
+# (see analyzer_executor); a new analyzer only lengthens the scan if it depends
+# on something slow.
+ANALYZER_STAGES: list[Stage] = [
+    Stage("score_data", calculate_score, ("results",)),
+    Stage("category_scores", _category_scores, ("score_data",)),
+    Stage("portal_scores", calculate_portal_scores, ("category_scores",)),
+    Stage("patient_journey", calculate_journey_scores, ("category_scores",)),
+    Stage("season_insight", get_season_insight),
+    Stage("competitor_analysis", _safe_competitors, ("url", "hospital_name", "deadline"), "async"),
+    Stage("keyword_rankings", _safe_keyword_rankings, ("url", "score_data", "deadline"), "async"),
+    Stage("multilingual_readiness", analyze_multilingual_readiness, ("pages",), "cpu"),
+    Stage("content_freshness", analyze_content_freshness, ("pages",), "cpu"),
+    Stage("conversion_analysis", _conversion_analysis, ("pages",), "cpu"),
+    Stage("server_performance", _server_performance, ("crawl_results",)),
+    Stage("procedure_completeness", analyze_procedure_completeness, ("pages",), "cpu"),
+    Stage("medical_compliance", check_medical_compliance, ("pages",), "cpu"),
+    Stage("tech_stack", detect_tech_stack, ("pages", "response_headers"), "cpu"),
+    Stage("video_presence", analyze_video_presence, ("pages",), "cpu"),
+    Stage("review_sentiment", analyze_review_sentiment, ("pages",), "cpu"),
+    Stage(
+        "generated_keywords", extract_and_generate_keywords, ("pages", "region_name"), "cpu"
+    ),
+    Stage(
+        "voice_search", analyze_voice_search_readiness, ("pages", "category_scores"), "cpu"
+    ),
+    Stage(
+        "international_usability",
+        analyze_international_usability,
+        ("pages", "multilingual_readiness"),
+        "cpu",
+    ),
+]
+
+# Stage outputs copied into the scan result, in report order
+_REPORT_KEYS = [
+    "portal_scores",
+    "competitor_analysis",
+    "multilingual_readiness",
+    "content_freshness",
+    "patient_journey",
+    "conversion_analysis",
+    "server_performance",
+    "procedure_completeness",
+    "medical_compliance",
+    "voice_search",
+    "tech_stack",
+    "international_usability",
+    "review_sentiment",
+    "season_insight",
+    "video_presence",
+    "generated_keywords",
+    "keyword_rankings",
+]
+
+
+def scan_stages(check_geo: bool = True) -> list[Stage]:
+    """The full post-crawl stage graph for one scan."""
+    checks = CHECK_STAGES + (GEO_CHECK_STAGES if check_geo else [])
+    collect = Stage("results", _collect_results, tuple(s.name for s in checks))
+    return [*checks, collect, *ANALYZER_STAGES]
+
+
 async def run_scan(
     url: str,
     *,
@@ -94,12 +345,42 @@ async def run_scan(
     specialty: str = "",
     region: str = "",
     hospital_id: str | None = None,
+    crawl_concurrency: int | None = None,
 ) -> dict:
-    """Run full SEO + GEO/AEO scan on a URL. Returns scored results."""
-    crawler = Crawler(max_pages=max_pages, max_depth=max_depth)
+    """Run full SEO + GEO/AEO scan on a URL. Returns scored results.
+
+    After the crawl, checks and analyzers run as a stage graph (``scan_stages``):
+    each starts as soon as its inputs are ready. Everything runs within
+    ``settings.scan_deadline``:
+
+    - the crawl stops after ``scan_crawl_timeout`` (or at the deadline) and the
+      scan goes on with the pages crawled so far
+    - network-bound checks get their own timeout; one that overruns comes back
+      as ``system_limit``
+    - analyzer (cpu) stages still running at the deadline are given up and
+      report ``None``
+    """
+    started = time.monotonic()
+    deadline = started + settings.scan_deadline
+    crawler = Crawler(max_pages=max_pages, max_depth=max_depth, concurrency=crawl_concurrency)
+    await validate_url_async(url)
+
+    # Checks share the app-wide site client (pooled across scans). PageSpeed, which
+    # depends only on the URL, starts before the crawl so the two overlap.
+    client = get_client("sites")
+    perf_task = asyncio.create_task(
+        _safe_performance(
+            get_client("googleapis"), url, _remaining(deadline, settings.scan_performance_timeout)
+        )
+    )
 
     # Crawl pages
-    pages = await crawler.crawl(url)
+    pages = []
+    try:
+        pages = await crawler.crawl(url, timeout=_remaining(deadline, settings.scan_crawl_timeout))
+    finally:
+        if not pages:
+            perf_task.cancel()
     if not pages:
         return {
             "url": url,
@@ -109,200 +390,65 @@ async def run_scan(
             "category_scores": {},
         }
 
-    main_page = pages[0]
-    crawled_urls = [p.url for p in pages]
-    all_results: list[CheckResult] = []
+    # Parse each page once; every check and analyzer shares these
+    parsed = [p.parsed for p in pages]
+    main_page = parsed[0]
 
     # Auto-extract hospital name from page title if not provided
     if not hospital_name:
-        from bs4 import BeautifulSoup
-
-        soup = BeautifulSoup(main_page.html, "lxml")
-        title_tag = soup.find("title")
-        if title_tag and title_tag.string:
+        if main_page.title:
             # Clean title: remove common suffixes like " - 홈페이지", " | 공식 사이트"
-            raw_title = title_tag.string.strip()
+            raw_title = main_page.title
             for sep in [" - ", " | ", " :: ", " – ", " — "]:
                 if sep in raw_title:
                     raw_title = raw_title.split(sep)[0].strip()
                     break
             hospital_name = raw_title
 
-    # Run checks — async checks need an HTTP client
-    async with httpx.AsyncClient(
-        timeout=settings.crawler_timeout,
-        follow_redirects=True,
-        headers={"User-Agent": "CheckYourHospital-Bot/1.0"},
-    ) as client:
-        # Async checks (each wrapped for safety)
-        for coro, name in [
-            (check_robots(client, url), "robots_txt"),
-            (check_sitemap(client, url), "sitemap"),
-            (check_https(client, url), "https"),
-            (check_links(client, main_page.html, url), "links"),
-            (check_errors(client, crawled_urls), "errors_404"),
-        ]:
-            r = await _safe_check(coro, name)
-            if r:
-                all_results.append(r)
-
-        # Performance checks (returns 4 results)
-        try:
-            perf_results = await check_performance(client, url)
-            all_results.extend(perf_results)
-        except Exception as e:
-            logger.error(f"Performance check crashed: {e}")
-
-        # GEO/AEO: AI search mention (async, optional)
-        if check_geo:
-            for coro, name in [
-                (
-                    check_ai_search_mention(client, url, hospital_name, specialty, region),
-                    "ai_search_mention",
-                ),
-                (
-                    check_international_search(client, url, hospital_name, specialty, region),
-                    "international_search",
-                ),
-            ]:
-                r = await _safe_check(coro, name)
-                if r:
-                    all_results.append(r)
-
-    # Sync checks (HTML parsing, each wrapped for safety)
-    for fn, name in [
-        (lambda: check_meta_tags(main_page.html, url), "meta_tags"),
-        (lambda: check_headings(main_page.html), "headings"),
-        (lambda: check_images(main_page.html), "images_alt"),
-        (lambda: check_canonical(main_page.html, url), "canonical"),
-        (lambda: check_url_structure(url, crawled_urls), "url_structure"),
-        (lambda: check_mobile(main_page.html), "mobile"),
-        (lambda: check_multilingual_pages(main_page.html, crawled_urls), "multilingual_pages"),
-        (lambda: check_hreflang(main_page.html), "hreflang"),
-        (lambda: check_overseas_channels(main_page.html), "overseas_channels"),
-    ]:
-        all_results.append(_safe_sync(fn, name))
-
-    # GEO/AEO: HTML-based checks (sync)
-    if check_geo:
-        for fn, name in [
-            (lambda: check_structured_data(main_page.html), "structured_data"),
-            (lambda: check_faq_content(main_page.html), "faq_content"),
-            (lambda: check_eeat_signals(main_page.html, url, pages), "eeat_signals"),
-            (lambda: check_content_clarity(main_page.html), "content_clarity"),
-        ]:
-            all_results.append(_safe_sync(fn, name))
-
-    # Multilingual readiness analysis (uses all crawled pages)
-    page_dicts = [{"url": p.url, "html": p.html, "status_code": p.status_code} for p in pages]
-    multilingual_readiness = analyze_multilingual_readiness(page_dicts)
-
-    # Content freshness analysis
-    content_freshness = analyze_content_freshness(page_dicts)
-
-    # Score
-    score_data = calculate_score(all_results)
-
-    portal_scores = calculate_portal_scores(score_data.get("category_scores", {}))
-
-    # Regional competitor comparison. This depends on optional Supabase data and
-    # must not block the core scan when benchmark tables are unavailable.
-    competitor_analysis = None
-    try:
-        competitor_analysis = await discover_competitors(url, hospital_name=hospital_name)
-    except Exception as e:
-        logger.error("Competitor discovery crashed: %s", e)
-
-    # Patient journey funnel scores
-    patient_journey = calculate_journey_scores(score_data.get("category_scores", {}))
-
-    # Conversion element analysis
-    conversion_result = _safe_sync(
-        lambda: check_conversion_elements(
-            [{"url": p.url, "html": p.html, "status_code": p.status_code} for p in pages]
-        ),
-        "conversion_elements",
-    )
-    conversion_analysis = {
-        "score": round(conversion_result.score * 100),
-        "grade": conversion_result.grade.value,
-        **conversion_result.details,
+    # Checks answer from what the crawl already fetched; only new URLs hit the network
+    checks_client = MemoizedClient(client, crawler.memo)
+    context = {
+        "url": url,
+        "client": checks_client,
+        "deadline": deadline,
+        "perf_task": perf_task,
+        "pages": parsed,
+        "crawl_results": pages,
+        "response_headers": {p.url: p.headers for p in pages},
+        "main_page": main_page,
+        "crawled_urls": [p.url for p in pages],
+        "hospital_name": hospital_name,
+        "specialty": specialty,
+        "region_name": region,
     }
+    stage_timings = await run_stages(scan_stages(check_geo), context, cpu_deadline=deadline)
 
-    # Procedure completeness analysis
-    procedure_completeness = analyze_procedure_completeness(
-        [{"url": p.url, "html": p.html} for p in pages]
-    )
-
-    # Medical advertising compliance check
-    medical_compliance = check_medical_compliance(
-        [{"url": p.url, "html": p.html} for p in pages]
-    )
-
-    # Voice search readiness analysis
-    voice_search = analyze_voice_search_readiness(
-        [{"url": p.url, "html": p.html} for p in pages],
-        score_data.get("category_scores", {}),
-    )
-
-    # Tech stack detection
-    tech_stack = detect_tech_stack(
-        [{"url": p.url, "html": p.html} for p in pages]
-    )
-
-    # Video presence analysis
-    video_presence = analyze_video_presence(
-        [{"url": p.url, "html": p.html} for p in pages]
-    )
-
-    # International usability analysis
-    page_dicts = [{"url": p.url, "html": p.html} for p in pages]
-    international_usability = analyze_international_usability(page_dicts, multilingual_readiness)
-
-    # Review sentiment analysis
-    review_sentiment = analyze_review_sentiment(
-        [{"url": p.url, "html": p.html} for p in pages]
-    )
-
-    # Keyword engine: extract procedures and generate search keywords
-    generated_keywords = extract_and_generate_keywords(
-        [{"url": p.url, "html": p.html} for p in pages],
-        region_name=region,
-    )
-
-    # Season insight (date-based, no URL dependency)
-    season_insight = get_season_insight()
-
-    # Keyword rankings (SERP check) — uses keyword_analysis if available
-    keyword_rankings = {}
-    keyword_analysis = score_data.get("keyword_analysis", {})
-    kw_list = keyword_analysis.get("keywords", [])
-    if kw_list:
-        try:
-            keyword_rankings = await check_keyword_rankings(url, kw_list)
-        except Exception as e:
-            logger.error("SERP checker crashed: %s", e)
+    all_results: list[CheckResult] = context["results"]
+    score_data = context["score_data"]
 
     scan_result = {
         "url": url,
         "pages_crawled": len(pages),
+        "crawl_stats": crawler.stats,
+        "response_memo": checks_client.memo.stats(),
+        "scan_budget": {
+            "deadline_s": settings.scan_deadline,
+            "elapsed_ms": round((time.monotonic() - started) * 1000),
+            "crawl_timed_out": crawler.stats.get("timed_out", False),
+            "timed_out": [r.name for r in all_results if r.details.get("timed_out")],
+            "stages_timed_out": [
+                name for name, timing in stage_timings.items() if timing.get("timed_out")
+            ],
+            "regex_guard": [
+                event
+                for key in _REPORT_KEYS
+                if isinstance(context[key], dict)
+                for event in context[key].get("details", {}).get("regex_guard", [])
+            ],
+        },
+        "stage_timings": stage_timings,
         **score_data,
-        "portal_scores": portal_scores,
-        "competitor_analysis": competitor_analysis,
-        "multilingual_readiness": multilingual_readiness,
-        "content_freshness": content_freshness,
-        "patient_journey": patient_journey,
-        "conversion_analysis": conversion_analysis,
-        "procedure_completeness": procedure_completeness,
-        "medical_compliance": medical_compliance,
-        "voice_search": voice_search,
-        "tech_stack": tech_stack,
-        "international_usability": international_usability,
-        "review_sentiment": review_sentiment,
-        "season_insight": season_insight,
-        "video_presence": video_presence,
-        "generated_keywords": generated_keywords,
-        "keyword_rankings": keyword_rankings,
+        **{key: context[key] for key in _REPORT_KEYS},
     }
 
     if hospital_id:
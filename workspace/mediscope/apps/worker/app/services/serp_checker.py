@@ -1,5 +1,12 @@
-"""SERP checker: check keyword rankings on Naver and Google."""
+"""SERP checker: check keyword rankings on Naver and Google.
 
+SERPs are cached in two tiers: a size-bounded in-process LRU (entries live no
+longer than the matching ``serp_cache`` row) in front of the Supabase
+``serp_cache`` table (7-day TTL). Overlapping keyword sets across clinics in a
+region are then answered without DB or API round-trips.
+"""
+
+import asyncio
 import logging
 from collections import defaultdict
 from datetime import datetime, timedelta
@@ -8,13 +15,16 @@ from urllib.parse import urlparse
 import httpx
 
 from ..config import settings
-from ..db.supabase import get_supabase_client
+from ..db.repository import get_repository, gte, in_
+from .http_clients import get_client
+from .ttl_cache import MISSING, TTLCache
 
 logger = logging.getLogger("checkyourhospital.serp_checker")
 
 _CACHE_TTL_DAYS = 7
 _NAVER_SEARCH_URL = "https://openapi.naver.com/v1/search/webkeyword.json"
 _SERPER_SEARCH_URL = "https://google.serper.dev/search"
+_CLIENTS = {"naver": "naver", "google": "serper"}  # portal → shared http_clients target
 
 
 async def check_keyword_rankings(
@@ -31,53 +41,43 @@ async def check_keyword_rankings(
     Returns:
         Dict with results, summary, and competitors_in_serp.
     """
-    has_naver = bool(settings.naver_client_id and settings.naver_client_secret)
-    has_google = bool(settings.serper_api_key)
+    fetchers = {}
+    if settings.naver_client_id and settings.naver_client_secret:
+        fetchers["naver"] = _search_naver
+    if settings.serper_api_key:
+        fetchers["google"] = _search_google
+
+    entries: list[dict] = [
+        {
+            "keyword": kw_entry["keyword"],
+            "language": kw_entry.get("language", "ko"),
+            "naver": {"rank": None, "cached": False},
+            "google": {"rank": None, "cached": False},
+        }
+        for kw_entry in keywords
+        if kw_entry.get("keyword")
+    ]
+    serps: dict[tuple[str, str], list[dict] | None] = {}
+    cached_keys: set[tuple[str, str]] = set()
+
+    if entries and fetchers:
+        unique_keywords = list(dict.fromkeys(e["keyword"] for e in entries))
+        pairs = [(keyword, portal) for keyword in unique_keywords for portal in fetchers]
+        serps, cached_keys = await _lookup_serps(pairs, fetchers)
 
     results: list[dict] = []
     competitor_counts: dict[str, dict] = defaultdict(
         lambda: {"appearances": 0, "ranks": [], "name": ""}
     )
-
-    async with httpx.AsyncClient(timeout=15) as client:
-        for kw_entry in keywords:
-            keyword = kw_entry.get("keyword", "")
-            language = kw_entry.get("language", "ko")
-            if not keyword:
-                continue
-
-            entry: dict = {
-                "keyword": keyword,
-                "language": language,
-                "naver": {"rank": None, "cached": False},
-                "google": {"rank": None, "cached": False},
-            }
-
-            # --- Naver ---
-            if has_naver:
-                naver_results, cached = await _get_or_fetch(
-                    client, keyword, "naver", _search_naver
-                )
-                entry["naver"]["cached"] = cached
-                if naver_results is not None:
-                    entry["naver"]["rank"] = _find_rank(naver_results, hospital_url)
-                    _collect_competitors(
-                        naver_results, hospital_url, competitor_counts
-                    )
-
-            # --- Google ---
-            if has_google:
-                google_results, cached = await _get_or_fetch(
-                    client, keyword, "google", _search_google
-                )
-                entry["google"]["cached"] = cached
-                if google_results is not None:
-                    entry["google"]["rank"] = _find_rank(google_results, hospital_url)
-                    _collect_competitors(
-                        google_results, hospital_url, competitor_counts
-                    )
-
-            results.append(entry)
+    for entry in entries:
+        for portal in fetchers:
+            key = (entry["keyword"], portal)
+            entry[portal]["cached"] = key in cached_keys
+            portal_results = serps.get(key)
+            if portal_results is not None:
+                entry[portal]["rank"] = _find_rank(portal_results, hospital_url)
+                _collect_competitors(portal_results, hospital_url, competitor_counts)
+        results.append(entry)
 
     summary = _build_summary(results)
     competitors = _build_competitors(competitor_counts)
@@ -234,8 +234,12 @@ def _build_summary(results: list[dict]) -> dict:
         }
 
     return {
-        "naver_avg_rank": round(sum(naver_ranks) / len(naver_ranks), 1) if naver_ranks else None,
-        "google_avg_rank": round(sum(google_ranks) / len(google_ranks), 1) if google_ranks else None,
+        "naver_avg_rank": (
+            round(sum(naver_ranks) / len(naver_ranks), 1) if naver_ranks else None
+        ),
+        "google_avg_rank": (
+            round(sum(google_ranks) / len(google_ranks), 1) if google_ranks else None
+        ),
         "keywords_found_naver": len(naver_ranks),
         "keywords_found_google": len(google_ranks),
         "keywords_total": len(results),
@@ -248,61 +252,164 @@ def _build_summary(results: list[dict]) -> dict:
 # Cache
 # ---------------------------------------------------------------------------
 
-async def _get_or_fetch(
-    client: httpx.AsyncClient,
-    keyword: str,
-    portal: str,
-    fetch_fn,
-) -> tuple[list[dict] | None, bool]:
-    """Return (results, cached). Try cache first, then fetch and save."""
-    cached = await _get_cached(keyword, portal)
-    if cached is not None:
-        return cached, True
-
-    results = await fetch_fn(client, keyword)
-    if results is not None:
-        await _save_cache(keyword, portal, results)
-    return results, False
-
-
-async def _get_cached(keyword: str, portal: str) -> list[dict] | None:
-    """Get cached SERP results if not expired (7-day TTL)."""
+_memory_cache = TTLCache(
+    max_entries=settings.serp_memory_cache_max_entries,
+    ttl=_CACHE_TTL_DAYS * 86400,
+)
+_tier_counts = {"memory_hits": 0, "negative_hits": 0, "db_hits": 0, "fetches": 0}
+
+
+def serp_cache_stats() -> dict:
+    """Hit counters for the two cache tiers (process memory, then ``serp_cache``)."""
+    lookups = _tier_counts["memory_hits"] + _tier_counts["db_hits"] + _tier_counts["fetches"]
+    hits = lookups - _tier_counts["fetches"]
+    return {
+        **_tier_counts,
+        "lookups": lookups,
+        "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        "memory": _memory_cache.stats(),
+    }
+
+
+def clear_serp_memory_cache() -> None:
+    _memory_cache.clear()
+    for key in _tier_counts:
+        _tier_counts[key] = 0
+
+
+def _seconds_until(expires_at: str | None) -> float:
+    """Remaining lifetime of a ``serp_cache`` row, so memory never outlives the DB tier."""
+    default = _CACHE_TTL_DAYS * 86400
     try:
-        sb = get_supabase_client()
-        if sb is None:
-            return None
-        result = (
-            sb.table("serp_cache")
-            .select("results")
-            .eq("keyword", keyword)
-            .eq("portal", portal)
-            .gte("expires_at", datetime.now().isoformat())
-            .single()
-            .execute()
+        expires = datetime.fromisoformat(expires_at)
+    except (TypeError, ValueError):
+        return default
+    now = datetime.now(expires.tzinfo) if expires.tzinfo else datetime.now()
+    return min(default, (expires - now).total_seconds())
+
+
+async def _lookup_serps(
+    pairs: list[tuple[str, str]], fetchers: dict
+) -> tuple[dict[tuple[str, str], list[dict] | None], set[tuple[str, str]]]:
+    """Resolve (keyword, portal) pairs through memory → ``serp_cache`` → search API.
+
+    Returns the SERPs and the set of pairs answered from a cache. Failed fetches
+    are remembered in memory for ``settings.serp_negative_ttl`` seconds (not
+    written to the DB), so a failing provider is not retried on every scan.
+    """
+    serps: dict[tuple[str, str], list[dict] | None] = {}
+    cached_keys: set[tuple[str, str]] = set()
+
+    for key in pairs:
+        value = _memory_cache.get(key)
+        if value is MISSING:
+            continue
+        serps[key] = value
+        if value is None:
+            _tier_counts["negative_hits"] += 1
+        else:
+            cached_keys.add(key)
+        _tier_counts["memory_hits"] += 1
+
+    pending = [key for key in pairs if key not in serps]
+    if pending:
+        rows = await _get_cached_many(
+            list(dict.fromkeys(k for k, _ in pending)),
+            list(dict.fromkeys(p for _, p in pending)),
         )
-        if result.data:
-            return result.data["results"]
-    except Exception:
-        pass
-    return None
+        for key in pending:
+            row = rows.get(key)
+            if row is None:
+                continue
+            serps[key] = row["results"]
+            cached_keys.add(key)
+            _memory_cache.set(key, row["results"], ttl=_seconds_until(row.get("expires_at")))
+            _tier_counts["db_hits"] += 1
+
+    misses = [key for key in pairs if key not in serps]
+    if misses:
+        _tier_counts["fetches"] += len(misses)
+        fetched = await _fetch_many(misses, fetchers)
+        for key, results in fetched.items():
+            serps[key] = results
+            if results is None:
+                _memory_cache.set(key, None, ttl=settings.serp_negative_ttl)
+            else:
+                _memory_cache.set(key, results)
+        await _save_cache_many(
+            [
+                (keyword, portal, res)
+                for (keyword, portal), res in fetched.items()
+                if res is not None
+            ]
+        )
+
+    return serps, cached_keys
+
+
+async def _get_cached_many(
+    keywords: list[str], portals: list[str]
+) -> dict[tuple[str, str], dict]:
+    """Unexpired cached SERPs for every (keyword, portal) pair, in one ``IN`` query."""
+    try:
+        repo = get_repository()
+        if repo is None:
+            return {}
+        rows = await repo.select_in(
+            "serp_cache",
+            "keyword,portal,results,expires_at",
+            "keyword",
+            keywords,
+            [in_("portal", portals), gte("expires_at", datetime.now().isoformat())],
+        )
+    except Exception as e:
+        logger.warning("Failed to read SERP cache: %s", e)
+        return {}
+    return {
+        (row["keyword"], row["portal"]): row
+        for row in rows
+        if row.get("results") is not None
+    }
+
+
+async def _fetch_many(
+    pairs: list[tuple[str, str]],
+    fetchers: dict,
+) -> dict[tuple[str, str], list[dict] | None]:
+    """Fetch cache misses concurrently, at most ``serp_provider_concurrency`` per portal."""
+    limits = {portal: asyncio.Semaphore(settings.serp_provider_concurrency) for portal in fetchers}
 
+    async def fetch(keyword: str, portal: str) -> list[dict] | None:
+        async with limits[portal]:
+            return await fetchers[portal](get_client(_CLIENTS[portal]), keyword)
 
-async def _save_cache(keyword: str, portal: str, results: list[dict]) -> None:
-    """Upsert SERP results into cache with 7-day TTL."""
+    fetched = await asyncio.gather(*(fetch(keyword, portal) for keyword, portal in pairs))
+    return dict(zip(pairs, fetched))
+
+
+async def _save_cache_many(entries: list[tuple[str, str, list[dict]]]) -> None:
+    """Upsert fetched SERPs into the cache (7-day TTL) in a single batch write."""
+    if not entries:
+        return
     try:
-        sb = get_supabase_client()
-        if sb is None:
+        repo = get_repository()
+        if repo is None:
             return
         now = datetime.now()
-        sb.table("serp_cache").upsert(
-            {
-                "keyword": keyword,
-                "portal": portal,
-                "results": results,
-                "checked_at": now.isoformat(),
-                "expires_at": (now + timedelta(days=_CACHE_TTL_DAYS)).isoformat(),
-            },
+        expires_at = (now + timedelta(days=_CACHE_TTL_DAYS)).isoformat()
+        await repo.upsert(
+            "serp_cache",
+            [
+                {
+                    "keyword": keyword,
+                    "portal": portal,
+                    "results": results,
+                    "checked_at": now.isoformat(),
+                    "expires_at": expires_at,
+                }
+                for keyword, portal, results in entries
+            ],
             on_conflict="keyword,portal",
-        ).execute()
+        )
     except Exception as e:
         logger.warning("Failed to save SERP cache: %s", e)
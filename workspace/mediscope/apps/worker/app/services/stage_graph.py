@@ -0,0 +1,168 @@
+"""Dependency-aware stage scheduler for the scan pipeline.
+
+Each ``Stage`` declares the context keys it reads (``inputs``) and writes its
+return value to the context under its own ``name``. ``run_stages`` starts every
+stage as soon as its inputs exist, so independent stages overlap and a new stage
+only lengthens the scan if it sits on the critical path.
+
+Stage kinds:
+
+- ``sync``  — cheap glue, run inline on the event loop
+- ``async`` — ``fn(**inputs)`` returns an awaitable (network checks)
+- ``cpu``   — page analyzers, run through ``analyzer_executor.run_analyzers``;
+  ``pages`` must be one of the inputs and is passed positionally. The cpu
+  stages that become ready together go out as one batch, so the pages are
+  shipped and parsed once per batch rather than once per analyzer
+
+With a ``cpu_deadline``, a cpu batch still running at the deadline is given up:
+its stages, and every stage that depends on them, output ``None`` and are
+marked ``timed_out`` in the timings. A worker thread or process cannot be
+interrupted, so the abandoned analyzers finish in the background.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .analyzer_executor import run_analyzers
+
+logger = logging.getLogger("checkyourhospital.stage_graph")
+
+KINDS = ("sync", "async", "cpu")
+
+
+class StageGraphError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    fn: Callable
+    inputs: tuple[str, ...] = ()
+    kind: str = "sync"  # sync | async | cpu
+
+
+def validate_stages(stages: list[Stage], provided: set[str]) -> None:
+    """Reject duplicate names, unknown inputs, bad kinds and cycles up front."""
+    names = [s.name for s in stages]
+    dupes = {n for n in names if names.count(n) > 1} | (set(names) & provided)
+    if dupes:
+        raise StageGraphError(f"Duplicate stage outputs: {sorted(dupes)}")
+
+    available = provided | set(names)
+    for stage in stages:
+        if stage.kind not in KINDS:
+            raise StageGraphError(f"Stage {stage.name!r} has unknown kind {stage.kind!r}")
+        missing = [i for i in stage.inputs if i not in available]
+        if missing:
+            raise StageGraphError(f"Stage {stage.name!r} needs unknown inputs {missing}")
+        if stage.kind == "cpu" and "pages" not in stage.inputs:
+            raise StageGraphError(f"cpu stage {stage.name!r} must take 'pages'")
+
+    # Kahn's algorithm — anything left unresolved is on a cycle
+    ready = set(provided)
+    remaining = list(stages)
+    while remaining:
+        resolvable = [s for s in remaining if all(i in ready for i in s.inputs)]
+        if not resolvable:
+            raise StageGraphError(f"Cycle between stages {sorted(s.name for s in remaining)}")
+        ready.update(s.name for s in resolvable)
+        remaining = [s for s in remaining if s not in resolvable]
+
+
+async def _run_async(stage: Stage, kwargs: dict) -> dict:
+    return {stage.name: await stage.fn(**kwargs)}
+
+
+async def _run_cpu(pages, jobs: list[tuple[Stage, dict]], deadline: float | None) -> dict:
+    """Run a cpu batch; raises ``TimeoutError`` once ``deadline`` (monotonic) passes."""
+    batch = run_analyzers(pages, [(stage.name, stage.fn, kwargs) for stage, kwargs in jobs])
+    if deadline is None:
+        return await batch
+    return await asyncio.wait_for(batch, max(0.0, deadline - time.monotonic()))
+
+
+async def run_stages(
+    stages: list[Stage], context: dict, *, cpu_deadline: float | None = None
+) -> dict[str, dict]:
+    """Execute ``stages`` with maximal parallelism, filling ``context`` in place.
+
+    Returns per-stage timings ``{name: {"start_ms", "duration_ms"}}`` relative to
+    the call, plus ``"timed_out": True`` for stages given up at ``cpu_deadline``
+    (a ``time.monotonic()`` value). If a stage raises, the stages still running
+    are cancelled and the exception propagates.
+    """
+    validate_stages(stages, set(context))
+
+    started = time.perf_counter()
+    pending = list(stages)
+    running: dict[asyncio.Task, tuple[list[Stage], float]] = {}
+    timings: dict[str, dict] = {}
+    timed_out: set[str] = set()
+
+    def record(name: str, t0: float) -> None:
+        now = time.perf_counter()
+        timings[name] = {
+            "start_ms": round((t0 - started) * 1000),
+            "duration_ms": round((now - t0) * 1000),
+        }
+        if name in timed_out:
+            timings[name]["timed_out"] = True
+
+    try:
+        while pending or running:
+            # Launch everything that is ready; sync stages may unlock more, so repeat
+            cpu_jobs: list[tuple[Stage, dict]] = []
+            progressed = True
+            while progressed:
+                progressed = False
+                for stage in [s for s in pending if all(i in context for i in s.inputs)]:
+                    pending.remove(stage)
+                    kwargs = {i: context[i] for i in stage.inputs}
+                    t0 = time.perf_counter()
+                    if timed_out.intersection(stage.inputs):
+                        # An input was given up at the deadline: skip this stage too
+                        timed_out.add(stage.name)
+                        context[stage.name] = None
+                        record(stage.name, t0)
+                        progressed = True
+                    elif stage.kind == "sync":
+                        context[stage.name] = stage.fn(**kwargs)
+                        record(stage.name, t0)
+                        progressed = True
+                    elif stage.kind == "cpu":
+                        kwargs.pop("pages")
+                        cpu_jobs.append((stage, kwargs))
+                    else:
+                        running[asyncio.create_task(_run_async(stage, kwargs))] = ([stage], t0)
+            if cpu_jobs:
+                task = asyncio.create_task(_run_cpu(context["pages"], cpu_jobs, cpu_deadline))
+                running[task] = ([stage for stage, _ in cpu_jobs], time.perf_counter())
+
+            if not running:
+                break
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                batch, t0 = running.pop(task)
+                if batch[0].kind == "cpu" and isinstance(task.exception(), TimeoutError):
+                    logger.warning(
+                        "Analyzer stages %s passed the scan deadline", [s.name for s in batch]
+                    )
+                    timed_out.update(s.name for s in batch)
+                    outputs = dict.fromkeys((s.name for s in batch), None)
+                else:
+                    outputs = task.result()
+                for stage in batch:
+                    context[stage.name] = outputs[stage.name]
+                    record(stage.name, t0)
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    logger.debug("Ran %d stages in %.0fms", len(stages), (time.perf_counter() - started) * 1000)
+    return timings
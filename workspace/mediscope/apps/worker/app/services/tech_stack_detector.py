@@ -1,111 +1,43 @@
 """Tech stack detector: identifies marketing/analytics technologies from HTML signatures."""
 
+import json
+import logging
 import re
+from collections import defaultdict
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+from ..checks.parsed_page import ParsedPage, as_pages
+from ..config import settings
+from .keyword_matcher import RegexSet
+
+logger = logging.getLogger("checkyourhospital.tech_stack")
+
+SIGNATURES_FILE = Path(__file__).resolve().parent.parent / "data" / "tech_signatures.json"
 
-TECH_SIGNATURES: dict[str, dict] = {
-    # Analytics
-    "google_analytics": {
-        "patterns": [r"gtag\(", r"google-analytics\.com", r"googletagmanager\.com", r"GA_TRACKING_ID", r"ga\('create"],
-        "category": "analytics",
-        "label": "Google Analytics",
-    },
-    "ga4": {
-        "patterns": [r"gtag.*G-[A-Z0-9]+", r"google.*gtag"],
-        "category": "analytics",
-        "label": "GA4",
-    },
-    "naver_analytics": {
-        "patterns": [r"wcs_add", r"naver\.com/wcslog"],
-        "category": "analytics",
-        "label": "네이버 애널리틱스",
-    },
-    # Advertising
-    "google_ads": {
-        "patterns": [r"googleads\.g\.doubleclick", r"adsbygoogle", r"google_conversion"],
-        "category": "ads",
-        "label": "Google Ads",
-    },
-    "facebook_pixel": {
-        "patterns": [r"fbq\(", r"facebook\.com/tr", r"connect\.facebook\.net.*fbevents"],
-        "category": "ads",
-        "label": "Facebook Pixel",
-    },
-    "kakao_pixel": {
-        "patterns": [r"kakao.*pixel", r"kpixel"],
-        "category": "ads",
-        "label": "카카오 픽셀",
-    },
-    "naver_ads": {
-        "patterns": [r"wcs_do", r"naver.*conversion"],
-        "category": "ads",
-        "label": "네이버 광고",
-    },
-    # Chat/CRM
-    "channel_io": {
-        "patterns": [r"channel\.io", r"ChannelIO"],
-        "category": "chat",
-        "label": "Channel.io",
-    },
-    "zendesk": {
-        "patterns": [r"zendesk\.com", r"zdassets"],
-        "category": "chat",
-        "label": "Zendesk",
-    },
-    "kakao_chat": {
-        "patterns": [r"kakao.*chat", r"plusfriend"],
-        "category": "chat",
-        "label": "카카오톡 채팅",
-    },
-    # CMS
-    "wordpress": {
-        "patterns": [r"wp-content", r"wp-includes", r"wordpress"],
-        "category": "cms",
-        "label": "WordPress",
-    },
-    "cafe24": {
-        "patterns": [r"cafe24\.com", r"sim\.cafe24"],
-        "category": "cms",
-        "label": "카페24",
-    },
-    "gnuboard": {
-        "patterns": [r"gnuboard", r"youngcart"],
-        "category": "cms",
-        "label": "그누보드",
-    },
-    "wix": {
-        "patterns": [r"wix\.com", r"wixstatic"],
-        "category": "cms",
-        "label": "Wix",
-    },
-    # CDN
-    "cloudflare": {
-        "patterns": [r"cloudflare", r"cf-ray"],
-        "category": "cdn",
-        "label": "Cloudflare",
-    },
-    "aws_cloudfront": {
-        "patterns": [r"cloudfront\.net"],
-        "category": "cdn",
-        "label": "AWS CloudFront",
-    },
-    # Booking
-    "naver_booking": {
-        "patterns": [r"booking\.naver", r"naver.*reservation"],
-        "category": "booking",
-        "label": "네이버 예약",
-    },
-    "goodoc": {
-        "patterns": [r"goodoc", r"굿닥"],
-        "category": "booking",
-        "label": "굿닥",
-    },
-    # SEO
-    "schema_org": {
-        "patterns": [r"schema\.org", r"application/ld\+json"],
-        "category": "seo",
-        "label": "구조화 데이터",
-    },
-}
+
+def load_signatures(extra_file: str = "") -> dict[str, dict]:
+    """Built-in signatures, with ``extra_file`` (same format) merged over them.
+
+    Each entry has ``label`` and ``category`` plus any of:
+
+    - ``hosts`` — host suffixes of script/link/iframe/img/a/form URLs
+    - ``script_tokens`` — identifiers used in inline scripts
+    - ``headers`` — ``{name: regex}`` on response headers (``""``: present)
+    - ``cookies`` — cookie name prefixes set by the response
+    - ``patterns`` — regexes over the raw HTML (case-insensitive)
+    """
+    signatures = json.loads(SIGNATURES_FILE.read_text(encoding="utf-8"))
+    if extra_file:
+        try:
+            signatures.update(json.loads(Path(extra_file).read_text(encoding="utf-8")))
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring tech signatures file %s: %s", extra_file, e)
+    return signatures
+
+
+TECH_SIGNATURES: dict[str, dict] = load_signatures(settings.tech_signatures_file)
 
 ALL_CATEGORIES = ["analytics", "ads", "chat", "cms", "cdn", "booking", "seo"]
 
@@ -119,19 +51,114 @@ RECOMMENDED_TECH: list[dict[str, str]] = [
 ]
 
 
-def _match_tech(html: str, tech_id: str, sig: dict) -> bool:
-    """Check if any pattern in a signature matches the HTML."""
-    for pattern in sig["patterns"]:
-        if re.search(pattern, html, re.IGNORECASE):
-            return True
-    return False
+_URL_ATTRS = {
+    "script": "src", "link": "href", "iframe": "src", "img": "src", "a": "href", "form": "action",
+}
+_JS_TOKEN_RE = re.compile(r"[A-Za-z_$][\w$]*")
+# Cookie names in a (possibly comma-joined) Set-Cookie value
+_COOKIE_NAME_RE = re.compile(r"(?:^|,)\s*([^=;,\s]+)=")
+
+
+class PageIndex(NamedTuple):
+    hosts: set[str]
+    script_tokens: set[str]
+    headers: dict[str, str]
+    cookies: set[str]
+
+
+def index_page(page: ParsedPage, headers: dict[str, str] | None = None) -> PageIndex:
+    """What signatures look up: resource hosts, inline-script identifiers,
+    response headers (lower-cased names) and cookie names."""
+    hosts: set[str] = set()
+    for tag in page.soup.find_all(list(_URL_ATTRS)):
+        value = tag.get(_URL_ATTRS[tag.name])
+        if isinstance(value, str) and "//" in value:
+            try:
+                host = urlsplit(value.strip()).hostname
+            except ValueError:  # malformed, e.g. an unclosed IPv6 bracket
+                continue
+            if host:
+                hosts.add(host)
+    tokens: set[str] = set()
+    for script in page.soup.find_all("script", src=False):
+        if script.string:
+            tokens.update(_JS_TOKEN_RE.findall(script.string))
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    cookies = set(_COOKIE_NAME_RE.findall(headers.get("set-cookie", "")))
+    return PageIndex(hosts, tokens, headers, cookies)
+
+
+class SignatureDB:
+    """``TECH_SIGNATURES`` compiled into lookup tables.
+
+    A page is matched by host, token, header and cookie lookups first; only the
+    techs still unconfirmed are left for the single pass over the HTML, which
+    stops evaluating a tech at its first matching pattern.
+    """
 
+    def __init__(self, signatures: dict[str, dict]):
+        self.signatures = signatures
+        self._hosts: dict[str, set[str]] = defaultdict(set)
+        self._tokens: dict[str, set[str]] = defaultdict(set)
+        self._headers: dict[str, list[tuple[str, re.Pattern | None]]] = defaultdict(list)
+        self._cookies: list[tuple[str, str]] = []
+        for tech_id, sig in signatures.items():
+            for host in sig.get("hosts", ()):
+                self._hosts[host.lower()].add(tech_id)
+            for token in sig.get("script_tokens", ()):
+                self._tokens[token].add(tech_id)
+            for name, pattern in sig.get("headers", {}).items():
+                compiled = re.compile(pattern, re.IGNORECASE) if pattern else None
+                self._headers[name.lower()].append((tech_id, compiled))
+            self._cookies.extend((prefix, tech_id) for prefix in sig.get("cookies", ()))
+        self._html = RegexSet({
+            tech_id: [re.compile(p, re.IGNORECASE) for p in sig.get("patterns", ())]
+            for tech_id, sig in signatures.items()
+            if sig.get("patterns")
+        })
 
-def detect_tech_stack(pages: list[dict]) -> dict:
+    def match(self, page: ParsedPage, headers: dict[str, str] | None = None) -> set[str]:
+        """Tech ids detected on ``page``."""
+        index = index_page(page, headers)
+        found: set[str] = set()
+        for host in index.hosts:
+            # www.googletagmanager.com → googletagmanager.com → com
+            parts = host.split(".")
+            for i in range(len(parts) - 1):
+                found |= self._hosts.get(".".join(parts[i:]), set())
+        for token in index.script_tokens & self._tokens.keys():
+            found |= self._tokens[token]
+        for name, value in index.headers.items():
+            for tech_id, pattern in self._headers.get(name, ()):
+                if pattern is None or pattern.search(value):
+                    found.add(tech_id)
+        for cookie in index.cookies:
+            found.update(tech_id for prefix, tech_id in self._cookies if cookie.startswith(prefix))
+        if len(found) < len(self.signatures):
+            found = self._html.labels(page.html, known=found)
+        return found
+
+
+_db: SignatureDB | None = None
+
+
+def get_signature_db() -> SignatureDB:
+    global _db
+    if _db is None:
+        _db = SignatureDB(TECH_SIGNATURES)
+    return _db
+
+
+def detect_tech_stack(
+    pages: list[dict] | list[ParsedPage],
+    response_headers: dict[str, dict[str, str]] | None = None,
+) -> dict:
     """Detect marketing/analytics tech stack from crawled pages.
 
     Args:
-        pages: list of dicts with "url" and "html" keys.
+        pages: ParsedPage objects or dicts with "url" and "html" keys.
+        response_headers: Optional response headers per page URL (header and
+            cookie signatures only apply when given).
 
     Returns:
         Dict with detected techs, by_category breakdown, missing_recommended, and recommendations.
@@ -146,13 +173,15 @@ def detect_tech_stack(pages: list[dict]) -> dict:
         }
 
     detected: dict[str, dict] = {}
+    db = get_signature_db()
+    response_headers = response_headers or {}
 
-    for page in pages:
-        html = page.get("html", "")
-        page_url = page.get("url", "")
+    for page in as_pages(pages):
+        page_url = page.url
+        matched = db.match(page, response_headers.get(page_url))
 
         for tech_id, sig in TECH_SIGNATURES.items():
-            if _match_tech(html, tech_id, sig):
+            if tech_id in matched:
                 if tech_id not in detected:
                     detected[tech_id] = {
                         "label": sig["label"],
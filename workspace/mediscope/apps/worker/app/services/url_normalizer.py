@@ -0,0 +1,135 @@
+"""URL canonicalization for crawl deduplication.
+
+The crawler used to dedupe on raw strings, so ``/about`` and ``/about/``,
+``https://example.com:443/`` and ``https://EXAMPLE.com/``, ``%7e`` and ``~``,
+``?utm_source=…`` tracking links and ``;jsessionid=…`` session URLs were all
+"new" pages eating into the page budget.
+
+- ``canonical_url`` is still a fetchable URL: lower-cased scheme and host, no
+  default port, no fragment, consistent percent-encoding, tracking/session
+  params (``crawler_strip_params``) removed and the query sorted
+  (``crawler_sort_query``)
+- ``url_key`` further folds what is the same page in practice but must not be
+  rewritten in a request: ``www.`` vs bare host and a trailing slash
+
+Percent-escapes are normalized textually and never decoded, so non-UTF-8
+(e.g. EUC-KR) query values survive unchanged.
+"""
+
+import fnmatch
+import re
+import string
+from functools import lru_cache
+from urllib.parse import quote, urlsplit, urlunsplit
+
+from ..config import settings
+
+_UNRESERVED = frozenset(string.ascii_letters + string.digits + "-._~")
+_ESCAPE_RE = re.compile(r"%([0-9A-Fa-f]{2})")
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+# Characters left as-is in a path / query component (besides unreserved and %)
+_PATH_SAFE = "/:@!$&'()*+,;="
+_QUERY_SAFE = "/:@!$'()*+,;?"
+
+
+@lru_cache(maxsize=8)
+def _param_matcher(spec: str) -> re.Pattern | None:
+    """Case-insensitive matcher for a comma-separated list of names (``*`` wildcards)."""
+    names = [n.strip() for n in spec.split(",") if n.strip()]
+    if not names:
+        return None
+    return re.compile("|".join(fnmatch.translate(n) for n in names), re.IGNORECASE)
+
+
+def _normalize_escapes(component: str, safe: str) -> str:
+    """Decode escapes of unreserved characters, upper-case the rest, escape raw characters."""
+    def fix(m: re.Match) -> str:
+        char = chr(int(m.group(1), 16))
+        return char if char in _UNRESERVED else "%" + m.group(1).upper()
+
+    return quote(_ESCAPE_RE.sub(fix, component), safe=safe + "%")
+
+
+def _strip_path_params(path: str, strip: re.Pattern | None) -> str:
+    """Drop ``;name=value`` path parameters whose name is stripped (``;jsessionid=…``)."""
+    if strip is None or ";" not in path:
+        return path
+    segments = []
+    for segment in path.split("/"):
+        head, *params = segment.split(";")
+        kept = [p for p in params if not strip.fullmatch(p.split("=", 1)[0])]
+        segments.append(";".join([head, *kept]))
+    return "/".join(segments)
+
+
+def _host(host: str) -> str:
+    host = host.rstrip(".")
+    try:
+        host = host.encode("idna").decode("ascii")
+    except UnicodeError:
+        pass
+    return f"[{host}]" if ":" in host else host
+
+
+def canonical_url(
+    url: str, *, strip_params: str | None = None, sort_query: bool | None = None
+) -> str:
+    """Normalized, still fetchable form of ``url`` (see module docstring).
+
+    ``strip_params`` / ``sort_query`` default to the crawler settings. URLs that
+    cannot be parsed are returned without their fragment only.
+    """
+    strip = _param_matcher(settings.crawler_strip_params if strip_params is None else strip_params)
+    if sort_query is None:
+        sort_query = settings.crawler_sort_query
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.split("#", 1)[0]
+    scheme = parts.scheme.lower()
+    if not parts.hostname:
+        return urlunsplit((scheme, parts.netloc, parts.path, parts.query, ""))
+
+    netloc = _host(parts.hostname)
+    if port is not None and port != _DEFAULT_PORTS.get(scheme):
+        netloc += f":{port}"
+    if parts.username is not None:
+        userinfo = parts.netloc.rpartition("@")[0]
+        netloc = f"{userinfo}@{netloc}"
+
+    path = _normalize_escapes(_strip_path_params(parts.path, strip), _PATH_SAFE) or "/"
+
+    params = []
+    for pair in parts.query.split("&"):
+        if not pair:
+            continue
+        name, eq, value = pair.partition("=")
+        if strip is not None and strip.fullmatch(name):
+            continue
+        name = _normalize_escapes(name, _QUERY_SAFE)
+        params.append(name + eq + _normalize_escapes(value, _QUERY_SAFE + "="))
+    if sort_query:
+        params.sort()
+    return urlunsplit((scheme, netloc, path, "&".join(params), ""))
+
+
+def site_host(url: str) -> str:
+    """Host of ``url`` for same-site checks: lower-cased, without ``www.``."""
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError:
+        return ""
+    return host.rstrip(".").removeprefix("www.")
+
+
+def url_key(url: str, **kwargs) -> str:
+    """Dedup key: ``canonical_url`` with ``www.`` and a trailing slash folded."""
+    canonical = canonical_url(url, **kwargs)
+    try:
+        parts = urlsplit(canonical)
+    except ValueError:
+        return canonical
+    netloc = parts.netloc.removeprefix("www.")
+    path = parts.path.rstrip("/") if parts.path != "/" else parts.path
+    return urlunsplit((parts.scheme, netloc, path or "/", parts.query, ""))
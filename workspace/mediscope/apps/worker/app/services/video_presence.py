@@ -3,6 +3,9 @@
 import re
 from urllib.parse import urlparse
 
+from ..checks.parsed_page import ParsedPage, as_pages
+from .regex_guard import PageScan, RegexGuard
+
 VIDEO_EMBED_PATTERNS: dict[str, list[str]] = {
     "youtube": [
         r'<iframe[^>]+src=["\'][^"\']*youtube\.com/embed/([^"\'?]+)',
@@ -56,19 +59,36 @@ _SOCIAL_EXCLUDE = {
     "twitter": {r'twitter\.com/intent', r'twitter\.com/share', r'x\.com/intent'},
 }
 
+_EMBED_RES = {
+    platform: [re.compile(p, re.IGNORECASE | re.DOTALL) for p in patterns]
+    for platform, patterns in VIDEO_EMBED_PATTERNS.items()
+}
+_LINK_RES = {
+    platform: [re.compile(p, re.IGNORECASE) for p in patterns]
+    for platform, patterns in VIDEO_LINK_PATTERNS.items()
+}
+_URL_RE = re.compile(r'(?:href|src)=["\']([^"\']+)', re.IGNORECASE)
+_OG_VIDEO_RE = re.compile(r'<meta[^>]+property=["\']og:video["\']', re.IGNORECASE)
+_VIDEO_SCHEMA_RE = re.compile(r'"@type"\s*:\s*"VideoObject"', re.IGNORECASE)
+
 
-def _extract_urls(html: str) -> list[str]:
+def _scan(scan: PageScan | None) -> PageScan:
+    return scan or RegexGuard("video_presence").page("")
+
+
+def _extract_urls(html: str, scan: PageScan | None = None) -> list[str]:
     """Extract all href and src URLs from HTML."""
-    return re.findall(r'(?:href|src)=["\']([^"\']+)', html, re.IGNORECASE)
+    return _scan(scan).findall(_URL_RE, html)
 
 
-def _extract_embedded_videos(html: str) -> dict[str, dict]:
+def _extract_embedded_videos(html: str, scan: PageScan | None = None) -> dict[str, dict]:
     """Find embedded videos in HTML."""
+    scan = _scan(scan)
     results: dict[str, dict] = {}
-    for platform, patterns in VIDEO_EMBED_PATTERNS.items():
+    for platform, patterns in _EMBED_RES.items():
         urls: list[str] = []
         for pattern in patterns:
-            for match in re.finditer(pattern, html, re.IGNORECASE | re.DOTALL):
+            for match in scan.finditer(pattern, html):
                 url = match.group(0) if platform == "self_hosted" else match.group(0)
                 # Extract the src URL from the full match
                 src_match = re.search(r'src=["\']([^"\']+)', match.group(0))
@@ -82,13 +102,14 @@ def _extract_embedded_videos(html: str) -> dict[str, dict]:
     return results
 
 
-def _extract_video_links(html: str) -> dict[str, list[str]]:
+def _extract_video_links(html: str, scan: PageScan | None = None) -> dict[str, list[str]]:
     """Find video links (non-embed) in HTML."""
+    scan = _scan(scan)
     results: dict[str, list[str]] = {}
-    for platform, patterns in VIDEO_LINK_PATTERNS.items():
+    for platform, patterns in _LINK_RES.items():
         urls: list[str] = []
         for pattern in patterns:
-            for match in re.finditer(pattern, html, re.IGNORECASE):
+            for match in scan.finditer(pattern, html):
                 url = match.group(0)
                 if url not in urls:
                     urls.append(url)
@@ -96,9 +117,9 @@ def _extract_video_links(html: str) -> dict[str, list[str]]:
     return results
 
 
-def _detect_social_profiles(html: str) -> dict[str, dict]:
+def _detect_social_profiles(html: str, scan: PageScan | None = None) -> dict[str, dict]:
     """Detect social media profile links."""
-    all_urls = _extract_urls(html)
+    all_urls = _extract_urls(html, scan)
     profiles: dict[str, dict] = {}
 
     for platform, patterns in SOCIAL_PATTERNS.items():
@@ -125,14 +146,11 @@ def _detect_social_profiles(html: str) -> dict[str, dict]:
     return profiles
 
 
-def _check_video_metadata(html: str) -> dict[str, bool]:
+def _check_video_metadata(html: str, scan: PageScan | None = None) -> dict[str, bool]:
     """Check for video-related metadata."""
-    has_og_video = bool(re.search(
-        r'<meta[^>]+property=["\']og:video["\']', html, re.IGNORECASE
-    ))
-    has_video_schema = bool(re.search(
-        r'"@type"\s*:\s*"VideoObject"', html, re.IGNORECASE
-    ))
+    scan = _scan(scan)
+    has_og_video = scan.search(_OG_VIDEO_RE, html) is not None
+    has_video_schema = scan.search(_VIDEO_SCHEMA_RE, html) is not None
     return {"has_og_video": has_og_video, "has_video_schema": has_video_schema}
 
 
@@ -269,14 +287,15 @@ def _build_recommendations(
     return recs
 
 
-def analyze_video_presence(pages: list[dict]) -> dict:
+def analyze_video_presence(pages: list[dict] | list[ParsedPage]) -> dict:
     """Analyze video content and social media presence from crawled pages.
 
     Args:
-        pages: list of dicts with "url" and "html" keys.
+        pages: ParsedPage objects or dicts with "url" and "html" keys.
 
     Returns:
-        Dict with embedded_videos, social_profiles, scores, and recommendations.
+        Dict with embedded_videos, social_profiles, scores, and recommendations;
+        ``details["regex_guard"]`` lists pages whose scan hit a cap or budget.
     """
     if not pages:
         empty_embedded = {p: {"count": 0, "urls": []} for p in VIDEO_EMBED_PATTERNS}
@@ -303,12 +322,14 @@ def analyze_video_presence(pages: list[dict]) -> dict:
     all_profiles: dict[str, dict] = {}
     has_video_schema = False
     has_og_video = False
+    guard = RegexGuard("video_presence")
 
-    for page in pages:
-        html = page.get("html", "")
+    for page in as_pages(pages):
+        html = page.html
+        scan = guard.page(page.url)
 
         # Embedded videos
-        page_embedded = _extract_embedded_videos(html)
+        page_embedded = _extract_embedded_videos(html, scan)
         for platform, data in page_embedded.items():
             for url in data["urls"]:
                 if url not in all_embedded[platform]["urls"]:
@@ -316,7 +337,7 @@ def analyze_video_presence(pages: list[dict]) -> dict:
             all_embedded[platform]["count"] = len(all_embedded[platform]["urls"])
 
         # Also check video links
-        video_links = _extract_video_links(html)
+        video_links = _extract_video_links(html, scan)
         for platform, urls in video_links.items():
             if platform in all_embedded:
                 for url in urls:
@@ -325,13 +346,13 @@ def analyze_video_presence(pages: list[dict]) -> dict:
                 all_embedded[platform]["count"] = len(all_embedded[platform]["urls"])
 
         # Social profiles (first found wins)
-        page_profiles = _detect_social_profiles(html)
+        page_profiles = _detect_social_profiles(html, scan)
         for platform, info in page_profiles.items():
             if platform not in all_profiles or (not all_profiles[platform]["found"] and info["found"]):
                 all_profiles[platform] = info
 
         # Metadata
-        meta = _check_video_metadata(html)
+        meta = _check_video_metadata(html, scan)
         if meta["has_video_schema"]:
             has_video_schema = True
         if meta["has_og_video"]:
@@ -364,7 +385,7 @@ def analyze_video_presence(pages: list[dict]) -> dict:
         has_video_schema, has_og_video, missing_platforms,
     )
 
-    return {
+    return guard.report({
         "embedded_videos": all_embedded,
         "total_videos": total_videos,
         "social_profiles": all_profiles,
@@ -376,4 +397,4 @@ def analyze_video_presence(pages: list[dict]) -> dict:
         "overall_score": overall_score,
         "missing_platforms": missing_platforms,
         "recommendations": recommendations,
-    }
+    })
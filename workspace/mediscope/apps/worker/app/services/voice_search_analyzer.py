@@ -4,6 +4,8 @@ import re
 
 from bs4 import BeautifulSoup
 
+from ..checks.parsed_page import ParsedPage, as_page, as_pages, visible_text
+
 # ── Question patterns for heading detection ──────────────────────────────────
 
 QUESTION_PATTERNS = [
@@ -82,32 +84,17 @@ def _has_howto_schema(json_ld_items: list[dict]) -> bool:
     return False
 
 
-def _count_long_tail_questions(soup: BeautifulSoup) -> int:
+def _count_long_tail_questions(doc: BeautifulSoup | ParsedPage) -> int:
     """Count long-tail (5+ word) question-form content in text."""
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    text = soup.get_text(separator=" ", strip=True)
+    text = doc.text if isinstance(doc, ParsedPage) else visible_text(doc)
     en_matches = _LONG_TAIL_RE.findall(text)
     ko_matches = _LONG_TAIL_KO_RE.findall(text)
     return len(en_matches) + len(ko_matches)
 
 
-def _extract_json_ld(html: str) -> list[dict]:
+def _extract_json_ld(html: str | ParsedPage) -> list[dict]:
     """Extract JSON-LD structured data from HTML."""
-    import json
-
-    soup = BeautifulSoup(html, "html.parser")
-    results = []
-    for script in soup.find_all("script", type="application/ld+json"):
-        try:
-            data = json.loads(script.string or "")
-            if isinstance(data, list):
-                results.extend(data)
-            else:
-                results.append(data)
-        except (json.JSONDecodeError, TypeError):
-            continue
-    return results
+    return as_page(html).json_ld
 
 
 def _get_types(json_ld_items: list[dict]) -> set[str]:
@@ -132,12 +119,12 @@ def _get_types(json_ld_items: list[dict]) -> set[str]:
 
 
 def analyze_voice_search_readiness(
-    pages: list[dict], category_scores: dict
+    pages: list[dict] | list[ParsedPage], category_scores: dict
 ) -> dict:
     """Analyze voice search optimization readiness.
 
     Args:
-        pages: Crawled page dicts with keys: url, html
+        pages: ParsedPage objects or crawled page dicts with keys: url, html
         category_scores: Per-item score breakdown from scorer
 
     Returns:
@@ -153,9 +140,10 @@ def analyze_voice_search_readiness(
         }
 
     # Use main page for HTML analysis
-    main_html = pages[0].get("html", "")
-    soup = BeautifulSoup(main_html, "html.parser")
-    json_ld = _extract_json_ld(main_html)
+    pages = as_pages(pages)
+    main_page = pages[0]
+    soup = main_page.soup
+    json_ld = _extract_json_ld(main_page)
     schema_types = _get_types(json_ld)
 
     checks: dict[str, dict] = {}
@@ -185,8 +173,7 @@ def analyze_voice_search_readiness(
     question_headings = _count_question_headings(soup)
     # Also check sub-pages
     for page in pages[1:]:
-        sub_soup = BeautifulSoup(page.get("html", ""), "html.parser")
-        question_headings.extend(_count_question_headings(sub_soup))
+        question_headings.extend(_count_question_headings(page.soup))
     q_count = len(question_headings)
     if q_count >= 5:
         checks["question_headings"] = {
@@ -218,8 +205,7 @@ def analyze_voice_search_readiness(
     # 3. Featured Snippet suitability
     snippets = _check_featured_snippet_paragraphs(soup)
     for page in pages[1:]:
-        sub_soup = BeautifulSoup(page.get("html", ""), "html.parser")
-        snippets.extend(_check_featured_snippet_paragraphs(sub_soup))
+        snippets.extend(_check_featured_snippet_paragraphs(page.soup))
     if len(snippets) >= 2:
         checks["featured_snippet"] = {
             "status": "pass",
@@ -336,7 +322,7 @@ def analyze_voice_search_readiness(
     has_howto = _has_howto_schema(json_ld)
     if not has_howto:
         for page in pages[1:]:
-            page_ld = _extract_json_ld(page.get("html", ""))
+            page_ld = _extract_json_ld(page)
             if _has_howto_schema(page_ld):
                 has_howto = True
                 break
@@ -356,13 +342,7 @@ def analyze_voice_search_readiness(
         })
 
     # 8. Long-tail keyword content (5+ words)
-    long_tail_count = _count_long_tail_questions(
-        BeautifulSoup(main_html, "html.parser")
-    )
-    for page in pages[1:]:
-        long_tail_count += _count_long_tail_questions(
-            BeautifulSoup(page.get("html", ""), "html.parser")
-        )
+    long_tail_count = sum(_count_long_tail_questions(page) for page in pages)
     if long_tail_count >= 3:
         checks["long_tail"] = {
             "status": "pass",
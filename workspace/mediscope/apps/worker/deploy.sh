@@ -16,12 +16,17 @@ PROJECT="memoriz-b5ba9"
 
 echo "=== Deploying ${SERVICE_NAME} to Cloud Run (${REGION}) ==="
 
+# --no-cpu-throttling: scans run in the background worker pool after POST /scan
+# has returned 202, so the CPU must stay allocated between requests.
+# The scan job queue is a per-instance SQLite file; GET /worker/scan/{task_id}
+# only finds tasks accepted by the same instance.
 gcloud run deploy "$SERVICE_NAME" \
   --source . \
   --region "$REGION" \
   --platform managed \
   --memory 1Gi \
   --cpu 1 \
+  --no-cpu-throttling \
   --timeout 300 \
   --concurrency 5 \
   --min-instances 0 \
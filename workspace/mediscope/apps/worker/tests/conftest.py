@@ -10,6 +10,37 @@ from httpx import ASGITransport, AsyncClient
 os.environ["WORKER_API_KEY"] = "test-key"
 os.environ["SUPABASE_URL"] = ""
 os.environ["SUPABASE_SECRET_KEY"] = ""
+os.environ["JOB_QUEUE_PATH"] = ":memory:"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_dns_cache():
+    """Tests mock getaddrinfo per host; don't let one test's answer leak into the next."""
+    from app.security.dns_resolver import resolver
+
+    resolver.clear()
+    yield
+    resolver.clear()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pagespeed_cache():
+    """PSI results are cached per URL; each test mocks its own response."""
+    from app.services.pagespeed_cache import clear_pagespeed_cache
+
+    clear_pagespeed_cache()
+    yield
+    clear_pagespeed_cache()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_render_cache(tmp_path):
+    """Rendered PNG/PDFs are cached on disk; keep each test's renders in its own dir."""
+    from app.services.render_cache import RenderCache, set_render_cache
+
+    set_render_cache(RenderCache(tmp_path / "render-cache", 10 * 1024 * 1024))
+    yield
+    set_render_cache(None)
 
 
 @pytest.fixture
@@ -0,0 +1,89 @@
+"""Tests for the analyzer executor (inline / thread / process modes)."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.checks.parsed_page import ParsedPage
+from app.services.analyzer_executor import (
+    _get_executor,
+    run_analyzers,
+    shutdown_executors,
+    to_payload,
+)
+from app.services.tech_stack_detector import detect_tech_stack
+from app.services.video_presence import analyze_video_presence
+
+PAGES = [
+    {
+        "url": "https://a.com/",
+        "html": '<html><head><script src="https://www.googletagmanager.com/gtag/js"></script>'
+        '</head><body><iframe src="https://www.youtube.com/embed/abc"></iframe></body></html>',
+    },
+    {"url": "https://a.com/about", "html": "<html><body><p>소개</p></body></html>"},
+]
+
+JOBS = [
+    ("tech_stack", detect_tech_stack, {}),
+    ("video_presence", analyze_video_presence, {}),
+]
+
+
+def _count_pages(pages, *, offset=0):
+    return len(pages) + offset
+
+
+def _busy(pages):
+    time.sleep(0.3)
+    return "done"
+
+
+@pytest.fixture(autouse=True)
+def _pools():
+    yield
+    shutdown_executors()
+
+
+class TestRunAnalyzers:
+    @pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+    async def test_modes_match_direct_call(self, mode):
+        results = await run_analyzers(PAGES, JOBS, mode=mode)
+        assert list(results) == ["tech_stack", "video_presence"]
+        assert results["tech_stack"] == detect_tech_stack(PAGES)
+        assert results["video_presence"] == analyze_video_presence(PAGES)
+
+    @pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+    async def test_kwargs_passed(self, mode):
+        results = await run_analyzers(PAGES, [("n", _count_pages, {"offset": 10})], mode=mode)
+        assert results == {"n": 12}
+
+    async def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            await run_analyzers(PAGES, JOBS, mode="gpu")
+
+    async def test_no_jobs(self):
+        assert await run_analyzers(PAGES, [], mode="process") == {}
+
+    def test_process_pool_does_not_fork(self):
+        assert _get_executor("process")._mp_context.get_start_method() == "forkserver"
+
+    async def test_thread_mode_keeps_loop_responsive(self):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await run_analyzers(PAGES, [("busy", _busy, {})], mode="thread")
+        task.cancel()
+        # Inline, the 0.3s analyzer would have blocked every tick
+        assert ticks >= 10
+
+    def test_payload_is_compact(self):
+        page = ParsedPage(url="https://a.com/", html="<p>x</p>", status_code=200)
+        page.soup  # noqa: B018
+        assert to_payload([page]) == [("https://a.com/", "<p>x</p>", 200)]
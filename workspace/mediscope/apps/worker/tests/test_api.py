@@ -26,6 +26,23 @@ class TestHealthEndpoint:
         assert data["status"] == "ok"
 
 
+@pytest.mark.asyncio
+class TestMetricsEndpoint:
+    async def test_metrics_requires_auth(self, test_client):
+        resp = await test_client.get("/worker/metrics")
+        assert resp.status_code == 401
+
+    async def test_metrics_reports_caches(self, test_client, auth_headers):
+        resp = await test_client.get("/worker/metrics", headers=auth_headers)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert {
+            "scan_cache", "serp_cache", "dns", "jobs", "pagespeed_cache", "lab_metrics",
+            "browser_pool", "render_cache", "regex_guard",
+        } <= set(data)
+        assert "hit_rate" in data["serp_cache"]
+
+
 @pytest.mark.asyncio
 class TestScanEndpoint:
     async def test_scan_no_auth(self, test_client):
@@ -48,6 +65,32 @@ class TestScanEndpoint:
         assert data["status"] == "queued"
         assert "task_id" in data
 
+    async def test_scan_status_queued(self, test_client, auth_headers):
+        with patch("app.security.ssrf.socket.getaddrinfo",
+                   return_value=[(2, 1, 6, "", ("93.184.216.34", 443))]):
+            resp = await test_client.post(
+                "/worker/scan",
+                json={"url": "https://example.com", "priority": 5},
+                headers=auth_headers,
+            )
+        task_id = resp.json()["task_id"]
+
+        resp = await test_client.get(f"/worker/scan/{task_id}", headers=auth_headers)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["task_id"] == task_id
+        assert data["status"] == "queued"
+        assert data["priority"] == 5
+        assert data["attempts"] == 0
+
+    async def test_scan_status_unknown(self, test_client, auth_headers):
+        resp = await test_client.get("/worker/scan/nope", headers=auth_headers)
+        assert resp.status_code == 404
+
+    async def test_scan_status_no_auth(self, test_client):
+        resp = await test_client.get("/worker/scan/anything")
+        assert resp.status_code == 401
+
     async def test_scan_ssrf_blocked(self, test_client, auth_headers):
         with patch("app.security.ssrf.socket.getaddrinfo",
                    return_value=[(2, 1, 6, "", ("127.0.0.1", 443))]):
@@ -60,10 +103,26 @@ class TestScanEndpoint:
         assert "blocked" in resp.json()["detail"].lower()
 
 
+@pytest.mark.asyncio
+class TestScanJob:
+    async def test_audit_failed_only_on_last_attempt(self):
+        from app.api.routes import _run_scan_task
+
+        with patch("app.api.routes.run_scan", AsyncMock(side_effect=RuntimeError("down"))), \
+                patch("app.api.routes.update_audit_status", AsyncMock()) as status:
+            with pytest.raises(RuntimeError):
+                await _run_scan_task("t1", "https://a.com/", "audit-1", {}, final_attempt=False)
+            assert ("audit-1", "failed") not in [c.args for c in status.await_args_list]
+
+            with pytest.raises(RuntimeError):
+                await _run_scan_task("t1", "https://a.com/", "audit-1", {}, final_attempt=True)
+            assert ("audit-1", "failed") in [c.args for c in status.await_args_list]
+
+
 @pytest.mark.asyncio
 class TestBenchmarkEndpoint:
     async def test_benchmark_no_data(self, test_client):
-        with patch("app.services.benchmark.get_supabase_client", return_value=None):
+        with patch("app.services.benchmark.get_repository", return_value=None):
             resp = await test_client.get("/worker/benchmark")
         assert resp.status_code == 200
         data = resp.json()
@@ -0,0 +1,93 @@
+"""Tests for the lightweight batch scan."""
+
+import httpx
+import pytest
+import respx
+
+from app.api import batch_routes
+from app.api.batch_routes import BatchScanRequest, LightScanResult, _light_scan
+from app.db.repository import FakeRepository, set_repository
+
+_HTML = {"Content-Type": "text/html; charset=utf-8"}
+
+
+class _Unread(httpx.AsyncByteStream):
+    """Body that fails the test if anything reads it."""
+
+    async def __aiter__(self):
+        raise AssertionError("body should not be read")
+        yield b""
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(follow_redirects=True) as c:
+        yield c
+
+
+@pytest.mark.asyncio
+class TestLightScan:
+    async def test_html_page(self, client):
+        home = (
+            '<html><head><meta name="description" content="피부과">'
+            '<link rel="canonical" href="https://example.com/"></head></html>'
+        )
+        async with respx.mock:
+            respx.get("https://example.com/").mock(
+                return_value=httpx.Response(200, text=home, headers=_HTML)
+            )
+            respx.get("https://example.com/robots.txt").mock(
+                return_value=httpx.Response(200, text="User-agent: *\nAllow: /")
+            )
+            respx.get("https://example.com/sitemap.xml").mock(
+                return_value=httpx.Response(200, text="<sitemapindex></sitemapindex>")
+            )
+            result = await _light_scan(client, "https://example.com/")
+
+        assert result.error is None
+        assert result.has_meta_description and result.has_canonical
+        assert result.has_robots_txt and result.has_sitemap
+        assert result.score == 100
+
+    async def test_non_html_and_missing_files_are_not_read(self, client):
+        async with respx.mock:
+            respx.get("https://example.com/").mock(
+                return_value=httpx.Response(
+                    200, headers={"Content-Type": "application/pdf"}, stream=_Unread()
+                )
+            )
+            respx.get(url__regex=r"/(robots\.txt|sitemap\.xml)$").mock(
+                return_value=httpx.Response(404, headers=_HTML, stream=_Unread())
+            )
+            result = await _light_scan(client, "https://example.com/")
+
+        assert result.error is None
+        assert not result.has_meta_description
+        assert not result.has_robots_txt and not result.has_sitemap
+        assert result.score == 20  # https only
+
+
+@pytest.mark.asyncio
+class TestBatchScanUpdateDb:
+    async def test_scores_written_through_repository(self, monkeypatch):
+        async def passthrough(url):
+            return url
+
+        async def light_scan(client, url):
+            return LightScanResult(url=url, score=60)
+
+        monkeypatch.setattr(batch_routes, "validate_url_async", passthrough)
+        monkeypatch.setattr(batch_routes, "_light_scan", light_scan)
+        repo = FakeRepository({
+            "beauty_clinics": [
+                {"website": "https://a.com", "latest_score": None},
+                {"website": "https://b.com", "latest_score": None},
+            ]
+        })
+        set_repository(repo)
+        try:
+            await batch_routes.batch_scan(BatchScanRequest(urls=["https://a.com/"]))
+        finally:
+            set_repository(None)
+
+        assert [r["latest_score"] for r in repo.rows("beauty_clinics")] == [60, None]
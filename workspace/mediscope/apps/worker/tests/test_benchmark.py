@@ -1,9 +1,10 @@
 """Tests for benchmark service."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
+from app.db.repository import FakeRepository
 from app.services.benchmark import BenchmarkStats, compute_benchmark, _build_distribution
 from app.services.regions import get_region_name, get_region_sggus
 
@@ -81,31 +82,22 @@ class TestRegions:
 @pytest.mark.asyncio
 class TestComputeBenchmark:
     async def test_returns_none_without_supabase(self):
-        with patch(
-            "app.services.benchmark.get_supabase_client", return_value=None
-        ):
+        with patch("app.services.benchmark.get_repository", return_value=None):
             result = await compute_benchmark()
         assert result is None
 
     async def test_returns_stats_with_data(self):
-        mock_client = MagicMock()
-        mock_query = MagicMock()
-        mock_client.table.return_value = mock_query
-        mock_query.select.return_value = mock_query
-        mock_query.not_ = MagicMock()
-        mock_query.not_.is_.return_value = mock_query
-        mock_query.not_.is_.return_value.execute.return_value = MagicMock(
-            data=[
+        repo = FakeRepository({
+            "beauty_clinics": [
                 {"latest_score": 30},
                 {"latest_score": 50},
                 {"latest_score": 70},
                 {"latest_score": 90},
-            ]
-        )
+                {"latest_score": None},
+            ],
+        })
 
-        with patch(
-            "app.services.benchmark.get_supabase_client", return_value=mock_client
-        ):
+        with patch("app.services.benchmark.get_repository", return_value=repo):
             result = await compute_benchmark(your_score=60)
 
         assert result is not None
@@ -119,56 +111,34 @@ class TestComputeBenchmark:
         assert result.distribution[5]["count"] == 1  # 50 → bin 50-59
 
     async def test_returns_none_with_empty_data(self):
-        mock_client = MagicMock()
-        mock_query = MagicMock()
-        mock_client.table.return_value = mock_query
-        mock_query.select.return_value = mock_query
-        mock_query.not_ = MagicMock()
-        mock_query.not_.is_.return_value = mock_query
-        mock_query.not_.is_.return_value.execute.return_value = MagicMock(data=[])
-
-        with patch(
-            "app.services.benchmark.get_supabase_client", return_value=mock_client
-        ):
+        repo = FakeRepository({"beauty_clinics": [{"latest_score": None}]})
+
+        with patch("app.services.benchmark.get_repository", return_value=repo):
             result = await compute_benchmark()
         assert result is None
 
     async def test_region_name_resolved(self):
-        mock_client = MagicMock()
-        mock_query = MagicMock()
-        mock_client.table.return_value = mock_query
-        mock_query.select.return_value = mock_query
-        mock_query.in_.return_value = mock_query
-        mock_query.eq.return_value = mock_query
-        mock_query.not_ = MagicMock()
-        mock_query.not_.is_.return_value = mock_query
-        mock_query.not_.is_.return_value.execute.return_value = MagicMock(
-            data=[{"latest_score": 50}, {"latest_score": 80}]
-        )
-
-        with patch(
-            "app.services.benchmark.get_supabase_client", return_value=mock_client
-        ):
+        repo = FakeRepository({
+            "beauty_clinics": [
+                {"sido": "서울특별시", "sggu": "강남구", "latest_score": 50},
+                {"sido": "서울특별시", "sggu": "서초구", "latest_score": 80},
+                {"sido": "서울특별시", "sggu": "마포구", "latest_score": 10},
+            ],
+        })
+
+        with patch("app.services.benchmark.get_repository", return_value=repo):
             result = await compute_benchmark(sido="서울특별시", sggu="강남구")
 
         assert result is not None
         assert result.region_name == "강남/서초"
+        assert result.total_count == 2  # 마포구 is outside the region
 
     async def test_region_name_param(self):
-        mock_client = MagicMock()
-        mock_query = MagicMock()
-        mock_client.table.return_value = mock_query
-        mock_query.select.return_value = mock_query
-        mock_query.in_.return_value = mock_query
-        mock_query.not_ = MagicMock()
-        mock_query.not_.is_.return_value = mock_query
-        mock_query.not_.is_.return_value.execute.return_value = MagicMock(
-            data=[{"latest_score": 40}]
-        )
+        repo = FakeRepository({
+            "beauty_clinics": [{"sggu": "서초구", "latest_score": 40}],
+        })
 
-        with patch(
-            "app.services.benchmark.get_supabase_client", return_value=mock_client
-        ):
+        with patch("app.services.benchmark.get_repository", return_value=repo):
             result = await compute_benchmark(region_name="강남/서초")
 
         assert result is not None
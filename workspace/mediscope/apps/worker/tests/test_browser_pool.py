@@ -0,0 +1,204 @@
+"""Tests for the shared Chromium pool (Playwright faked)."""
+
+import asyncio
+
+import pytest
+
+from app.services import image_generator, pdf_generator
+from app.services.browser_pool import BrowserPool
+
+
+class _FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+        self.viewport = None
+        self.closed = False
+
+    async def set_viewport_size(self, viewport):
+        self.viewport = viewport
+
+    async def set_content(self, html, wait_until=None):
+        self.html = html
+
+    async def pdf(self, **kwargs):
+        return b"%PDF-" + self.html.encode()
+
+    async def screenshot(self, **kwargs):
+        return b"\x89PNG" + repr(self.viewport).encode()
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def new_page(self):
+        self.browser.pages_created += 1
+        return _FakePage(self.browser)
+
+    async def close(self):
+        pass
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.pages_created = 0
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **options):
+        return _FakeContext(self)
+
+    async def close(self):
+        self.connected = False
+
+
+class _FakeChromium:
+    def __init__(self):
+        self.browsers: list[_FakeBrowser] = []
+
+    async def launch(self, **kwargs):
+        self.browsers.append(_FakeBrowser())
+        return self.browsers[-1]
+
+
+class _FakePlaywright:
+    def __init__(self):
+        self.chromium = _FakeChromium()
+
+    async def stop(self):
+        pass
+
+
+class _StubBrowser:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self, **options):
+        browser = self
+
+        class Ctx:
+            async def close(self):
+                browser.active -= 1
+
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        return Ctx()
+
+
+def _pool(**kwargs) -> BrowserPool:
+    pool = BrowserPool(**kwargs)
+    pool._playwright = _FakePlaywright()
+    return pool
+
+
+async def _set_and_screenshot(page):
+    await page.set_content("<p>x</p>")
+    return await page.screenshot()
+
+
+@pytest.mark.asyncio
+class TestBrowserPool:
+    async def test_browser_and_pages_are_reused(self):
+        pool = _pool(size=2, recycle_after=100)
+        for _ in range(5):
+            await pool.render(_set_and_screenshot)
+
+        [browser] = pool._playwright.chromium.browsers
+        assert browser.pages_created == 1
+        assert pool.stats()["launches"] == 1
+        assert pool.stats()["renders"] == 5
+
+    async def test_concurrency_is_capped(self):
+        pool = _pool(size=2, recycle_after=100)
+        active = peak = 0
+
+        async def slow(page):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        await asyncio.gather(*(pool.render(slow) for _ in range(6)))
+        assert peak == 2
+        assert pool.stats()["idle_pages"] == 2
+
+    async def test_recycled_after_n_jobs(self):
+        pool = _pool(size=1, recycle_after=3)
+        for _ in range(7):
+            await pool.render(_set_and_screenshot)
+
+        browsers = pool._playwright.chromium.browsers
+        assert len(browsers) == 3
+        assert not browsers[0].connected  # closed on recycle
+        assert pool.stats()["recycles"] == 2
+
+    async def test_crash_is_recovered_and_render_retried(self):
+        pool = _pool(size=1, recycle_after=100)
+        attempts = 0
+
+        async def crash_once(page):
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                page.browser.connected = False  # Chromium died mid-render
+                raise RuntimeError("Target closed")
+            return b"ok"
+
+        assert await pool.render(crash_once) == b"ok"
+        assert attempts == 2
+        assert len(pool._playwright.chromium.browsers) == 2
+        assert pool.stats()["crashes"] == 1
+
+    async def test_render_error_without_crash_is_raised(self):
+        pool = _pool(size=1, recycle_after=100)
+
+        async def bad(page):
+            raise ValueError("bad template")
+
+        with pytest.raises(ValueError):
+            await pool.render(bad)
+        assert pool.stats()["idle_pages"] == 0
+        assert pool.stats()["in_use"] == 0
+
+    async def test_generators_route_through_pool(self, monkeypatch):
+        pool = _pool(size=2, recycle_after=100)
+        monkeypatch.setattr(pdf_generator, "get_browser_pool", lambda: pool)
+        monkeypatch.setattr(image_generator, "get_browser_pool", lambda: pool)
+
+        png = await image_generator.html_to_screenshot("<p>x</p>", width=600, height=300)
+        pdf = await pdf_generator.html_to_pdf("<p>report</p>")
+
+        assert png.startswith(b"\x89PNG") and b"600" in png
+        assert pdf == b"%PDF-<p>report</p>"
+        # The PNG's page was reused for the PDF, with the viewport reset
+        [browser] = pool._playwright.chromium.browsers
+        assert browser.pages_created == 1
+        assert pool._idle_pages[0].viewport == pdf_generator._PDF_VIEWPORT
+
+    async def test_limits_concurrent_contexts(self, monkeypatch):
+        pool = BrowserPool(size=2)
+        browser = _StubBrowser()
+
+        async def ensure():
+            return browser
+
+        monkeypatch.setattr(pool, "_ensure_browser", ensure)
+
+        async def job():
+            async with pool.context():
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(job() for _ in range(6)))
+        assert browser.peak == 2
+        assert browser.active == 0
+        assert pool.stats()["contexts_opened"] == 6
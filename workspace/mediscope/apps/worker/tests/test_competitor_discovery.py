@@ -1,9 +1,8 @@
 """Tests for regional competitor discovery."""
 
-from types import SimpleNamespace
-
 import pytest
 
+from app.db.repository import FakeRepository
 from app.services import competitor_discovery
 from app.services.competitor_discovery import (
     _build_insight,
@@ -13,44 +12,6 @@ from app.services.competitor_discovery import (
 )
 
 
-class FakeQuery:
-    def __init__(self, data):
-        self.data = data
-        self.not_ = self
-
-    def select(self, *args, **kwargs):
-        return self
-
-    def ilike(self, *args, **kwargs):
-        return self
-
-    def limit(self, *args, **kwargs):
-        return self
-
-    def eq(self, *args, **kwargs):
-        return self
-
-    def in_(self, *args, **kwargs):
-        return self
-
-    def is_(self, *args, **kwargs):
-        return self
-
-    def order(self, *args, **kwargs):
-        return self
-
-    def execute(self):
-        return SimpleNamespace(data=self.data)
-
-
-class FakeSupabase:
-    def __init__(self, responses):
-        self.responses = {table: list(items) for table, items in responses.items()}
-
-    def table(self, name):
-        return FakeQuery(self.responses[name].pop(0))
-
-
 def test_extract_domain_normalizes_urls():
     assert _extract_domain("https://www.example.com/path") == "example.com"
     assert _extract_domain("example.com/path") == "example.com"
@@ -71,82 +32,92 @@ def test_build_insight_handles_missing_score():
 
 @pytest.mark.asyncio
 async def test_discover_competitors_builds_region_and_portal_comparison(monkeypatch):
-    fake_sb = FakeSupabase(
+    repo = FakeRepository(
         {
             "beauty_clinics": [
-                [
-                    {
-                        "id": 1,
-                        "name": "내 병원",
-                        "sido": "서울",
-                        "sggu": "강남구",
-                        "website": "https://myclinic.co.kr",
-                        "latest_score": 70,
-                    }
-                ],
-                [
-                    {
-                        "id": 1,
-                        "name": "내 병원",
-                        "website": "https://myclinic.co.kr",
-                        "latest_score": 70,
-                        "sggu": "강남구",
+                {
+                    "id": 1,
+                    "name": "내 병원",
+                    "sido": "서울",
+                    "sggu": "강남구",
+                    "website": "https://myclinic.co.kr",
+                    "latest_score": 70,
+                },
+                {
+                    "id": 2,
+                    "name": "A 피부과",
+                    "sido": "서울",
+                    "sggu": "강남구",
+                    "website": "https://a-clinic.kr",
+                    "latest_score": 90,
+                },
+                {
+                    "id": 3,
+                    "name": "B 피부과",
+                    "sido": "서울",
+                    "sggu": "서초구",
+                    "website": "https://b-clinic.kr",
+                    "latest_score": 80,
+                },
+                {
+                    "id": 4,
+                    "name": "미평가 피부과",
+                    "sido": "서울",
+                    "sggu": "강남구",
+                    "website": "https://unscored.kr",
+                    "latest_score": None,
+                },
+            ],
+            "audits": [
+                {
+                    "url": "https://a-clinic.kr",
+                    "status": "completed",
+                    "created_at": "2025-01-02T00:00:00",
+                    "details": {
+                        "portal_scores": {
+                            "naver": {"score": 90},
+                            "google": {"score": 80},
+                        }
                     },
-                    {
-                        "id": 2,
-                        "name": "A 피부과",
-                        "website": "https://a-clinic.kr",
-                        "latest_score": 90,
-                        "sggu": "강남구",
+                },
+                {
+                    "url": "https://b-clinic.kr",
+                    "status": "completed",
+                    "created_at": "2025-01-02T00:00:00",
+                    "details": {
+                        "portal_scores": {
+                            "naver": {"score": 80},
+                            "google": {"score": 75},
+                        }
                     },
-                    {
-                        "id": 3,
-                        "name": "B 피부과",
-                        "website": "https://b-clinic.kr",
-                        "latest_score": 80,
-                        "sggu": "서초구",
+                },
+                {
+                    "url": "https://myclinic.co.kr",
+                    "status": "completed",
+                    "created_at": "2025-01-01T00:00:00",
+                    "details": {
+                        "portal_scores": {
+                            "naver": {"score": 10},
+                            "google": {"score": 10},
+                        }
                     },
-                ],
-            ],
-            "audits": [
-                [
-                    {
-                        "url": "https://a-clinic.kr",
-                        "details": {
-                            "portal_scores": {
-                                "naver": {"score": 90},
-                                "google": {"score": 80},
-                            }
-                        },
-                    }
-                ],
-                [
-                    {
-                        "url": "https://b-clinic.kr",
-                        "details": {
-                            "portal_scores": {
-                                "naver": {"score": 80},
-                                "google": {"score": 75},
-                            }
-                        },
-                    }
-                ],
-                [
-                    {
-                        "url": "https://myclinic.co.kr",
-                        "details": {
-                            "portal_scores": {
-                                "naver": {"score": 60},
-                                "google": {"score": 70},
-                            }
-                        },
-                    }
-                ],
+                },
+                {
+                    "url": "https://myclinic.co.kr",
+                    "status": "completed",
+                    "created_at": "2025-01-02T00:00:00",
+                    "details": {
+                        "portal_scores": {
+                            "naver": {"score": 60},
+                            "google": {"score": 70},
+                        }
+                    },
+                },
             ],
         }
     )
 
-    monkeypatch.setattr(competitor_discovery, "get_supabase_client", lambda: fake_sb)
+    monkeypatch.setattr(competitor_discovery, "get_repository", lambda: repo)
     monkeypatch.setattr(
         competitor_discovery,
         "get_region_name",
@@ -174,6 +145,6 @@ async def test_discover_competitors_builds_region_and_portal_comparison(monkeypa
 
 @pytest.mark.asyncio
 async def test_discover_competitors_returns_none_without_supabase(monkeypatch):
-    monkeypatch.setattr(competitor_discovery, "get_supabase_client", lambda: None)
+    monkeypatch.setattr(competitor_discovery, "get_repository", lambda: None)
 
     assert await discover_competitors("https://myclinic.co.kr") is None
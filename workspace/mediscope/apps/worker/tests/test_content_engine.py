@@ -470,7 +470,7 @@ class TestContentAPI:
         assert len(data["content_types"]) == 5
         assert len(data["languages"]) == 4
 
-    @patch("app.services.procedure_data.get_supabase_client")
+    @patch("app.services.procedure_data.get_repository")
     async def test_procedures_endpoint(self, mock_sb):
         mock_sb.return_value = None  # No Supabase — returns empty
 
@@ -0,0 +1,52 @@
+"""Tests for the deduplicating crawl frontier."""
+
+from app.services.crawl_frontier import DigestSet, Frontier
+
+
+class TestDigestSet:
+    def test_add_and_contains(self):
+        s = DigestSet()
+        assert s.add("https://a.com/")
+        assert not s.add("https://a.com/")
+        assert "https://a.com/" in s
+        assert "https://a.com/x" not in s
+        assert len(s) == 1
+
+
+class TestFrontier:
+    async def test_dedupes_on_push(self):
+        f = Frontier()
+        f.seed("https://a.com/")
+        assert not f.push("https://www.a.com/", 1)
+        assert not f.push("https://a.com/?utm_source=x", 1)
+        assert not f.push("https://a.com/#top", 1)  # same raw URL: no fetch saved
+        assert f.push("https://a.com/about", 1)
+        assert not f.push("https://a.com/about", 2)  # queued, not yet fetched
+
+        assert f.stats() == {
+            "enqueued": 2, "duplicates_dropped": 4, "fetches_saved": 2, "seen": 2,
+        }
+
+    async def test_pushed_links_queued_canonical(self):
+        f = Frontier()
+        f.seed("https://A.com")  # the start URL is fetched as given
+        f.push("https://A.com/p?utm_source=x&b=2&a=1#top", 1)
+        assert [await f.get() for _ in range(2)] == [
+            (0, "https://A.com"), (1, "https://a.com/p?a=1&b=2"),
+        ]
+
+    async def test_depth_then_fifo_order(self):
+        f = Frontier()
+        f.push("https://a.com/deep", 2)
+        f.push("https://a.com/b", 1)
+        f.push("https://a.com/c", 1)
+        assert [await f.get() for _ in range(3)] == [
+            (1, "https://a.com/b"), (1, "https://a.com/c"), (2, "https://a.com/deep"),
+        ]
+
+    async def test_redirect_target_marked_seen(self):
+        f = Frontier()
+        f.seed("https://a.com/old")
+        f.mark_seen("https://a.com/new")
+        assert not f.push("https://a.com/new", 1)
+        assert f.fetches_saved == 1
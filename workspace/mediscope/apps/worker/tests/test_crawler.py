@@ -1,11 +1,14 @@
 """Tests for the Crawler service."""
 
+import asyncio
 from unittest.mock import patch
 
+import httpx
 import pytest
+import respx
 
 from app.security.ssrf import SSRFError
-from app.services.crawler import Crawler
+from app.services.crawler import Crawler, CrawlResult
 
 
 class TestCrawlerInit:
@@ -50,3 +53,327 @@ class TestCrawlerValidation:
             # httpx will fail since we're not mocking the HTTP layer,
             # so results should be empty (no pages fetched)
             assert isinstance(results, list)
+
+
+_PUBLIC_DNS = [(2, 1, 6, "", ("93.184.216.34", 443))]
+
+
+def _site(pages: int, delay: float = 0.0):
+    """Mock a site whose homepage links to ``pages`` leaf pages."""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay)
+        if request.url.path == "/":
+            links = "".join(f'<a href="/p{i}">p{i}</a>' for i in range(pages))
+            body = f"<html><body>{links}<a href='https://other.com/x'>x</a></body></html>"
+        else:
+            body = "<html><body><a href='/'>home</a></body></html>"
+        return httpx.Response(200, html=body)
+
+    return handler
+
+
+class TestConcurrentCrawl:
+    async def test_concurrent_respects_max_pages_and_domain(self):
+        c = Crawler(max_pages=5, max_depth=2, concurrency=4)
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC_DNS):
+            async with respx.mock:
+                respx.get(url__startswith="https://example.com/").mock(side_effect=_site(10))
+                other = respx.get(url__startswith="https://other.com/")
+                results = await c.crawl("https://example.com/")
+
+        assert len(results) == 5
+        assert results[0].url == "https://example.com/"
+        assert len({r.url for r in results}) == 5
+        assert not other.called
+        assert c.stats["mode"] == "concurrent"
+        assert c.stats["pages"] == 5
+
+    async def test_max_depth_respected(self):
+        c = Crawler(max_pages=50, max_depth=1, concurrency=4)
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC_DNS):
+            async with respx.mock:
+                respx.get(url__startswith="https://example.com/").mock(side_effect=_site(3))
+                results = await c.crawl("https://example.com/")
+
+        # Homepage + 3 leaf pages; leaf links back to "/" are already visited
+        assert sorted(r.url for r in results) == [
+            "https://example.com/",
+            "https://example.com/p0",
+            "https://example.com/p1",
+            "https://example.com/p2",
+        ]
+
+    async def test_concurrent_faster_than_sequential(self):
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC_DNS):
+            async with respx.mock:
+                respx.get(url__startswith="https://example.com/").mock(
+                    side_effect=_site(8, delay=0.05)
+                )
+                seq = Crawler(max_pages=9, max_depth=1, concurrency=1)
+                seq_results = await seq.crawl("https://example.com/")
+                conc = Crawler(max_pages=9, max_depth=1, concurrency=8, per_host_limit=8)
+                conc_results = await conc.crawl("https://example.com/")
+
+        assert {r.url for r in seq_results} == {r.url for r in conc_results}
+        assert seq.stats["mode"] == "sequential"
+        assert conc.stats["wall_time_ms"] < seq.stats["wall_time_ms"]
+        assert conc.stats["speedup"] > 1.5
+
+    async def test_per_host_limit_caps_in_flight(self):
+        active = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return await _site(10)(request)
+
+        c = Crawler(max_pages=11, max_depth=1, concurrency=8, per_host_limit=2)
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC_DNS):
+            async with respx.mock:
+                respx.get(url__startswith="https://example.com/").mock(side_effect=handler)
+                results = await c.crawl("https://example.com/")
+
+        assert len(results) == 11
+        assert peak <= 2
+
+    async def test_failed_fetches_free_their_page_slot(self):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            path = request.url.path
+            if path in ("/p0", "/p1"):
+                # Slow failures: they hold page slots while later links queue up
+                await asyncio.sleep(0.05)
+                raise httpx.ConnectError("refused", request=request)
+            if path == "/p2":
+                await asyncio.sleep(0.05)
+                return httpx.Response(
+                    200, content=b"%PDF", headers={"content-type": "application/pdf"}
+                )
+            return await _site(6)(request)
+
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC_DNS):
+            async with respx.mock:
+                respx.get(url__startswith="https://example.com/").mock(side_effect=handler)
+                seq = await Crawler(max_pages=3, max_depth=1, concurrency=1).crawl(
+                    "https://example.com/"
+                )
+                conc = await Crawler(max_pages=3, max_depth=1, concurrency=4).crawl(
+                    "https://example.com/"
+                )
+
+        assert len(seq) == 3
+        assert len(conc) == 3
+        assert conc[0].url == "https://example.com/"
+
+    async def test_timeout_returns_pages_crawled_so_far(self):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path != "/":
+                await asyncio.sleep(5)
+            return await _site(4)(request)
+
+        c = Crawler(max_pages=10, max_depth=1, concurrency=4)
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC_DNS):
+            async with respx.mock:
+                respx.get(url__startswith="https://example.com/").mock(side_effect=handler)
+                started = asyncio.get_running_loop().time()
+                results = await c.crawl("https://example.com/", timeout=0.2)
+                elapsed = asyncio.get_running_loop().time() - started
+
+        assert elapsed < 1
+        assert [r.url for r in results] == ["https://example.com/"]
+        assert c.stats["timed_out"] is True
+
+
+class TestCrawlResultMetadata:
+    def test_slotted(self):
+        r = CrawlResult(url="https://a.com/", html="<p>x</p>", status_code=200)
+        assert not hasattr(r, "__dict__")
+        assert r.final_url == "https://a.com/"
+        assert r.parsed is r.parsed
+
+    async def test_crawl_captures_headers_and_redirects(self):
+        c = Crawler(max_pages=1, max_depth=0)
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC_DNS):
+            async with respx.mock:
+                respx.get("https://example.com/").mock(
+                    return_value=httpx.Response(301, headers={"Location": "/ko/"})
+                )
+                respx.get("https://example.com/ko/").mock(
+                    return_value=httpx.Response(
+                        200,
+                        html="<html><body>안녕</body></html>",
+                        headers={"Cache-Control": "max-age=60", "ETag": '"v1"'},
+                    )
+                )
+                [page] = await c.crawl("https://example.com/")
+
+        assert page.url == "https://example.com/"
+        assert page.final_url == "https://example.com/ko/"
+        assert page.headers["cache-control"] == "max-age=60"
+        assert page.headers["etag"] == '"v1"'
+        assert [(h.url, h.status_code, h.location) for h in page.redirects] == [
+            ("https://example.com/", 301, "/ko/")
+        ]
+        assert page.redirect_ms >= 0
+        assert page.elapsed_ms is not None
+        assert page.transfer_size == len("<html><body>안녕</body></html>".encode())
+        assert page.content_encoding is None
+
+    async def test_ttfb_and_wire_size_from_real_exchange(self):
+        import gzip
+
+        from app.services.crawler import _HeaderTimer
+
+        body = gzip.compress(b"<html>" + b"a" * 5000 + b"</html>")
+
+        async def handle(reader, writer):
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Encoding: gzip\r\n"
+                + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        timer = _HeaderTimer()
+        try:
+            async with httpx.AsyncClient() as client:
+                resp = await client.get(
+                    f"http://127.0.0.1:{port}/", extensions={"trace": timer}
+                )
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        page = CrawlResult.from_response(str(resp.url), resp, ttfb_ms=timer.last)
+        assert page.ttfb_ms is not None and page.ttfb_ms >= 0
+        assert page.content_encoding == "gzip"
+        assert page.transfer_size == len(body)
+        assert len(page.html) == len("<html>") + 5000 + len("</html>")
+
+
+class _ChunkStream(httpx.AsyncByteStream):
+    """Response body served in chunks, counting how many were pulled."""
+
+    def __init__(self, chunks: list[bytes]):
+        self.chunks = chunks
+        self.pulled = 0
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.pulled += 1
+            yield chunk
+
+
+class TestStreamedFetch:
+    async def test_non_html_body_not_downloaded(self):
+        pdf = _ChunkStream([b"%PDF" + b"x" * 1000] * 50)
+        home = '<html><body><a href="/brochure.pdf">pdf</a></body></html>'
+        c = Crawler(max_pages=5, max_depth=1)
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC_DNS):
+            async with respx.mock:
+                respx.get("https://example.com/").mock(return_value=httpx.Response(200, html=home))
+                respx.get("https://example.com/brochure.pdf").mock(
+                    return_value=httpx.Response(
+                        200, headers={"Content-Type": "application/pdf"}, stream=pdf
+                    )
+                )
+                results = await c.crawl("https://example.com/")
+
+        assert [r.url for r in results] == ["https://example.com/"]
+        assert pdf.pulled == 0
+        assert c.stats["non_html_skipped"] == 1
+        entry = c.memo.get("https://example.com/brochure.pdf")
+        assert entry.status_code == 200 and entry.partial
+
+    async def test_html_capped_and_marked_truncated(self):
+        page = _ChunkStream([b"<html>" + b"a" * 94] * 100)
+        c = Crawler(max_pages=1, max_depth=0, max_html_bytes=1000)
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC_DNS):
+            async with respx.mock:
+                respx.get("https://example.com/").mock(
+                    return_value=httpx.Response(
+                        200, headers={"Content-Type": "text/html"}, stream=page
+                    )
+                )
+                [result] = await c.crawl("https://example.com/")
+
+        assert result.truncated
+        assert len(result.html) == 1000
+        assert page.pulled == 11  # the one that overflows the cap; the other 89 are never read
+        assert c.stats["truncated"] == 1
+        assert c.memo.get("https://example.com/").partial
+
+    async def test_incremental_decoding(self):
+        text = "<html><body>안녕하세요 병원입니다</body></html>"
+        for charset in ("utf-8", "euc-kr"):
+            raw = text.encode(charset)
+            # 3-byte chunks split multibyte characters across chunk boundaries
+            stream = _ChunkStream([raw[i:i + 3] for i in range(0, len(raw), 3)])
+            c = Crawler(max_pages=1, max_depth=0)
+            with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC_DNS):
+                async with respx.mock:
+                    respx.get("https://example.com/").mock(
+                        return_value=httpx.Response(
+                            200, headers={"Content-Type": f"text/html; charset={charset}"},
+                            stream=stream,
+                        )
+                    )
+                    [result] = await c.crawl("https://example.com/")
+            assert result.html == text
+            assert not result.truncated
+
+    async def test_fetch_single_reads_within_cap(self):
+        c = Crawler(max_html_bytes=10)
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC_DNS):
+            async with respx.mock:
+                respx.get("https://example.com/").mock(
+                    return_value=httpx.Response(200, html="<html>" + "b" * 100 + "</html>")
+                )
+                result = await c.fetch_single("https://example.com/")
+        assert result.html == "<html>bbbb"
+        assert result.truncated
+
+
+class TestFrontierDedup:
+    async def test_url_variants_fetched_once(self):
+        home = "".join(
+            f'<a href="{href}">x</a>'
+            for href in (
+                "/about",
+                "/about/",
+                "https://www.example.com/about",
+                "/about?utm_source=naver&fbclid=1",
+                "/about#doctors",
+                "https://example.com:443/ABOUT",  # different path: a real page
+                "/list?b=2&a=1",
+                "/list?a=1&b=2",
+            )
+        )
+        c = Crawler(max_pages=10, max_depth=1)
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC_DNS):
+            async with respx.mock:
+                route = respx.get(url__startswith="https://example.com/").mock(
+                    side_effect=lambda request: httpx.Response(
+                        200, html=home if request.url.path == "/" else "<html></html>"
+                    )
+                )
+                results = await c.crawl("https://example.com/")
+
+        fetched = [str(call.request.url) for call in route.calls]
+        assert sorted(fetched) == [
+            "https://example.com/",
+            "https://example.com/ABOUT",
+            "https://example.com/about",
+            "https://example.com/list?a=1&b=2",
+        ]
+        assert len(results) == 4
+        # Raw-string dedupe would have fetched about/, www, utm and the unsorted list
+        assert c.stats["frontier"]["fetches_saved"] == 4
+        assert c.stats["frontier"]["duplicates_dropped"] == 5
@@ -0,0 +1,73 @@
+"""Tests for the shared, app-scoped HTTP client registry."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+
+from app.config import settings
+from app.security.pinned_transport import PinnedTransport
+from app.services import http_clients
+from app.services.http_clients import aclose_clients, get_client
+
+_PUBLIC_DNS = [(2, 1, 6, "", ("93.184.216.34", 443))]
+
+
+@pytest.fixture(autouse=True)
+async def _fresh_registry():
+    await aclose_clients()
+    yield
+    await aclose_clients()
+
+
+@pytest.mark.asyncio
+class TestRegistry:
+    async def test_same_client_per_target(self):
+        assert get_client("serper") is get_client("serper")
+        assert get_client("serper") is not get_client("naver")
+
+    async def test_unknown_target(self):
+        with pytest.raises(KeyError):
+            get_client("nope")
+
+    async def test_sites_client_is_pinned(self):
+        client = get_client("sites")
+        transport = client._transport
+        assert isinstance(transport, PinnedTransport)
+        assert client.follow_redirects is True
+        assert client.headers["User-Agent"] == http_clients.BOT_USER_AGENT
+
+    async def test_sites_client_keeps_no_cookies(self):
+        client = get_client("sites")
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC_DNS):
+            async with respx.mock:
+                respx.get("https://example.com/").mock(
+                    return_value=httpx.Response(200, headers={"Set-Cookie": "sid=abc; Path=/"})
+                )
+                await client.get("https://example.com/")
+        assert len(client.cookies) == 0
+
+    async def test_http2_follows_setting(self, monkeypatch):
+        monkeypatch.setattr(settings, "http2_enabled", False)
+        assert http_clients.http2_available() is False
+        monkeypatch.setattr(settings, "http2_enabled", True)
+        assert http_clients.http2_available() is True  # h2 is a dependency
+
+    async def test_aclose_closes_and_rebuilds(self):
+        client = get_client("resend")
+        await aclose_clients()
+        assert client.is_closed
+        assert get_client("resend") is not client
+
+
+class TestLoopBinding:
+    def test_new_event_loop_gets_new_clients(self):
+        import asyncio
+
+        async def grab():
+            return get_client("llm")
+
+        first = asyncio.run(grab())
+        second = asyncio.run(grab())
+        assert first is not second
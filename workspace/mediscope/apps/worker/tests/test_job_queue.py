@@ -0,0 +1,242 @@
+"""Tests for the SQLite job queue and worker pool."""
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from app.services.job_queue import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue, WorkerPool
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = JobQueue(
+        str(tmp_path / "jobs.sqlite3"), visibility_timeout=30, max_attempts=3, retry_backoff=0
+    )
+    yield q
+    q.close()
+
+
+class TestJobQueue:
+    def test_enqueue_and_claim(self, queue):
+        job_id = queue.enqueue("scan", {"url": "https://a.com/"})
+        job = queue.claim()
+        assert job.id == job_id
+        assert job.payload == {"url": "https://a.com/"}
+        assert job.status == RUNNING
+        assert job.attempts == 1
+        assert queue.claim() is None
+
+    def test_priority_then_fifo(self, queue):
+        low = queue.enqueue("scan", {}, priority=0)
+        high = queue.enqueue("scan", {}, priority=10)
+        low2 = queue.enqueue("scan", {}, priority=0)
+        assert [queue.claim().id for _ in range(3)] == [high, low, low2]
+
+    def test_complete(self, queue):
+        job_id = queue.enqueue("scan", {})
+        queue.claim()
+        queue.complete(job_id, {"total_score": 80})
+        job = queue.get(job_id)
+        assert job.status == SUCCEEDED
+        assert job.result == {"total_score": 80}
+
+    def test_retry_then_fail(self, queue):
+        job_id = queue.enqueue("scan", {}, max_attempts=2)
+        queue.claim()
+        assert queue.fail(job_id, "boom") == QUEUED
+        queue.claim()
+        assert queue.fail(job_id, "boom again") == FAILED
+        job = queue.get(job_id)
+        assert job.status == FAILED
+        assert job.attempts == 2
+        assert job.error == "boom again"
+        assert queue.claim() is None
+
+    def test_retry_backoff_delays_next_claim(self, tmp_path):
+        q = JobQueue(str(tmp_path / "b.sqlite3"), retry_backoff=60)
+        job_id = q.enqueue("scan", {})
+        q.claim()
+        q.fail(job_id, "boom")
+        assert q.claim() is None  # not due for another minute
+        q.close()
+
+    def test_lapsed_lease_is_reclaimed(self, tmp_path):
+        q = JobQueue(str(tmp_path / "v.sqlite3"), visibility_timeout=0.05)
+        job_id = q.enqueue("scan", {})
+        q.claim()
+        assert q.claim() is None
+        time.sleep(0.1)
+        job = q.claim()
+        assert job.id == job_id
+        assert job.attempts == 2
+        q.close()
+
+    def test_heartbeat_keeps_lease(self, tmp_path):
+        q = JobQueue(str(tmp_path / "h.sqlite3"), visibility_timeout=0.2)
+        q.enqueue("scan", {})
+        job = q.claim()
+        for _ in range(3):
+            time.sleep(0.1)
+            q.heartbeat(job.id)
+        assert q.claim() is None
+        q.close()
+
+    def test_release_does_not_count_attempt(self, queue):
+        job_id = queue.enqueue("scan", {})
+        queue.claim()
+        queue.release(job_id)
+        job = queue.get(job_id)
+        assert job.status == QUEUED
+        assert job.attempts == 0
+
+    def test_restart_recovery(self, tmp_path):
+        path = str(tmp_path / "r.sqlite3")
+        first = JobQueue(path, max_attempts=3)
+        job_id = first.enqueue("scan", {"url": "https://a.com/"})
+        first.claim()
+        first.close()  # process dies mid-scan
+
+        second = JobQueue(path, max_attempts=3)
+        assert second.recover() == 1
+        job = second.claim()
+        assert job.id == job_id
+        assert job.payload == {"url": "https://a.com/"}
+        second.close()
+
+    def test_counts(self, queue):
+        queue.enqueue("scan", {})
+        queue.enqueue("scan", {})
+        queue.claim()
+        assert queue.counts() == {QUEUED: 1, RUNNING: 1}
+
+
+async def _wait_for(queue: JobQueue, job_id: str, status: str, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if queue.get(job_id).status == status:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"{job_id} never reached {status}: {queue.get(job_id)}")
+
+
+class TestWorkerPool:
+    async def test_runs_jobs(self, queue):
+        async def handler(job):
+            return {"echo": job.payload["n"]}
+
+        pool = WorkerPool(queue, {"scan": handler}, size=2, poll_interval=0.01)
+        await pool.start()
+        job_id = queue.enqueue("scan", {"n": 1})
+        pool.notify()
+        await _wait_for(queue, job_id, SUCCEEDED)
+        await pool.stop()
+        assert queue.get(job_id).result == {"echo": 1}
+
+    async def test_concurrency_bounded_by_size(self, queue):
+        active = peak = 0
+
+        async def handler(job):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+
+        pool = WorkerPool(queue, {"scan": handler}, size=2, poll_interval=0.01)
+        ids = [queue.enqueue("scan", {}) for _ in range(6)]
+        await pool.start()
+        for job_id in ids:
+            await _wait_for(queue, job_id, SUCCEEDED)
+        await pool.stop()
+        assert peak == 2
+
+    async def test_failed_job_is_retried(self, queue):
+        calls = []
+
+        async def handler(job):
+            calls.append(job.attempts)
+            if job.attempts < 2:
+                raise RuntimeError("transient")
+            return {"ok": True}
+
+        pool = WorkerPool(queue, {"scan": handler}, size=1, poll_interval=0.01)
+        job_id = queue.enqueue("scan", {})
+        await pool.start()
+        await _wait_for(queue, job_id, SUCCEEDED)
+        await pool.stop()
+        assert calls == [1, 2]
+
+    async def test_unknown_kind_fails(self, queue):
+        pool = WorkerPool(queue, {}, size=1, poll_interval=0.01)
+        job_id = queue.enqueue("mystery", {}, max_attempts=1)
+        await pool.start()
+        await _wait_for(queue, job_id, FAILED)
+        await pool.stop()
+
+    async def test_stop_releases_running_job(self, queue):
+        started = asyncio.Event()
+
+        async def handler(job):
+            started.set()
+            await asyncio.sleep(10)
+
+        pool = WorkerPool(queue, {"scan": handler}, size=1, poll_interval=0.01)
+        job_id = queue.enqueue("scan", {})
+        await pool.start()
+        await asyncio.wait_for(started.wait(), 1)
+        await pool.stop()
+        job = queue.get(job_id)
+        assert job.status == QUEUED
+        assert job.attempts == 0
+
+    async def test_claim_error_does_not_kill_worker(self, queue, monkeypatch, caplog):
+        claim = queue.claim
+        failures = []
+
+        def flaky_claim():
+            if not failures:
+                failures.append(1)
+                raise sqlite3.OperationalError("database is locked")
+            return claim()
+
+        monkeypatch.setattr(queue, "claim", flaky_claim)
+
+        async def handler(job):
+            return {"ok": True}
+
+        pool = WorkerPool(queue, {"scan": handler}, size=1, poll_interval=0.01)
+        job_id = queue.enqueue("scan", {})
+        await pool.start()
+        await _wait_for(queue, job_id, SUCCEEDED)
+        assert pool._tasks[0].done() is False
+        await pool.stop()
+        assert failures == [1]
+        assert "database is locked" in caplog.text
+
+    async def test_heartbeat_error_keeps_lease_renewal_going(self, tmp_path, monkeypatch, caplog):
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"), visibility_timeout=0.15)
+        beat = queue.heartbeat
+        beats = []
+
+        def flaky_heartbeat(job_id):
+            beats.append(job_id)
+            if len(beats) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            beat(job_id)
+
+        monkeypatch.setattr(queue, "heartbeat", flaky_heartbeat)
+
+        async def handler(job):
+            await asyncio.sleep(0.4)
+            return {"ok": True}
+
+        pool = WorkerPool(queue, {"scan": handler}, size=1, poll_interval=0.01)
+        job_id = queue.enqueue("scan", {})
+        await pool.start()
+        await _wait_for(queue, job_id, SUCCEEDED)
+        await pool.stop()
+        queue.close()
+        assert len(beats) >= 3
+        assert "Heartbeat for job" in caplog.text
@@ -0,0 +1,99 @@
+"""Tests for the shared Aho-Corasick keyword matcher."""
+
+import re
+
+from app.services.keyword_matcher import (
+    Hit,
+    KeywordMatcher,
+    RegexSet,
+    non_overlapping,
+    required_literals,
+)
+
+
+class TestKeywordMatcher:
+    def test_reports_every_hit_with_offsets(self):
+        m = KeywordMatcher.from_groups({"pos": ["만족", "만족스러"], "proc": ["보톡스"]})
+        text = "보톡스 결과가 만족스러웠어요"
+        assert sorted(m.hits(text)) == [
+            Hit(0, 3, "proc"),
+            Hit(8, 10, "pos"),
+            Hit(8, 12, "pos"),
+        ]
+
+    def test_overlapping_and_suffix_keywords(self):
+        m = KeywordMatcher([("he", "he"), ("she", "she"), ("hers", "hers"), ("his", "his")])
+        assert sorted(m.hits("ushers")) == [Hit(1, 4, "she"), Hit(2, 4, "he"), Hit(2, 6, "hers")]
+
+    def test_case_insensitive_offsets_match_original(self):
+        m = KeywordMatcher([("botox", "botox")])
+        text = "İstanbul BOTOX"
+        [hit] = m.hits(text)
+        assert text[hit.start:hit.end] == "BOTOX"
+
+    def test_keyword_with_several_labels(self):
+        m = KeywordMatcher([("review", "section"), ("review", "page")])
+        assert m.labels("patient review") == {"section", "page"}
+
+    def test_no_hits(self):
+        m = KeywordMatcher.from_groups({"a": ["filler"]})
+        assert m.hits("nothing here") == []
+        assert len(m) == 1
+
+    def test_non_overlapping_is_leftmost_longest(self):
+        hits = [Hit(0, 2, "k"), Hit(0, 4, "k"), Hit(3, 5, "k"), Hit(5, 7, "k")]
+        assert non_overlapping(hits) == [Hit(0, 4, "k"), Hit(5, 7, "k")]
+
+
+class TestRequiredLiterals:
+    def test_literal_runs(self):
+        assert required_literals(r"gtag.*G-[A-Z0-9]+").atoms == ["gtag", "G-"]
+        assert required_literals(r"No\.\s*1").atoms == ["No.", "1"]
+        assert required_literals(r"ga\('create").exact
+
+    def test_optional_character_dropped(self):
+        lits = required_literals(r"최고의?")
+        assert lits.atoms == ["최고"] and lits.leading and not lits.exact
+
+    def test_alternation_and_leading_class_require_nothing(self):
+        assert required_literals(r"a|b").atoms == []
+        assert required_literals(r"[5-9]0%\s*할인").atoms == []
+
+
+class TestRegexSet:
+    PATTERNS = {
+        "exaggeration": [re.compile(r"최고의?", re.I), re.compile(r"100\s*%", re.I)],
+        "comparison": [re.compile(r"가장\s+\w+[한]", re.I)],
+        "discount": [re.compile(r"[5-9]0%\s*할인", re.I)],
+        "testimonial": [re.compile(r"患者.*の声", re.I)],
+    }
+
+    def test_matches_equal_finditer(self):
+        rs = RegexSet(self.PATTERNS)
+        text = "최고의 시술, 최고 100 % 만족! 가장 유명한 곳 70% 할인. 患者さんの声"
+        found = rs.matches(text)
+        for label, patterns in self.PATTERNS.items():
+            expected = [m.span() for p in patterns for m in p.finditer(text)]
+            assert [m.span() for m in found.get(label, [])] == expected
+
+    def test_regex_skipped_when_literal_missing(self):
+        class Spy:
+            pattern = "체험"
+            flags = re.I
+            calls = 0
+
+            def finditer(self, text):
+                Spy.calls += 1
+                return iter(())
+
+            def match(self, text, pos):
+                Spy.calls += 1
+
+        rs = RegexSet({"x": [Spy()]})
+        assert rs.labels("아무 내용 없음") == set()
+        assert Spy.calls == 0
+
+    def test_labels(self):
+        rs = RegexSet(self.PATTERNS)
+        assert rs.labels("業界 患者様の声 and 80%할인") == {"testimonial", "discount"}
+        assert rs.labels("") == set()
@@ -0,0 +1,201 @@
+"""Tests for local lab metrics (browser faked)."""
+
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+import respx
+
+from app.checks.performance import check_performance
+from app.config import settings
+from app.security.ssrf import SSRFError
+from app.services import lab_metrics
+from app.services.lab_metrics import LabMetrics, lab_performance_score, measure_lab_metrics
+
+_RAW = {"fcp": 900.0, "lcp": 1800.0, "cls": 0.02, "tbt": 120.0, "bytes": 350_000, "requests": 24}
+_PSI = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
+
+
+class _FakeRoute:
+    def __init__(self, url):
+        self.request = type("Req", (), {"url": url})()
+        self.outcome = None
+
+    async def abort(self, reason):
+        self.outcome = "abort"
+
+    async def continue_(self):
+        self.outcome = "continue"
+
+
+class _FakeCDP:
+    def __init__(self, sent):
+        self.sent = sent
+
+    async def send(self, method, params=None):
+        self.sent.append((method, params))
+
+
+class _FakePage:
+    def __init__(self, ctx):
+        self.ctx = ctx
+
+    async def goto(self, url, **kwargs):
+        self.ctx.visited.append(url)
+        # Page requests pass through the route guard like in a real browser
+        for sub in self.ctx.subrequests:
+            route = _FakeRoute(sub)
+            await self.ctx.guard(route)
+            self.ctx.routed.append((sub, route.outcome))
+
+    async def wait_for_load_state(self, state, timeout=None):
+        pass
+
+    async def evaluate(self, script):
+        return dict(_RAW)
+
+
+class _FakeContext:
+    def __init__(self, subrequests=()):
+        self.subrequests = list(subrequests)
+        self.visited: list[str] = []
+        self.routed: list[tuple[str, str]] = []
+        self.cdp: list = []
+        self.options: dict = {}
+        self.guard = None
+
+    async def route(self, matcher, handler):
+        self.guard = handler
+
+    async def add_init_script(self, script):
+        pass
+
+    async def new_page(self):
+        return _FakePage(self)
+
+    async def new_cdp_session(self, page):
+        return _FakeCDP(self.cdp)
+
+
+class _FakePool:
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.opened = 0
+
+    @asynccontextmanager
+    async def context(self, **options):
+        self.opened += 1
+        self.ctx.options = options
+        yield self.ctx
+
+
+@pytest.fixture
+def fake_browser(monkeypatch):
+    lab_metrics.clear_lab_metrics_cache()
+
+    async def allow(url):
+        if "internal" in url:
+            raise SSRFError("Blocked private IP")
+        return url
+
+    monkeypatch.setattr(lab_metrics, "validate_url_async", allow)
+    ctx = _FakeContext(["https://cdn.example.com/app.js", "http://internal.local/admin"])
+    pool = _FakePool(ctx)
+    monkeypatch.setattr(lab_metrics, "get_browser_pool", lambda: pool)
+    yield pool
+    lab_metrics.clear_lab_metrics_cache()
+
+
+@pytest.mark.asyncio
+class TestMeasure:
+    async def test_measures_and_throttles(self, fake_browser):
+        m = await measure_lab_metrics("https://example.com/", "mobile")
+        assert (m.lcp_ms, m.cls, m.tbt_ms, m.transfer_bytes) == (1800.0, 0.02, 120.0, 350_000)
+        cdp = dict(fake_browser.ctx.cdp)
+        assert cdp["Emulation.setCPUThrottlingRate"] == {"rate": 4}
+        assert cdp["Network.emulateNetworkConditions"]["latency"] == 150
+        assert fake_browser.ctx.options["is_mobile"] is True
+
+    async def test_subrequests_to_private_hosts_are_aborted(self, fake_browser):
+        m = await measure_lab_metrics("https://example.com/", "desktop")
+        assert fake_browser.ctx.routed == [
+            ("https://cdn.example.com/app.js", "continue"),
+            ("http://internal.local/admin", "abort"),
+        ]
+        assert m.blocked_requests == 1
+
+    async def test_cached_per_url_and_profile(self, fake_browser):
+        await measure_lab_metrics("https://example.com/", "mobile")
+        await measure_lab_metrics("https://example.com/", "mobile")
+        await measure_lab_metrics("https://example.com/", "desktop")
+        assert fake_browser.opened == 2
+        assert lab_metrics.lab_metrics_stats()["hits"] == 1
+
+
+class TestScore:
+    def _metrics(self, **kw):
+        base = dict(url="u", profile="mobile", fcp_ms=1800, lcp_ms=2500, cls=0.1, tbt_ms=200,
+                    transfer_bytes=None, requests=None)
+        return LabMetrics(**{**base, **kw})
+
+    def test_p10_values_score_90(self):
+        assert lab_performance_score(self._metrics()) == pytest.approx(90, abs=0.1)
+
+    def test_median_values_score_50(self):
+        m = self._metrics(fcp_ms=3000, lcp_ms=4000, cls=0.25, tbt_ms=600)
+        assert lab_performance_score(m) == pytest.approx(50, abs=0.1)
+
+    def test_missing_metrics_are_reweighted(self):
+        partial = self._metrics(fcp_ms=None, cls=None)
+        assert lab_performance_score(partial) == pytest.approx(90, abs=0.1)
+        assert lab_performance_score(
+            self._metrics(fcp_ms=None, lcp_ms=None, cls=None, tbt_ms=None)
+        ) is None
+
+
+@pytest.mark.asyncio
+class TestCheckPerformanceLabMode:
+    async def test_fallback_when_pagespeed_fails(self, fake_browser, monkeypatch):
+        monkeypatch.setattr(settings, "lab_metrics_mode", "fallback")
+        async with respx.mock:
+            respx.get(_PSI).mock(return_value=httpx.Response(429))
+            async with httpx.AsyncClient() as client:
+                results = await check_performance(client, "https://example.com/")
+
+        by_name = {r.name: r for r in results}
+        assert by_name["lcp"].details["value"] == 1.8
+        assert by_name["lcp"].details["source"] == "lab"
+        assert by_name["inp"].details["metric"] == "tbt"
+        assert by_name["performance_score"].details["value"] > 90
+        assert all(r.fail_type == "site_issue" for r in results)
+
+    async def test_always_skips_pagespeed(self, fake_browser, monkeypatch):
+        monkeypatch.setattr(settings, "lab_metrics_mode", "always")
+        async with respx.mock:
+            psi = respx.get(_PSI)
+            async with httpx.AsyncClient() as client:
+                results = await check_performance(client, "https://example.com/")
+        assert not psi.called
+        assert [r.name for r in results] == ["lcp", "inp", "cls", "performance_score"]
+
+    async def test_off_keeps_neutral_fallback(self, fake_browser, monkeypatch):
+        monkeypatch.setattr(settings, "lab_metrics_mode", "off")
+        async with respx.mock:
+            respx.get(_PSI).mock(return_value=httpx.Response(500))
+            async with httpx.AsyncClient() as client:
+                results = await check_performance(client, "https://example.com/")
+        assert all(r.fail_type == "api_error" for r in results)
+        assert fake_browser.opened == 0
+
+    async def test_lab_failure_keeps_neutral_fallback(self, fake_browser, monkeypatch):
+        monkeypatch.setattr(settings, "lab_metrics_mode", "fallback")
+
+        async def boom(*args, **kwargs):
+            raise RuntimeError("browser crashed")
+
+        monkeypatch.setattr(lab_metrics, "measure_lab_metrics", boom)
+        async with respx.mock:
+            respx.get(_PSI).mock(return_value=httpx.Response(500))
+            async with httpx.AsyncClient() as client:
+                results = await check_performance(client, "https://example.com/")
+        assert all(r.fail_type == "api_error" for r in results)
@@ -0,0 +1,175 @@
+"""Tests for the PageSpeed Insights result cache."""
+
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+
+from app.checks.performance import PageSpeedError, check_performance
+from app.config import settings
+from app.db.repository import FakeRepository
+from app.services import pagespeed_cache
+from app.services.pagespeed_cache import cached_pagespeed, pagespeed_cache_stats
+
+_PSI = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
+_METRICS = {"lcp_ms": 1800.0, "inp_ms": 120.0, "cls": 0.02, "performance_score": 92.0}
+_PSI_BODY = {
+    "lighthouseResult": {
+        "audits": {
+            "largest-contentful-paint": {"numericValue": 1800},
+            "interaction-to-next-paint": {"numericValue": 120},
+            "cumulative-layout-shift": {"numericValue": 0.02},
+        },
+        "categories": {"performance": {"score": 0.92}},
+    }
+}
+
+
+class _Fetcher:
+    def __init__(self, result=_METRICS, delay=0.0, error=None):
+        self.calls = 0
+        self.result = result
+        self.delay = delay
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return dict(self.result)
+
+
+@pytest.fixture
+def no_db():
+    with patch.object(pagespeed_cache, "get_repository", return_value=None):
+        yield
+
+
+@pytest.mark.asyncio
+class TestCachedPagespeed:
+    async def test_fresh_hit_skips_fetch(self, no_db):
+        fetch = _Fetcher()
+        await cached_pagespeed("https://a.com/", "mobile", fetch)
+        again = await cached_pagespeed("https://a.com/", "mobile", fetch)
+        other_strategy = await cached_pagespeed("https://a.com/", "desktop", fetch)
+
+        assert again == _METRICS == other_strategy
+        assert fetch.calls == 2
+        stats = pagespeed_cache_stats()
+        assert (stats["fresh_hits"], stats["misses"]) == (1, 2)
+
+    async def test_concurrent_misses_share_one_fetch(self, no_db):
+        fetch = _Fetcher(delay=0.05)
+        results = await asyncio.gather(
+            *(cached_pagespeed("https://a.com/", "mobile", fetch) for _ in range(5))
+        )
+        assert fetch.calls == 1
+        assert all(r == _METRICS for r in results)
+        assert pagespeed_cache_stats()["coalesced"] == 4
+
+    async def test_waiter_timeout_does_not_cancel_shared_fetch(self, no_db):
+        fetch = _Fetcher(delay=0.05)
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(cached_pagespeed("https://a.com/", "mobile", fetch), 0.01)
+        assert await cached_pagespeed("https://a.com/", "mobile", fetch) == _METRICS
+        assert fetch.calls == 1
+
+    async def test_stale_entry_served_and_refreshed(self, no_db, monkeypatch):
+        monkeypatch.setattr(settings, "pagespeed_cache_ttl", 60)
+        monkeypatch.setattr(settings, "pagespeed_stale_ttl", 600)
+        pagespeed_cache._memory.set(
+            ("https://a.com/", "mobile"), ({"lcp_ms": 9000.0}, time.time() - 120)
+        )
+
+        fetch = _Fetcher(delay=0.01)
+        served = await cached_pagespeed("https://a.com/", "mobile", fetch)
+        assert served == {"lcp_ms": 9000.0}
+
+        await asyncio.sleep(0.05)  # background refresh lands
+        assert fetch.calls == 1
+        assert await cached_pagespeed("https://a.com/", "mobile", fetch) == _METRICS
+        stats = pagespeed_cache_stats()
+        assert (stats["stale_hits"], stats["refreshes"], stats["fresh_hits"]) == (1, 1, 1)
+
+    async def test_expired_entry_is_refetched(self, no_db, monkeypatch):
+        monkeypatch.setattr(settings, "pagespeed_cache_ttl", 60)
+        monkeypatch.setattr(settings, "pagespeed_stale_ttl", 60)
+        pagespeed_cache._memory.set(
+            ("https://a.com/", "mobile"), ({"lcp_ms": 9000.0}, time.time() - 500)
+        )
+        fetch = _Fetcher()
+        assert await cached_pagespeed("https://a.com/", "mobile", fetch) == _METRICS
+        assert fetch.calls == 1
+
+    async def test_errors_are_not_cached(self, no_db):
+        failing = _Fetcher(error=PageSpeedError("PageSpeed API 호출 실패"))
+        with pytest.raises(PageSpeedError):
+            await cached_pagespeed("https://a.com/", "mobile", failing)
+        fetch = _Fetcher()
+        assert await cached_pagespeed("https://a.com/", "mobile", fetch) == _METRICS
+        assert pagespeed_cache_stats()["errors"] == 1
+
+    async def test_db_tier_survives_restart(self):
+        repo = FakeRepository()
+        with patch.object(pagespeed_cache, "get_repository", return_value=repo):
+            await cached_pagespeed("https://a.com/", "mobile", _Fetcher())
+            [row] = repo.rows("pagespeed_cache")
+            assert (row["url"], row["strategy"], row["metrics"]) == (
+                "https://a.com/",
+                "mobile",
+                _METRICS,
+            )
+
+            pagespeed_cache.clear_pagespeed_cache()  # new process: memory tier empty
+            fetch = _Fetcher()
+            assert await cached_pagespeed("https://a.com/", "mobile", fetch) == _METRICS
+
+        assert fetch.calls == 0
+        assert pagespeed_cache_stats()["db_hits"] == 1
+
+    async def test_old_db_row_is_refetched(self):
+        old = (datetime.now(UTC) - timedelta(days=30)).isoformat()
+        repo = FakeRepository({
+            "pagespeed_cache": [
+                {
+                    "url": "https://a.com/",
+                    "strategy": "mobile",
+                    "metrics": {"lcp_ms": 1.0},
+                    "fetched_at": old,
+                }
+            ]
+        })
+        fetch = _Fetcher()
+        with patch.object(pagespeed_cache, "get_repository", return_value=repo):
+            assert await cached_pagespeed("https://a.com/", "mobile", fetch) == _METRICS
+        assert fetch.calls == 1
+
+
+@pytest.mark.asyncio
+class TestCheckPerformanceCached:
+    async def test_rescan_does_not_call_psi_again(self, no_db):
+        async with respx.mock:
+            route = respx.get(_PSI).mock(return_value=httpx.Response(200, json=_PSI_BODY))
+            async with httpx.AsyncClient() as client:
+                first = await check_performance(client, "https://example.com/")
+                second = await check_performance(client, "https://example.com/")
+
+        assert route.call_count == 1
+        assert [r.details for r in first] == [r.details for r in second]
+        assert {r.name: r.details["value"] for r in second}["performance_score"] == 92.0
+
+    async def test_lighthouse_runtime_error_is_not_cached(self, no_db):
+        body = {"lighthouseResult": {"runtimeError": {"code": "NO_FCP"}, "audits": {}}}
+        async with respx.mock:
+            route = respx.get(_PSI).mock(return_value=httpx.Response(200, json=body))
+            async with httpx.AsyncClient() as client:
+                await check_performance(client, "https://example.com/")
+                await check_performance(client, "https://example.com/")
+
+        assert route.call_count == 2
+        assert pagespeed_cache_stats()["errors"] == 2
@@ -0,0 +1,90 @@
+"""Tests for the parse-once ParsedPage model."""
+
+from bs4 import BeautifulSoup
+
+from app.checks.meta_tags import check_meta_tags
+from app.checks.parsed_page import ParsedPage, as_page, as_pages
+from app.services.crawler import CrawlResult
+
+HTML = """<html lang=" ko "><head>
+<title> 강남 피부과 | 공식 </title>
+<meta name="Description" content="설명">
+<meta property="og:title" content="OG">
+<script type="application/ld+json">[{"@type": "Organization"}, {"@type": "FAQPage"}]</script>
+<script type="application/ld+json">{not json</script>
+<style>.a{color:red}</style>
+</head><body>
+<h1>메인</h1><h3>소제목</h3>
+<p>보이는 텍스트</p>
+<script>var hidden = 1;</script>
+<noscript>JS 필요</noscript>
+<a href="/about">About</a><a href="https://other.com/x">x</a>
+</body></html>"""
+
+
+class TestParsedPage:
+    def test_soup_parsed_once(self):
+        page = ParsedPage(url="https://a.com/", html=HTML)
+        assert page.soup is page.soup
+
+    def test_derived_views(self):
+        page = ParsedPage(url="https://a.com/", html=HTML)
+        assert page.title == "강남 피부과 | 공식"
+        assert page.lang == "ko"
+        assert page.meta["description"] == "설명"
+        assert page.meta["og:title"] == "OG"
+        assert page.headings == [(1, "메인"), (3, "소제목")]
+        assert page.links == ["https://a.com/about", "https://other.com/x"]
+        assert [d["@type"] for d in page.json_ld] == ["Organization", "FAQPage"]
+
+    def test_visible_text_excludes_scripts(self):
+        page = ParsedPage(html=HTML)
+        assert "보이는 텍스트" in page.text
+        assert "hidden" not in page.text
+        assert "color:red" not in page.text
+        assert "JS 필요" not in page.text
+        assert "JS 필요" in page.full_text
+
+    def test_text_does_not_mutate_soup(self):
+        page = ParsedPage(html=HTML)
+        _ = page.text
+        assert page.soup.find("noscript") is not None
+        assert len(page.soup.find_all("script")) == 3
+
+    def test_title_override(self):
+        assert ParsedPage(html=HTML, title="Given").title == "Given"
+
+    def test_empty_html(self):
+        page = ParsedPage()
+        assert page.title == ""
+        assert page.lang == ""
+        assert page.text == ""
+        assert page.json_ld == []
+
+
+class TestAsPage:
+    def test_passthrough(self):
+        page = ParsedPage(html=HTML)
+        assert as_page(page) is page
+
+    def test_str(self):
+        page = as_page(HTML, "https://a.com/")
+        assert page.url == "https://a.com/"
+        assert page.title == "강남 피부과 | 공식"
+
+    def test_dict(self):
+        page = as_page({"url": "https://a.com/x", "html": HTML, "status_code": 404})
+        assert page.url == "https://a.com/x"
+        assert page.status_code == 404
+
+    def test_crawl_result_memoized(self):
+        result = CrawlResult(url="https://a.com/", html=HTML, status_code=200)
+        assert as_page(result) is result.parsed
+        assert as_pages([result, result])[1] is result.parsed
+
+    def test_check_accepts_parsed_page(self):
+        page = ParsedPage(url="https://a.com/", html=HTML)
+        from_page = check_meta_tags(page, "https://a.com/")
+        from_html = check_meta_tags(HTML, "https://a.com/")
+        assert from_page.score == from_html.score
+        assert isinstance(page.soup, BeautifulSoup)
@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.db.repository import FakeRepository, set_repository
 from app.services.pdf_generator import (
     CATEGORY_LABELS,
     generate_pdf,
@@ -93,16 +94,17 @@ class TestGeneratePdf:
 
         mock_client = MagicMock()
         mock_client.storage = mock_storage
-        mock_client.table.return_value = mock_client
-        mock_client.update.return_value = mock_client
-        mock_client.eq.return_value = mock_client
-        mock_client.execute.return_value = MagicMock(data=None)
+        repo = FakeRepository({"audits": [{"id": "test-audit-id", "report_url": None}]})
 
-        with patch("app.services.pdf_generator.get_supabase_client", return_value=mock_client):
-            url = await generate_pdf("test-audit-id", SAMPLE_AUDIT_DATA)
+        set_repository(repo)
+        try:
+            with patch("app.services.pdf_generator.get_supabase_client", return_value=mock_client):
+                url = await generate_pdf("test-audit-id", SAMPLE_AUDIT_DATA)
+        finally:
+            set_repository(None)
 
         assert url == "https://storage.example.com/reports/test-id.pdf"
         mock_storage.from_.assert_called_with("reports")
         mock_storage.upload.assert_called_once()
         # Verify the audit report_url was updated
-        mock_client.table.assert_any_call("audits")
+        assert repo.rows("audits")[0]["report_url"] == url
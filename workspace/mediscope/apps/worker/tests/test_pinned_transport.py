@@ -0,0 +1,111 @@
+"""Tests for the pinned-IP transport used by crawls and scan checks."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpcore
+import httpx
+import pytest
+import respx
+
+from app.security import pinned_transport, ssrf
+from app.security.pinned_transport import (
+    BlockedAddressError,
+    PinnedNetworkBackend,
+    PinnedTransport,
+)
+from app.security.ssrf import SSRFError
+
+_HOSTS = {
+    "example.com": "93.184.216.34",
+    "internal.example.com": "10.0.0.7",
+    "pinned.test": "127.0.0.1",
+}
+
+
+def _fake_getaddrinfo(host, port, *args, **kwargs):
+    return [(2, 1, 6, "", (_HOSTS[host], port))]
+
+
+class _RecordingBackend(httpcore.AsyncNetworkBackend):
+    def __init__(self):
+        self.dialed = []
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        self.dialed.append((host, port))
+        raise httpcore.ConnectError("recorded")
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+
+@pytest.mark.asyncio
+class TestPinnedNetworkBackend:
+    async def test_dials_cached_ip_not_hostname(self):
+        inner = _RecordingBackend()
+        backend = PinnedNetworkBackend(inner)
+        with patch("app.security.ssrf.socket.getaddrinfo", side_effect=_fake_getaddrinfo):
+            with pytest.raises(httpcore.ConnectError):
+                await backend.connect_tcp("example.com", 443)
+        assert inner.dialed == [("93.184.216.34", 443)]
+
+    async def test_refuses_private_address(self):
+        inner = _RecordingBackend()
+        backend = PinnedNetworkBackend(inner)
+        with patch("app.security.ssrf.socket.getaddrinfo", side_effect=_fake_getaddrinfo):
+            with pytest.raises(httpcore.ConnectError, match="Blocked private IP"):
+                await backend.connect_tcp("internal.example.com", 443)
+        assert inner.dialed == []
+
+
+@pytest.mark.asyncio
+class TestPinnedTransport:
+    async def test_redirect_to_private_host_is_blocked(self):
+        with patch("app.security.ssrf.socket.getaddrinfo", side_effect=_fake_getaddrinfo):
+            async with respx.mock:
+                respx.get("https://example.com/").mock(
+                    return_value=httpx.Response(
+                        302, headers={"Location": "http://internal.example.com/admin"}
+                    )
+                )
+                internal = respx.get("http://internal.example.com/admin")
+                async with httpx.AsyncClient(
+                    transport=PinnedTransport(), follow_redirects=True
+                ) as client:
+                    with pytest.raises(BlockedAddressError) as exc:
+                        await client.get("https://example.com/")
+
+        assert not internal.called
+        # Callers that catch either family keep working
+        assert isinstance(exc.value, httpx.HTTPError)
+        assert isinstance(exc.value, SSRFError)
+
+    async def test_connects_to_validated_ip_with_original_host(self, monkeypatch):
+        """Real socket round-trip: the hostname never reaches a second resolver."""
+        monkeypatch.setattr(ssrf, "_is_private_ip", lambda ip: False)
+        monkeypatch.setattr(pinned_transport, "_is_private_ip", lambda ip: False)
+        seen = {}
+
+        async def handle(reader, writer):
+            head = await reader.readuntil(b"\r\n\r\n")
+            seen["head"] = head.decode()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: close\r\n\r\nok")
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            with patch(
+                "app.security.ssrf.socket.getaddrinfo", side_effect=_fake_getaddrinfo
+            ) as gai:
+                async with httpx.AsyncClient(transport=PinnedTransport()) as client:
+                    resp = await client.get(f"http://pinned.test:{port}/page")
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        assert resp.status_code == 200
+        assert resp.text == "ok"
+        assert f"Host: pinned.test:{port}" in seen["head"]
+        assert gai.call_count == 1  # validation and connect share one resolution
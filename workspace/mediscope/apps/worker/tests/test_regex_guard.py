@@ -0,0 +1,170 @@
+"""Tests for guarded analyzer regex scans, with an adversarial HTML corpus."""
+
+import random
+import re
+import time
+
+import pytest
+
+from app.checks.parsed_page import ParsedPage
+from app.config import settings
+from app.services.content_freshness_analyzer import analyze_content_freshness
+from app.services.regex_guard import RegexGuard, regex_guard_stats
+from app.services.video_presence import VIDEO_EMBED_PATTERNS, analyze_video_presence
+
+_SELF_HOSTED = re.compile(VIDEO_EMBED_PATTERNS["self_hosted"][1], re.IGNORECASE | re.DOTALL)
+
+# Each document makes at least one analyzer pattern backtrack quadratically
+# when scanned in one piece (the video one alone takes seconds at this size)
+_SIZE = 120_000
+ADVERSARIAL_CORPUS = {
+    "video_without_source": "<html><body>" + "<video>" * (_SIZE // 7) + "</body></html>",
+    "unclosed_video_tag": "<video " + "a" * _SIZE,
+    "unclosed_meta": "<meta property=x " * (_SIZE // 17),
+    "unterminated_attributes": '<a href="' * (_SIZE // 9),
+    "unterminated_iframe_src": '<iframe src="' * (_SIZE // 13),
+    "digit_runs": "<p>" + "2024-" * (_SIZE // 5) + "</p>",
+    "korean_year_runs": "<p>" + "2024년 " * (_SIZE // 6) + "</p>",
+    "whitespace_after_year": "<p>" + ("2024" + " " * 2000) * (_SIZE // 2004) + "</p>",
+}
+
+# Fragments the fuzzer splices together: broken tags, unbalanced quotes and
+# long runs of the characters the patterns' open-ended classes consume
+_FUZZ_FRAGMENTS = [
+    "<video", "<video>", "<source", 'src="', "src='", "<iframe ", "youtube.com/embed/",
+    "<meta ", 'property="og:video', '"@type" :', "2024", "년 ", "월", "-", ".", "/",
+    "March 3,", "\n", " " * 50, "a" * 200, ">", '"', "'", "<", "\x00",
+]
+
+
+def _fuzz_document(rnd: random.Random, size: int) -> str:
+    parts: list[str] = []
+    length = 0
+    while length < size:
+        frag = rnd.choice(_FUZZ_FRAGMENTS) * rnd.choice((1, 1, 1, 5, 50))
+        parts.append(frag)
+        length += len(frag)
+    return "".join(parts)
+
+
+def _parsed(name: str, html: str) -> ParsedPage:
+    page = ParsedPage(url=f"https://hostile.example/{name}", html=html)
+    page.text  # parse outside the timed section
+    return page
+
+
+@pytest.fixture
+def tight_budget(monkeypatch):
+    monkeypatch.setattr(settings, "regex_budget_ms", 100)
+    monkeypatch.setattr(settings, "regex_cpu_budget_ms", 100)
+
+
+class TestPageScan:
+    PATTERNS = [
+        re.compile(r"(\d{4})[-./](\d{1,2})(?!\s*[-./]\d)"),
+        re.compile(r'(?:href|src)=["\']([^"\']+)', re.IGNORECASE),
+        re.compile(r"<video[^>]*>.{0,80}?<source[^>]+src=\"([^\"]+)", re.DOTALL),
+        re.compile(r"^ab|cd$"),
+    ]
+
+    def test_matches_equal_finditer_across_window_edges(self):
+        rnd = random.Random(3)
+        fragments = ["2024-03", "2024.1.5", 'href="/a/b"', "<video>", '<source src="/x.mp4">',
+                     "ab", "cd", " ", "x" * 37]
+        guard = RegexGuard("test", chunk=300, overlap=200)
+        for _ in range(50):
+            text = "".join(rnd.choice(fragments) for _ in range(rnd.randint(0, 400)))
+            scan = guard.page("")
+            for pattern in self.PATTERNS:
+                assert [m.span() for m in scan.finditer(pattern, text)] == [
+                    m.span() for m in pattern.finditer(text)
+                ]
+        assert guard.events == []
+
+    def test_input_cap(self):
+        guard = RegexGuard("test", max_input=1000)
+        text = "2024-01 " + "x" * 2000 + "2024-02"
+        scan = guard.page("https://a.example/")
+        assert [m.group(0) for m in scan.finditer(self.PATTERNS[0], text)] == ["2024-01"]
+        scan.search(self.PATTERNS[0], text)
+
+        [event] = guard.events
+        assert event["analyzer"] == "test"
+        assert event["url"] == "https://a.example/"
+        assert event["reason"] == "input_cap"
+        assert event["length"] == len(text)
+
+    def test_budget_stops_page_scans(self):
+        guard = RegexGuard("video_presence", budget_ms=20, cpu_budget_ms=20)
+        scan = guard.page("https://a.example/")
+        html = ADVERSARIAL_CORPUS["video_without_source"]
+
+        started = time.perf_counter()
+        assert list(scan.finditer(_SELF_HOSTED, html)) == []
+        assert time.perf_counter() - started < 1.0
+        assert scan.exhausted
+        assert scan.search(re.compile("video"), html) is None
+
+        [event] = guard.events
+        assert event["reason"] in ("time_budget", "cpu_budget")
+        assert 0 < event["offset"] < len(html)
+        # A fresh page gets a fresh budget
+        assert guard.page("https://b.example/").search(re.compile("video"), html)
+
+    def test_report(self):
+        guard = RegexGuard("test", max_input=10)
+        assert guard.report({"score": 1}) == {"score": 1}
+        list(guard.page("https://a.example/").finditer(re.compile("x"), "x" * 20))
+        result = guard.report({"score": 1})
+        assert result["details"]["regex_guard"][0]["reason"] == "input_cap"
+
+    def test_stats(self):
+        before = regex_guard_stats()
+        guard = RegexGuard("test", max_input=10)
+        list(guard.page("").finditer(re.compile("x"), "x" * 20))
+        after = regex_guard_stats()
+        assert after["pages"] == before["pages"] + 1
+        assert after["input_capped"] == before["input_capped"] + 1
+
+
+@pytest.mark.usefixtures("tight_budget")
+class TestAdversarialCorpus:
+    @pytest.mark.parametrize("name", sorted(ADVERSARIAL_CORPUS))
+    def test_analyzers_stay_within_budget(self, name):
+        page = _parsed(name, ADVERSARIAL_CORPUS[name])
+        for analyze in (analyze_video_presence, analyze_content_freshness):
+            started = time.perf_counter()
+            result = analyze([page])
+            elapsed = time.perf_counter() - started
+            # Unguarded, the worst of these take tens of seconds; the rest of
+            # the time here is HTML parsing, which the guard does not bound
+            assert elapsed < 3.0, (name, analyze.__name__, elapsed)
+            for event in result.get("details", {}).get("regex_guard", []):
+                assert event["url"] == page.url
+
+    def test_pathological_page_reported(self):
+        pages = [
+            _parsed("ok", '<iframe src="https://www.youtube.com/embed/abc"></iframe>'),
+            _parsed("video_without_source", ADVERSARIAL_CORPUS["video_without_source"]),
+        ]
+        result = analyze_video_presence(pages)
+
+        [event] = result["details"]["regex_guard"]
+        assert event["analyzer"] == "video_presence"
+        assert event["url"] == "https://hostile.example/video_without_source"
+        # The well-formed page is still analyzed
+        assert result["embedded_videos"]["youtube"]["count"] == 1
+
+    def test_clean_pages_have_no_details(self):
+        html = "<p>최종 수정 2025년 3월 2일</p><video src='/a.mp4'></video>"
+        assert "details" not in analyze_video_presence([_parsed("clean", html)])
+        assert "details" not in analyze_content_freshness([_parsed("clean", html)])
+
+    def test_fuzzed_documents(self):
+        rnd = random.Random(20260)
+        for i in range(12):
+            page = _parsed(f"fuzz-{i}", _fuzz_document(rnd, 60_000))
+            started = time.perf_counter()
+            analyze_video_presence([page])
+            analyze_content_freshness([page])
+            assert time.perf_counter() - started < 2.0, i
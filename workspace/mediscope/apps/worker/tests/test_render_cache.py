@@ -0,0 +1,176 @@
+"""Tests for the content-addressed render cache."""
+
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.config import settings
+from app.db.repository import FakeRepository, set_repository
+from app.services import image_generator, pdf_generator
+from app.services.image_generator import ImageType, generate_image
+from app.services.render_cache import RenderCache, get_render_cache, render_key, storage_path
+
+_DATA = {"category": "피부 시술", "duration": "30분"}
+_AUDIT = {"url": "https://example.com", "total_score": 72, "grade": "B", "category_scores": {}}
+
+
+def _storage_client(existing: list[str] | None = None) -> MagicMock:
+    client = MagicMock()
+    bucket = client.storage.from_.return_value
+    bucket.list.return_value = [{"name": n} for n in existing or []]
+    bucket.get_public_url.side_effect = lambda path: f"https://cdn.example.com/{path}"
+    return client
+
+
+class TestRenderKey:
+    def test_stable_and_order_independent(self, tmp_path):
+        tpl = tmp_path / "card.html"
+        tpl.write_text("<p>{{ x }}</p>")
+        a = render_key(tpl, {"a": 1, "b": 2}, language="ko", size=(1080, 1080))
+        b = render_key(tpl, {"b": 2, "a": 1}, language="ko", size=(1080, 1080))
+        assert a == b
+
+    def test_inputs_change_key(self, tmp_path):
+        tpl = tmp_path / "card.html"
+        tpl.write_text("<p>{{ x }}</p>")
+        base = render_key(tpl, _DATA, language="ko", size=(1080, 1080))
+        assert render_key(tpl, _DATA, language="en", size=(1080, 1080)) != base
+        assert render_key(tpl, _DATA, language="ko", size=(1200, 630)) != base
+        edited = {**_DATA, "duration": "40분"}
+        assert render_key(tpl, edited, language="ko", size=(1080, 1080)) != base
+
+    def test_template_edit_changes_key(self, tmp_path):
+        tpl = tmp_path / "card.html"
+        tpl.write_text("<p>{{ x }}</p>")
+        before = render_key(tpl, _DATA)
+        st = tpl.stat()
+        os.utime(tpl, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert render_key(tpl, _DATA) != before
+
+    def test_storage_path(self):
+        assert storage_path("abc", "pdf") == "cache/abc.pdf"
+
+
+@pytest.mark.asyncio
+class TestDiskCache:
+    async def test_put_and_get(self, tmp_path):
+        cache = RenderCache(tmp_path, 1024)
+        assert await cache.get("k", "png") is None
+        await cache.put("k", "png", b"png-bytes")
+        assert await cache.get("k", "png") == b"png-bytes"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    async def test_lru_eviction(self, tmp_path):
+        cache = RenderCache(tmp_path, 250)
+        await cache.put("a", "png", b"a" * 100)
+        await cache.put("b", "png", b"b" * 100)
+        await cache.get("a", "png")  # a is now most recently used
+        await cache.put("c", "png", b"c" * 100)
+
+        assert await cache.get("b", "png") is None
+        assert await cache.get("a", "png") is not None
+        assert not (tmp_path / "b.png").exists()
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] == 200
+
+    async def test_index_rebuilt_from_disk(self, tmp_path):
+        await RenderCache(tmp_path, 1024).put("k", "pdf", b"%PDF")
+        restarted = RenderCache(tmp_path, 1024)
+        assert await restarted.get("k", "pdf") == b"%PDF"
+        assert restarted.stats()["entries"] == 1
+
+    async def test_zero_size_disables_disk_tier(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", 0)
+        await cache.put("k", "png", b"png-bytes")
+        assert await cache.get("k", "png") is None
+        assert not (tmp_path / "cache").exists()
+
+    async def test_oversized_content_not_cached(self, tmp_path):
+        cache = RenderCache(tmp_path, 10)
+        await cache.put("k", "png", b"x" * 11)
+        assert await cache.get("k", "png") is None
+
+
+@pytest.mark.asyncio
+class TestGeneratorCaching:
+    async def test_identical_image_skips_render(self):
+        screenshot = AsyncMock(return_value=b"\x89PNG")
+        with patch.object(image_generator, "html_to_screenshot", screenshot) as shot:
+            first = await generate_image(ImageType.SNS_CARD, "리쥬란", _DATA)
+            second = await generate_image(ImageType.SNS_CARD, "리쥬란", _DATA)
+            await generate_image(ImageType.SNS_CARD, "리쥬란", _DATA, language="en")
+
+        assert first == second == b"\x89PNG"
+        assert shot.await_count == 2
+        assert get_render_cache().stats()["hits"] == 1
+
+    async def test_uploaded_image_skips_render_and_upload(
+        self, test_client, auth_headers, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "render_cache_storage", True)
+        body = {
+            "image_type": "sns_card",
+            "procedure_name": "리쥬란",
+            "data": _DATA,
+            "upload": True,
+        }
+        path = image_generator.image_upload_path(ImageType.SNS_CARD, "리쥬란", _DATA)
+        assert path.startswith("cache/") and path.endswith(".png")
+
+        client = _storage_client(existing=[path.rpartition("/")[2]])
+        with (
+            patch.object(
+                image_generator, "html_to_screenshot", AsyncMock(return_value=b"\x89PNG")
+            ) as shot,
+            patch("app.services.render_cache.get_supabase_client", return_value=client),
+        ):
+            resp = await test_client.post(
+                "/worker/content/image", json=body, headers=auth_headers
+            )
+
+        assert resp.status_code == 200
+        assert resp.json() == {"url": f"https://cdn.example.com/{path}", "filename": path}
+        shot.assert_not_awaited()
+        client.storage.from_.return_value.upload.assert_not_called()
+
+    async def test_identical_report_skips_render(self):
+        client = _storage_client()
+        with (
+            patch.object(
+                pdf_generator, "html_to_pdf", AsyncMock(return_value=b"%PDF-1.4")
+            ) as to_pdf,
+            patch.object(pdf_generator, "get_supabase_client", return_value=client),
+        ):
+            await pdf_generator.generate_pdf("a1", _AUDIT)
+            url = await pdf_generator.generate_pdf("a2", _AUDIT)
+
+        assert to_pdf.await_count == 1
+        assert url == "https://cdn.example.com/a2.pdf"  # still uploaded per audit
+        assert client.storage.from_.return_value.upload.call_count == 2
+
+    async def test_uploaded_report_skips_upload(self, monkeypatch):
+        monkeypatch.setattr(settings, "render_cache_storage", True)
+        client = _storage_client()
+        repo = FakeRepository({"audits": [{"id": "a1"}, {"id": "a2"}]})
+        set_repository(repo)
+        try:
+            with (
+                patch.object(
+                    pdf_generator, "html_to_pdf", AsyncMock(return_value=b"%PDF-1.4")
+                ) as to_pdf,
+                patch.object(pdf_generator, "get_supabase_client", return_value=client),
+                patch("app.services.render_cache.get_supabase_client", return_value=client),
+            ):
+                first = await pdf_generator.generate_pdf("a1", _AUDIT)
+                second = await pdf_generator.generate_pdf("a2", _AUDIT)
+        finally:
+            set_repository(None)
+
+        assert first == second
+        assert first.startswith("https://cdn.example.com/cache/") and first.endswith(".pdf")
+        assert to_pdf.await_count == 1
+        assert client.storage.from_.return_value.upload.call_count == 1
+        # Both audits still point at the shared report
+        assert [r["report_url"] for r in repo.rows("audits")] == [first, first]
@@ -0,0 +1,186 @@
+"""Tests for the async Supabase repository layer and its in-memory fake."""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.db import repository
+from app.db.repository import (
+    FakeRepository,
+    Repository,
+    eq,
+    gte,
+    ilike,
+    in_,
+    is_null,
+    lt,
+    not_null,
+)
+from app.db.supabase import save_scan_result, update_audit_status
+
+
+def _client(data):
+    """MagicMock supabase client whose every builder call chains back to itself."""
+    query = MagicMock()
+    for name in ("select", "eq", "in_", "ilike", "gte", "lt", "order", "limit", "update",
+                 "insert", "upsert", "is_"):
+        getattr(query, name).return_value = query
+    query.not_ = query
+    query.execute.return_value = SimpleNamespace(data=data)
+    client = MagicMock()
+    client.table.return_value = query
+    return client, query
+
+
+class TestRepository:
+    async def test_select_builds_query(self):
+        client, query = _client([{"id": 1}])
+        repo = Repository(client, max_concurrency=2)
+
+        rows = await repo.select(
+            "audits", "id", [eq("status", "completed"), not_null("details")],
+            order="created_at", desc=True, limit=5,
+        )
+
+        assert rows == [{"id": 1}]
+        client.table.assert_called_with("audits")
+        query.select.assert_called_with("id")
+        query.eq.assert_called_with("status", "completed")
+        query.is_.assert_called_with("details", "null")
+        query.order.assert_called_with("created_at", desc=True)
+        query.limit.assert_called_with(5)
+
+    async def test_execute_runs_off_event_loop(self):
+        client, query = _client([])
+        seen = {}
+
+        def execute():
+            seen["thread"] = threading.current_thread().name
+            return SimpleNamespace(data=None)
+
+        query.execute.side_effect = execute
+        rows = await Repository(client).select("audits")
+
+        assert rows == []
+        assert seen["thread"].startswith("db")
+
+    async def test_concurrency_is_bounded(self):
+        client, query = _client([])
+        active = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def execute():
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+            return SimpleNamespace(data=[])
+
+        query.execute.side_effect = execute
+        repo = Repository(client, max_concurrency=2)
+
+        await asyncio.gather(*(repo.select("audits") for _ in range(6)))
+
+        assert active["max"] == 2
+
+    async def test_select_in_chunks(self):
+        client, query = _client([{"id": 1}])
+        repo = Repository(client)
+
+        rows = await repo.select_in("hospitals", "id", "id", range(250), chunk_size=100)
+
+        assert query.in_.call_count == 3
+        assert len(rows) == 3
+        assert [len(c.args[1]) for c in query.in_.call_args_list] == [100, 100, 50]
+
+    async def test_empty_insert_skips_round_trip(self):
+        client, query = _client([])
+        assert await Repository(client).insert("audit_items", []) == []
+        client.table.assert_not_called()
+
+    def test_get_repository_override(self, monkeypatch):
+        fake = FakeRepository()
+        repository.set_repository(fake)
+        try:
+            assert repository.get_repository() is fake
+        finally:
+            repository.set_repository(None)
+        monkeypatch.setattr(repository, "get_supabase_client", lambda: None)
+        assert repository.get_repository() is None
+
+
+class TestFakeRepository:
+    @pytest.fixture
+    def repo(self):
+        return FakeRepository({
+            "clinics": [
+                {"id": 1, "website": "https://A-Clinic.kr", "score": 90, "sggu": "강남구"},
+                {"id": 2, "website": "https://b-clinic.kr", "score": None, "sggu": "서초구"},
+                {"id": 3, "website": "https://c.kr", "score": 40, "sggu": "마포구"},
+            ],
+        })
+
+    async def test_filters(self, repo):
+        async def ids(*filters):
+            return [r["id"] for r in await repo.select("clinics", "id", list(filters))]
+
+        assert await ids(ilike("website", "%a-clinic%")) == [1]
+        assert await ids(in_("sggu", {"강남구", "서초구"})) == [1, 2]
+        assert await ids(not_null("score")) == [1, 3]
+        assert await ids(is_null("score")) == [2]
+        assert await ids(gte("score", 50)) == [1]
+        assert await ids(lt("score", 50)) == [3]
+
+    async def test_order_limit_and_projection(self, repo):
+        rows = await repo.select("clinics", "id, score", order="score", desc=True, limit=2)
+        assert rows == [{"id": 1, "score": 90}, {"id": 3, "score": 40}]
+
+    async def test_upsert_on_conflict(self, repo):
+        await repo.upsert("cache", {"k": "a", "p": "n", "v": 1}, on_conflict="k,p")
+        await repo.upsert("cache", {"k": "a", "p": "n", "v": 2}, on_conflict="k,p")
+        assert repo.rows("cache") == [{"k": "a", "p": "n", "v": 2}]
+
+    async def test_update(self, repo):
+        updated = await repo.update("clinics", {"score": 10}, [eq("id", 2)])
+        assert updated[0]["score"] == 10
+        assert (await repo.select_one("clinics", "score", [eq("id", 2)])) == {"score": 10}
+
+
+class TestSaveScanResult:
+    async def test_writes_audit_items_and_hospital(self):
+        repo = FakeRepository({
+            "audits": [{"id": "a1", "hospital_id": "h1", "status": "scanning"}],
+            "hospitals": [{"id": "h1"}],
+        })
+        repository.set_repository(repo)
+        try:
+            ok = await save_scan_result("a1", {
+                "total_score": 72.4,
+                "grade": "B",
+                "items": [
+                    {"category": "technical_seo", "item_key": "robots_txt", "status": "pass",
+                     "display_name": "robots.txt"},
+                    {"category": "technical_seo", "item_key": "sitemap", "status": "fail"},
+                ],
+            })
+        finally:
+            repository.set_repository(None)
+
+        assert ok is True
+        assert repo.rows("audits")[0]["status"] == "completed"
+        assert repo.rows("audits")[0]["total_score"] == 72
+        items = repo.rows("audit_items")
+        assert [i["item_key"] for i in items] == ["robots_txt", "sitemap"]
+        assert items[0]["details"]["display_name"] == "robots.txt"
+        assert repo.calls.count(("insert", "audit_items")) == 1  # one batched insert
+        assert repo.rows("hospitals")[0]["latest_audit_id"] == "a1"
+
+    async def test_update_status_without_supabase(self, monkeypatch):
+        monkeypatch.setattr(repository, "get_supabase_client", lambda: None)
+        assert await update_audit_status("a1", "failed") is False
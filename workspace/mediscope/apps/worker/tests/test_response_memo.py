@@ -0,0 +1,200 @@
+"""Tests for the per-scan response memo shared by the crawl and the checks."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+
+from app.checks.errors import check_errors
+from app.checks.https_check import check_https
+from app.checks.links import check_links
+from app.config import settings
+from app.services.crawler import Crawler
+from app.services.response_memo import MemoizedClient, ResponseMemo
+
+_PUBLIC_DNS = [(2, 1, 6, "", ("93.184.216.34", 443))]
+_HTML = {"Content-Type": "text/html; charset=utf-8"}
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(follow_redirects=True) as c:
+        yield c
+
+
+@pytest.mark.asyncio
+class TestResponseMemo:
+    async def test_records_redirect_hops(self, client):
+        async with respx.mock:
+            respx.get("https://example.com/old").mock(
+                return_value=httpx.Response(301, headers={"Location": "/mid"})
+            )
+            respx.get("https://example.com/mid").mock(
+                return_value=httpx.Response(302, headers={"Location": "https://example.com/new"})
+            )
+            respx.get("https://example.com/new").mock(
+                return_value=httpx.Response(200, text="<p>ok</p>", headers=_HTML)
+            )
+            memo = ResponseMemo()
+            memo.record(await client.get("https://example.com/old"))
+
+        assert memo.get("https://example.com/old").status_code == 301
+        assert memo.get("https://example.com/old").location == "https://example.com/mid"
+        assert memo.get("https://example.com/mid").location == "https://example.com/new"
+        followed = memo.resolve("https://example.com/old", follow_redirects=True)
+        assert followed.content == b"<p>ok</p>"
+        unfollowed = memo.resolve("https://example.com/old#top", follow_redirects=False)
+        assert unfollowed.status_code == 301
+
+    async def test_followed_lookup_needs_final_body(self):
+        memo = ResponseMemo()
+        memo.record(
+            httpx.Response(
+                301,
+                headers={"Location": "https://example.com/b"},
+                request=httpx.Request("GET", "https://example.com/a"),
+            )
+        )
+        assert memo.resolve("https://example.com/a", follow_redirects=False) is not None
+        assert memo.resolve("https://example.com/a", follow_redirects=True) is None
+
+
+@pytest.mark.asyncio
+class TestMemoizedClient:
+    async def test_replays_status_headers_and_body(self, client):
+        memo = ResponseMemo()
+        async with respx.mock:
+            route = respx.get("https://example.com/").mock(
+                return_value=httpx.Response(200, text="안녕", headers=_HTML)
+            )
+            memo.record(await client.get("https://example.com/"))
+            memoized = MemoizedClient(client, memo)
+            resp = await memoized.get("https://example.com/")
+            head = await memoized.head("https://example.com/")
+
+        assert route.call_count == 1
+        assert resp.text == "안녕"
+        assert resp.headers["content-type"].startswith("text/html")
+        assert head.status_code == 200
+        assert memo.stats()["hits"] == 2
+
+    async def test_miss_fetches_once_and_records(self, client):
+        memo = ResponseMemo()
+        memoized = MemoizedClient(client, memo)
+        async with respx.mock:
+            route = respx.get("https://example.com/x").mock(return_value=httpx.Response(404))
+            first = await memoized.get("https://example.com/x", follow_redirects=True)
+            second = await memoized.head("https://example.com/x")
+
+        assert route.call_count == 1
+        assert first.status_code == second.status_code == 404
+        assert memo.stats() == {"entries": 1, "hits": 1, "fetches": 1}
+
+    async def test_recorded_failure_is_replayed(self, client):
+        memo = ResponseMemo()
+        memo.record_error("https://example.com/down", httpx.ConnectTimeout("timed out"))
+        with pytest.raises(httpx.HTTPError):
+            await MemoizedClient(client, memo).get("https://example.com/down")
+
+    async def test_requests_with_options_bypass_memo(self, client):
+        memo = ResponseMemo()
+        memoized = MemoizedClient(client, memo)
+        async with respx.mock:
+            route = respx.get("https://example.com/s").mock(return_value=httpx.Response(200))
+            await memoized.get("https://example.com/s", params={"q": "1"})
+            await memoized.get("https://example.com/s", params={"q": "1"})
+
+        assert route.call_count == 2
+        assert len(memo) == 0
+
+    async def test_head_miss_does_not_read_body(self, client):
+        memo = ResponseMemo()
+        memoized = MemoizedClient(client, memo)
+        async with respx.mock:
+            get = respx.get("https://example.com/video.mp4").mock(
+                return_value=httpx.Response(200, content=b"x" * 1000)
+            )
+            head = respx.head("https://example.com/video.mp4").mock(
+                return_value=httpx.Response(200, headers={"Content-Type": "video/mp4"})
+            )
+            first = await memoized.head("https://example.com/video.mp4")
+            second = await memoized.head("https://example.com/video.mp4")
+
+        assert first.status_code == second.status_code == 200
+        assert head.call_count == 1
+        assert not get.called
+        assert memo.get("https://example.com/video.mp4").partial
+
+    async def test_get_miss_capped_at_html_byte_limit(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "crawler_max_html_bytes", 100)
+        memo = ResponseMemo()
+        async with respx.mock:
+            respx.get("https://example.com/big").mock(
+                return_value=httpx.Response(200, content=b"x" * 1000)
+            )
+            resp = await MemoizedClient(client, memo).get("https://example.com/big")
+
+        assert resp.content == b"x" * 100
+        assert memo.get("https://example.com/big").partial
+
+    async def test_partial_entry_answers_head_only(self, client):
+        memo = ResponseMemo()
+        async with respx.mock:
+            route = respx.get("https://example.com/guide.pdf").mock(
+                return_value=httpx.Response(
+                    200, content=b"%PDF-full", headers={"Content-Type": "application/pdf"}
+                )
+            )
+            async with client.stream("GET", "https://example.com/guide.pdf") as resp:
+                memo.record(resp, content=b"", partial=True)
+            memoized = MemoizedClient(client, memo)
+            head = await memoized.head("https://example.com/guide.pdf")
+            get = await memoized.get("https://example.com/guide.pdf")
+
+        assert head.status_code == 200
+        assert get.content == b"%PDF-full"
+        assert route.call_count == 2
+        assert not memo.get("https://example.com/guide.pdf").partial
+
+
+@pytest.mark.asyncio
+class TestChecksFromCrawl:
+    async def test_checks_reuse_crawl_responses(self):
+        home = (
+            '<html><a href="/about">About</a><a href="/old">Old</a>'
+            '<img src="https://example.com/a.png"></html>'
+        )
+        crawler = Crawler(max_pages=5, max_depth=1, concurrency=1)
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC_DNS):
+            async with respx.mock:
+                routes = {
+                    "home": respx.get("https://example.com/").mock(
+                        return_value=httpx.Response(200, text=home, headers=_HTML)
+                    ),
+                    "about": respx.get("https://example.com/about").mock(
+                        return_value=httpx.Response(200, text="<html></html>", headers=_HTML)
+                    ),
+                    "old": respx.get("https://example.com/old").mock(
+                        return_value=httpx.Response(301, headers={"Location": "/about"})
+                    ),
+                    "http": respx.get("http://example.com/").mock(
+                        return_value=httpx.Response(301, headers={"Location": "https://example.com/"})
+                    ),
+                }
+                pages = await crawler.crawl("https://example.com/")
+                crawled = {name: r.call_count for name, r in routes.items()}
+
+                async with httpx.AsyncClient(follow_redirects=True) as raw:
+                    memoized = MemoizedClient(raw, crawler.memo)
+                    https = await check_https(memoized, "https://example.com/")
+                    links = await check_links(memoized, pages[0].parsed, "https://example.com/")
+                    errors = await check_errors(memoized, [p.url for p in pages])
+                after = {name: r.call_count for name, r in routes.items()}
+
+        # Only the http:// redirect probe was new to the scan
+        assert after == {**crawled, "http": 1}
+        assert https.details["http_redirects_to_https"] is True
+        assert links.details["broken_count"] == 0
+        assert errors.details["error_count"] == 0
+        assert crawler.memo.stats()["fetches"] == 1
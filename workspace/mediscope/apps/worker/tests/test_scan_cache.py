@@ -0,0 +1,135 @@
+"""Tests for scan single-flight coalescing and the result cache."""
+
+import asyncio
+
+import pytest
+
+from app.services.scan_cache import ScanCache, scan_key
+
+
+def _scanner(result: dict | None = None, delay: float = 0.0):
+    calls = []
+
+    async def scan():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return dict(result or {"total_score": 70})
+
+    return scan, calls
+
+
+class TestScanKey:
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://Example.com",
+            "https://example.com/",
+            "https://EXAMPLE.com:443/",
+            "https://www.example.com/#top",
+        ],
+    )
+    def test_equivalent_urls(self, url):
+        assert scan_key(url, {}) == scan_key("https://example.com/", {})
+
+    def test_path_query_and_port_kept(self):
+        key = scan_key("http://a.com:8080/x?y=1", {})
+        assert key != scan_key("http://a.com/x?y=1", {})
+        assert key != scan_key("http://a.com:8080/x", {})
+
+    def test_key_includes_options(self):
+        assert scan_key("https://a.com", {"depth": 3}) == scan_key("https://A.com/", {"depth": 3})
+        assert scan_key("https://a.com", {"depth": 3}) != scan_key("https://a.com", {"depth": 2})
+
+
+class TestScanCache:
+    async def test_concurrent_requests_share_one_scan(self):
+        cache = ScanCache(ttl=60, max_entries=10)
+        scan, calls = _scanner(delay=0.05)
+        results = await asyncio.gather(*(cache.run("k", scan) for _ in range(5)))
+        assert len(calls) == 1
+        assert all(r["total_score"] == 70 for r in results)
+        assert sum(r["scan_cache"]["coalesced"] for r in results) == 4
+        assert cache.stats["coalesced"] == 4
+
+    async def test_completed_result_served_from_cache(self):
+        cache = ScanCache(ttl=60, max_entries=10)
+        scan, calls = _scanner()
+        await cache.run("k", scan)
+        result = await cache.run("k", scan)
+        assert len(calls) == 1
+        assert result["scan_cache"]["hit"] is True
+        assert cache.stats["hits"] == 1
+
+    async def test_callers_get_independent_copies(self):
+        cache = ScanCache(ttl=60, max_entries=10)
+        scan, _ = _scanner()
+        first = await cache.run("k", scan)
+        first["task_id"] = "a"
+        second = await cache.run("k", scan)
+        assert "task_id" not in second
+
+    async def test_force_refresh_bypasses_cache(self):
+        cache = ScanCache(ttl=60, max_entries=10)
+        scan, calls = _scanner()
+        await cache.run("k", scan)
+        await cache.run("k", scan, force_refresh=True)
+        assert len(calls) == 2
+
+    async def test_ttl_expiry(self):
+        cache = ScanCache(ttl=0.05, max_entries=10)
+        scan, calls = _scanner()
+        await cache.run("k", scan)
+        await asyncio.sleep(0.1)
+        await cache.run("k", scan)
+        assert len(calls) == 2
+
+    async def test_zero_ttl_disables_caching(self):
+        cache = ScanCache(ttl=0, max_entries=10)
+        scan, calls = _scanner()
+        await cache.run("k", scan)
+        await cache.run("k", scan)
+        assert len(calls) == 2
+
+    async def test_error_results_not_cached(self):
+        cache = ScanCache(ttl=60, max_entries=10)
+        scan, calls = _scanner({"error": "사이트에 접근할 수 없습니다"})
+        await cache.run("k", scan)
+        await cache.run("k", scan)
+        assert len(calls) == 2
+
+    async def test_exception_shared_and_not_cached(self):
+        cache = ScanCache(ttl=60, max_entries=10)
+        calls = []
+
+        async def boom():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("down")
+
+        results = await asyncio.gather(
+            cache.run("k", boom), cache.run("k", boom), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert len(calls) == 1
+        with pytest.raises(RuntimeError):
+            await cache.run("k", boom)
+        assert len(calls) == 2
+
+    async def test_cancelled_waiter_does_not_cancel_scan(self):
+        cache = ScanCache(ttl=60, max_entries=10)
+        scan, calls = _scanner(delay=0.05)
+        first = asyncio.create_task(cache.run("k", scan))
+        second = asyncio.create_task(cache.run("k", scan))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await second
+        assert result["total_score"] == 70
+        assert len(calls) == 1
+
+    async def test_lru_eviction(self):
+        cache = ScanCache(ttl=60, max_entries=2)
+        scan, calls = _scanner()
+        for key in ("a", "b", "c"):
+            await cache.run(key, scan)
+        await cache.run("a", scan)
+        assert len(calls) == 4
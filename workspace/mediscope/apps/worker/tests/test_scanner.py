@@ -0,0 +1,259 @@
+"""Tests for the scan orchestrator: concurrency, per-check timeouts and the scan deadline."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.checks.base import CheckResult, Grade
+from app.config import settings
+from app.services import scanner
+from app.services.crawler import CrawlResult
+from app.services.response_memo import MemoizedClient, ResponseMemo
+from app.services.stage_graph import Stage
+
+_HTML = "<html><head><title>테스트 피부과 | 공식</title></head><body><h1>안녕</h1></body></html>"
+
+
+def _result(name: str) -> CheckResult:
+    return CheckResult(name=name, score=1.0, grade=Grade.PASS)
+
+
+def _check(name: str, delay: float = 0.0):
+    async def fake(*args, **kwargs):
+        await asyncio.sleep(delay)
+        return _result(name)
+
+    return fake
+
+
+class _FakeCrawler:
+    crawl_delay = 0.0
+    crawl_timeout = None
+    perf_started_during_crawl = False
+
+    def __init__(self, **kwargs):
+        self.stats = {}
+        self.memo = ResponseMemo()
+
+    async def crawl(self, url, timeout=None):
+        _FakeCrawler.crawl_timeout = timeout
+        await asyncio.sleep(self.crawl_delay)
+        _FakeCrawler.perf_started_during_crawl = _perf_started.is_set()
+        return [CrawlResult(url=url, html=_HTML, status_code=200)]
+
+
+_perf_started = asyncio.Event()
+
+
+async def _passthrough(url):
+    return url
+
+
+def _performance(delay: float = 0.0):
+    async def fake(client, url):
+        _perf_started.set()
+        await asyncio.sleep(delay)
+        return [_result(n) for n in ("lcp", "inp", "cls", "performance_score")]
+
+    return fake
+
+
+def _slow_analyzer(pages):
+    time.sleep(1.0)
+    return {"score": 1}
+
+
+def _patch_check(monkeypatch, name: str, fn) -> None:
+    """Swap the check behind one of scanner.CHECK_STAGES, keeping its inputs."""
+    stages = []
+    for stage in scanner.CHECK_STAGES:
+        if stage.name == name:
+            stage = scanner._check_stage(name, fn, stage.inputs[1:])
+        stages.append(stage)
+    monkeypatch.setattr(scanner, "CHECK_STAGES", stages)
+
+
+@pytest.fixture
+def scan_env(monkeypatch):
+    """Patch out the network: crawler, every async check and Supabase-backed steps."""
+    global _perf_started
+    _perf_started = asyncio.Event()
+    _FakeCrawler.crawl_delay = 0.0
+    _FakeCrawler.perf_started_during_crawl = False
+    monkeypatch.setattr(scanner, "Crawler", _FakeCrawler)
+    monkeypatch.setattr(scanner, "validate_url_async", _passthrough)
+    for name in ("robots_txt", "sitemap", "https", "links", "errors_404"):
+        _patch_check(monkeypatch, name, _check(name))
+    monkeypatch.setattr(scanner, "check_performance", _performance())
+
+    async def no_competitors(*args, **kwargs):
+        return None
+
+    async def no_rankings(*args, **kwargs):
+        return {}
+
+    monkeypatch.setattr(scanner, "discover_competitors", no_competitors)
+    monkeypatch.setattr(scanner, "check_keyword_rankings", no_rankings)
+    return monkeypatch
+
+
+class TestSafeCheck:
+    async def test_returns_result(self):
+        r = await scanner._safe_check(_check("robots_txt")(), "robots_txt", timeout=1)
+        assert r.name == "robots_txt"
+        assert r.grade == Grade.PASS
+
+    async def test_timeout_is_system_limit(self):
+        r = await scanner._safe_check(_check("sitemap", delay=1)(), "sitemap", timeout=0.05)
+        assert r.fail_type == "system_limit"
+        assert r.details["timed_out"] is True
+
+    async def test_crash_is_api_error(self):
+        async def boom():
+            raise RuntimeError("x")
+
+        r = await scanner._safe_check(boom(), "https", timeout=1)
+        assert r.fail_type == "api_error"
+
+    async def test_check_stage_passes_inputs_in_order(self):
+        async def check(client, url):
+            return _result(f"{client}:{url}")
+
+        stage = scanner._check_stage("https", check, ("client", "url"))
+        r = await stage.fn(url="u", deadline=time.monotonic() + 5, client="c")
+        assert r.name == "c:u"
+
+    def test_remaining_clipped_to_deadline(self):
+        assert scanner._remaining(time.monotonic() + 2, cap=30) <= 2
+        assert scanner._remaining(time.monotonic() + 100, cap=30) == 30
+        assert scanner._remaining(time.monotonic() - 5, cap=30) == 0
+
+
+class TestRunScanConcurrency:
+    async def test_checks_run_concurrently(self, scan_env):
+        for name in ("robots_txt", "sitemap", "https", "links", "errors_404"):
+            _patch_check(scan_env, name, _check(name, delay=0.2))
+
+        started = time.perf_counter()
+        result = await scanner.run_scan("https://example.com/", check_geo=False)
+        elapsed = time.perf_counter() - started
+
+        # Five 0.2s checks one after another would take a full second
+        assert elapsed < 0.6
+        assert result["scan_budget"]["timed_out"] == []
+        assert result["scan_budget"]["regex_guard"] == []
+
+    async def test_pagespeed_starts_during_crawl(self, scan_env):
+        _FakeCrawler.crawl_delay = 0.05
+        await scanner.run_scan("https://example.com/", check_geo=False)
+        assert _FakeCrawler.perf_started_during_crawl is True
+
+    async def test_slow_check_becomes_system_limit(self, scan_env):
+        scan_env.setattr(settings, "scan_check_timeout", 0.1)
+        _patch_check(scan_env, "sitemap", _check("sitemap", delay=5))
+
+        result = await scanner.run_scan("https://example.com/", check_geo=False)
+
+        assert result["scan_budget"]["timed_out"] == ["sitemap"]
+        assert result["total_score"] > 0
+
+    async def test_slow_pagespeed_becomes_system_limit(self, scan_env):
+        scan_env.setattr(settings, "scan_performance_timeout", 0.1)
+        scan_env.setattr(scanner, "check_performance", _performance(delay=5))
+
+        started = time.perf_counter()
+        result = await scanner.run_scan("https://example.com/", check_geo=False)
+
+        assert time.perf_counter() - started < 2
+        assert "total_score" in result
+
+    async def test_scan_deadline_caps_every_check(self, scan_env):
+        scan_env.setattr(settings, "scan_deadline", 0.2)
+        _patch_check(scan_env, "robots_txt", _check("robots_txt", delay=5))
+        _patch_check(scan_env, "errors_404", _check("errors_404", delay=5))
+
+        started = time.perf_counter()
+        result = await scanner.run_scan("https://example.com/", check_geo=False)
+
+        assert time.perf_counter() - started < 1
+        assert sorted(result["scan_budget"]["timed_out"]) == ["errors_404", "robots_txt"]
+
+    async def test_crawl_bounded_by_deadline(self, scan_env):
+        scan_env.setattr(settings, "scan_deadline", 30)
+        scan_env.setattr(settings, "scan_crawl_timeout", 10)
+        await scanner.run_scan("https://example.com/", check_geo=False)
+        assert 9 < _FakeCrawler.crawl_timeout <= 10
+
+        scan_env.setattr(settings, "scan_deadline", 5)
+        await scanner.run_scan("https://example.com/", check_geo=False)
+        assert _FakeCrawler.crawl_timeout <= 5
+
+    async def test_slow_analyzer_given_up_at_deadline(self, scan_env):
+        scan_env.setattr(settings, "scan_deadline", 0.3)
+        stages = [
+            Stage(s.name, _slow_analyzer, s.inputs, s.kind)
+            if s.name == "multilingual_readiness"
+            else s
+            for s in scanner.ANALYZER_STAGES
+        ]
+        scan_env.setattr(scanner, "ANALYZER_STAGES", stages)
+
+        started = time.perf_counter()
+        result = await scanner.run_scan("https://example.com/", check_geo=False)
+
+        assert time.perf_counter() - started < 0.9
+        budget = result["scan_budget"]
+        # The dependent stage is skipped along with the slow one
+        assert {"multilingual_readiness", "international_usability"} <= set(
+            budget["stages_timed_out"]
+        )
+        assert result["multilingual_readiness"] is None
+        assert result["total_score"] > 0
+
+    async def test_hospital_name_from_title(self, scan_env):
+        seen = {}
+
+        async def competitors(url, hospital_name=""):
+            seen["name"] = hospital_name
+
+        scan_env.setattr(scanner, "discover_competitors", competitors)
+        await scanner.run_scan("https://example.com/", check_geo=False)
+        assert seen["name"] == "테스트 피부과"
+
+    async def test_checks_get_crawl_memo(self, scan_env):
+        seen = {}
+
+        async def errors(client, crawled_urls):
+            seen["client"] = client
+            return _result("errors_404")
+
+        _patch_check(scan_env, "errors_404", errors)
+        result = await scanner.run_scan("https://example.com/", check_geo=False)
+        assert isinstance(seen["client"], MemoizedClient)
+        assert result["response_memo"] == {"entries": 0, "hits": 0, "fetches": 0}
+
+    async def test_stage_timings_reported(self, scan_env):
+        result = await scanner.run_scan("https://example.com/", check_geo=False)
+        timings = result["stage_timings"]
+        assert {"robots_txt", "results", "score_data", "voice_search"} <= set(timings)
+        # Stages downstream of the score cannot start before it finished
+        score = timings["score_data"]
+        assert timings["voice_search"]["start_ms"] >= score["start_ms"] + score["duration_ms"]
+
+
+class TestScanStages:
+    @pytest.mark.parametrize("check_geo", [True, False])
+    def test_graph_is_valid(self, check_geo):
+        from app.services.stage_graph import validate_stages
+
+        provided = {
+            "url", "client", "deadline", "perf_task", "pages", "crawl_results",
+            "response_headers", "main_page", "crawled_urls", "hospital_name", "specialty",
+            "region_name",
+        }
+        validate_stages(scanner.scan_stages(check_geo), provided)
+
+    def test_report_keys_are_stage_outputs(self):
+        names = {s.name for s in scanner.scan_stages()}
+        assert set(scanner._REPORT_KEYS) <= names
@@ -71,3 +71,86 @@ class TestSSRF:
         ):
             with pytest.raises(SSRFError):
                 validate_url("https://nonexistent.example.com/")
+
+
+_PUBLIC = [(2, 1, 6, "", ("93.184.216.34", 443))]
+
+
+class TestDNSCache:
+    def test_repeat_validation_resolves_once(self):
+        from app.security.dns_resolver import resolver
+
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC) as gai:
+            for path in ("/", "/a", "/b"):
+                validate_url(f"https://example.com{path}")
+        assert gai.call_count == 1
+        assert resolver.stats()["lookups_saved"] == 2
+
+    def test_failure_is_negatively_cached(self):
+        import socket
+
+        with patch(
+            "app.security.ssrf.socket.getaddrinfo",
+            side_effect=socket.gaierror("DNS failed"),
+        ) as gai:
+            for _ in range(3):
+                with pytest.raises(SSRFError):
+                    validate_url("https://nonexistent.example.com/")
+        assert gai.call_count == 1
+
+    def test_ip_literal_skips_resolver(self):
+        with patch("app.security.ssrf.socket.getaddrinfo") as gai:
+            with pytest.raises(SSRFError):
+                validate_url("https://10.0.0.5/")
+        gai.assert_not_called()
+
+    def test_private_check_applies_to_cached_addresses(self):
+        with patch(
+            "app.security.ssrf.socket.getaddrinfo",
+            return_value=[(2, 1, 6, "", ("10.0.0.1", 443))],
+        ):
+            with pytest.raises(SSRFError):
+                validate_url("https://internal.example.com/")
+        with pytest.raises(SSRFError):
+            validate_url("https://internal.example.com/other")
+
+
+@pytest.mark.asyncio
+class TestValidateUrlAsync:
+    async def test_allows_public_and_blocks_private(self):
+        from app.security.ssrf import validate_url_async
+
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC):
+            assert await validate_url_async("https://example.com/") == "https://example.com/"
+        with patch(
+            "app.security.ssrf.socket.getaddrinfo",
+            return_value=[(2, 1, 6, "", ("192.168.0.10", 443))],
+        ):
+            with pytest.raises(SSRFError):
+                await validate_url_async("https://home.example.com/")
+
+    async def test_concurrent_lookups_share_one_resolution(self):
+        import asyncio
+        import time
+
+        from app.security.dns_resolver import resolver
+        from app.security.ssrf import validate_url_async
+
+        def slow_resolve(*args, **kwargs):
+            time.sleep(0.05)
+            return _PUBLIC
+
+        with patch("app.security.ssrf.socket.getaddrinfo", side_effect=slow_resolve) as gai:
+            await asyncio.gather(
+                *(validate_url_async(f"https://example.com/{i}") for i in range(5))
+            )
+        assert gai.call_count == 1
+        assert resolver.stats()["coalesced"] == 4
+
+    async def test_sync_and_async_share_cache(self):
+        from app.security.ssrf import validate_url_async
+
+        with patch("app.security.ssrf.socket.getaddrinfo", return_value=_PUBLIC) as gai:
+            validate_url("https://example.com/")
+            await validate_url_async("https://example.com/page")
+        assert gai.call_count == 1
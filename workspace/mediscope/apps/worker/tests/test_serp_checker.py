@@ -1,12 +1,16 @@
 """Tests for SERP checker service."""
 
+import asyncio
 import json
+import time
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 
+from app.db.repository import FakeRepository
+from app.services import serp_checker
 from app.services.serp_checker import (
     _build_competitors,
     _build_summary,
@@ -14,11 +18,20 @@ from app.services.serp_checker import (
     _extract_domain,
     _find_rank,
     check_keyword_rankings,
+    clear_serp_memory_cache,
+    serp_cache_stats,
 )
 
 HOSPITAL_URL = "https://hongdae.doctorpetit.com"
 
 
+@pytest.fixture(autouse=True)
+def _fresh_memory_cache():
+    clear_serp_memory_cache()
+    yield
+    clear_serp_memory_cache()
+
+
 def _make_response(status_code: int, json_data: dict) -> httpx.Response:
     """Create an httpx.Response with a request object set (needed for raise_for_status)."""
     resp = httpx.Response(
@@ -174,8 +187,10 @@ class TestSearchNaver:
             mock_settings.naver_client_id = "test-id"
             mock_settings.naver_client_secret = "test-secret"
             mock_settings.serper_api_key = ""
+            mock_settings.serp_provider_concurrency = 4
+            mock_settings.serp_negative_ttl = 900
 
-            with patch("app.services.serp_checker.get_supabase_client", return_value=None):
+            with patch("app.services.serp_checker.get_repository", return_value=None):
                 mock_resp = _make_response(200, naver_response)
 
                 with patch("httpx.AsyncClient.get", new_callable=AsyncMock, return_value=mock_resp):
@@ -193,8 +208,10 @@ class TestSearchNaver:
             mock_settings.naver_client_id = "test-id"
             mock_settings.naver_client_secret = "test-secret"
             mock_settings.serper_api_key = ""
+            mock_settings.serp_provider_concurrency = 4
+            mock_settings.serp_negative_ttl = 900
 
-            with patch("app.services.serp_checker.get_supabase_client", return_value=None):
+            with patch("app.services.serp_checker.get_repository", return_value=None):
                 with patch(
                     "httpx.AsyncClient.get",
                     new_callable=AsyncMock,
@@ -228,8 +245,10 @@ class TestSearchGoogle:
             mock_settings.naver_client_id = ""
             mock_settings.naver_client_secret = ""
             mock_settings.serper_api_key = "test-serper-key"
+            mock_settings.serp_provider_concurrency = 4
+            mock_settings.serp_negative_ttl = 900
 
-            with patch("app.services.serp_checker.get_supabase_client", return_value=None):
+            with patch("app.services.serp_checker.get_repository", return_value=None):
                 mock_resp = _make_response(200, serper_response)
 
                 with patch("httpx.AsyncClient.post", new_callable=AsyncMock, return_value=mock_resp):
@@ -253,6 +272,8 @@ class TestGracefulDegradation:
             mock_settings.naver_client_id = ""
             mock_settings.naver_client_secret = ""
             mock_settings.serper_api_key = ""
+            mock_settings.serp_provider_concurrency = 4
+            mock_settings.serp_negative_ttl = 900
 
             result = await check_keyword_rankings(HOSPITAL_URL, KEYWORDS)
 
@@ -266,6 +287,8 @@ class TestGracefulDegradation:
             mock_settings.naver_client_id = "id"
             mock_settings.naver_client_secret = "secret"
             mock_settings.serper_api_key = ""
+            mock_settings.serp_provider_concurrency = 4
+            mock_settings.serp_negative_ttl = 900
 
             result = await check_keyword_rankings(HOSPITAL_URL, [])
 
@@ -285,20 +308,23 @@ class TestCache:
             {"title": "Cached 닥터쁘띠", "link": "https://hongdae.doctorpetit.com"},
         ]
 
-        mock_sb = MagicMock()
-        mock_sb.table.return_value = mock_sb
-        mock_sb.select.return_value = mock_sb
-        mock_sb.eq.return_value = mock_sb
-        mock_sb.gte.return_value = mock_sb
-        mock_sb.single.return_value = mock_sb
-        mock_sb.execute.return_value = MagicMock(data={"results": cached_results})
+        repo = FakeRepository({
+            "serp_cache": [{
+                "keyword": "홍대 보톡스",
+                "portal": "naver",
+                "results": cached_results,
+                "expires_at": "2999-01-01T00:00:00",
+            }],
+        })
 
         with patch("app.services.serp_checker.settings") as mock_settings:
             mock_settings.naver_client_id = "id"
             mock_settings.naver_client_secret = "secret"
             mock_settings.serper_api_key = ""
+            mock_settings.serp_provider_concurrency = 4
+            mock_settings.serp_negative_ttl = 900
 
-            with patch("app.services.serp_checker.get_supabase_client", return_value=mock_sb):
+            with patch("app.services.serp_checker.get_repository", return_value=repo):
                 with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
                     result = await check_keyword_rankings(
                         HOSPITAL_URL,
@@ -311,15 +337,8 @@ class TestCache:
         assert result["results"][0]["naver"]["rank"] == 2
 
     async def test_cache_miss_calls_api(self):
-        mock_sb = MagicMock()
-        mock_sb.table.return_value = mock_sb
-        mock_sb.select.return_value = mock_sb
-        mock_sb.eq.return_value = mock_sb
-        mock_sb.gte.return_value = mock_sb
-        mock_sb.single.return_value = mock_sb
-        mock_sb.upsert.return_value = mock_sb
         # Cache miss
-        mock_sb.execute.return_value = MagicMock(data=None)
+        repo = FakeRepository()
 
         naver_response = {
             "items": [
@@ -331,8 +350,10 @@ class TestCache:
             mock_settings.naver_client_id = "id"
             mock_settings.naver_client_secret = "secret"
             mock_settings.serper_api_key = ""
+            mock_settings.serp_provider_concurrency = 4
+            mock_settings.serp_negative_ttl = 900
 
-            with patch("app.services.serp_checker.get_supabase_client", return_value=mock_sb):
+            with patch("app.services.serp_checker.get_repository", return_value=repo):
                 mock_resp = _make_response(200, naver_response)
                 with patch("httpx.AsyncClient.get", new_callable=AsyncMock, return_value=mock_resp):
                     result = await check_keyword_rankings(
@@ -342,3 +363,141 @@ class TestCache:
 
         assert result["results"][0]["naver"]["cached"] is False
         assert result["results"][0]["naver"]["rank"] == 1
+        saved = repo.rows("serp_cache")
+        assert [(r["keyword"], r["portal"]) for r in saved] == [("홍대 보톡스", "naver")]
+
+    async def test_bulk_lookup_fetches_only_misses_concurrently(self):
+        keywords = [{"keyword": f"키워드 {i}", "language": "ko"} for i in range(6)]
+        repo = FakeRepository({
+            "serp_cache": [
+                {
+                    "keyword": "키워드 0",
+                    "portal": "naver",
+                    "results": [{"title": "닥터쁘띠", "link": "https://hongdae.doctorpetit.com"}],
+                    "expires_at": "2999-01-01T00:00:00",
+                },
+                {
+                    # Expired rows are misses
+                    "keyword": "키워드 1",
+                    "portal": "naver",
+                    "results": [],
+                    "expires_at": "2000-01-01T00:00:00",
+                },
+            ],
+        })
+        active = {"now": 0, "max": 0}
+        fetched = []
+
+        async def fake_search(client, keyword):
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            fetched.append(keyword)
+            return [{"title": "B피부과", "link": "https://b-skin.com"}]
+
+        with patch("app.services.serp_checker.settings") as mock_settings:
+            mock_settings.naver_client_id = "id"
+            mock_settings.naver_client_secret = "secret"
+            mock_settings.serper_api_key = ""
+            mock_settings.serp_provider_concurrency = 2
+            mock_settings.serp_negative_ttl = 900
+
+            with (
+                patch("app.services.serp_checker.get_repository", return_value=repo),
+                patch("app.services.serp_checker._search_naver", fake_search),
+            ):
+                result = await check_keyword_rankings(HOSPITAL_URL, keywords)
+
+        assert sorted(fetched) == [f"키워드 {i}" for i in range(1, 6)]
+        assert active["max"] == 2
+        assert [r["naver"]["cached"] for r in result["results"]] == [True] + [False] * 5
+        assert result["results"][0]["naver"]["rank"] == 1
+        assert repo.calls.count(("select", "serp_cache")) == 1
+        assert repo.calls.count(("upsert", "serp_cache")) == 1
+        assert len(repo.rows("serp_cache")) == 6
+
+
+@pytest.mark.asyncio
+class TestMemoryTier:
+    @staticmethod
+    def _settings(mock_settings):
+        mock_settings.naver_client_id = "id"
+        mock_settings.naver_client_secret = "secret"
+        mock_settings.serper_api_key = ""
+        mock_settings.serp_provider_concurrency = 4
+        mock_settings.serp_negative_ttl = 900
+
+    async def test_repeat_lookup_skips_db_and_api(self):
+        repo = FakeRepository()
+        calls = []
+
+        async def fake_search(client, keyword):
+            calls.append(keyword)
+            return [{"title": "닥터쁘띠", "link": "https://hongdae.doctorpetit.com"}]
+
+        with patch("app.services.serp_checker.settings") as mock_settings:
+            self._settings(mock_settings)
+            with (
+                patch("app.services.serp_checker.get_repository", return_value=repo),
+                patch("app.services.serp_checker._search_naver", fake_search),
+            ):
+                await check_keyword_rankings(HOSPITAL_URL, [{"keyword": "강남 보톡스"}])
+                db_calls = len(repo.calls)
+                second = await check_keyword_rankings(
+                    "https://other-clinic.kr", [{"keyword": "강남 보톡스"}]
+                )
+
+        assert calls == ["강남 보톡스"]
+        assert len(repo.calls) == db_calls  # served from memory
+        assert second["results"][0]["naver"]["cached"] is True
+        stats = serp_cache_stats()
+        assert stats["memory_hits"] == 1
+        assert stats["fetches"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    async def test_failed_fetch_is_negatively_cached(self):
+        repo = FakeRepository()
+        calls = []
+
+        async def failing_search(client, keyword):
+            calls.append(keyword)
+            return None
+
+        with patch("app.services.serp_checker.settings") as mock_settings:
+            self._settings(mock_settings)
+            with (
+                patch("app.services.serp_checker.get_repository", return_value=repo),
+                patch("app.services.serp_checker._search_naver", failing_search),
+            ):
+                for _ in range(3):
+                    result = await check_keyword_rankings(
+                        HOSPITAL_URL, [{"keyword": "강남 보톡스"}]
+                    )
+
+        assert calls == ["강남 보톡스"]
+        assert result["results"][0]["naver"]["rank"] is None
+        assert result["results"][0]["naver"]["cached"] is False
+        assert repo.rows("serp_cache") == []  # failures never reach the DB tier
+        assert serp_cache_stats()["negative_hits"] == 2
+
+    async def test_db_hit_is_promoted_until_row_expiry(self):
+        expires_at = (datetime.now() + timedelta(seconds=0.2)).isoformat()
+        repo = FakeRepository({
+            "serp_cache": [{
+                "keyword": "강남 보톡스",
+                "portal": "naver",
+                "results": [{"title": "닥터쁘띠", "link": "https://hongdae.doctorpetit.com"}],
+                "expires_at": expires_at,
+            }],
+        })
+        with patch("app.services.serp_checker.settings") as mock_settings:
+            self._settings(mock_settings)
+            with patch("app.services.serp_checker.get_repository", return_value=repo):
+                await check_keyword_rankings(HOSPITAL_URL, [{"keyword": "강남 보톡스"}])
+                await check_keyword_rankings(HOSPITAL_URL, [{"keyword": "강남 보톡스"}])
+
+        assert serp_cache_stats()["db_hits"] == 1
+        assert serp_cache_stats()["memory_hits"] == 1
+        expires, _ = serp_checker._memory_cache._entries[("강남 보톡스", "naver")]
+        assert 0 < expires - time.monotonic() <= 0.2
@@ -0,0 +1,130 @@
+"""Tests for the crawl-metadata server delivery performance check."""
+
+import asyncio
+import gzip
+
+import httpx
+
+from app.checks import server_performance
+from app.checks.base import Grade
+from app.checks.server_performance import check_server_performance
+from app.services.crawler import CrawlResult, RedirectHop, _HeaderTimer
+
+_BIG_HTML = "<html><body>" + "<p>시술 안내</p>" * 400 + "</body></html>"
+
+
+def _page(
+    *,
+    ttfb: float | None = 200,
+    encoding: str | None = "br",
+    headers: dict | None = None,
+    http_version: str = "HTTP/2",
+    html: str = _BIG_HTML,
+    redirects: tuple = (),
+) -> CrawlResult:
+    return CrawlResult(
+        url="https://a.com/",
+        html=html,
+        status_code=200,
+        headers={"cache-control": "max-age=300", "etag": '"v1"'} if headers is None else headers,
+        redirects=redirects,
+        ttfb_ms=ttfb,
+        transfer_size=len(html) // 4,
+        content_encoding=encoding,
+        http_version=http_version,
+    )
+
+
+class TestServerPerformance:
+    def test_fast_well_configured_site_passes(self):
+        r = check_server_performance([_page(), _page(ttfb=300)])
+        assert r.grade == Grade.PASS
+        assert r.score == 1.0
+        assert r.issues == []
+        assert r.details["compression"]["brotli"] is True
+        assert r.details["ttfb"]["median_ms"] == 250
+
+    def test_slow_uncompressed_uncached_site_fails(self):
+        pages = [
+            _page(ttfb=2500, encoding=None, headers={}, http_version="HTTP/1.1")
+            for _ in range(3)
+        ]
+        r = check_server_performance(pages)
+        assert r.grade == Grade.FAIL
+        assert r.details["ttfb"]["score"] == 0.0
+        assert r.details["compression"]["score"] == 0.0
+        assert r.details["caching"]["score"] == 0.0
+        assert r.details["http2"]["version"] == "HTTP/1.1"
+        assert any("TTFB" in i for i in r.issues)
+
+    def test_http11_penalized_when_h2_was_offered(self, monkeypatch):
+        monkeypatch.setattr(server_performance, "http2_available", lambda: True)
+        r = check_server_performance([_page(http_version="HTTP/1.1")])
+        assert r.details["http2"]["score"] == 0.5
+        assert any("HTTP/2 미지원" in i for i in r.issues)
+
+    def test_http2_skipped_when_h2_not_offered(self, monkeypatch):
+        monkeypatch.setattr(server_performance, "http2_available", lambda: False)
+        r = check_server_performance([_page(http_version="HTTP/1.1")])
+        assert r.details["http2"]["score"] is None
+        assert r.details["http2"]["h2_offered"] is False
+        assert not any("HTTP/2" in i for i in r.issues)
+        assert r.score == 1.0
+
+    def test_redirect_latency(self):
+        hops = (
+            RedirectHop("http://a.com/", 301, "https://a.com/", 400.0),
+            RedirectHop("https://a.com/", 302, "https://a.com/ko/", 500.0),
+        )
+        r = check_server_performance([_page(redirects=hops)])
+        assert r.details["redirects"] == {
+            "score": 0.0, "main_hops": 2, "main_redirect_ms": 900.0, "pages_redirected": 1,
+        }
+        assert r.score < 1.0
+
+    def test_small_pages_not_judged_on_compression(self):
+        r = check_server_performance([_page(html="<p>hi</p>", encoding=None)])
+        assert r.details["compression"] == {"score": None, "checked": 0}
+
+    def test_unmeasured_ttfb_is_left_out(self):
+        r = check_server_performance([_page(ttfb=None)])
+        assert r.details["ttfb"]["score"] is None
+        assert r.score == 1.0
+
+    def test_no_pages(self):
+        r = check_server_performance([])
+        assert r.fail_type == "not_applicable"
+
+    async def test_against_local_server(self):
+        """End to end on a real socket: headers, encoding and TTFB from one GET."""
+        body = gzip.compress(_BIG_HTML.encode())
+
+        async def handle(reader, writer):
+            await reader.readuntil(b"\r\n\r\n")
+            await asyncio.sleep(0.05)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+                b"Content-Encoding: gzip\r\nCache-Control: no-cache\r\n"
+                + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        timer = _HeaderTimer()
+        try:
+            async with httpx.AsyncClient() as client:
+                resp = await client.get(f"http://127.0.0.1:{port}/", extensions={"trace": timer})
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        page = CrawlResult.from_response(str(resp.url), resp, ttfb_ms=timer.last)
+        r = check_server_performance([page])
+        assert r.details["ttfb"]["median_ms"] >= 50
+        assert r.details["compression"]["encodings"] == {"gzip": 1}
+        assert r.details["caching"]["score"] == 0.5  # Cache-Control but no validator
+        assert r.details["http2"]["version"] == "HTTP/1.1"
+        assert r.details["html_bytes"]["transfer_bytes"] == len(body)
@@ -0,0 +1,152 @@
+"""Tests for the dependency-aware stage scheduler."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services import stage_graph
+from app.services.stage_graph import Stage, StageGraphError, run_stages, validate_stages
+
+
+def _sleep(seconds: float, value):
+    async def run(**kwargs):
+        await asyncio.sleep(seconds)
+        return value
+
+    return run
+
+
+def _count_pages(pages):
+    return len(pages)
+
+
+def _slow_count(pages):
+    time.sleep(0.5)
+    return len(pages)
+
+
+class TestValidateStages:
+    def test_unknown_input(self):
+        with pytest.raises(StageGraphError, match="unknown inputs"):
+            validate_stages([Stage("a", lambda b: b, ("b",))], set())
+
+    def test_duplicate_output(self):
+        with pytest.raises(StageGraphError, match="Duplicate"):
+            validate_stages([Stage("a", lambda: 1), Stage("a", lambda: 2)], set())
+
+    def test_output_shadows_context(self):
+        with pytest.raises(StageGraphError, match="Duplicate"):
+            validate_stages([Stage("url", lambda: 1)], {"url"})
+
+    def test_cycle(self):
+        stages = [Stage("a", lambda b: b, ("b",)), Stage("b", lambda a: a, ("a",))]
+        with pytest.raises(StageGraphError, match="Cycle"):
+            validate_stages(stages, set())
+
+    def test_bad_kind(self):
+        with pytest.raises(StageGraphError, match="kind"):
+            validate_stages([Stage("a", lambda: 1, kind="gpu")], set())
+
+    def test_cpu_stage_needs_pages(self):
+        with pytest.raises(StageGraphError, match="pages"):
+            validate_stages([Stage("a", _count_pages, ("x",), "cpu")], {"x"})
+
+
+class TestRunStages:
+    async def test_dependencies_feed_outputs(self):
+        context = {"x": 2}
+        await run_stages(
+            [
+                Stage("doubled", lambda x: x * 2, ("x",)),
+                Stage("total", lambda x, doubled: x + doubled, ("x", "doubled")),
+            ],
+            context,
+        )
+        assert context["doubled"] == 4
+        assert context["total"] == 6
+
+    async def test_independent_stages_overlap(self):
+        stages = [Stage(f"s{i}", _sleep(0.1, i), kind="async") for i in range(5)]
+        started = time.perf_counter()
+        timings = await run_stages(stages, {})
+        assert time.perf_counter() - started < 0.3
+        assert set(timings) == {f"s{i}" for i in range(5)}
+
+    async def test_dependent_stage_waits(self):
+        context: dict = {}
+        timings = await run_stages(
+            [
+                Stage("slow", _sleep(0.1, "done"), kind="async"),
+                Stage("after", lambda slow: slow.upper(), ("slow",)),
+                Stage("independent", _sleep(0.0, 1), kind="async"),
+            ],
+            context,
+        )
+        assert context["after"] == "DONE"
+        assert timings["after"]["start_ms"] >= timings["slow"]["duration_ms"]
+        assert timings["independent"]["start_ms"] < timings["slow"]["duration_ms"]
+
+    async def test_cpu_stage_gets_pages(self):
+        context = {"pages": [{"url": "https://a.com/", "html": "<p>x</p>"}]}
+        await run_stages([Stage("n", _count_pages, ("pages",), "cpu")], context)
+        assert context["n"] == 1
+
+    async def test_ready_cpu_stages_share_one_batch(self, monkeypatch):
+        calls = []
+        original = stage_graph.run_analyzers
+
+        async def run_analyzers(pages, jobs):
+            calls.append([name for name, _, _ in jobs])
+            return await original(pages, jobs)
+
+        monkeypatch.setattr(stage_graph, "run_analyzers", run_analyzers)
+        context = {"pages": [{"url": "https://a.com/", "html": "<p>x</p>"}]}
+        await run_stages(
+            [
+                Stage("a", _count_pages, ("pages",), "cpu"),
+                Stage("b", _count_pages, ("pages",), "cpu"),
+                Stage("slow", _sleep(0.05, 1), kind="async"),
+                Stage("c", lambda pages, slow: len(pages) + slow, ("pages", "slow"), "cpu"),
+            ],
+            context,
+        )
+        assert calls == [["a", "b"], ["c"]]
+        assert (context["a"], context["b"], context["c"]) == (1, 1, 2)
+
+    async def test_cpu_deadline_gives_up_batch_and_dependants(self):
+        context = {"pages": [{"url": "https://a.com/", "html": "<p>x</p>"}]}
+        timings = await run_stages(
+            [
+                Stage("slow", _slow_count, ("pages",), "cpu"),
+                Stage("after", lambda slow: slow, ("slow",)),
+                Stage("quick", _sleep(0.0, 1), kind="async"),
+            ],
+            context,
+            cpu_deadline=time.monotonic() + 0.1,
+        )
+        assert context["slow"] is None
+        assert context["after"] is None
+        assert context["quick"] == 1
+        assert timings["slow"]["timed_out"] is True
+        assert timings["after"]["timed_out"] is True
+        assert "timed_out" not in timings["quick"]
+
+    async def test_failure_cancels_running_stages(self):
+        cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def boom():
+            raise RuntimeError("stage failed")
+
+        with pytest.raises(RuntimeError, match="stage failed"):
+            await run_stages(
+                [Stage("slow", slow, kind="async"), Stage("boom", boom, kind="async")], {}
+            )
+        assert cancelled.is_set()
@@ -1,63 +1,73 @@
 """Tests for tech stack detector."""
 
+import json
+
 import pytest
 
+from app.checks.parsed_page import ParsedPage
 from app.services.tech_stack_detector import (
     ALL_CATEGORIES,
     TECH_SIGNATURES,
-    _match_tech,
+    SignatureDB,
     detect_tech_stack,
+    get_signature_db,
+    index_page,
+    load_signatures,
 )
 
 
 # ── Pattern matching ───────────────────────────────────────────────────────
 
 
+def _matches(html: str, tech_id: str) -> bool:
+    return tech_id in get_signature_db().match(ParsedPage(url="https://a.com/", html=html))
+
+
 class TestMatchTech:
     def test_google_analytics_gtag(self):
         html = '<script>gtag("config", "G-XXXXXX")</script>'
-        assert _match_tech(html, "google_analytics", TECH_SIGNATURES["google_analytics"])
+        assert _matches(html, "google_analytics")
 
     def test_google_analytics_tag_manager(self):
         html = '<script src="https://www.googletagmanager.com/gtag/js"></script>'
-        assert _match_tech(html, "google_analytics", TECH_SIGNATURES["google_analytics"])
+        assert _matches(html, "google_analytics")
 
     def test_facebook_pixel(self):
         html = "<script>fbq('init', '123456');</script>"
-        assert _match_tech(html, "facebook_pixel", TECH_SIGNATURES["facebook_pixel"])
+        assert _matches(html, "facebook_pixel")
 
     def test_channel_io(self):
         html = '<script src="https://cdn.channel.io/plugin/ch-plugin-web.js"></script>'
-        assert _match_tech(html, "channel_io", TECH_SIGNATURES["channel_io"])
+        assert _matches(html, "channel_io")
 
     def test_wordpress(self):
         html = '<link rel="stylesheet" href="/wp-content/themes/flavor/style.css">'
-        assert _match_tech(html, "wordpress", TECH_SIGNATURES["wordpress"])
+        assert _matches(html, "wordpress")
 
     def test_cloudflare(self):
         html = '<script src="https://cdnjs.cloudflare.com/ajax/libs/jquery.js"></script>'
-        assert _match_tech(html, "cloudflare", TECH_SIGNATURES["cloudflare"])
+        assert _matches(html, "cloudflare")
 
     def test_schema_org(self):
         html = '<script type="application/ld+json">{"@context":"https://schema.org"}</script>'
-        assert _match_tech(html, "schema_org", TECH_SIGNATURES["schema_org"])
+        assert _matches(html, "schema_org")
 
     def test_naver_analytics(self):
         html = "<script>var _nasa={}; wcs_add['wa']='abc123';</script>"
-        assert _match_tech(html, "naver_analytics", TECH_SIGNATURES["naver_analytics"])
+        assert _matches(html, "naver_analytics")
 
     def test_naver_booking(self):
         html = '<a href="https://booking.naver.com/booking/13/bizes/12345">예약</a>'
-        assert _match_tech(html, "naver_booking", TECH_SIGNATURES["naver_booking"])
+        assert _matches(html, "naver_booking")
 
     def test_no_match(self):
         html = "<html><body><p>Hello world</p></body></html>"
-        assert not _match_tech(html, "google_analytics", TECH_SIGNATURES["google_analytics"])
+        assert not _matches(html, "google_analytics")
 
     def test_case_insensitive(self):
         html = "<script>CHANNELIO.init()</script>"
         # ChannelIO pattern should match case-insensitively
-        assert _match_tech(html, "channel_io", TECH_SIGNATURES["channel_io"])
+        assert _matches(html, "channel_io")
 
 
 # ── Full detection ─────────────────────────────────────────────────────────
@@ -167,3 +177,77 @@ class TestDetectTechStack:
         assert "naver_booking" in result["detected"]
         assert "네이버 애널리틱스" in result["by_category"]["analytics"]
         assert "네이버 예약" in result["by_category"]["booking"]
+
+
+# ── Compiled signature database ────────────────────────────────────────────
+
+
+class TestSignatureDB:
+    def test_index_page(self):
+        page = ParsedPage("https://example.com", """
+            <script src="https://www.googletagmanager.com/gtag/js"></script>
+            <script>window.ChannelIO = function () {};</script>
+            <img src="/local.png"><a href="//booking.naver.com/x">예약</a>
+        """)
+        cookies = "__cf_bm=abc; Path=/, sid=1; Expires=Wed, 21 Oct 2026 07:28:00 GMT"
+        index = index_page(page, {"Set-Cookie": cookies})
+        assert index.hosts == {"www.googletagmanager.com", "booking.naver.com"}
+        assert "ChannelIO" in index.script_tokens
+        assert index.cookies == {"__cf_bm", "sid"}
+
+    def test_confirmed_techs_skip_html_pass(self, monkeypatch):
+        db = SignatureDB({
+            "cdn": {
+                "label": "CDN", "category": "cdn", "hosts": ["example.net"], "patterns": ["cdnjs"],
+            },
+        })
+
+        def scan(text):
+            raise AssertionError("HTML scanned after every tech was confirmed")
+
+        monkeypatch.setattr(db._html, "_scan", scan)
+        page = ParsedPage("https://example.com", '<script src="https://cdn.example.net/a.js"></script>')
+        assert db.match(page) == {"cdn"}
+
+    def test_headers_and_cookies(self):
+        page = ParsedPage("https://example.com", "<html><body>plain</body></html>")
+        result = detect_tech_stack(
+            [page],
+            response_headers={
+                "https://example.com": {"server": "cloudflare", "x-amz-cf-id": "abc"},
+            },
+        )
+        assert {"cloudflare", "aws_cloudfront"} <= result["detected"].keys()
+
+        page = ParsedPage("https://example.com/blog", "<html><body>plain</body></html>")
+        headers = {"set-cookie": "wordpress_test_cookie=WP+Cookie+check; path=/"}
+        result = detect_tech_stack([page], response_headers={page.url: headers})
+        assert "wordpress" in result["detected"]
+
+    def test_inline_script_token(self):
+        html = "<script>window.fbq = window.fbq || function () {};</script>"
+        result = detect_tech_stack([{"url": "https://example.com", "html": html}])
+        assert "facebook_pixel" in result["detected"]
+
+    def test_extra_signatures_file(self, tmp_path):
+        extra = tmp_path / "martech.json"
+        extra.write_text(json.dumps({
+            "hotjar": {
+                "label": "Hotjar",
+                "category": "analytics",
+                "hosts": ["hotjar.com"],
+                "patterns": ["hjSiteSettings"],
+            },
+        }))
+        signatures = load_signatures(str(extra))
+        assert "google_analytics" in signatures and "hotjar" in signatures
+
+        db = SignatureDB(signatures)
+        html = '<script src="https://static.hotjar.com/c/hotjar-1.js"></script>'
+        page = ParsedPage("https://example.com", html)
+        assert "hotjar" in db.match(page)
+
+    def test_invalid_extra_file_is_ignored(self, tmp_path):
+        bad = tmp_path / "bad.json"
+        bad.write_text("{not json")
+        assert load_signatures(str(bad)).keys() == TECH_SIGNATURES.keys()
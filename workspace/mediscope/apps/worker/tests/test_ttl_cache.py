@@ -0,0 +1,43 @@
+"""Tests for the in-process TTL/LRU cache."""
+
+import time
+
+from app.services.ttl_cache import MISSING, TTLCache
+
+
+class TestTTLCache:
+    def test_get_set_and_counters(self):
+        cache = TTLCache(max_entries=10, ttl=60)
+        assert cache.get("a") is MISSING
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.stats() == {
+            "entries": 1, "hits": 1, "misses": 1, "evictions": 0, "hit_rate": 0.5
+        }
+
+    def test_none_is_a_cached_value(self):
+        cache = TTLCache(max_entries=10, ttl=60)
+        cache.set("neg", None)
+        assert cache.get("neg") is None
+
+    def test_expiry(self):
+        cache = TTLCache(max_entries=10, ttl=60)
+        cache.set("a", 1, ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("a") is MISSING
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = TTLCache(max_entries=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # b is now least recently used
+        cache.set("c", 3)
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.evictions == 1
+
+    def test_non_positive_ttl_not_stored(self):
+        cache = TTLCache(max_entries=2, ttl=60)
+        cache.set("a", 1, ttl=0)
+        assert cache.get("a") is MISSING
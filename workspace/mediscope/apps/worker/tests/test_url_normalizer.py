@@ -0,0 +1,68 @@
+"""Tests for crawl URL canonicalization."""
+
+from app.services.url_normalizer import canonical_url, site_host, url_key
+
+
+class TestCanonicalUrl:
+    def test_scheme_host_port_and_fragment(self):
+        assert canonical_url("HTTPS://Example.COM:443/a#top") == "https://example.com/a"
+        assert canonical_url("http://example.com:80") == "http://example.com/"
+        assert canonical_url("http://example.com:8080/a") == "http://example.com:8080/a"
+
+    def test_percent_encoding_variants(self):
+        assert canonical_url("https://a.com/%7euser/%e2%82%ac") == "https://a.com/~user/%E2%82%AC"
+        assert canonical_url("https://a.com/시술/리프팅") == canonical_url(
+            "https://a.com/%EC%8B%9C%EC%88%A0/%EB%A6%AC%ED%94%84%ED%8C%85"
+        )
+        # Reserved escapes keep their meaning
+        assert canonical_url("https://a.com/a%2fb") == "https://a.com/a%2Fb"
+
+    def test_tracking_and_session_params_stripped(self):
+        url = "https://a.com/p?utm_source=x&id=3&fbclid=abc&GCLID=1&PHPSESSID=z&NaPm=ct"
+        assert canonical_url(url) == "https://a.com/p?id=3"
+        assert canonical_url("https://a.com/p;jsessionid=ABC?x=1") == "https://a.com/p?x=1"
+        assert canonical_url("https://a.com/?utm_medium=sns") == "https://a.com/"
+
+    def test_query_sorted_and_blank_values_kept(self):
+        assert canonical_url("https://a.com/?b=2&a=1&c=&d") == "https://a.com/?a=1&b=2&c=&d"
+        assert (
+            canonical_url("https://a.com/?b=2&a=1", sort_query=False) == "https://a.com/?b=2&a=1"
+        )
+
+    def test_configurable_strip_list(self):
+        assert canonical_url("https://a.com/?ref=x&utm_source=y", strip_params="ref") == (
+            "https://a.com/?utm_source=y"
+        )
+        assert canonical_url("https://a.com/?utm_source=y", strip_params="") == (
+            "https://a.com/?utm_source=y"
+        )
+
+    def test_non_utf8_query_values_untouched(self):
+        # EUC-KR "강남" as sent by older Korean boards
+        url = "https://a.com/board?keyword=%b0%ad%b3%b2&page=2"
+        assert canonical_url(url) == "https://a.com/board?keyword=%B0%AD%B3%B2&page=2"
+
+    def test_unparseable_url_returned_without_fragment(self):
+        assert canonical_url("http://[::1/a#x") == "http://[::1/a"
+
+
+class TestUrlKey:
+    def test_www_and_trailing_slash_folded(self):
+        keys = {
+            url_key(u)
+            for u in (
+                "https://www.example.com/about/",
+                "https://example.com/about",
+                "https://EXAMPLE.com:443/about?utm_campaign=spring#team",
+            )
+        }
+        assert keys == {"https://example.com/about"}
+
+    def test_distinct_pages_stay_distinct(self):
+        assert url_key("https://a.com/") != url_key("https://a.com/about")
+        assert url_key("https://a.com/?page=1") != url_key("https://a.com/?page=2")
+        assert url_key("http://a.com/") != url_key("https://a.com/")
+
+    def test_site_host(self):
+        assert site_host("https://www.Example.com:8443/x") == "example.com"
+        assert site_host("http://[::1/") == ""
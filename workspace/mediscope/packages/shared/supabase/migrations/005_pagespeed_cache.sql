@@ -0,0 +1,16 @@
+-- PageSpeed result cache
+-- 005_pagespeed_cache.sql
+
+-- ============================================================
+-- pagespeed_cache: PageSpeed Insights metrics per (url, strategy)
+-- Written by the worker (app/services/pagespeed_cache.py)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS pagespeed_cache (
+    url TEXT NOT NULL,
+    strategy TEXT NOT NULL DEFAULT 'mobile' CHECK (strategy IN ('mobile', 'desktop')),
+    metrics JSONB NOT NULL,
+    fetched_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (url, strategy)
+);
+
+CREATE INDEX IF NOT EXISTS idx_pagespeed_cache_fetched ON pagespeed_cache(fetched_at);